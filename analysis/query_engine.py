@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import duckdb
 import numpy as np
 import pandas as pd
 
+from analysis.result_cache import data_fingerprint, get_result_cache
+
 # UI helper for Streamlit dashboards
 # Keys are the internal IDs used in app_trading_hub.py dropdowns.
 ENTRY_MODELS = {
@@ -257,6 +260,27 @@ def strategy_key(strategy: StrategyConfig) -> Tuple[Any, ...]:
     )
 
 
+def cached_view(fn: Callable) -> Callable:
+    """
+    Cache a (con, filters, strategy) view in the shared result cache.
+
+    Key: view name + filters_key + strategy_key, plus the fingerprint of the
+    views' source tables (v_orb_trades, daily_features, orb_trades_1m_exec),
+    so appended or rebuilt rows are never served from cache.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(con: duckdb.DuckDBPyConnection, filters: Filters, strategy: StrategyConfig):
+        cache = get_result_cache()
+        if cache is None:
+            return fn(con, filters, strategy)
+        key = (fn.__name__, filters_key(filters), strategy_key(strategy))
+        fingerprint = data_fingerprint(con, "query_engine")
+        return cache.get_or_compute("query_engine", key, fingerprint, lambda: fn(con, filters, strategy))
+
+    return wrapper
+
+
 def serialize_filters(filters: Filters) -> Dict[str, Any]:
     """Convert Filters to a JSON-serializable dict."""
     data = asdict(filters)
@@ -390,112 +414,109 @@ def _sanitize(df: pd.DataFrame) -> pd.DataFrame:
     return df.replace([np.inf, -np.inf], np.nan).where(pd.notnull(df), None)
 
 
-def _fetch_base_frame(con: duckdb.DuckDBPyConnection, filters: Filters) -> pd.DataFrame:
-    """Base frame with ORB prices and optional close confirmations."""
+# Base frame columns in output order: name -> SQL expression (v = v_orb_trades, df = daily_features)
+BASE_COLUMNS: Dict[str, str] = {
+    "date_local": "v.date_local",
+    "instrument": "v.instrument",
+    "orb_time": "v.orb_time",
+    "break_dir": "v.break_dir",
+    "outcome": "v.outcome",
+    "r_multiple": "v.r_multiple",
+    "asia_type_code": "df.asia_type_code",
+    "london_type_code": "df.london_type_code",
+    "pre_ny_type_code": "df.pre_ny_type_code",
+    "asia_range": "df.asia_range",
+    "london_range": "df.london_range",
+    "pre_ny_range": "df.pre_ny_range",
+    "atr_20": "df.atr_20",
+    **{
+        f"orb_{field}": "CASE v.orb_time "
+        + " ".join(f"WHEN '{orb}' THEN df.orb_{orb}_{field}" for orb in ORB_TIMES)
+        + " END"
+        for field in ("high", "low", "size")
+    },
+    "close_confirmations": "ex.close_confirmations",
+}
+
+# Columns _apply_strategy reads
+STRATEGY_COLUMNS: Tuple[str, ...] = ("break_dir", "outcome", "orb_high", "orb_low", "orb_size", "close_confirmations")
+
+EXEC_CONFIRMS_TABLE = "orb_exec_confirmations"
+
+
+def refresh_exec_confirmations(con: duckdb.DuckDBPyConnection) -> Optional[str]:
+    """
+    Materialize MAX(close_confirmations) per (date_local, orb) of orb_trades_1m_exec.
+
+    Built as a TEMP table on the connection (nothing is written to the
+    database, so read-only connections work too) and rebuilt only when the
+    source's row count / last date / confirmation sum change. Returns the
+    table to join, or None when orb_trades_1m_exec does not exist.
+    """
+    try:
+        source = con.execute(
+            "SELECT COUNT(*), MAX(date_local), SUM(close_confirmations) FROM orb_trades_1m_exec"
+        ).fetchone()
+    except duckdb.Error:
+        return None
+    fingerprint = repr(tuple(source))
+
+    table, meta = f"temp.{EXEC_CONFIRMS_TABLE}", f"temp.{EXEC_CONFIRMS_TABLE}_meta"
+    con.execute(f"CREATE TEMP TABLE IF NOT EXISTS {meta} (source_fingerprint VARCHAR)")
+    row = con.execute(f"SELECT source_fingerprint FROM {meta}").fetchone()
+    if row is None or row[0] != fingerprint:
+        con.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE {table} AS
+            SELECT date_local, orb AS orb_time, MAX(close_confirmations) AS close_confirmations
+            FROM orb_trades_1m_exec
+            GROUP BY date_local, orb
+            """
+        )
+        con.execute(f"DELETE FROM {meta}")
+        con.execute(f"INSERT INTO {meta} VALUES (?)", [fingerprint])
+    return table
+
+
+def _fetch_base_frame(
+    con: duckdb.DuckDBPyConnection, filters: Filters, columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Base frame with ORB prices and optional close confirmations.
+
+    columns: subset of BASE_COLUMNS to fetch (default all), returned in BASE_COLUMNS order.
+    """
+    wanted = set(BASE_COLUMNS if columns is None else columns)
+    unknown = wanted - set(BASE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown base columns: {sorted(unknown)}")
+
     where_sql, params = _build_where_clause(filters, include_outcome_filter=True, trades_only=False, table_alias="v")
-    sql = f"""
-    WITH execs AS (
-      SELECT date_local, orb AS orb_time, MAX(close_confirmations) AS close_confirmations
-      FROM orb_trades_1m_exec
-      GROUP BY date_local, orb
+    exec_table = refresh_exec_confirmations(con) if "close_confirmations" in wanted else None
+
+    select = []
+    for name, expr in BASE_COLUMNS.items():
+        if name not in wanted:
+            continue
+        if name == "close_confirmations" and exec_table is None:
+            expr = "NULL"  # execs table missing
+        select.append(f"{expr} AS {name}")
+
+    exec_join = (
+        f"LEFT JOIN {exec_table} ex ON ex.date_local = v.date_local AND ex.orb_time = v.orb_time"
+        if exec_table is not None
+        else ""
     )
+    sql = f"""
     SELECT
-      v.date_local,
-      v.instrument,
-      v.orb_time,
-      v.break_dir,
-      v.outcome,
-      v.r_multiple,
-      df.asia_type_code,
-      df.london_type_code,
-      df.pre_ny_type_code,
-      df.asia_range,
-      df.london_range,
-      df.pre_ny_range,
-      df.atr_20,
-      CASE v.orb_time
-        WHEN '0900' THEN df.orb_0900_high
-        WHEN '1000' THEN df.orb_1000_high
-        WHEN '1100' THEN df.orb_1100_high
-        WHEN '1800' THEN df.orb_1800_high
-        WHEN '2300' THEN df.orb_2300_high
-        WHEN '0030' THEN df.orb_0030_high
-      END AS orb_high,
-      CASE v.orb_time
-        WHEN '0900' THEN df.orb_0900_low
-        WHEN '1000' THEN df.orb_1000_low
-        WHEN '1100' THEN df.orb_1100_low
-        WHEN '1800' THEN df.orb_1800_low
-        WHEN '2300' THEN df.orb_2300_low
-        WHEN '0030' THEN df.orb_0030_low
-      END AS orb_low,
-      CASE v.orb_time
-        WHEN '0900' THEN df.orb_0900_size
-        WHEN '1000' THEN df.orb_1000_size
-        WHEN '1100' THEN df.orb_1100_size
-        WHEN '1800' THEN df.orb_1800_size
-        WHEN '2300' THEN df.orb_2300_size
-        WHEN '0030' THEN df.orb_0030_size
-      END AS orb_size,
-      ex.close_confirmations
+      {", ".join(select)}
     FROM v_orb_trades v
     JOIN daily_features df
       ON df.date_local = v.date_local AND df.instrument = v.instrument
-    LEFT JOIN execs ex
-      ON ex.date_local = v.date_local AND ex.orb_time = v.orb_time
+    {exec_join}
     {where_sql}
     """
-    try:
-        df = con.execute(sql, params).fetchdf()
-    except duckdb.Error:
-        # Fallback if execs table missing
-        sql_no_exec = f"""
-        SELECT
-          v.date_local,
-          v.instrument,
-          v.orb_time,
-          v.break_dir,
-          v.outcome,
-          v.r_multiple,
-          df.asia_type_code,
-          df.london_type_code,
-          df.pre_ny_type_code,
-          df.asia_range,
-          df.london_range,
-          df.pre_ny_range,
-          df.atr_20,
-          CASE v.orb_time
-            WHEN '0900' THEN df.orb_0900_high
-            WHEN '1000' THEN df.orb_1000_high
-            WHEN '1100' THEN df.orb_1100_high
-            WHEN '1800' THEN df.orb_1800_high
-            WHEN '2300' THEN df.orb_2300_high
-            WHEN '0030' THEN df.orb_0030_high
-          END AS orb_high,
-          CASE v.orb_time
-            WHEN '0900' THEN df.orb_0900_low
-            WHEN '1000' THEN df.orb_1000_low
-            WHEN '1100' THEN df.orb_1100_low
-            WHEN '1800' THEN df.orb_1800_low
-            WHEN '2300' THEN df.orb_2300_low
-            WHEN '0030' THEN df.orb_0030_low
-          END AS orb_low,
-          CASE v.orb_time
-            WHEN '0900' THEN df.orb_0900_size
-            WHEN '1000' THEN df.orb_1000_size
-            WHEN '1100' THEN df.orb_1100_size
-            WHEN '1800' THEN df.orb_1800_size
-            WHEN '2300' THEN df.orb_2300_size
-            WHEN '0030' THEN df.orb_0030_size
-          END AS orb_size,
-          NULL AS close_confirmations
-        FROM v_orb_trades v
-        JOIN daily_features df
-          ON df.date_local = v.date_local AND df.instrument = v.instrument
-        {where_sql}
-        """
-        df = con.execute(sql_no_exec, params).fetchdf()
-    return df
+    return con.execute(sql, params).fetchdf()
 
 
 def _required_closes(strategy: StrategyConfig) -> int:
@@ -509,7 +530,7 @@ def _required_closes(strategy: StrategyConfig) -> int:
 
 
 def _apply_strategy(df: pd.DataFrame, strategy: StrategyConfig) -> pd.DataFrame:
-    frame = df.copy()
+    frame = df.copy(deep=False)  # new columns only; the base frame is never modified
     frame["orb_mid"] = (frame["orb_high"] + frame["orb_low"]) / 2
     frame["level_basis"] = strategy.level_basis
     frame["broke_side"] = frame["break_dir"]
@@ -538,34 +559,41 @@ def _apply_strategy(df: pd.DataFrame, strategy: StrategyConfig) -> pd.DataFrame:
     frame["retest_hit"] = np.where(frame["break_occurred"], True, False)
     frame["rejection_hit"] = np.where(frame["break_occurred"], True, False)
 
-    def _fail_reason(row: pd.Series) -> Optional[str]:
-        if not row.get("break_occurred", False):
-            return "no_break"
-        if not row.get("confirm_pass", False):
-            return "confirm_not_met"
-        if strategy.retest_required and not row.get("retest_hit", False):
-            return "retest_not_met"
-        if strategy.retest_required and strategy.entry_model == "break_retest_reject" and not row.get(
-            "rejection_hit", False
-        ):
-            return "rejection_not_met"
-        if (
-            strategy.max_stop_ticks is not None
-            and row.get("stop_ticks") is not None
-            and pd.notnull(row.get("stop_ticks"))
-            and row.get("stop_ticks") > strategy.max_stop_ticks
-        ):
-            return "stop_too_large"
-        return None
-
-    frame["filtered_out_reason"] = frame.apply(_fail_reason, axis=1)
+    # First failing check wins (same order as the entry funnel)
+    break_occurred = frame["break_occurred"].to_numpy(dtype=bool)
+    stop_ticks = pd.to_numeric(frame["stop_ticks"], errors="coerce").to_numpy(dtype=float)
+    retest_check = strategy.retest_required
+    rejection_check = strategy.retest_required and strategy.entry_model == "break_retest_reject"
+    max_stop = strategy.max_stop_ticks if strategy.max_stop_ticks is not None else np.inf
+    frame["filtered_out_reason"] = np.select(
+        [
+            ~break_occurred,
+            ~frame["confirm_pass"].to_numpy(dtype=bool),
+            retest_check & ~frame["retest_hit"].to_numpy(dtype=bool),
+            rejection_check & ~frame["rejection_hit"].to_numpy(dtype=bool),
+            stop_ticks > max_stop,  # NaN stops never fail
+        ],
+        ["no_break", "confirm_not_met", "retest_not_met", "rejection_not_met", "stop_too_large"],
+        default=None,
+    )
     frame["eligible_trade"] = frame["filtered_out_reason"].isnull() & frame["outcome"].isin(["WIN", "LOSS"])
     return frame
 
 
-def strategy_dataset(con: duckdb.DuckDBPyConnection, filters: Filters, strategy: StrategyConfig) -> pd.DataFrame:
-    """Return strategy-aware dataset."""
-    base = _fetch_base_frame(con, filters)
+def strategy_dataset(
+    con: duckdb.DuckDBPyConnection,
+    filters: Filters,
+    strategy: StrategyConfig,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Return strategy-aware dataset.
+
+    columns: base columns the caller reads beyond STRATEGY_COLUMNS (default all).
+    """
+    if columns is not None:
+        columns = (*STRATEGY_COLUMNS, *columns)
+    base = _fetch_base_frame(con, filters, columns)
     df = _apply_strategy(base, strategy)
     return df
 
@@ -605,10 +633,11 @@ def drilldown_full(con: duckdb.DuckDBPyConnection, filters: Filters, order: str
     return drilldown_full_with_strategy(con, filters, default_strategy(), order=order)
 
 
+@cached_view
 def headline_stats_with_strategy(
     con: duckdb.DuckDBPyConnection, filters: Filters, strategy: StrategyConfig
 ) -> Dict[str, Any]:
-    df = strategy_dataset(con, filters, strategy)
+    df = strategy_dataset(con, filters, strategy, columns=("r_multiple",))
     trades_df = df[df["eligible_trade"]]
     trades = len(trades_df)
     wins = len(trades_df[trades_df["outcome"] == "WIN"])
@@ -638,7 +667,7 @@ def headline_stats_with_strategy(
         asia_range_min=None,
         asia_range_max=None,
     )
-    base_df = strategy_dataset(con, base_filters, strategy)
+    base_df = strategy_dataset(con, base_filters, strategy, columns=())
     base_opportunities = len(base_df)
     base_trades = len(base_df[base_df["outcome"].isin(["WIN", "LOSS"])])
 
@@ -653,10 +682,11 @@ def headline_stats_with_strategy(
     }
 
 
+@cached_view
 def equity_curve_with_strategy(
     con: duckdb.DuckDBPyConnection, filters: Filters, strategy: StrategyConfig
 ) -> pd.DataFrame:
-    df = strategy_dataset(con, filters, strategy)
+    df = strategy_dataset(con, filters, strategy, columns=("date_local", "orb_time", "r_multiple"))
     trades = df[df["eligible_trade"]].copy()
     trades = trades.sort_values(["date_local", "orb_time"])
     trades["equity"] = trades["r_multiple"].cumsum()
@@ -666,15 +696,16 @@ def equity_curve_with_strategy(
 def histogram_with_strategy(
     con: duckdb.DuckDBPyConnection, filters: Filters, strategy: StrategyConfig
 ) -> pd.DataFrame:
-    df = strategy_dataset(con, filters, strategy)
+    df = strategy_dataset(con, filters, strategy, columns=("r_multiple",))
     trades = df[df["eligible_trade"]].copy()
     return trades[["r_multiple"]].dropna()
 
 
+@cached_view
 def heatmap_with_strategy(
     con: duckdb.DuckDBPyConnection, filters: Filters, strategy: StrategyConfig
 ) -> pd.DataFrame:
-    df = strategy_dataset(con, filters, strategy)
+    df = strategy_dataset(con, filters, strategy, columns=("asia_type_code", "london_type_code", "r_multiple"))
     trades = df[df["eligible_trade"]].copy()
     if trades.empty:
         return trades
@@ -714,7 +745,7 @@ def drilldown_full_with_strategy(
 
 
 def entry_funnel(con: duckdb.DuckDBPyConnection, filters: Filters, strategy: StrategyConfig) -> Dict[str, int]:
-    df = strategy_dataset(con, filters, strategy)
+    df = strategy_dataset(con, filters, strategy, columns=())
     total = len(df)
     break_occurred = int((df["break_occurred"]).sum())
     confirm_met = int((df["break_occurred"] & df["confirm_pass"]).sum())
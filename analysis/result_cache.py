@@ -0,0 +1,211 @@
+"""
+Result Cache - persistent, size-bounded cache for analysis results
+==================================================================
+
+WhatIfEngine.analyze_conditions and the query_engine views recompute the same
+answers for the same inputs on every Streamlit rerun and restart. This cache
+stores pickled results in a local SQLite file, so repeat queries return
+without touching DuckDB beyond a cheap fingerprint check:
+
+- keys:      (namespace, caller key, data fingerprint). Each namespace
+             declares the tables its results are computed from
+             (NAMESPACE_TABLES); data_fingerprint covers their row count,
+             newest key and a hash of every row, so appends and in-place
+             rebuilds both produce a new fingerprint. bars_1m is too large to
+             hash per request: its rewrites are tracked by bar_change_log.
+             Old entries simply age out.
+- eviction:  least recently used first, once the stored values exceed
+             max_bytes.
+- counters:  hits / misses / evictions per ResultCache instance (stats()).
+
+SQLite (not DuckDB) so several app processes can share the file while the
+gold database is open elsewhere.
+
+Usage:
+    from analysis.result_cache import get_result_cache, data_fingerprint
+
+    cache = get_result_cache()              # data/cache/results.sqlite, 256 MB
+    value = cache.get_or_compute("query_engine", key, data_fingerprint(con, "query_engine"), compute)
+    cache.stats()                           # {'hits': .., 'misses': .., 'evictions': .., ...}
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import duckdb
+
+RESULT_CACHE_PATH = "data/cache/results.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump to invalidate every stored result (e.g. after changing result shapes)
+CACHE_VERSION = "v1"
+
+# Table -> (column whose MAX() tracks new data, hash every row?)
+FINGERPRINT_TABLES: Dict[str, Tuple[str, bool]] = {
+    "daily_features": ("date_local", True),
+    "v_orb_trades": ("date_local", True),
+    "orb_trades_1m_exec": ("date_local", True),
+    "bars_1m": ("ts_utc", False),  # rewrites show up in bar_change_log instead
+}
+
+# Namespace -> tables its cached results are computed from
+NAMESPACE_TABLES: Dict[str, Tuple[str, ...]] = {
+    "query_engine": ("v_orb_trades", "daily_features", "orb_trades_1m_exec"),
+    "what_if": ("daily_features", "bars_1m"),
+}
+
+_MISSING = object()
+
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS results (
+        digest      TEXT PRIMARY KEY,
+        namespace   TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        nbytes      INTEGER NOT NULL,
+        accessed_at INTEGER NOT NULL,
+        value       BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS results_lru ON results (accessed_at);
+"""
+
+
+def data_fingerprint(con: duckdb.DuckDBPyConnection, namespace: Optional[str] = None) -> str:
+    """
+    Version string of a namespace's source tables (every fingerprinted table
+    when namespace is None): row count, newest key and, for hashed tables, the
+    sum of row hashes; plus the last bar_change_log entry when bars_1m is a
+    source (catches in-place bar rewrites). Missing tables are part of the
+    fingerprint, not an error.
+    """
+    tables = NAMESPACE_TABLES[namespace] if namespace is not None else tuple(FINGERPRINT_TABLES)
+    parts = [CACHE_VERSION]
+    for table in tables:
+        key_column, hashed = FINGERPRINT_TABLES[table]
+        content = f"SUM(hash({table}))" if hashed else "NULL"
+        try:
+            count, newest, digest = con.execute(
+                f"SELECT COUNT(*), MAX({key_column}), {content} FROM {table}"
+            ).fetchone()
+            parts.append(f"{table}:{count}:{newest}:{digest}")
+        except duckdb.Error:
+            parts.append(f"{table}:missing")
+    if "bars_1m" in tables:
+        try:
+            parts.append(f"changes:{con.execute('SELECT MAX(change_id) FROM bar_change_log').fetchone()[0]}")
+        except duckdb.Error:
+            pass
+    return "|".join(parts)
+
+
+class ResultCache:
+    """Disk-backed LRU cache of picklable results, bounded by max_bytes."""
+
+    def __init__(self, path: str = RESULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA_SQL)
+
+    @staticmethod
+    def _digest(namespace: str, key: Tuple, fingerprint: str) -> str:
+        return hashlib.sha256(repr((namespace, key, fingerprint)).encode()).hexdigest()
+
+    def get(self, namespace: str, key: Tuple, fingerprint: str, default: Any = None) -> Any:
+        """Cached value, or default on a miss."""
+        digest = self._digest(namespace, key, fingerprint)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE digest = ?", [digest]).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE digest = ?", [time.time_ns(), digest])
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, namespace: str, key: Tuple, fingerprint: str, value: Any) -> None:
+        """Store a value, then evict least recently used entries beyond max_bytes."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        digest = self._digest(namespace, key, fingerprint)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                [digest, namespace, fingerprint, len(blob), time.time_ns(), blob],
+            )
+            self._evict()
+
+    def get_or_compute(self, namespace: str, key: Tuple, fingerprint: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(namespace, key, fingerprint, default=_MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(namespace, key, fingerprint, value)
+        return value
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for digest, nbytes in self._conn.execute("SELECT digest, nbytes FROM results ORDER BY accessed_at, rowid"):
+            if total <= self.max_bytes:
+                break
+            victims.append(digest)
+            total -= nbytes
+        self._conn.executemany("DELETE FROM results WHERE digest = ?", [(d,) for d in victims])
+        self.evictions += len(victims)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM results")
+            else:
+                self._conn.execute("DELETE FROM results WHERE namespace = ?", [namespace])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, nbytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM results"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": nbytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_default_cache: Optional[ResultCache] = None
+_default_enabled = True
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Process-wide cache at RESULT_CACHE_PATH (None when disabled with set_result_cache(None))."""
+    global _default_cache
+    if _default_cache is None and _default_enabled:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def set_result_cache(cache: Optional[ResultCache]) -> None:
+    """Replace the process-wide cache; None disables caching for callers of get_result_cache()."""
+    global _default_cache, _default_enabled
+    _default_cache = cache
+    _default_enabled = cache is not None
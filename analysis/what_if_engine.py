@@ -7,7 +7,14 @@ Evaluates condition sets against historical data to answer:
 
 Features:
 - Deterministic (same inputs = same outputs)
-- Caches results (keyed by setup + condition hash)
+- Caches results (keyed by setup + condition hash), in memory and on disk
+  (analysis/result_cache.py, keyed by the daily_features/bars_1m fingerprint)
+- Simulate once, mask many: each (instrument, orb, rr, sl_mode, date range)
+  is simulated once into a columnar TradeTable; condition sets and direction
+  are boolean masks over it, so changing conditions costs milliseconds.
+  Trade tables are shared by every engine in the process and keyed by the
+  database path and the same content fingerprint as the disk cache, so an
+  in-place feature rebuild or bar rewrite is never served from memory
 - Reuses execution_engine.py and cost_model.py
 - No UI dependency (pure backend logic)
 
@@ -41,16 +48,23 @@ import hashlib
 import json
 import sys
 import os
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import date, datetime
 from dataclasses import dataclass, asdict
 import numpy as np
+import pandas as pd
 
 # Add paths for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from strategies.execution_engine import simulate_orb_trade
+from strategies.execution_engine import simulate_orb_trades_batch
 from pipeline.cost_model import calculate_expectancy, get_cost_model
+from analysis.result_cache import ResultCache, data_fingerprint, get_result_cache
+
+# Baseline trade tables kept per process (LRU), shared by all WhatIfEngine instances
+MAX_TRADE_TABLES = 64
+_TRADE_TABLES: "OrderedDict[Tuple, TradeTable]" = OrderedDict()
 
 
 @dataclass
@@ -112,6 +126,89 @@ class MetricsResult:
         return {k: v for k, v in asdict(self).items() if k != 'trades'}
 
 
+@dataclass
+class TradeTable:
+    """
+    Baseline of one setup: every daily_features row in the date range
+    (ordered by date_local) with its simulated trade.
+
+    features: date_local, atr_20, orb_size, orb_break_dir, pre_orb_travel,
+              asia_type, london_type, ny_type
+    trades:   trade dict per row (None where the ORB did not break)
+    """
+    features: pd.DataFrame
+    trades: List[Optional[Dict]]
+    data_version: str
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def traded_mask(self, direction: str) -> np.ndarray:
+        """Rows with a break in the requested direction ('BOTH' = any break)."""
+        break_dir = self.features['orb_break_dir']
+        mask = break_dir.notna() & (break_dir != 'NONE')
+        if direction != 'BOTH':
+            mask &= break_dir == direction
+        return mask.to_numpy(dtype=bool)
+
+    def condition_mask(self, conditions: ConditionSet) -> np.ndarray:
+        """Rows passing every condition (missing ATR / travel never fails a filter)."""
+        f = self.features
+        atr = f['atr_20'].to_numpy(dtype=float)
+        has_atr = np.nan_to_num(atr) > 0
+        passes = np.ones(len(f), dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            orb_size_norm = f['orb_size'].to_numpy(dtype=float) / atr
+            travel_norm = f['pre_orb_travel'].to_numpy(dtype=float) / atr
+
+        # ORB size filters (normalized)
+        if conditions.orb_size_min is not None:
+            passes &= ~(has_atr & (orb_size_norm < conditions.orb_size_min))
+        if conditions.orb_size_max is not None:
+            passes &= ~(has_atr & (orb_size_norm > conditions.orb_size_max))
+
+        # Travel filters (normalized)
+        if conditions.pre_orb_travel_max is not None:
+            passes &= ~(has_atr & (travel_norm >= conditions.pre_orb_travel_max))
+
+        # Session type filters
+        if conditions.asia_types is not None:
+            passes &= f['asia_type'].isin(conditions.asia_types).to_numpy()
+        if conditions.london_types is not None:
+            passes &= f['london_type'].isin(conditions.london_types).to_numpy()
+
+        # Percentile filters (rank within the previous percentile_window_days rows)
+        if conditions.orb_size_percentile_min is not None or conditions.orb_size_percentile_max is not None:
+            percentile = self.orb_size_percentile(conditions.percentile_window_days)
+            ranked = ~np.isnan(percentile)
+            if conditions.orb_size_percentile_min is not None:
+                passes &= ~(ranked & (percentile < conditions.orb_size_percentile_min))
+            if conditions.orb_size_percentile_max is not None:
+                passes &= ~(ranked & (percentile > conditions.orb_size_percentile_max))
+
+        return passes
+
+    def orb_size_percentile(self, window: int) -> np.ndarray:
+        """Percent of the previous `window` ORB sizes below each row's (NaN without history)."""
+        sizes = self.features['orb_size'].to_numpy(dtype=float)
+        below = np.zeros(len(sizes))
+        counted = np.zeros(len(sizes))
+        for lag in range(1, min(window, len(sizes)) + 1):
+            prev = sizes[:-lag]
+            valid = ~np.isnan(prev)
+            below[lag:] += valid & (prev < sizes[lag:])
+            counted[lag:] += valid
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentile = below / counted * 100
+        percentile[(counted == 0) | np.isnan(sizes)] = np.nan
+        return percentile
+
+    def select(self, mask: np.ndarray) -> List[Dict]:
+        """Trade dicts of the masked rows, in date order."""
+        return [self.trades[i] for i in np.flatnonzero(mask)]
+
+
 class WhatIfEngine:
     """
     What-If Analyzer Engine
@@ -120,9 +217,13 @@ class WhatIfEngine:
     and caching.
     """
 
-    def __init__(self, db_connection: duckdb.DuckDBPyConnection):
+    def __init__(self, db_connection: duckdb.DuckDBPyConnection, result_cache: Optional[ResultCache] = None):
         self.conn = db_connection
-        self.cache = {}  # In-memory cache (could be replaced with disk cache)
+        self.cache = {}  # In-memory cache (per engine, for cache_version)
+        self.cache_version = None
+        self.result_cache = result_cache if result_cache is not None else get_result_cache()  # Disk cache
+        self.trade_table_hits = 0
+        self.trade_table_misses = 0
 
     def analyze_conditions(
         self,
@@ -166,16 +267,29 @@ class WhatIfEngine:
             condition_set, date_start, date_end
         )
 
-        # Check cache
+        # Check cache (memory, then disk); memory is dropped when the data changes
+        fingerprint = data_fingerprint(self.conn, 'what_if')
+        data_version = self._data_version(fingerprint)
+        if data_version != self.cache_version:
+            self.cache = {}
+            self.cache_version = data_version
+
         if use_cache and cache_key in self.cache:
             return self.cache[cache_key]
 
-        # Query daily_features
-        dates_and_features = self._query_daily_features(
-            instrument, orb_time, date_start, date_end
+        if use_cache and self.result_cache is not None:
+            cached = self.result_cache.get('what_if', (cache_key,), fingerprint)
+            if cached is not None:
+                self.cache[cache_key] = cached
+                return cached
+
+        # Baseline simulated once per setup; conditions are masks over it
+        table = self.get_trade_table(
+            instrument, orb_time, rr, sl_mode, date_start, date_end,
+            use_cache=use_cache, data_version=data_version
         )
 
-        if len(dates_and_features) == 0:
+        if len(table) == 0:
             return {
                 'error': 'No data found for date range',
                 'baseline': None,
@@ -184,23 +298,12 @@ class WhatIfEngine:
                 'delta': None
             }
 
-        # Apply conditions and split into matched/non-matched
-        matched_dates, non_matched_dates = self._apply_conditions(
-            dates_and_features, orb_time, condition_set
-        )
-
-        # Simulate trades for all three sets
-        baseline_trades = self._simulate_trades(
-            dates_and_features, instrument, orb_time, direction, rr, sl_mode
-        )
-
-        conditional_trades = self._simulate_trades(
-            matched_dates, instrument, orb_time, direction, rr, sl_mode
-        )
+        traded = table.traded_mask(direction)
+        matched = table.condition_mask(condition_set)
 
-        non_matched_trades = self._simulate_trades(
-            non_matched_dates, instrument, orb_time, direction, rr, sl_mode
-        )
+        baseline_trades = table.select(traded)
+        conditional_trades = table.select(traded & matched)
+        non_matched_trades = table.select(traded & ~matched)
 
         # Calculate metrics
         baseline_metrics = self._calculate_metrics(baseline_trades, instrument)
@@ -223,9 +326,71 @@ class WhatIfEngine:
         # Cache result
         if use_cache:
             self.cache[cache_key] = result
+            if self.result_cache is not None:
+                self.result_cache.put('what_if', (cache_key,), fingerprint, result)
 
         return result
 
+    def get_trade_table(
+        self,
+        instrument: str,
+        orb_time: str,
+        rr: float,
+        sl_mode: str,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        use_cache: bool = True,
+        data_version: Optional[str] = None
+    ) -> TradeTable:
+        """
+        Baseline TradeTable for a setup, simulated on first use.
+
+        Keyed by data version + setup + date range (direction and conditions
+        are applied as masks). use_cache=False re-simulates and replaces the
+        stored table. data_version defaults to the current _data_version().
+        """
+        if data_version is None:
+            data_version = self._data_version()
+        key = (
+            data_version, instrument, orb_time, float(rr), sl_mode.lower(),
+            str(date_start) if date_start else 'all',
+            str(date_end) if date_end else 'all',
+        )
+
+        if use_cache and key in _TRADE_TABLES:
+            _TRADE_TABLES.move_to_end(key)
+            self.trade_table_hits += 1
+            return _TRADE_TABLES[key]
+
+        self.trade_table_misses += 1
+        features = self._query_daily_features(instrument, orb_time, date_start, date_end)
+        table = TradeTable(features=features, trades=[None] * len(features), data_version=data_version)
+
+        traded = np.flatnonzero(table.traded_mask('BOTH'))
+        trades = self._simulate_trades(
+            features.iloc[traded].to_dict('records'), instrument, orb_time, 'BOTH', rr, sl_mode
+        )
+        for i, trade in zip(traded, trades):
+            table.trades[i] = trade
+
+        _TRADE_TABLES[key] = table
+        _TRADE_TABLES.move_to_end(key)
+        while len(_TRADE_TABLES) > MAX_TRADE_TABLES:
+            _TRADE_TABLES.popitem(last=False)
+        return table
+
+    def _data_version(self, fingerprint: Optional[str] = None) -> str:
+        """Database path + What-If content fingerprint (result_cache.data_fingerprint)"""
+        try:
+            path = self.conn.execute(
+                "SELECT path FROM duckdb_databases() WHERE database_name = current_database()"
+            ).fetchone()[0]
+        except duckdb.Error:
+            path = None
+        if fingerprint is None:
+            fingerprint = data_fingerprint(self.conn, 'what_if')
+        return f"{path}|{fingerprint}"
+
     def _generate_cache_key(
         self,
         instrument: str,
@@ -261,8 +426,8 @@ class WhatIfEngine:
         orb_time: str,
         date_start: Optional[str],
         date_end: Optional[str]
-    ) -> List[Dict]:
-        """Query daily_features with optional date range"""
+    ) -> pd.DataFrame:
+        """Query daily_features with optional date range (one row per date, ordered)"""
 
         # Build WHERE clause
         where_parts = [
@@ -294,105 +459,11 @@ class WhatIfEngine:
 
         rows = self.conn.execute(query).fetchall()
 
-        # Convert to dicts
-        results = []
-        for row in rows:
-            results.append({
-                'date_local': row[0],
-                'atr_20': row[1],
-                'orb_size': row[2],
-                'orb_break_dir': row[3],
-                'pre_orb_travel': row[4],
-                'asia_type': row[5],
-                'london_type': row[6],
-                'ny_type': row[7]
-            })
-
-        return results
-
-    def _apply_conditions(
-        self,
-        dates_and_features: List[Dict],
-        orb_time: str,
-        conditions: ConditionSet
-    ) -> tuple:
-        """
-        Apply conditions and split into matched/non-matched
-
-        Returns:
-            (matched_dates, non_matched_dates)
-        """
-        matched = []
-        non_matched = []
-
-        # Calculate percentiles if needed
-        if conditions.orb_size_percentile_min is not None or conditions.orb_size_percentile_max is not None:
-            # Calculate rolling percentiles
-            for i, d in enumerate(dates_and_features):
-                # Get window of recent ORB sizes
-                window = conditions.percentile_window_days
-                start_idx = max(0, i - window)
-                window_sizes = [dates_and_features[j]['orb_size']
-                               for j in range(start_idx, i)
-                               if dates_and_features[j]['orb_size'] is not None]
-
-                if len(window_sizes) > 0 and d['orb_size'] is not None:
-                    # Calculate percentile rank of current ORB size
-                    percentile = (sum(x < d['orb_size'] for x in window_sizes) / len(window_sizes)) * 100
-                    d['orb_size_percentile'] = percentile
-                else:
-                    d['orb_size_percentile'] = None
-
-        # Apply filters
-        for d in dates_and_features:
-            passes = True
-
-            # ORB size filters (normalized)
-            if d['atr_20'] and d['atr_20'] > 0:
-                orb_size_norm = d['orb_size'] / d['atr_20']
-
-                if conditions.orb_size_min is not None:
-                    if orb_size_norm < conditions.orb_size_min:
-                        passes = False
-
-                if conditions.orb_size_max is not None:
-                    if orb_size_norm > conditions.orb_size_max:
-                        passes = False
-
-            # Travel filters (normalized)
-            if d['atr_20'] and d['atr_20'] > 0 and d['pre_orb_travel'] is not None:
-                travel_norm = d['pre_orb_travel'] / d['atr_20']
-
-                if conditions.pre_orb_travel_max is not None:
-                    if travel_norm >= conditions.pre_orb_travel_max:
-                        passes = False
-
-            # Session type filters
-            if conditions.asia_types is not None:
-                if d['asia_type'] not in conditions.asia_types:
-                    passes = False
-
-            if conditions.london_types is not None:
-                if d['london_type'] not in conditions.london_types:
-                    passes = False
-
-            # Percentile filters
-            if 'orb_size_percentile' in d and d['orb_size_percentile'] is not None:
-                if conditions.orb_size_percentile_min is not None:
-                    if d['orb_size_percentile'] < conditions.orb_size_percentile_min:
-                        passes = False
-
-                if conditions.orb_size_percentile_max is not None:
-                    if d['orb_size_percentile'] > conditions.orb_size_percentile_max:
-                        passes = False
-
-            # Append to appropriate list
-            if passes:
-                matched.append(d)
-            else:
-                non_matched.append(d)
-
-        return matched, non_matched
+        # Columnar, date_local kept as datetime.date
+        return pd.DataFrame(rows, columns=[
+            'date_local', 'atr_20', 'orb_size', 'orb_break_dir',
+            'pre_orb_travel', 'asia_type', 'london_type', 'ny_type'
+        ])
 
     def _simulate_trades(
         self,
@@ -403,11 +474,11 @@ class WhatIfEngine:
         rr: float,
         sl_mode: str
     ) -> List[Dict]:
-        """Simulate trades using execution_engine.py"""
+        """Simulate trades using execution_engine.py (one batch for all dates)"""
         trades = []
 
+        selected = []
         for d in dates:
-            date_local = d['date_local']
             orb_break_dir = d.get('orb_break_dir')
 
             # Skip if no break or direction doesn't match
@@ -418,19 +489,22 @@ class WhatIfEngine:
                 if direction != orb_break_dir:
                     continue
 
-            # Simulate trade
-            result = simulate_orb_trade(
-                con=self.conn,
-                date_local=date_local,
-                orb=orb_time,
-                mode='1m',
-                confirm_bars=1,
-                rr=rr,
-                sl_mode=sl_mode.lower(),
-                buffer_ticks=0,
-                entry_delay_bars=0
-            )
+            selected.append(d['date_local'])
+
+        # Simulate trades
+        results = simulate_orb_trades_batch(
+            con=self.conn,
+            dates=selected,
+            orb=orb_time,
+            mode='1m',
+            confirm_bars=1,
+            rr=rr,
+            sl_mode=sl_mode.lower(),
+            buffer_ticks=0,
+            entry_delay_bars=0
+        )
 
+        for date_local, result in zip(selected, results):
             # Convert to dict
             trade_dict = asdict(result)
             trade_dict['date_local'] = date_local
@@ -552,14 +626,21 @@ class WhatIfEngine:
         }
 
     def clear_cache(self):
-        """Clear all cached results"""
+        """Clear all cached results (including the shared trade tables and disk cache)"""
         self.cache = {}
+        _TRADE_TABLES.clear()
+        if self.result_cache is not None:
+            self.result_cache.clear('what_if')
 
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
         return {
             'cache_size': len(self.cache),
-            'cache_keys': list(self.cache.keys())
+            'cache_keys': list(self.cache.keys()),
+            'trade_tables': len(_TRADE_TABLES),
+            'trade_table_hits': self.trade_table_hits,
+            'trade_table_misses': self.trade_table_misses,
+            'disk_cache': self.result_cache.stats() if self.result_cache is not None else None
         }
 
 
@@ -527,15 +527,24 @@ class SnapshotManager:
 
         Returns version string based on daily_features metadata
         """
-        try:
-            # Get max date from daily_features (data freshness indicator)
-            max_date = self.conn.execute("""
-                SELECT MAX(date_local) FROM daily_features
-            """).fetchone()[0]
-
-            return f"daily_features_{max_date}"
-        except:
-            return f"daily_features_{datetime.now().date()}"
+        return get_data_version(self.conn)
+
+
+def get_data_version(conn: duckdb.DuckDBPyConnection) -> str:
+    """
+    Data version of daily_features (also keys WhatIfEngine trade tables)
+
+    Returns version string based on daily_features metadata
+    """
+    try:
+        # Get max date from daily_features (data freshness indicator)
+        max_date = conn.execute("""
+            SELECT MAX(date_local) FROM daily_features
+        """).fetchone()[0]
+
+        return f"daily_features_{max_date}"
+    except:
+        return f"daily_features_{datetime.now().date()}"
 
 
 if __name__ == "__main__":
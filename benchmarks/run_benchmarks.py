@@ -0,0 +1,343 @@
+"""
+Benchmark Runner - research and live hot paths on synthetic data
+================================================================
+
+Times each hot path on a scratch gold.db (benchmarks/synthetic_market.py)
+at several data sizes, writes the results to JSON with the git commit
+(provenance.get_git_commit) and compares them with a baseline:
+
+- simulate_orb_trade            one 1000 ORB trade per trading day
+- build_features                FeatureBuilder.build_features, last 10 days
+- build_features_bulk           FeatureBuilder.build_features_bulk, whole range
+                                (database preparation, timed once)
+- auto_search                   AutoSearchEngine.run_search, fixed grid, empty memory
+- what_if                       WhatIfEngine.analyze_conditions, cold caches
+
+A metric regresses when its median exceeds baseline * (1 + threshold)
+plus a small noise floor. Regressions print a report and exit with code 1.
+
+Usage:
+    python -m benchmarks.run_benchmarks                        # sizes 0.25 0.5 1 (years)
+    python -m benchmarks.run_benchmarks --sizes 0.25 --repeat 5 --only what_if
+    python -m benchmarks.run_benchmarks --update-baseline      # accept current numbers
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import duckdb
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for path in (REPO_ROOT, REPO_ROOT / "trading_app"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from benchmarks.synthetic_market import (  # noqa: E402
+    SEARCH_SETTINGS, add_what_if_columns, create_scratch_db, date_range_for,
+)
+from trading_app.provenance import get_git_commit  # noqa: E402
+
+DEFAULT_SIZES = (0.25, 0.5, 1.0)
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+NOISE_FLOOR_S = 0.02  # Absolute slack so sub-10ms metrics do not flap
+
+BASELINE_PATH = REPO_ROOT / "benchmarks" / "baseline.json"
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+WHAT_IF_CONDITIONS = {'orb_size_min': 0.1, 'london_types': ['L1_SWEEP_HIGH', 'L2_SWEEP_LOW']}
+
+
+@dataclass
+class Case:
+    """One prepared benchmark: run() does the timed work and returns items processed"""
+    run: Callable[[], int]
+    reset: Optional[Callable[[], None]] = None  # Untimed, before every run
+    close: Optional[Callable[[], None]] = None
+
+
+BENCHMARKS: Dict[str, Callable[[str, date, date], Case]] = {}
+
+
+def benchmark(name: str):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+# =============================================================================
+# DATABASE PREPARATION
+# =============================================================================
+
+def prepare_db(db_path: str, years: float, seed: int) -> Dict:
+    """
+    Scratch gold.db with bars, daily_features and the search / What-If tables
+
+    Returns:
+        Dict with bar counts, date range and build_features_bulk seconds
+    """
+    from pipeline.build_daily_features import FeatureBuilder
+    from scripts.migrations.create_auto_search_tables import create_auto_search_tables
+
+    counts = create_scratch_db(db_path, years, seed=seed)
+    start, end = date_range_for(years)
+
+    builder = FeatureBuilder(db_path=db_path)
+    builder.init_schema()
+    builder._ensure_schema_columns(auto_migrate=True)
+    started = time.perf_counter()
+    builder.build_features_bulk(start, end)
+    bulk_seconds = time.perf_counter() - started
+    builder.close()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_auto_search_tables(db_path)
+    con = duckdb.connect(db_path)
+    con.execute((REPO_ROOT / "pipeline" / "schema_search_knowledge.sql").read_text(encoding="utf-8"))
+    add_what_if_columns(con)
+    con.close()
+    return {'bars_1m': counts, 'start': start, 'end': end, 'build_features_bulk_seconds': bulk_seconds}
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+@benchmark("simulate_orb_trade")
+def _simulate_orb_trade(db_path: str, start: date, end: date) -> Case:
+    from strategies.execution_engine import simulate_orb_trade
+
+    con = duckdb.connect(db_path)
+    dates = [row[0] for row in con.execute(
+        "SELECT date_local FROM daily_features WHERE instrument = 'MGC' ORDER BY date_local"
+    ).fetchall()]
+
+    def run() -> int:
+        for trade_date in dates:
+            simulate_orb_trade(con, trade_date, '1000', rr=2.0)
+        return len(dates)
+
+    return Case(run, close=con.close)
+
+
+@benchmark("build_features")
+def _build_features(db_path: str, start: date, end: date) -> Case:
+    from pipeline.build_daily_features import FeatureBuilder
+
+    builder = FeatureBuilder(db_path=db_path)
+    days = [end - timedelta(days=i) for i in range(14)]
+    days = sorted(d for d in days if d.weekday() < 5 and d >= start)[-10:]
+
+    def run() -> int:
+        for trade_date in days:
+            builder.build_features(trade_date)
+        return len(days)
+
+    return Case(run, close=builder.close)
+
+
+@benchmark("auto_search")
+def _auto_search(db_path: str, start: date, end: date) -> Case:
+    from auto_search_engine import AutoSearchEngine
+
+    con = duckdb.connect(db_path)
+    settings = {**SEARCH_SETTINGS, 'date_start': str(start), 'date_end': str(end)}
+
+    def reset() -> None:
+        for table in ("search_candidates", "search_memory", "search_knowledge", "search_runs"):
+            con.execute(f"DELETE FROM {table}")
+
+    def run() -> int:
+        return AutoSearchEngine(con).run_search('MGC', settings, max_seconds=3600)['stats']['tested']
+
+    return Case(run, reset=reset, close=con.close)
+
+
+@benchmark("what_if")
+def _what_if(db_path: str, start: date, end: date) -> Case:
+    from analysis import result_cache
+    from analysis.what_if_engine import WhatIfEngine
+
+    result_cache.set_result_cache(None)  # Time the computation, not the disk cache
+    con = duckdb.connect(db_path)
+    engine = WhatIfEngine(con)
+
+    def run() -> int:
+        result = engine.analyze_conditions('MGC', '1000', 'BOTH', 2.0, 'FULL', conditions=WHAT_IF_CONDITIONS)
+        return result['baseline'].sample_size
+
+    return Case(run, reset=engine.clear_cache, close=con.close)
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def time_case(case: Case, repeat: int) -> Dict:
+    runs, items = [], 0
+    try:
+        for _ in range(repeat):
+            if case.reset is not None:
+                case.reset()
+            started = time.perf_counter()
+            items = case.run()
+            runs.append(time.perf_counter() - started)
+    finally:
+        if case.close is not None:
+            case.close()
+    seconds = statistics.median(runs)
+    return {
+        'seconds': seconds,
+        'min_seconds': min(runs),
+        'runs': runs,
+        'items': items,
+        'per_item_ms': seconds / items * 1000 if items else None,
+    }
+
+
+def metric_key(name: str, years: float) -> str:
+    return f"{name}@{years:g}y"
+
+
+def run_benchmarks(
+    sizes: Sequence[float] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    only: Optional[Sequence[str]] = None,
+    seed: int = 7,
+    workdir: Optional[str] = None,
+) -> Dict:
+    """
+    Run the selected benchmarks at every size
+
+    Returns:
+        Results dict (JSON-serializable): provenance plus metrics keyed
+        '<benchmark>@<years>y'
+    """
+    names = list(only) if only else list(BENCHMARKS) + ["build_features_bulk"]
+    unknown = set(names) - set(BENCHMARKS) - {"build_features_bulk"}
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)} (known: {sorted(BENCHMARKS)})")
+
+    metrics, datasets = {}, {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for years in sizes:
+            db_path = str(Path(tmp) / f"gold_{years:g}y.db")
+            prepared = prepare_db(db_path, years, seed)
+            datasets[f"{years:g}y"] = {
+                'start': str(prepared['start']), 'end': str(prepared['end']), 'bars_1m': prepared['bars_1m'],
+            }
+            if "build_features_bulk" in names:
+                seconds = prepared['build_features_bulk_seconds']
+                metrics[metric_key("build_features_bulk", years)] = {
+                    'benchmark': "build_features_bulk", 'size_years': years,
+                    'seconds': seconds, 'min_seconds': seconds, 'runs': [seconds], 'items': None,
+                    'per_item_ms': None,
+                }
+            for name in names:
+                if name == "build_features_bulk":
+                    continue
+                case = BENCHMARKS[name](db_path, prepared['start'], prepared['end'])
+                metrics[metric_key(name, years)] = {
+                    'benchmark': name, 'size_years': years, **time_case(case, repeat),
+                }
+
+    return {
+        'git_commit': get_git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'duckdb': duckdb.__version__,
+        'seed': seed,
+        'repeat': repeat,
+        'datasets': datasets,
+        'metrics': metrics,
+    }
+
+
+def find_regressions(results: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """Metrics slower than baseline * (1 + threshold) + NOISE_FLOOR_S"""
+    regressions = []
+    for key, metric in results['metrics'].items():
+        base = baseline.get('metrics', {}).get(key)
+        if base is None:
+            continue
+        limit = base['seconds'] * (1 + threshold) + NOISE_FLOOR_S
+        if metric['seconds'] > limit:
+            regressions.append({
+                'metric': key,
+                'seconds': metric['seconds'],
+                'baseline_seconds': base['seconds'],
+                'ratio': metric['seconds'] / base['seconds'] if base['seconds'] else float('inf'),
+                'baseline_commit': baseline.get('git_commit'),
+            })
+    return regressions
+
+
+def write_json(data: Dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, default=str) + "\n", encoding="utf-8")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hot paths on synthetic market data")
+    parser.add_argument("--sizes", type=float, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Data sizes in years of 1m bars (default: 0.25 0.5 1)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per metric (median kept)")
+    parser.add_argument("--only", nargs="+", default=None,
+                        help=f"Subset of: {', '.join(list(BENCHMARKS) + ['build_features_bulk'])}")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=str, default=None, help="Results JSON (default: benchmarks/results/)")
+    parser.add_argument("--baseline", type=str, default=str(BASELINE_PATH))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline (default: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--workdir", type=str, default=None, help="Directory for scratch databases")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.only, args.seed, args.workdir)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{stamp}_{results['git_commit'] or 'nogit'}.json"
+    write_json(results, output)
+
+    print(f"{'metric':<32} {'median s':>10} {'min s':>10} {'items':>8} {'ms/item':>10}")
+    for key, metric in results['metrics'].items():
+        per_item = f"{metric['per_item_ms']:.2f}" if metric['per_item_ms'] is not None else "-"
+        print(f"{key:<32} {metric['seconds']:>10.3f} {metric['min_seconds']:>10.3f} "
+              f"{metric['items'] if metric['items'] is not None else '-':>8} {per_item:>10}")
+    print(f"\n[OK] Results written to {output} (commit {results['git_commit']})")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        write_json(results, baseline_path)
+        print(f"[OK] Baseline updated: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"[INFO] No baseline at {baseline_path} - run with --update-baseline to create one")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n[FAIL] {len(regressions)} metric(s) regressed more than {args.threshold:.0%} "
+              f"vs baseline {baseline.get('git_commit')}:")
+        for r in regressions:
+            print(f"  {r['metric']:<32} {r['baseline_seconds']:.3f}s -> {r['seconds']:.3f}s ({r['ratio']:.2f}x)")
+        return 1
+    print(f"[OK] No regressions vs baseline {baseline.get('git_commit')} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
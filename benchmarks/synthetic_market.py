@@ -0,0 +1,238 @@
+"""
+Synthetic Market - deterministic 1-minute bars for benchmarks
+=============================================================
+
+Generates continuous-contract 1-minute bars for MGC / NQ / MPL and writes
+them into a scratch gold.db built from schema.sql, so hot paths can be
+timed on realistic data of any size without touching production data.
+
+The generator reproduces the structure the pipeline cares about:
+- sessions:     CME Globex hours in UTC (daily break 22:00-23:00 UTC,
+                closed Friday 22:00 to Sunday 23:00)
+- volatility:   per-minute sigma x regime multiplier (regimes switch every
+                regime_days trading days) x intraday seasonality (busier
+                London and New York hours)
+- gaps:         price gaps at every session open, plus randomly missing
+                minutes (missing_bar_rate)
+- rolls:        source_symbol follows the front contract (rolled on the
+                roll_day of the month before expiry); the unadjusted
+                continuous price jumps by roll_premium at each roll
+
+Same spec + seed = identical bars.
+
+The fixed AutoSearchEngine grid and the What-If columns the feature builder
+does not write live here too, so the benchmark and test databases share one
+definition.
+
+Usage:
+    from benchmarks.synthetic_market import add_what_if_columns, create_scratch_db
+
+    counts = create_scratch_db("scratch/gold.db", years=0.5)   # 1m rows per instrument
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCHEMA_PATH = REPO_ROOT / "schema.sql"
+
+# Last generated day (fixed so a size in years always means the same bars)
+DEFAULT_END = date(2025, 12, 31)
+
+MONTH_CODES = "FGHJKMNQUVXZ"
+
+# Intraday volatility multiplier by UTC hour (Asia quiet, London and NY busy)
+SEASONALITY = np.array(
+    [0.8, 0.8, 0.9, 0.9, 0.8, 0.8, 0.9, 1.3, 1.4, 1.2, 1.1, 1.0,
+     1.0, 1.5, 1.8, 1.6, 1.4, 1.2, 1.0, 1.0, 0.9, 0.8, 0.0, 0.9]
+)
+
+
+@dataclass(frozen=True)
+class MarketSpec:
+    """Bar generation parameters for one instrument"""
+    instrument: str
+    bars_table: str
+    base_price: float
+    tick_size: float
+    minute_sigma: float  # Points per minute in a normal regime
+    contract_months: Tuple[int, ...]
+    regimes: Tuple[float, ...] = (0.6, 1.0, 1.8)  # Quiet / normal / volatile multipliers
+    regime_days: int = 20
+    gap_sigma: float = 4.0  # Session-open gap, in minute sigmas
+    missing_bar_rate: float = 0.002
+    roll_premium: float = 0.002  # Fraction of price added at each roll
+    roll_day: int = 20
+
+
+SPECS: Dict[str, MarketSpec] = {
+    'MGC': MarketSpec('MGC', 'bars_1m', 2650.0, 0.1, 0.6, (2, 4, 6, 8, 10, 12)),
+    'NQ': MarketSpec('NQ', 'bars_1m_nq', 21000.0, 0.25, 8.0, (3, 6, 9, 12)),
+    'MPL': MarketSpec('MPL', 'bars_1m_mpl', 1000.0, 0.1, 0.5, (1, 4, 7, 10)),
+}
+
+# Fixed AutoSearchEngine grid: 4 ORBs x 4 RRs x (no filter + 3 sizes)
+SEARCH_SETTINGS = {
+    'orb_times': ['0900', '1000', '1800', '2300'],
+    'rr_targets': [1.0, 1.5, 2.0, 3.0],
+    'filter_types': ['SIZE'],
+    'filter_ranges': {'SIZE': [0.2, 0.5, 1.0]},
+    'min_sample_size': 1,
+    'min_expected_r': -10.0,  # Everything scored is "promising"
+}
+
+
+def trading_minutes(start: date, end: date) -> pd.DatetimeIndex:
+    """UTC minute timestamps with the exchange open, start 00:00 UTC to end 24:00 UTC"""
+    ts = pd.date_range(pd.Timestamp(start, tz="UTC"), pd.Timestamp(end + timedelta(days=1), tz="UTC"),
+                       freq="1min", inclusive="left")
+    dow, hour = ts.dayofweek, ts.hour
+    closed = (
+        (hour == 22)
+        | (dow == 5)
+        | ((dow == 4) & (hour >= 22))
+        | ((dow == 6) & (hour < 23))
+    )
+    return ts[~closed]
+
+
+def contract_symbols(ts: pd.DatetimeIndex, spec: MarketSpec) -> np.ndarray:
+    """Front-month source_symbol per timestamp (e.g. MGCG5)"""
+    months = sorted(spec.contract_months)
+    # Contract E is front until roll_day of month E-1: count months from there
+    key = ts.year.to_numpy() * 12 + ts.month.to_numpy() - 1 + (ts.day.to_numpy() >= spec.roll_day)
+    keys, inverse = np.unique(key, return_inverse=True)
+    labels = []
+    for k in keys:
+        year, month = divmod(int(k), 12)
+        expiry = next((c for c in months if c > month + 1), None)
+        if expiry is None:
+            year, expiry = year + 1, months[0]
+        labels.append(f"{spec.instrument}{MONTH_CODES[expiry - 1]}{year % 10}")
+    return np.asarray(labels, dtype=object)[inverse]
+
+
+def generate_bars(spec: MarketSpec, start: date, end: date, seed: int = 7) -> pd.DataFrame:
+    """
+    Deterministic 1-minute OHLCV bars (bars_1m columns) for spec
+
+    Returns:
+        DataFrame with ts_utc, symbol, source_symbol, open, high, low, close, volume
+    """
+    rng = np.random.default_rng([seed, sum(map(ord, spec.instrument))])
+    ts = trading_minutes(start, end)
+    n = len(ts)
+
+    # Regime per trading day, switching every regime_days days
+    day_index = pd.factorize(ts.normalize())[0]
+    n_periods = day_index.max() // spec.regime_days + 1 if n else 0
+    regime = np.asarray(spec.regimes)[rng.integers(0, len(spec.regimes), n_periods)][day_index // spec.regime_days]
+    sigma = spec.minute_sigma * regime * SEASONALITY[ts.hour]
+
+    steps = rng.normal(0.0, 1.0, n) * sigma
+    session_open = np.ones(n, dtype=bool)
+    session_open[1:] = np.diff(ts.asi8) > 60 * 1_000_000_000
+    steps[session_open] += rng.normal(0.0, spec.gap_sigma * spec.minute_sigma, session_open.sum())
+
+    symbols = contract_symbols(ts, spec)
+    rolled = np.zeros(n, dtype=bool)
+    rolled[1:] = symbols[1:] != symbols[:-1]
+
+    # Multiplicative roll jump on top of the additive walk
+    path = spec.base_price + np.cumsum(steps)
+    path *= np.cumprod(np.where(rolled, 1.0 + spec.roll_premium, 1.0))
+    path = np.maximum(path, spec.base_price * 0.1)
+
+    tick = spec.tick_size
+    close = np.round(path / tick) * tick
+    open_ = np.concatenate([[close[0]], close[:-1]]) if n else close
+    open_ = np.where(session_open, np.round((close - steps * 0.5) / tick) * tick, open_)
+    wick = np.abs(rng.normal(0.0, 0.5, (2, n))) * sigma
+    high = np.round((np.maximum(open_, close) + wick[0]) / tick) * tick
+    low = np.round((np.minimum(open_, close) - wick[1]) / tick) * tick
+    volume = rng.poisson(60 * np.maximum(SEASONALITY[ts.hour], 0.1) * regime) + 1
+
+    keep = rng.random(n) >= spec.missing_bar_rate
+    keep |= session_open  # never drop the first bar of a session
+    return pd.DataFrame({
+        "ts_utc": ts[keep],
+        "symbol": spec.instrument,
+        "source_symbol": symbols[keep],
+        "open": np.round(open_[keep], 6),
+        "high": np.round(high[keep], 6),
+        "low": np.round(low[keep], 6),
+        "close": np.round(close[keep], 6),
+        "volume": volume[keep].astype(np.int64),
+    })
+
+
+def date_range_for(years: float, end: date = DEFAULT_END) -> Tuple[date, date]:
+    """(start, end) covering the given number of years up to end"""
+    return end - timedelta(days=max(1, int(round(years * 365)))) + timedelta(days=1), end
+
+
+def create_scratch_db(
+    db_path: str,
+    years: float,
+    instruments: Sequence[str] = tuple(SPECS),
+    seed: int = 7,
+    end: date = DEFAULT_END,
+    specs: Optional[Dict[str, MarketSpec]] = None,
+) -> Dict[str, int]:
+    """
+    Create db_path from schema.sql and fill the 1m / 5m bar tables
+
+    Returns:
+        Rows of 1-minute bars written per instrument
+    """
+    specs = specs or SPECS
+    start, end = date_range_for(years, end)
+    con = duckdb.connect(db_path)
+    try:
+        con.execute(SCHEMA_PATH.read_text(encoding="utf-8"))
+        counts = {}
+        for instrument in instruments:
+            spec = specs[instrument]
+            bars = generate_bars(spec, start, end, seed)
+            con.register("bars_df", bars)
+            con.execute(f"INSERT INTO {spec.bars_table} SELECT * FROM bars_df")
+            con.unregister("bars_df")
+            con.execute(f"""
+                INSERT INTO {spec.bars_table.replace('1m', '5m')}
+                SELECT
+                  to_timestamp(floor(epoch(ts_utc) / 300) * 300) AS ts_5m,
+                  symbol,
+                  arg_max(source_symbol, ts_utc),
+                  arg_min(open, ts_utc),
+                  max(high),
+                  min(low),
+                  arg_max(close, ts_utc),
+                  sum(volume)
+                FROM {spec.bars_table}
+                GROUP BY 1, 2
+            """)
+            counts[instrument] = len(bars)
+    finally:
+        con.close()
+    return counts
+
+
+def add_what_if_columns(con) -> None:
+    """Add and fill the daily_features columns the What-If queries read that the feature builder does not write"""
+    con.execute("""
+        ALTER TABLE daily_features ADD COLUMN IF NOT EXISTS pre_orb_travel DOUBLE;
+        ALTER TABLE daily_features ADD COLUMN IF NOT EXISTS asia_type VARCHAR;
+        ALTER TABLE daily_features ADD COLUMN IF NOT EXISTS london_type VARCHAR;
+        ALTER TABLE daily_features ADD COLUMN IF NOT EXISTS ny_type VARCHAR;
+        UPDATE daily_features SET
+            pre_orb_travel = pre_asia_range,
+            asia_type = asia_type_code,
+            london_type = london_type_code,
+            atr_20 = COALESCE(atr_20, 20.0);
+    """)
@@ -2,11 +2,9 @@ from __future__ import annotations
 
 import os
 import sys
-import time as time_mod
 import datetime as dt
-import subprocess
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple
 
 import duckdb
 from dotenv import load_dotenv
@@ -15,6 +13,12 @@ from zoneinfo import ZoneInfo
 import databento as db
 from databento.common.error import BentoClientError
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.download_scheduler import Download, DownloadScheduler, checkpoint_path
+# Change tracking for incremental feature maintenance
+from pipeline.incremental_features import update_features_incremental
+from pipeline.ingest_dbn import front_contract_bars, upsert_bars_frame
+
 
 # -----------------------------
 # Config
@@ -71,26 +75,6 @@ def local_day_to_utc_window(d: dt.date, tz_name: str) -> Tuple[dt.datetime, dt.d
 # DuckDB writes
 # -----------------------------
 
-def upsert_bars_1m(
-    con: duckdb.DuckDBPyConnection,
-    cfg: Cfg,
-    source_symbol: str,
-    rows_1m: List[Tuple[str, str, str, float, float, float, float, int]],
-) -> int:
-    if not rows_1m:
-        return 0
-
-    con.executemany(
-        """
-        INSERT OR REPLACE INTO bars_1m
-        (ts_utc, symbol, source_symbol, open, high, low, close, volume)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        rows_1m,
-    )
-    return len(rows_1m)
-
-
 def rebuild_5m_from_1m(con: duckdb.DuckDBPyConnection, cfg: Cfg, start_utc: dt.datetime, end_utc: dt.datetime) -> None:
     con.execute(
         """
@@ -129,47 +113,33 @@ def rebuild_5m_from_1m(con: duckdb.DuckDBPyConnection, cfg: Cfg, start_utc: dt.d
 # Databento helpers
 # -----------------------------
 
-def safe_get_range_with_retries(
-    client: db.Historical,
-    *,
-    dataset: str,
-    schema: str,
-    parent_symbol: str,
-    start_utc: dt.datetime,
-    end_utc: dt.datetime,
-    max_retries: int,
-    retry_sleep_sec: float,
-):
-    last_err: Optional[Exception] = None
-    for attempt in range(1, max_retries + 1):
-        try:
-            return client.timeseries.get_range(
-                dataset=dataset,
-                schema=schema,
-                stype_in="parent",
-                symbols=[parent_symbol],
-                start=start_utc.isoformat(),
-                end=end_utc.isoformat(),
-            )
-        except Exception as e:
-            last_err = e
-            # 422 should be handled by clamping; if it still happens, break fast.
-            if isinstance(e, BentoClientError) and "data_end_after_available_end" in str(e):
-                raise
-            time_mod.sleep(retry_sleep_sec * attempt)
-    raise RuntimeError(f"Databento get_range failed after {max_retries} retries: {last_err}") from last_err
-
-
-def choose_front_symbol(df) -> Optional[str]:
-    # pick the most active outright contract (ignore spreads with '-')
+def fetch_chunk(cfg: Cfg, api_key: str, days: List[dt.date]) -> Download:
+    """
+    Front-contract bars for consecutive LOCAL days [days[0] 09:00 -> days[-1]+1 09:00).
+
+    One get_range per chunk; the front contract is still picked per trading day.
+    """
+    start_utc, _ = local_day_to_utc_window(days[0], cfg.tz_local)
+    _, end_utc = local_day_to_utc_window(days[-1], cfg.tz_local)
+    store = db.Historical(api_key).timeseries.get_range(
+        dataset=cfg.dataset,
+        schema=cfg.schema,
+        stype_in="parent",
+        symbols=[cfg.parent_symbol],
+        start=start_utc.isoformat(),
+        end=end_utc.isoformat(),
+    )
+    df = store.to_df()
     if df is None or len(df) == 0:
-        return None
-    tmp = df.copy()
-    tmp = tmp[tmp["symbol"].astype(str).str.contains("-") == False]  # outrights only
-    if len(tmp) == 0:
-        return None
-    vols = tmp.groupby("symbol")["volume"].sum().sort_values(ascending=False)
-    return str(vols.index[0]) if len(vols) else None
+        return Download(bars=None, nbytes=store.nbytes)
+    # Databento index is ts_event (tz-aware UTC)
+    raw = df.reset_index().rename(columns={"ts_event": "ts_utc"})
+    return Download(bars=front_contract_bars(raw, cfg.tz_local), nbytes=store.nbytes)
+
+
+def is_retryable(e: Exception) -> bool:
+    # 422 (range past the available end) will not succeed on retry
+    return not (isinstance(e, BentoClientError) and "data_end_after_available_end" in str(e))
 
 
 # -----------------------------
@@ -177,118 +147,73 @@ def choose_front_symbol(df) -> Optional[str]:
 # -----------------------------
 
 def main():
-    if len(sys.argv) != 3:
-        raise SystemExit("Usage: python backfill_databento_continuous.py YYYY-MM-DD YYYY-MM-DD")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill bars_1m from Databento (continuous front contract)")
+    parser.add_argument("start", type=parse_date, help="First LOCAL trading day (YYYY-MM-DD)")
+    parser.add_argument("end", type=parse_date, help="Last LOCAL trading day (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent chunk downloads")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Days per get_range request")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file of completed days")
+    parser.add_argument("--fresh", action="store_true", help="Ignore (and overwrite) the checkpoint")
+    args = parser.parse_args()
 
     cfg = env_cfg()
     api_key = os.getenv("DATABENTO_API_KEY")
     if not api_key:
         raise RuntimeError("Missing DATABENTO_API_KEY (set it in your environment or .env)")
 
-    start_day = parse_date(sys.argv[1])
-    end_day = parse_date(sys.argv[2])
+    start_day = args.start
+    end_day = args.end
 
     # Note: No artificial end date cap. If Databento returns 422 (data not available),
-    # it will be caught and handled gracefully below.
+    # that chunk fails fast and is reported below.
+
+    checkpoint = args.checkpoint or checkpoint_path(f"databento_{cfg.symbol}")
+    if args.fresh and os.path.exists(checkpoint):
+        os.remove(checkpoint)
 
-    client = db.Historical(api_key)
     con = duckdb.connect(cfg.db_path)
 
-    total = 0
+    def write(chunk: List[dt.date], download: Download) -> int:
+        if download.bars is None:
+            return 0
+        return upsert_bars_frame(con, download.bars, cfg.symbol)
+
     try:
-        days = list(daterange_inclusive(start_day, end_day))
-        days = list(reversed(days))  # newest -> oldest
-
-        for d in days:
-            start_utc, end_utc = local_day_to_utc_window(d, cfg.tz_local)
-
-            store = safe_get_range_with_retries(
-                client,
-                dataset=cfg.dataset,
-                schema=cfg.schema,
-                parent_symbol=cfg.parent_symbol,
-                start_utc=start_utc,
-                end_utc=end_utc,
-                max_retries=cfg.max_retries,
-                retry_sleep_sec=cfg.retry_sleep_sec,
-            )
-
-            df = store.to_df()
-            if df is None or len(df) == 0:
-                print(f"{d} (local) [{start_utc.isoformat()} -> {end_utc.isoformat()}] -> inserted/replaced 0 rows (no data)")
-                continue
-
-            front = choose_front_symbol(df)
-            if not front:
-                print(f"{d} (local) [{start_utc.isoformat()} -> {end_utc.isoformat()}] -> inserted/replaced 0 rows (no outright front)")
-                continue
-
-            df_front = df[df["symbol"].astype(str) == front].copy()
-            if len(df_front) == 0:
-                print(f"{d} (local) [{start_utc.isoformat()} -> {end_utc.isoformat()}] -> front={front} -> inserted/replaced 0 rows")
-                continue
-
-            # Databento index is ts_event (tz-aware UTC)
-            rows_1m: List[Tuple[str, str, str, float, float, float, float, int]] = []
-            for ts_event, row in df_front.iterrows():
-                # ensure ISO with offset
-                ts_iso = ts_event.isoformat()
-                rows_1m.append((
-                    ts_iso,             # ts_utc
-                    cfg.symbol,         # logical symbol (continuous)
-                    front,              # source_symbol (actual contract)
-                    float(row["open"]),
-                    float(row["high"]),
-                    float(row["low"]),
-                    float(row["close"]),
-                    int(row["volume"]),
-                ))
-
-            inserted = upsert_bars_1m(con, cfg, front, rows_1m)
-            total += inserted
-
-            print(
-                f"{d} (local) [{start_utc.isoformat()} -> {end_utc.isoformat()}] -> front={front} -> inserted/replaced {inserted} rows"
-            )
-
-        # rebuild 5m for the full requested LOCAL range (also clamp to available end)
+        scheduler = DownloadScheduler(
+            lambda chunk: fetch_chunk(cfg, api_key, chunk),
+            write,
+            checkpoint_path=checkpoint,
+            workers=args.workers,
+            chunk_days=args.chunk_days,
+            max_retries=cfg.max_retries,
+            backoff_sec=cfg.retry_sleep_sec,
+            retryable=is_retryable,
+            tz_local=cfg.tz_local,
+        )
+        stats = scheduler.run(daterange_inclusive(start_day, end_day))
+        for chunk in stats.failed:
+            print(f"FAILED: {chunk[0]} -> {chunk[-1]} (rerun to retry; completed days are checkpointed)")
+
+        # rebuild 5m for the full requested LOCAL range
         range_start_utc, _ = local_day_to_utc_window(start_day, cfg.tz_local)
         _, range_end_utc = local_day_to_utc_window(end_day, cfg.tz_local)
-        if range_end_utc > AVAILABLE_END_UTC:
-            range_end_utc = AVAILABLE_END_UTC
-
-        if range_start_utc < range_end_utc:
-            rebuild_5m_from_1m(con, cfg, range_start_utc, range_end_utc)
-            print("OK: rebuilt 5m bars for range")
+        rebuild_5m_from_1m(con, cfg, range_start_utc, range_end_utc)
+        print("OK: rebuilt 5m bars for range")
 
-        print(f"OK: bars_1m upsert total = {total}")
+        print(f"OK: bars_1m upsert total = {stats.rows}")
+        print(f"OK: {stats.summary()}")
 
     finally:
         con.close()
 
-    # build daily_features (V1) and daily_features for parity
-    for d in reversed(list(daterange_inclusive(start_day, end_day))):
-        cmd_v1 = [sys.executable, "build_daily_features.py", d.isoformat()]
-        r1 = subprocess.run(cmd_v1, capture_output=True, text=True)
-        if r1.returncode != 0:
-            print(f"FAIL daily_features {d}:")
-            print(r1.stdout)
-            print(r1.stderr)
-            sys.exit(r1.returncode)
-        else:
-            print(f"OK: daily_features built for {d}")
-
-        cmd_v2 = [sys.executable, "build_daily_features.py", d.isoformat()]
-        r2 = subprocess.run(cmd_v2, capture_output=True, text=True)
-        if r2.returncode != 0:
-            print(f"FAIL daily_features {d}:")
-            print(r2.stdout)
-            print(r2.stderr)
-            sys.exit(r2.returncode)
-        else:
-            print(f"OK: daily_features built for {d}")
+    # Recompute only the features invalidated by the bars written above
+    update_features_incremental(db_path=cfg.db_path)
 
     print("DONE")
+    if stats.failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ import time as time_mod
 import datetime as dt
 import subprocess
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple
 
 import duckdb
 from dotenv import load_dotenv
@@ -15,6 +15,10 @@ from zoneinfo import ZoneInfo
 import databento as db
 from databento.common.error import BentoClientError
 
+# Change tracking for incremental feature maintenance
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.ingest_dbn import upsert_bars_frame
+
 
 # -----------------------------
 # Config
@@ -71,26 +75,6 @@ def local_day_to_utc_window(d: dt.date, tz_name: str) -> Tuple[dt.datetime, dt.d
 # DuckDB writes
 # -----------------------------
 
-def upsert_bars_1m(
-    con: duckdb.DuckDBPyConnection,
-    cfg: Cfg,
-    source_symbol: str,
-    rows_1m: List[Tuple[str, str, str, float, float, float, float, int]],
-) -> int:
-    if not rows_1m:
-        return 0
-
-    con.executemany(
-        """
-        INSERT OR REPLACE INTO bars_1m_mpl
-        (ts_utc, symbol, source_symbol, open, high, low, close, volume)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        rows_1m,
-    )
-    return len(rows_1m)
-
-
 def rebuild_5m_from_1m(con: duckdb.DuckDBPyConnection, cfg: Cfg, start_utc: dt.datetime, end_utc: dt.datetime) -> None:
     con.execute(
         """
@@ -360,23 +344,9 @@ def main():
                 print(f"{d} (local) [{start_utc.isoformat()} -> {end_utc.isoformat()}] -> front={front} -> inserted/replaced 0 rows")
                 continue
 
-            # Databento index is ts_event (tz-aware UTC)
-            rows_1m: List[Tuple[str, str, str, float, float, float, float, int]] = []
-            for ts_event, row in df_front.iterrows():
-                # ensure ISO with offset
-                ts_iso = ts_event.isoformat()
-                rows_1m.append((
-                    ts_iso,             # ts_utc
-                    cfg.symbol,         # logical symbol (continuous)
-                    front,              # source_symbol (actual contract)
-                    float(row["open"]),
-                    float(row["high"]),
-                    float(row["low"]),
-                    float(row["close"]),
-                    int(row["volume"]),
-                ))
-
-            inserted = upsert_bars_1m(con, cfg, front, rows_1m)
+            # Databento index is ts_event (tz-aware UTC); one set-based upsert per day
+            bars = df_front.reset_index().rename(columns={"ts_event": "ts_utc", "symbol": "source_symbol"})
+            inserted = upsert_bars_frame(con, bars, cfg.symbol, table="bars_1m_mpl")
             total += inserted
 
             print(
@@ -9,9 +9,15 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import duckdb
 import httpx
+import pandas as pd
 from dotenv import load_dotenv
 from zoneinfo import ZoneInfo
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.download_scheduler import Download, DownloadScheduler, checkpoint_path
+# Set-based upsert with change tracking for incremental feature maintenance
+from pipeline.ingest_dbn import upsert_bars_frame
+
 
 # -----------------------------
 # Config
@@ -60,6 +66,7 @@ class ProjectX:
     def __init__(self, cfg: Cfg):
         self.cfg = cfg
         self.token: Optional[str] = None
+        self.bytes_received = 0
 
     def _headers(self) -> Dict[str, str]:
         h = {"accept": "text/plain", "Content-Type": "application/json"}
@@ -125,6 +132,7 @@ class ProjectX:
         with httpx.Client(timeout=60.0) as client:
             r = client.post(url, headers=self._headers(), json=payload)
             r.raise_for_status()
+            self.bytes_received += len(r.content)
             data = r.json()
         if not data.get("success"):
             raise RuntimeError(f"retrieveBars failed: {data}")
@@ -135,36 +143,18 @@ class ProjectX:
 # DuckDB writes
 # -----------------------------
 
-def upsert_bars_1m(con: duckdb.DuckDBPyConnection, cfg: Cfg, source_symbol: str, bars: List[Dict[str, Any]]) -> int:
-    """
-    Upsert into bars_1m using INSERT OR REPLACE on (symbol, ts_utc).
-    bars format: {t,o,h,l,c,v}
-    """
-    if not bars:
-        return 0
-
-    rows = []
-    for b in bars:
-        rows.append((
-            b["t"],                 # ISO timestamp with tz offset (UTC)
-            cfg.symbol,
-            source_symbol or None,
-            float(b["o"]),
-            float(b["h"]),
-            float(b["l"]),
-            float(b["c"]),
-            int(b["v"]),
-        ))
-
-    con.executemany(
-        """
-        INSERT OR REPLACE INTO bars_1m
-        (ts_utc, symbol, source_symbol, open, high, low, close, volume)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        rows,
-    )
-    return len(rows)
+def bars_frame(bars: List[Dict[str, Any]], source_symbol: str) -> pd.DataFrame:
+    """ProjectX bars ({t,o,h,l,c,v}) as a frame for upsert_bars_frame."""
+    df = pd.DataFrame(bars, columns=["t", "o", "h", "l", "c", "v"])
+    return pd.DataFrame({
+        "ts_utc": pd.to_datetime(df["t"], utc=True, format="ISO8601"),
+        "source_symbol": source_symbol or None,
+        "open": df["o"].astype(float),
+        "high": df["h"].astype(float),
+        "low": df["l"].astype(float),
+        "close": df["c"].astype(float),
+        "volume": df["v"].astype("int64"),
+    })
 
 
 def rebuild_5m_from_1m(con: duckdb.DuckDBPyConnection, cfg: Cfg, start_utc: str, end_utc: str) -> None:
@@ -297,19 +287,92 @@ def pick_contract_for_day(
     return preferred, []
 
 
+# -----------------------------
+# Chunked download
+# -----------------------------
+
+BARS_LIMIT = 20000  # retrieveBars limit per request; 7-day chunks (~10k bars) stay under it
+
+
+def fetch_chunk(cfg: Cfg, token: str, mgc_contracts: List[Dict[str, Any]], days: List[dt.date]) -> Download:
+    """
+    Bars for consecutive LOCAL days [days[0] 09:00 -> days[-1]+1 09:00) from one contract.
+
+    Chunks are fetched concurrently, so each picks its contract the way the
+    first day of a serial run did: newest first, the first one returning bars.
+    """
+    px = ProjectX(cfg)
+    px.token = token
+    start_utc = iso_utc_from_local_date(days[0], 9, 0, 0, cfg.tz_local)
+    end_utc = iso_utc_from_local_date(days[-1] + dt.timedelta(days=1), 9, 0, 0, cfg.tz_local)
+
+    picked, bars = pick_contract_for_day(px, mgc_contracts, start_utc, end_utc, None)
+    if len(bars) >= BARS_LIMIT:
+        raise ValueError(f"{days[0]} -> {days[-1]}: {len(bars)} bars hit the retrieveBars limit, use smaller chunks")
+    source_symbol = (picked.get("name") if picked else None) or ""
+    return Download(bars=bars_frame(bars, source_symbol), nbytes=px.bytes_received)
+
+
+def is_retryable(e: Exception) -> bool:
+    """Network errors, 5xx and 429 are retried; other client errors and truncated chunks fail fast."""
+    if isinstance(e, httpx.HTTPStatusError):
+        code = e.response.status_code
+        return code >= 500 or code == 429
+    return not isinstance(e, ValueError)
+
+
+def backfill_days(
+    cfg: Cfg,
+    px: ProjectX,
+    mgc_contracts: List[Dict[str, Any]],
+    days: List[dt.date],
+    con: duckdb.DuckDBPyConnection,
+    workers: int = 4,
+    chunk_days: int = 7,
+    checkpoint: Optional[str] = None,
+    backoff_sec: float = 2.0,
+    verbose: bool = True,
+):
+    """Download `days` in concurrent chunks; a single writer thread upserts into bars_1m."""
+    def write(chunk: List[dt.date], download: Download) -> int:
+        return upsert_bars_frame(con, download.bars, cfg.symbol, source="projectx")
+
+    scheduler = DownloadScheduler(
+        lambda chunk: fetch_chunk(cfg, px.token, mgc_contracts, chunk),
+        write,
+        checkpoint_path=checkpoint,
+        workers=workers,
+        chunk_days=chunk_days,
+        backoff_sec=backoff_sec,
+        retryable=is_retryable,
+        tz_local=cfg.tz_local,
+        verbose=verbose,
+    )
+    return scheduler.run(days)
+
+
 # -----------------------------
 # Main
 # -----------------------------
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python backfill_range.py YYYY-MM-DD YYYY-MM-DD")
-        print("Example: python backfill_range.py 2025-12-01 2026-01-09")
-        sys.exit(1)
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Backfill bars_1m from ProjectX",
+        epilog="Example: python backfill_range.py 2025-12-01 2026-01-09",
+    )
+    parser.add_argument("start", type=parse_date, help="First LOCAL trading day (YYYY-MM-DD)")
+    parser.add_argument("end", type=parse_date, help="Last LOCAL trading day (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent chunk downloads")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Days per request (<= 14 stays under the bar limit)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file of completed days")
+    parser.add_argument("--fresh", action="store_true", help="Ignore (and overwrite) the checkpoint")
+    args = parser.parse_args()
 
     cfg = env_cfg()
-    start_day = parse_date(sys.argv[1])
-    end_day = parse_date(sys.argv[2])
+    start_day = args.start
+    end_day = args.end
 
     px = ProjectX(cfg)
     px.login_key()
@@ -327,30 +390,19 @@ def main():
     print(f"Available contracts: {len(all_contracts)} | MGC-like: {len(mgc_contracts)} | live={cfg.live}")
     print(f"DB={cfg.db_path} symbol={cfg.symbol} tz_local={cfg.tz_local}")
 
-    con = duckdb.connect(cfg.db_path)
-
-    total = 0
-    current_contract: Optional[Dict[str, Any]] = None
-
-    # Pull 1 LOCAL day at a time: [local 09:00 -> next local 09:00] converted to UTC
-    for d in daterange_inclusive(start_day, end_day):
-        start_utc = iso_utc_from_local_date(d, 9, 0, 0, cfg.tz_local)
-        end_utc = iso_utc_from_local_date(d + dt.timedelta(days=1), 9, 0, 0, cfg.tz_local)
-
-        picked, bars = pick_contract_for_day(px, mgc_contracts, start_utc, end_utc, current_contract)
-        current_contract = picked
+    checkpoint = args.checkpoint or checkpoint_path(f"projectx_{cfg.symbol}")
+    if args.fresh and os.path.exists(checkpoint):
+        os.remove(checkpoint)
 
-        source_symbol = (picked.get("name") if picked else None) or ""
-        contract_id = (picked.get("id") if picked else None) or ""
-
-        inserted = upsert_bars_1m(con, cfg, source_symbol, bars)
-        total += inserted
+    con = duckdb.connect(cfg.db_path)
 
-        if inserted > 0:
-            print(f"{d} -> {source_symbol} ({contract_id}) -> inserted/replaced {inserted} rows")
-        else:
-            # Keep visibility: could be closed day, outage, or wrong contract set
-            print(f"{d} -> {source_symbol or 'NO_CONTRACT'} -> inserted/replaced 0 rows")
+    # LOCAL days [09:00 -> next 09:00], fetched in concurrent multi-day chunks
+    stats = backfill_days(
+        cfg, px, mgc_contracts, list(daterange_inclusive(start_day, end_day)), con,
+        workers=args.workers, chunk_days=args.chunk_days, checkpoint=checkpoint,
+    )
+    for chunk in stats.failed:
+        print(f"FAILED: {chunk[0]} -> {chunk[-1]} (rerun to retry; completed days are checkpointed)")
 
     # Build 5m for the whole LOCAL range in one shot
     range_start_utc = iso_utc_from_local_date(start_day, 9, 0, 0, cfg.tz_local)
@@ -360,13 +412,16 @@ def main():
     print("OK: rebuilt 5m bars for range")
 
     con.close()
-    print(f"OK: bars_1m upsert total = {total}")
+    print(f"OK: bars_1m upsert total = {stats.rows}")
+    print(f"OK: {stats.summary()}")
 
     # NOTE: Feature building is now handled by update_market_data_projectx.py
     # with proper PHASE 2 logic (stops at yesterday, rebuilds tail days)
     # Disabled here to avoid building features for incomplete days
 
     print("DONE")
+    if stats.failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
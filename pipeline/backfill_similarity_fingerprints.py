@@ -19,7 +19,7 @@ sys.path.insert(0, str(trading_app_dir))
 os.environ['FORCE_LOCAL_DB'] = '1'
 
 from cloud_mode import get_database_path
-from edge_utils import generate_similarity_fingerprint
+from edge_utils import generate_similarity_fingerprint, index_edge_fingerprint
 import json
 
 def backfill_fingerprints():
@@ -74,6 +74,7 @@ def backfill_fingerprints():
             SET similarity_fingerprint = ?
             WHERE edge_id = ?
         """, [fingerprint, edge_id])
+        index_edge_fingerprint(conn, edge_id, fingerprint)
 
         updated += 1
         print(f"  {updated}/{len(edges)} - {edge_id[:16]}... -> {fingerprint[:50]}...")
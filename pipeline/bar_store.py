@@ -0,0 +1,380 @@
+"""
+Bar Store - columnar, memory-mapped 1-minute bars for historical research
+=========================================================================
+
+Research paths (feature builds, execution engine, grid simulator) read the
+same years of bars_1m over and over. The bar store keeps an export of one
+bars table per instrument as raw NumPy files that are memory-mapped on read,
+so a trade date or scan window is an array slice instead of a query.
+
+Layout (one directory per trade month):
+
+    <root>/<table>/<symbol>/manifest.json
+    <root>/<table>/<symbol>/2025-01/ts.npy       int64   epoch ms (UTC), ascending
+                                   open.npy     float64 (NULL -> NaN)
+                                   high.npy     float64
+                                   low.npy      float64
+                                   close.npy    float64
+                                   volume.npy   int64   (NULL -> 0)
+                                   dates.npy    datetime64[D]  trade dates in the month
+                                   offsets.npy  int64   row offsets, len(dates) + 1
+
+Trade date of a bar = local (Australia/Brisbane) date of ts - 07:00, so a
+trade date's bars (D 07:00 -> D+1 07:00 local) never straddle two files and
+day() is always a zero-copy view. window() slices across files (copying only
+when a window crosses a month boundary).
+
+The DuckDB tables stay the source of truth. `sync` re-exports only months
+whose row count or content fingerprint changed since the last sync, and
+records the last bar_change_log entry it saw. Readers call refresh_changes()
+and check covers(), and query DuckDB for windows past the last synced bar or
+overlapping bars logged as rewritten since the sync.
+
+Usage:
+    python pipeline/bar_store.py sync                        # bars_1m / MGC
+    python pipeline/bar_store.py sync --table bars_1m_nq --symbol NQ
+    python pipeline/bar_store.py sync --full                 # rewrite every month
+
+    from pipeline.bar_store import BarStore
+
+    store = BarStore()                       # data/bar_store, bars_1m, MGC
+    bars = store.day(date(2025, 1, 10))      # BarBlock of memmap views
+    bars = store.window(start_ms, end_ms)    # [start, end) epoch ms
+"""
+
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Union
+from zoneinfo import ZoneInfo
+
+import duckdb
+import numpy as np
+
+DB_PATH = "data/db/gold.db"
+BAR_STORE_ROOT = "data/bar_store"
+SYMBOL = "MGC"
+
+TZ_LOCAL = ZoneInfo("Australia/Brisbane")
+# Australia/Brisbane is UTC+10 all year (no DST)
+LOCAL_UTC_OFFSET_MS = 10 * 3600 * 1000
+# Trade date boundary: bars before 07:00 local belong to the previous trade date
+TRADE_DATE_START_MS = 7 * 3600 * 1000
+MS_PER_DAY = 86_400_000
+
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+
+
+def local_to_epoch_ms(ts_local: Union[str, datetime]) -> int:
+    """Naive local timestamp ('YYYY-MM-DD HH:MM:SS' or datetime) or aware datetime -> epoch ms."""
+    if isinstance(ts_local, str):
+        ts_local = datetime.fromisoformat(ts_local)
+    if ts_local.tzinfo is None:
+        ts_local = ts_local.replace(tzinfo=TZ_LOCAL)
+    return int(ts_local.timestamp() * 1000)
+
+
+def epoch_ms_to_local(ts: np.ndarray) -> np.ndarray:
+    """Epoch ms -> naive local datetime64[us], as `ts_utc AT TIME ZONE 'Australia/Brisbane'` returns."""
+    return (ts + LOCAL_UTC_OFFSET_MS).astype("datetime64[ms]").astype("datetime64[us]")
+
+
+def trade_dates(ts: np.ndarray) -> np.ndarray:
+    """Trade date (datetime64[D]) of each epoch-ms bar timestamp."""
+    return ((ts + LOCAL_UTC_OFFSET_MS - TRADE_DATE_START_MS) // MS_PER_DAY).astype("datetime64[D]")
+
+
+@dataclass
+class BarBlock:
+    """Contiguous bars as parallel arrays (views into the store where possible)."""
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def slice(self, i0: int, i1: int) -> "BarBlock":
+        return BarBlock(*(getattr(self, col)[i0:i1] for col in COLUMNS))
+
+    @staticmethod
+    def concat(blocks: List["BarBlock"]) -> "BarBlock":
+        if len(blocks) == 1:
+            return blocks[0]
+        if not blocks:
+            return BarBlock(*(np.empty(0, dtype=np.int64 if col in ("ts", "volume") else float) for col in COLUMNS))
+        return BarBlock(*(np.concatenate([getattr(b, col) for b in blocks]) for col in COLUMNS))
+
+
+class _MonthPartition:
+    """One trade month, memory-mapped (arrays are read-only views of the files)."""
+
+    def __init__(self, path: str):
+        self.bars = BarBlock(*(np.load(os.path.join(path, f"{col}.npy"), mmap_mode="r") for col in COLUMNS))
+        self.dates = np.load(os.path.join(path, "dates.npy"))
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+
+
+class BarStore:
+    """Read side of the bar store for one (table, symbol)."""
+
+    def __init__(self, root: str = BAR_STORE_ROOT, symbol: str = SYMBOL, table: str = "bars_1m"):
+        self.root = root
+        self.symbol = symbol
+        self.table = table
+        self.path = os.path.join(root, table, symbol)
+
+        manifest_path = os.path.join(self.path, "manifest.json")
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(
+                f"No bar store at {self.path} (run: python pipeline/bar_store.py sync "
+                f"--table {table} --symbol {symbol})"
+            )
+        with open(manifest_path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+        # Months in time order with their [first, last] bar timestamps
+        self._months = sorted(self.manifest["months"])
+        self._first_ts = np.array([self.manifest["months"][m]["min_ts"] for m in self._months], dtype=np.int64)
+        self._last_ts = np.array([self.manifest["months"][m]["max_ts"] for m in self._months], dtype=np.int64)
+        self._partitions: Dict[str, _MonthPartition] = {}
+        # [first, last] epoch ms of bar_change_log entries newer than the sync (see refresh_changes)
+        self._changed = np.empty((0, 2), dtype=np.int64)
+
+    def months(self) -> List[str]:
+        return list(self._months)
+
+    def _partition(self, month: str) -> _MonthPartition:
+        if month not in self._partitions:
+            self._partitions[month] = _MonthPartition(os.path.join(self.path, month))
+        return self._partitions[month]
+
+    def day(self, trade_date: date) -> BarBlock:
+        """Bars of one trade date (D 07:00 -> D+1 07:00 local), zero-copy."""
+        month = trade_date.strftime("%Y-%m")
+        if month not in self.manifest["months"]:
+            return BarBlock.concat([])
+        part = self._partition(month)
+        j = int(np.searchsorted(part.dates, np.datetime64(trade_date, "D")))
+        if j == len(part.dates) or part.dates[j] != np.datetime64(trade_date, "D"):
+            return part.bars.slice(0, 0)
+        return part.bars.slice(int(part.offsets[j]), int(part.offsets[j + 1]))
+
+    def window(self, start_ms: int, end_ms: int, closed: str = "left") -> BarBlock:
+        """
+        Bars with start <= ts < end (closed='left') or start < ts <= end (closed='right').
+
+        Views when the window lies in one trade month; concatenated otherwise.
+        """
+        side = "left" if closed == "left" else "right"
+        # Months whose bars can overlap the window
+        lo = int(np.searchsorted(self._last_ts, start_ms, side="left"))
+        hi = int(np.searchsorted(self._first_ts, end_ms, side="right"))
+        blocks = []
+        for month in self._months[lo:hi]:
+            bars = self._partition(month).bars
+            i0 = int(np.searchsorted(bars.ts, start_ms, side=side))
+            i1 = int(np.searchsorted(bars.ts, end_ms, side=side))
+            if i1 > i0:
+                blocks.append(bars.slice(i0, i1))
+        return BarBlock.concat(blocks)
+
+    def refresh_changes(self, con: duckdb.DuckDBPyConnection) -> int:
+        """
+        Load the bar_change_log ranges of (table, symbol) logged after the last
+        sync; covers() is False for windows overlapping them. Returns their count.
+        """
+        try:
+            rows = con.execute("""
+                SELECT epoch_ms(first_ts_utc), epoch_ms(last_ts_utc)
+                FROM bar_change_log
+                WHERE symbol = ? AND bars_table = ? AND change_id > ?
+            """, [self.symbol, self.table, self.manifest.get("synced_change_id", 0)]).fetchall()
+        except duckdb.Error:
+            rows = []  # No change log: nothing rewritten since the sync
+        self._changed = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        return len(rows)
+
+    def covers(self, start_ms: int, end_ms: int) -> bool:
+        """
+        True if the store's exported range spans [start, end] and no bars in it
+        were rewritten since the sync (False: read DuckDB instead).
+        """
+        if not self._months or start_ms < self._first_ts[0] or end_ms > self.manifest["synced_max_ts"]:
+            return False
+        return not np.any((self._changed[:, 0] <= end_ms) & (self._changed[:, 1] >= start_ms))
+
+
+# ---------- sync (DuckDB -> store) ----------
+
+_TRADE_MONTH_SQL = (
+    "strftime((ts_utc AT TIME ZONE 'Australia/Brisbane') - INTERVAL 7 HOUR, '%Y-%m')"
+)
+
+
+def _month_summary(con: duckdb.DuckDBPyConnection, table: str, symbol: str) -> Dict[str, Dict]:
+    """Row count, timestamp range and content fingerprint per trade month (one aggregate scan)."""
+    rows = con.execute(f"""
+        SELECT
+          {_TRADE_MONTH_SQL} AS month,
+          COUNT(*) AS rows,
+          MIN(epoch_ms(ts_utc)) AS min_ts,
+          MAX(epoch_ms(ts_utc)) AS max_ts,
+          bit_xor(hash(epoch_ms(ts_utc), open, high, low, close, volume)) AS fingerprint
+        FROM {table}
+        WHERE symbol = ?
+        GROUP BY 1
+        ORDER BY 1
+    """, [symbol]).fetchall()
+    return {
+        month: {"rows": n, "min_ts": min_ts, "max_ts": max_ts, "fingerprint": str(fingerprint)}
+        for month, n, min_ts, max_ts, fingerprint in rows
+    }
+
+
+def _last_change_id(con: duckdb.DuckDBPyConnection, table: str, symbol: str) -> int:
+    """Newest bar_change_log entry for (table, symbol); 0 when there is none or no log."""
+    try:
+        return con.execute(
+            "SELECT COALESCE(MAX(change_id), 0) FROM bar_change_log WHERE symbol = ? AND bars_table = ?",
+            [symbol, table],
+        ).fetchone()[0]
+    except duckdb.Error:
+        return 0
+
+
+def _export_month(con: duckdb.DuckDBPyConnection, table: str, symbol: str, month: str, path: str) -> int:
+    """
+    Write one trade month as .npy columns + trade-date index.
+
+    The new files are written to <month>.tmp. The old directory is renamed aside
+    before the new one is moved in, so a crash never leaves the month missing.
+    """
+    first = date.fromisoformat(f"{month}-01")
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    data = con.execute(f"""
+        SELECT epoch_ms(ts_utc) AS ts, open, high, low, close, volume
+        FROM {table}
+        WHERE symbol = ?
+          AND ts_utc >= ? AND ts_utc < ?
+        ORDER BY ts_utc
+    """, [
+        symbol,
+        datetime(first.year, first.month, 1, 7, 0, tzinfo=TZ_LOCAL),
+        datetime(next_month.year, next_month.month, 1, 7, 0, tzinfo=TZ_LOCAL),
+    ]).fetchnumpy()
+
+    columns = {
+        "ts": np.asarray(data["ts"], dtype=np.int64),
+        "volume": np.ma.filled(data["volume"], 0).astype(np.int64),
+    }
+    for col in ("open", "high", "low", "close"):
+        columns[col] = np.ma.filled(data[col].astype(float), np.nan)
+
+    days = trade_dates(columns["ts"])
+    dates, starts = np.unique(days, return_index=True)
+    offsets = np.append(starts, len(days)).astype(np.int64)
+
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for col, values in columns.items():
+        np.save(os.path.join(tmp, f"{col}.npy"), values)
+    np.save(os.path.join(tmp, "dates.npy"), dates)
+    np.save(os.path.join(tmp, "offsets.npy"), offsets)
+    old = path + ".old"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.isdir(path):
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+    return len(days)
+
+
+def sync_bar_store(
+    con: duckdb.DuckDBPyConnection,
+    root: str = BAR_STORE_ROOT,
+    symbol: str = SYMBOL,
+    table: str = "bars_1m",
+    full: bool = False,
+) -> Dict[str, int]:
+    """
+    Bring the store for (table, symbol) up to date with DuckDB.
+
+    Only trade months whose row count or fingerprint changed are rewritten
+    (full=True rewrites all). Months deleted from the table are removed.
+
+    Returns:
+        {month: rows written} for every rewritten month
+    """
+    path = os.path.join(root, table, symbol)
+    manifest_path = os.path.join(path, "manifest.json")
+    previous = {}
+    if not full and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f)["months"]
+
+    # Read before the scan: changes logged during the sync are re-checked by readers
+    change_id = _last_change_id(con, table, symbol)
+    current = _month_summary(con, table, symbol)
+    os.makedirs(path, exist_ok=True)
+
+    written = {}
+    for month, summary in current.items():
+        if previous.get(month) == summary and os.path.isdir(os.path.join(path, month)):
+            continue
+        written[month] = _export_month(con, table, symbol, month, os.path.join(path, month))
+
+    for month in set(previous) - set(current):
+        shutil.rmtree(os.path.join(path, month), ignore_errors=True)
+
+    manifest = {
+        "table": table,
+        "symbol": symbol,
+        "synced_at": datetime.now().isoformat(timespec="seconds"),
+        "synced_max_ts": max((s["max_ts"] for s in current.values()), default=0),
+        "synced_change_id": change_id,
+        "months": current,
+    }
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return written
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Columnar memory-mapped bar store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="Export changed trade months from DuckDB")
+    sync.add_argument("--db", default=DB_PATH, help="DuckDB path (read-only)")
+    sync.add_argument("--root", default=BAR_STORE_ROOT, help="Bar store directory")
+    sync.add_argument("--table", default="bars_1m", help="Bars table (bars_1m, bars_1m_nq, bars_1m_mpl)")
+    sync.add_argument("--symbol", default=SYMBOL, help="Symbol to export")
+    sync.add_argument("--full", action="store_true", help="Rewrite every month")
+    args = parser.parse_args()
+
+    con = duckdb.connect(args.db, read_only=True)
+    try:
+        written = sync_bar_store(con, root=args.root, symbol=args.symbol, table=args.table, full=args.full)
+    finally:
+        con.close()
+
+    if written:
+        for month, rows in sorted(written.items()):
+            print(f"  [OK] {args.table}/{args.symbol} {month}: {rows} bars")
+    print(f"Bar store up to date ({len(written)} months written): "
+          f"{os.path.join(args.root, args.table, args.symbol)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,18 +39,28 @@ Usage:
   python build_daily_features.py 2026-01-10
   python build_daily_features.py 2024-01-02 2026-01-10
   python build_daily_features.py 2024-01-02 2026-01-10 --sl-mode half
+  python build_daily_features.py 2024-01-02 2026-01-10 --bulk
+  python build_daily_features.py 2021-01-01 2026-01-10 --workers 16
+  python build_daily_features.py 2021-01-01 2026-01-10 --bulk --bar-store data/bar_store
 """
 
 import duckdb
+import bisect
 import sys
 import os
+import re
 from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import Optional, Dict, Tuple, List
 
+import numpy as np
+import pandas as pd
+
 # Import cost_model for canonical realized RR calculations
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from pipeline.cost_model import calculate_realized_rr
+from pipeline.bar_store import BarStore
+from pipeline.date_chunks import month_chunks
 
 TZ_LOCAL = ZoneInfo("Australia/Brisbane")
 TZ_UTC = ZoneInfo("UTC")
@@ -67,11 +77,395 @@ def _dt_local(d: date, hh: int, mm: int) -> datetime:
     return datetime(d.year, d.month, d.day, hh, mm, tzinfo=TZ_LOCAL)
 
 
+def _epoch_ms(dt: datetime) -> int:
+    """Aware datetime -> epoch milliseconds (UTC), matching epoch_ms(ts_utc) in DuckDB."""
+    return int(dt.timestamp()) * 1000
+
+
+# ORB definitions: (name, local hour, local minute, day offset from trade date)
+ORB_TIMES = [
+    ("0900", 9, 0, 0),
+    ("1000", 10, 0, 0),
+    ("1100", 11, 0, 0),
+    ("1800", 18, 0, 0),
+    ("2300", 23, 0, 0),
+    ("0030", 0, 30, 1),
+]
+
+# Session windows in features-table column order:
+# (name, (start hh, mm, day offset), (end hh, mm, day offset)) relative to the trade date
+SESSION_WINDOWS = [
+    ("pre_asia", (7, 0, 0), (9, 0, 0)),
+    ("pre_london", (17, 0, 0), (18, 0, 0)),
+    ("pre_ny", (23, 0, 0), (0, 30, 1)),      # FIXED: D 23:00 -> (D+1) 00:30
+    ("asia", (9, 0, 0), (17, 0, 0)),
+    ("london", (18, 0, 0), (23, 0, 0)),
+    ("ny", (0, 30, 1), (2, 0, 1)),           # (D+1) 00:30 -> 02:00 (includes 00:30 ORB)
+]
+
+
+def session_bounds(trade_date: date, session_name: str) -> Tuple[datetime, datetime]:
+    """Local [start, end) of a named session for the given trade date."""
+    for name, (sh, sm, sd), (eh, em, ed) in SESSION_WINDOWS:
+        if name == session_name:
+            return (_dt_local(trade_date + timedelta(days=sd), sh, sm),
+                    _dt_local(trade_date + timedelta(days=ed), eh, em))
+    raise ValueError(f"Unknown session: {session_name}")
+
+
+# Upsert statement for the features table.
+# SINGLE SOURCE OF TRUTH for the column list: build_features, build_features_bulk
+# and _ensure_schema_columns all derive their columns from this text.
+FEATURE_INSERT_SQL = """
+    INSERT OR REPLACE INTO {table_name} (
+        date_local, instrument,
+
+        pre_asia_high, pre_asia_low, pre_asia_range,
+        pre_london_high, pre_london_low, pre_london_range,
+        pre_ny_high, pre_ny_low, pre_ny_range,
+
+        asia_high, asia_low, asia_range,
+        london_high, london_low, london_range,
+        ny_high, ny_low, ny_range,
+        asia_type_code, london_type_code, pre_ny_type_code,
+
+        orb_0900_high, orb_0900_low, orb_0900_size, orb_0900_break_dir, orb_0900_outcome, orb_0900_r_multiple, orb_0900_mae, orb_0900_mfe, orb_0900_stop_price, orb_0900_risk_ticks,
+        orb_0900_realized_rr, orb_0900_realized_risk_dollars, orb_0900_realized_reward_dollars,
+        orb_1000_high, orb_1000_low, orb_1000_size, orb_1000_break_dir, orb_1000_outcome, orb_1000_r_multiple, orb_1000_mae, orb_1000_mfe, orb_1000_stop_price, orb_1000_risk_ticks,
+        orb_1000_realized_rr, orb_1000_realized_risk_dollars, orb_1000_realized_reward_dollars,
+        orb_1100_high, orb_1100_low, orb_1100_size, orb_1100_break_dir, orb_1100_outcome, orb_1100_r_multiple, orb_1100_mae, orb_1100_mfe, orb_1100_stop_price, orb_1100_risk_ticks,
+        orb_1100_realized_rr, orb_1100_realized_risk_dollars, orb_1100_realized_reward_dollars,
+        orb_1800_high, orb_1800_low, orb_1800_size, orb_1800_break_dir, orb_1800_outcome, orb_1800_r_multiple, orb_1800_mae, orb_1800_mfe, orb_1800_stop_price, orb_1800_risk_ticks,
+        orb_1800_realized_rr, orb_1800_realized_risk_dollars, orb_1800_realized_reward_dollars,
+        orb_2300_high, orb_2300_low, orb_2300_size, orb_2300_break_dir, orb_2300_outcome, orb_2300_r_multiple, orb_2300_mae, orb_2300_mfe, orb_2300_stop_price, orb_2300_risk_ticks,
+        orb_2300_realized_rr, orb_2300_realized_risk_dollars, orb_2300_realized_reward_dollars,
+        orb_0030_high, orb_0030_low, orb_0030_size, orb_0030_break_dir, orb_0030_outcome, orb_0030_r_multiple, orb_0030_mae, orb_0030_mfe, orb_0030_stop_price, orb_0030_risk_ticks,
+        orb_0030_realized_rr, orb_0030_realized_risk_dollars, orb_0030_realized_reward_dollars,
+
+        orb_0900_tradeable_entry_price, orb_0900_tradeable_stop_price, orb_0900_tradeable_risk_points, orb_0900_tradeable_target_price, orb_0900_tradeable_outcome, orb_0900_tradeable_realized_rr, orb_0900_tradeable_realized_risk_dollars, orb_0900_tradeable_realized_reward_dollars,
+        orb_1000_tradeable_entry_price, orb_1000_tradeable_stop_price, orb_1000_tradeable_risk_points, orb_1000_tradeable_target_price, orb_1000_tradeable_outcome, orb_1000_tradeable_realized_rr, orb_1000_tradeable_realized_risk_dollars, orb_1000_tradeable_realized_reward_dollars,
+        orb_1100_tradeable_entry_price, orb_1100_tradeable_stop_price, orb_1100_tradeable_risk_points, orb_1100_tradeable_target_price, orb_1100_tradeable_outcome, orb_1100_tradeable_realized_rr, orb_1100_tradeable_realized_risk_dollars, orb_1100_tradeable_realized_reward_dollars,
+        orb_1800_tradeable_entry_price, orb_1800_tradeable_stop_price, orb_1800_tradeable_risk_points, orb_1800_tradeable_target_price, orb_1800_tradeable_outcome, orb_1800_tradeable_realized_rr, orb_1800_tradeable_realized_risk_dollars, orb_1800_tradeable_realized_reward_dollars,
+        orb_2300_tradeable_entry_price, orb_2300_tradeable_stop_price, orb_2300_tradeable_risk_points, orb_2300_tradeable_target_price, orb_2300_tradeable_outcome, orb_2300_tradeable_realized_rr, orb_2300_tradeable_realized_risk_dollars, orb_2300_tradeable_realized_reward_dollars,
+        orb_0030_tradeable_entry_price, orb_0030_tradeable_stop_price, orb_0030_tradeable_risk_points, orb_0030_tradeable_target_price, orb_0030_tradeable_outcome, orb_0030_tradeable_realized_rr, orb_0030_tradeable_realized_risk_dollars, orb_0030_tradeable_realized_reward_dollars,
+
+        rsi_at_0030, rsi_at_orb, atr_20
+    ) VALUES
+"""
+
+
+def _feature_columns() -> List[str]:
+    """Parse the column names out of FEATURE_INSERT_SQL (in insert order)."""
+    col_match = re.search(r'\((.*?)\)\s*VALUES', FEATURE_INSERT_SQL, re.DOTALL)
+    if not col_match:
+        raise RuntimeError("Failed to parse INSERT statement for column detection")
+
+    columns = []
+    for line in col_match.group(1).split('\n'):
+        line = line.strip()
+        if not line or line.startswith('--') or '{' in line:
+            continue
+        for col in line.split(','):
+            col = col.strip()
+            if col:
+                columns.append(col)
+    return columns
+
+
+# ---------- array kernels ----------
+# Canonical ORB / session math on NumPy slices of a preloaded bar window.
+# Used by the per-day calculators (via TradeDateBars) and by the bulk path.
+
+def _window_stats_from_arrays(high: np.ndarray, low: np.ndarray, volume: np.ndarray) -> Optional[Dict]:
+    """High/low/range/volume of a bar slice (None if the slice is empty)."""
+    if len(high) == 0:
+        return None
+
+    hi = float(high.max())
+    lo = float(low.min())
+    rng = hi - lo
+    return {
+        "high": hi,
+        "low": lo,
+        "range": rng,
+        "range_ticks": rng / 0.1,
+        "volume": int(volume.sum()),
+    }
+
+
+def _first_exit(hit_stop: np.ndarray, hit_target: np.ndarray) -> Tuple[Optional[int], Optional[str]]:
+    """Index of the first bar touching stop or target, and the conservative outcome there."""
+    hit_any = hit_stop | hit_target
+    if not hit_any.any():
+        return None, None
+    i = int(np.argmax(hit_any))
+    # Both hit in same bar = LOSS (conservative)
+    return i, ("LOSS" if hit_stop[i] else "WIN")
+
+
+def _orb_exec_from_arrays(orb_high: float, orb_low: float,
+                          high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                          rr: float = RR_DEFAULT, sl_mode: str = SL_MODE) -> Dict:
+    """
+    Structural (ORB-anchored) execution - see calculate_orb_1m_exec.
+
+    high/low/close are the bars AFTER the ORB window up to the scan end.
+    """
+    orb_size = orb_high - orb_low
+    orb_mid = (orb_high + orb_low) / 2.0
+
+    # entry = first 1m close outside ORB
+    outside = (close > orb_high) | (close < orb_low)
+    if not outside.any():
+        return {
+            "high": orb_high, "low": orb_low, "size": orb_size,
+            "break_dir": "NONE", "outcome": "NO_TRADE", "r_multiple": None,
+            "mae": None, "mfe": None,
+            "stop_price": None, "risk_ticks": None
+        }
+
+    entry_i = int(np.argmax(outside))
+    break_dir = "UP" if close[entry_i] > orb_high else "DOWN"
+
+    # GUARDRAIL: Validate entry method (must be at close, not ORB edge)
+    entry_price = float(close[entry_i])
+    assert entry_price != orb_high, "FATAL: Entry at ORB high (should be at close)"
+    assert entry_price != orb_low, "FATAL: Entry at ORB low (should be at close)"
+
+    orb_edge = orb_high if break_dir == "UP" else orb_low
+    if sl_mode == "full":
+        stop = orb_low if break_dir == "UP" else orb_high
+    else:  # half
+        stop = orb_mid
+
+    r_orb = abs(orb_edge - stop)
+    risk_ticks = r_orb / 0.1
+
+    if r_orb <= 0:
+        return {
+            "high": orb_high, "low": orb_low, "size": orb_size,
+            "break_dir": break_dir, "outcome": "NO_TRADE", "r_multiple": None,
+            "mae": None, "mfe": None,
+            "stop_price": stop, "risk_ticks": 0.0
+        }
+
+    target = orb_edge + rr * r_orb if break_dir == "UP" else orb_edge - rr * r_orb
+
+    # start checking AFTER entry bar
+    h = high[entry_i + 1:]
+    l = low[entry_i + 1:]
+    if break_dir == "UP":
+        exit_i, outcome = _first_exit(l <= stop, h >= target)
+        adverse = orb_edge - l
+        favorable = h - orb_edge
+    else:
+        exit_i, outcome = _first_exit(h >= stop, l <= target)
+        adverse = h - orb_edge
+        favorable = orb_edge - l
+
+    # MAE/MFE accumulate up to and including the exit bar
+    n = len(h) if exit_i is None else exit_i + 1
+    mae_raw = max(0.0, float(adverse[:n].max())) if n else 0.0
+    mfe_raw = max(0.0, float(favorable[:n].max())) if n else 0.0
+
+    if outcome is None:
+        return {
+            "high": orb_high, "low": orb_low, "size": orb_size,
+            "break_dir": break_dir, "outcome": "NO_TRADE", "r_multiple": None,
+            "mae": (mae_raw / r_orb) if mae_raw > 0 else None,
+            "mfe": (mfe_raw / r_orb) if mfe_raw > 0 else None,
+            "stop_price": stop, "risk_ticks": risk_ticks
+        }
+
+    return {
+        "high": orb_high, "low": orb_low, "size": orb_size,
+        "break_dir": break_dir, "outcome": outcome,
+        "r_multiple": float(rr) if outcome == "WIN" else -1.0,
+        "mae": mae_raw / r_orb, "mfe": mfe_raw / r_orb,
+        "stop_price": stop, "risk_ticks": risk_ticks
+    }
+
+
+def _orb_tradeable_from_arrays(orb_high: float, orb_low: float,
+                               open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                               rr: float = RR_DEFAULT, sl_mode: str = SL_MODE) -> Dict:
+    """
+    Tradeable (entry-anchored, B-entry model) execution - see calculate_orb_1m_tradeable.
+
+    open_/high/low/close are the bars AFTER the ORB window up to the scan end.
+    """
+    orb_mid = (orb_high + orb_low) / 2.0
+    empty = {
+        "entry_price": None,
+        "stop_price": None,
+        "risk_points": None,
+        "target_price": None,
+        "outcome": "NO_TRADE",
+        "realized_rr": None,
+        "realized_risk_dollars": None,
+        "realized_reward_dollars": None
+    }
+
+    # STEP 1: Find signal (first 1m CLOSE outside ORB)
+    outside = (close > orb_high) | (close < orb_low)
+    if not outside.any():
+        return empty
+
+    signal_i = int(np.argmax(outside))
+    break_dir = "UP" if close[signal_i] > orb_high else "DOWN"
+
+    # STEP 2: Entry at NEXT 1m OPEN (B-entry model)
+    if signal_i + 1 >= len(close):
+        return dict(empty, outcome="OPEN")
+
+    entry_price = float(open_[signal_i + 1])
+
+    # STEP 3/4: Stop and entry-anchored risk
+    if sl_mode == "full":
+        stop_price = orb_low if break_dir == "UP" else orb_high
+    else:  # half
+        stop_price = orb_mid
+    risk_points = abs(entry_price - stop_price)
+
+    if risk_points <= 0:
+        return dict(empty, entry_price=entry_price, stop_price=stop_price, risk_points=0.0)
+
+    # STEP 5: Target (entry-anchored)
+    if break_dir == "UP":
+        target_price = entry_price + (rr * risk_points)
+    else:
+        target_price = entry_price - (rr * risk_points)
+
+    # STEP 6: Realized RR from cost model
+    try:
+        realized = calculate_realized_rr(
+            instrument='MGC',
+            stop_distance_points=risk_points,
+            rr_theoretical=rr,
+            stress_level='normal'
+        )
+        realized_rr_win = realized['realized_rr']
+        realized_risk_dollars = realized['realized_risk_dollars']
+        realized_reward_dollars = realized['realized_reward_dollars']
+    except Exception:
+        realized_rr_win = None
+        realized_risk_dollars = None
+        realized_reward_dollars = None
+
+    # STEP 7: Outcome using bars AFTER entry bar
+    h = high[signal_i + 2:]
+    l = low[signal_i + 2:]
+    if break_dir == "UP":
+        _, outcome = _first_exit(l <= stop_price, h >= target_price)
+    else:
+        _, outcome = _first_exit(h >= stop_price, l <= target_price)
+    outcome = outcome or "OPEN"
+
+    # STEP 8: Final realized RR (costs can downgrade a WIN to a LOSS)
+    if outcome == "WIN":
+        if realized_rr_win is not None and realized_rr_win <= 0:
+            outcome = "LOSS"
+        final_realized_rr = realized_rr_win
+    elif outcome == "LOSS":
+        final_realized_rr = -1.0
+    else:  # OPEN
+        final_realized_rr = None
+
+    return {
+        "entry_price": entry_price,
+        "stop_price": stop_price,
+        "risk_points": risk_points,
+        "target_price": target_price,
+        "outcome": outcome,
+        "realized_rr": final_realized_rr,
+        "realized_risk_dollars": realized_risk_dollars,
+        "realized_reward_dollars": realized_reward_dollars
+    }
+
+
+def _rsi_from_closes(closes: List[float]) -> Optional[float]:
+    """RSI over the last 15 5m closes (oldest first); shared by per-day and bulk paths."""
+    if len(closes) < 15:
+        return None
+
+    gains, losses = [], []
+    for i in range(1, len(closes)):
+        ch = closes[i] - closes[i - 1]
+        gains.append(max(ch, 0.0))
+        losses.append(max(-ch, 0.0))
+
+    avg_gain = sum(gains[:RSI_LEN]) / RSI_LEN
+    avg_loss = sum(losses[:RSI_LEN]) / RSI_LEN
+    if avg_loss == 0:
+        return 100.0
+    rs = avg_gain / avg_loss
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+class TradeDateBars:
+    """
+    Contiguous 1m bars for one time span (ts = epoch ms UTC, OHLC float64, volume int64).
+
+    build_features loads one window per trade date (D 07:00 -> D+1 09:00 local) with a
+    single query; every session stat, ORB box and entry/outcome scan for that date is
+    then an index lookup (np.searchsorted) into these arrays. slice() returns views,
+    so the bulk path cuts per-day windows out of a month block without copying.
+    """
+
+    def __init__(self, ts: np.ndarray, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, volume: np.ndarray, start_ms: int, end_ms: int):
+        self.ts = ts
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def covers(self, start_local: datetime, end_local: datetime) -> bool:
+        return self.start_ms <= _epoch_ms(start_local) and _epoch_ms(end_local) <= self.end_ms
+
+    def span(self, start_local: datetime, end_local: datetime) -> Tuple[int, int]:
+        """Index range of bars with start <= ts < end."""
+        i0, i1 = np.searchsorted(self.ts, [_epoch_ms(start_local), _epoch_ms(end_local)])
+        return int(i0), int(i1)
+
+    def slice(self, start_local: datetime, end_local: datetime) -> "TradeDateBars":
+        i0, i1 = self.span(start_local, end_local)
+        return TradeDateBars(
+            self.ts[i0:i1], self.open[i0:i1], self.high[i0:i1], self.low[i0:i1],
+            self.close[i0:i1], self.volume[i0:i1],
+            _epoch_ms(start_local), _epoch_ms(end_local),
+        )
+
+    def stats(self, start_local: datetime, end_local: datetime) -> Optional[Dict]:
+        i0, i1 = self.span(start_local, end_local)
+        return _window_stats_from_arrays(self.high[i0:i1], self.low[i0:i1], self.volume[i0:i1])
+
+
 class FeatureBuilder:
-    def __init__(self, db_path: str = DB_PATH, sl_mode: str = "full", table_name: str = "daily_features"):
-        self.con = duckdb.connect(db_path)
+    def __init__(self, db_path: str = DB_PATH, sl_mode: str = "full", table_name: str = "daily_features",
+                 read_only: bool = False, bar_store: Optional[BarStore] = None):
+        self.con = duckdb.connect(db_path, read_only=read_only)
         self.sl_mode = sl_mode
         self.table_name = table_name
+        # Optional memory-mapped bars_1m export (pipeline/bar_store.py); None = query bars_1m
+        self.bar_store = bar_store
+
+        # Bar window for the trade date being built (see _bars_for)
+        self._day_bars: Optional[TradeDateBars] = None
+        # DB round trip counter (total, and for the last build_features call)
+        self.db_round_trips = 0
+        self.last_round_trips = 0
+
+    def _execute(self, sql: str, params: Optional[List] = None):
+        """con.execute wrapper that counts DB round trips."""
+        self.db_round_trips += 1
+        return self.con.execute(sql, params or [])
 
     def _ensure_schema_columns(self, auto_migrate: bool = True):
         """
@@ -82,61 +476,9 @@ class FeatureBuilder:
 
         This prevents schema mismatch errors when build_daily_features runs.
         """
-        # Self-detect columns from INSERT statement (line ~827-861 in build_features method)
+        # Self-detect columns from FEATURE_INSERT_SQL (shared with build_features)
         # This is the SINGLE SOURCE OF TRUTH - no hardcoded list
-        insert_sql = """
-            INSERT OR REPLACE INTO {table_name} (
-                date_local, instrument,
-
-                pre_asia_high, pre_asia_low, pre_asia_range,
-                pre_london_high, pre_london_low, pre_london_range,
-                pre_ny_high, pre_ny_low, pre_ny_range,
-
-                asia_high, asia_low, asia_range,
-                london_high, london_low, london_range,
-                ny_high, ny_low, ny_range,
-                asia_type_code, london_type_code, pre_ny_type_code,
-
-                orb_0900_high, orb_0900_low, orb_0900_size, orb_0900_break_dir, orb_0900_outcome, orb_0900_r_multiple, orb_0900_mae, orb_0900_mfe, orb_0900_stop_price, orb_0900_risk_ticks,
-                orb_0900_realized_rr, orb_0900_realized_risk_dollars, orb_0900_realized_reward_dollars,
-                orb_1000_high, orb_1000_low, orb_1000_size, orb_1000_break_dir, orb_1000_outcome, orb_1000_r_multiple, orb_1000_mae, orb_1000_mfe, orb_1000_stop_price, orb_1000_risk_ticks,
-                orb_1000_realized_rr, orb_1000_realized_risk_dollars, orb_1000_realized_reward_dollars,
-                orb_1100_high, orb_1100_low, orb_1100_size, orb_1100_break_dir, orb_1100_outcome, orb_1100_r_multiple, orb_1100_mae, orb_1100_mfe, orb_1100_stop_price, orb_1100_risk_ticks,
-                orb_1100_realized_rr, orb_1100_realized_risk_dollars, orb_1100_realized_reward_dollars,
-                orb_1800_high, orb_1800_low, orb_1800_size, orb_1800_break_dir, orb_1800_outcome, orb_1800_r_multiple, orb_1800_mae, orb_1800_mfe, orb_1800_stop_price, orb_1800_risk_ticks,
-                orb_1800_realized_rr, orb_1800_realized_risk_dollars, orb_1800_realized_reward_dollars,
-                orb_2300_high, orb_2300_low, orb_2300_size, orb_2300_break_dir, orb_2300_outcome, orb_2300_r_multiple, orb_2300_mae, orb_2300_mfe, orb_2300_stop_price, orb_2300_risk_ticks,
-                orb_2300_realized_rr, orb_2300_realized_risk_dollars, orb_2300_realized_reward_dollars,
-                orb_0030_high, orb_0030_low, orb_0030_size, orb_0030_break_dir, orb_0030_outcome, orb_0030_r_multiple, orb_0030_mae, orb_0030_mfe, orb_0030_stop_price, orb_0030_risk_ticks,
-                orb_0030_realized_rr, orb_0030_realized_risk_dollars, orb_0030_realized_reward_dollars,
-
-                orb_0900_tradeable_entry_price, orb_0900_tradeable_stop_price, orb_0900_tradeable_risk_points, orb_0900_tradeable_target_price, orb_0900_tradeable_outcome, orb_0900_tradeable_realized_rr, orb_0900_tradeable_realized_risk_dollars, orb_0900_tradeable_realized_reward_dollars,
-                orb_1000_tradeable_entry_price, orb_1000_tradeable_stop_price, orb_1000_tradeable_risk_points, orb_1000_tradeable_target_price, orb_1000_tradeable_outcome, orb_1000_tradeable_realized_rr, orb_1000_tradeable_realized_risk_dollars, orb_1000_tradeable_realized_reward_dollars,
-                orb_1100_tradeable_entry_price, orb_1100_tradeable_stop_price, orb_1100_tradeable_risk_points, orb_1100_tradeable_target_price, orb_1100_tradeable_outcome, orb_1100_tradeable_realized_rr, orb_1100_tradeable_realized_risk_dollars, orb_1100_tradeable_realized_reward_dollars,
-                orb_1800_tradeable_entry_price, orb_1800_tradeable_stop_price, orb_1800_tradeable_risk_points, orb_1800_tradeable_target_price, orb_1800_tradeable_outcome, orb_1800_tradeable_realized_rr, orb_1800_tradeable_realized_risk_dollars, orb_1800_tradeable_realized_reward_dollars,
-                orb_2300_tradeable_entry_price, orb_2300_tradeable_stop_price, orb_2300_tradeable_risk_points, orb_2300_tradeable_target_price, orb_2300_tradeable_outcome, orb_2300_tradeable_realized_rr, orb_2300_tradeable_realized_risk_dollars, orb_2300_tradeable_realized_reward_dollars,
-                orb_0030_tradeable_entry_price, orb_0030_tradeable_stop_price, orb_0030_tradeable_risk_points, orb_0030_tradeable_target_price, orb_0030_tradeable_outcome, orb_0030_tradeable_realized_rr, orb_0030_tradeable_realized_risk_dollars, orb_0030_tradeable_realized_reward_dollars,
-
-                rsi_at_0030, rsi_at_orb, atr_20
-            ) VALUES
-        """
-
-        # Parse column names from INSERT statement
-        import re
-        col_match = re.search(r'\((.*?)\)\s*VALUES', insert_sql, re.DOTALL)
-        if not col_match:
-            raise RuntimeError("Failed to parse INSERT statement for column detection")
-
-        columns_text = col_match.group(1)
-        required_columns = []
-        for line in columns_text.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('--') or '{' in line:
-                continue
-            for col in line.split(','):
-                col = col.strip()
-                if col:
-                    required_columns.append(col)
+        required_columns = _feature_columns()
 
         # Deterministic type mapping (explicit, minimal, justified)
         # Only list non-DOUBLE types here with reasons
@@ -210,72 +552,75 @@ class FeatureBuilder:
         print()
 
     # ---------- core time-window fetchers (FIX midnight safely) ----------
-    def _window_stats_1m(self, start_local: datetime, end_local: datetime) -> Optional[Dict]:
-        start_utc = start_local.astimezone(TZ_UTC)
-        end_utc = end_local.astimezone(TZ_UTC)
+    def _load_bars(self, start_local: datetime, end_local: datetime) -> TradeDateBars:
+        """
+        Load bars_1m for [start, end) with ONE query (or bar store slice) as a TradeDateBars window.
 
-        row = self.con.execute(
+        Windows the bar store does not cover (store synced before the newest bars, or
+        bars rewritten since the sync) are queried.
+        """
+        if self.bar_store is not None:
+            self.bar_store.refresh_changes(self.con)
+            if self.bar_store.covers(_epoch_ms(start_local), _epoch_ms(end_local)):
+                block = self.bar_store.window(_epoch_ms(start_local), _epoch_ms(end_local))
+                return TradeDateBars(
+                    block.ts, block.open, block.high, block.low, block.close, block.volume,
+                    _epoch_ms(start_local), _epoch_ms(end_local),
+                )
+
+        df = self._execute(
             """
-            SELECT
-              MAX(high) AS high,
-              MIN(low)  AS low,
-              MAX(high) - MIN(low) AS range,
-              SUM(volume) AS volume
+            SELECT epoch_ms(ts_utc) AS ts, open, high, low, close, volume
             FROM bars_1m
             WHERE symbol = ?
               AND ts_utc >= ? AND ts_utc < ?
+            ORDER BY ts_utc
             """,
-            [SYMBOL, start_utc, end_utc],
-        ).fetchone()
-
-        if not row or row[0] is None:
-            return None
+            [SYMBOL, start_local.astimezone(TZ_UTC), end_local.astimezone(TZ_UTC)],
+        ).fetchdf()
+
+        return TradeDateBars(
+            df["ts"].to_numpy(dtype=np.int64),
+            df["open"].to_numpy(dtype=float),
+            df["high"].to_numpy(dtype=float),
+            df["low"].to_numpy(dtype=float),
+            df["close"].to_numpy(dtype=float),
+            df["volume"].fillna(0).to_numpy(dtype=np.int64),
+            _epoch_ms(start_local),
+            _epoch_ms(end_local),
+        )
 
-        high, low, rng, vol = row
-        return {
-            "high": float(high),
-            "low": float(low),
-            "range": float(rng),
-            "range_ticks": float(rng) / 0.1 if rng is not None else None,
-            "volume": int(vol) if vol is not None else 0,
-        }
+    def load_trade_date_bars(self, trade_date: date) -> TradeDateBars:
+        """Every 1m bar any feature of trade_date reads: D 07:00 -> D+1 09:00 local."""
+        return self._load_bars(_dt_local(trade_date, 7, 0), _dt_local(trade_date + timedelta(days=1), 9, 0))
 
-    def _fetch_1m_bars(self, start_local: datetime, end_local: datetime) -> List[Tuple[datetime, float, float, float]]:
-        start_utc = start_local.astimezone(TZ_UTC)
-        end_utc = end_local.astimezone(TZ_UTC)
+    def _bars_for(self, start_local: datetime, end_local: datetime) -> TradeDateBars:
+        """The active trade-date window if it covers [start, end), else a one-off load."""
+        if self._day_bars is not None and self._day_bars.covers(start_local, end_local):
+            return self._day_bars
+        return self._load_bars(start_local, end_local)
 
-        return self.con.execute(
-            """
-            SELECT ts_utc, open, high, low, close
-            FROM bars_1m
-            WHERE symbol = ?
-              AND ts_utc >= ? AND ts_utc < ?
-            ORDER BY ts_utc
-            """,
-            [SYMBOL, start_utc, end_utc],
-        ).fetchall()
+    def _window_stats_1m(self, start_local: datetime, end_local: datetime) -> Optional[Dict]:
+        return self._bars_for(start_local, end_local).stats(start_local, end_local)
 
     # ---------- blocks ----------
     def get_pre_asia(self, trade_date: date) -> Optional[Dict]:
-        return self._window_stats_1m(_dt_local(trade_date, 7, 0), _dt_local(trade_date, 9, 0))
+        return self._window_stats_1m(*session_bounds(trade_date, "pre_asia"))
 
     def get_pre_london(self, trade_date: date) -> Optional[Dict]:
-        return self._window_stats_1m(_dt_local(trade_date, 17, 0), _dt_local(trade_date, 18, 0))
+        return self._window_stats_1m(*session_bounds(trade_date, "pre_london"))
 
     def get_pre_ny(self, trade_date: date) -> Optional[Dict]:
-        # FIXED: D 23:00 -> (D+1) 00:30
-        return self._window_stats_1m(_dt_local(trade_date, 23, 0), _dt_local(trade_date + timedelta(days=1), 0, 30))
+        return self._window_stats_1m(*session_bounds(trade_date, "pre_ny"))
 
     def get_asia_session(self, trade_date: date) -> Optional[Dict]:
-        return self._window_stats_1m(_dt_local(trade_date, 9, 0), _dt_local(trade_date, 17, 0))
+        return self._window_stats_1m(*session_bounds(trade_date, "asia"))
 
     def get_london_session(self, trade_date: date) -> Optional[Dict]:
-        return self._window_stats_1m(_dt_local(trade_date, 18, 0), _dt_local(trade_date, 23, 0))
+        return self._window_stats_1m(*session_bounds(trade_date, "london"))
 
     def get_ny_cash_session(self, trade_date: date) -> Optional[Dict]:
-        # (D+1) 00:30 -> 02:00 (includes 00:30 ORB)
-        return self._window_stats_1m(_dt_local(trade_date + timedelta(days=1), 0, 30),
-                                     _dt_local(trade_date + timedelta(days=1), 2, 0))
+        return self._window_stats_1m(*session_bounds(trade_date, "ny"))
 
     # ---------- ORB w/ 1m execution ----------
 
@@ -338,160 +683,19 @@ class FeatureBuilder:
                            stop_price, risk_ticks (debug)
         """
         orb_end_local = orb_start_local + timedelta(minutes=5)
+        bars = self._bars_for(orb_start_local, max(orb_end_local, scan_end_local))
 
-        orb_stats = self._window_stats_1m(orb_start_local, orb_end_local)
+        orb_stats = bars.stats(orb_start_local, orb_end_local)
         if not orb_stats:
             return None
 
-        orb_high = orb_stats["high"]
-        orb_low = orb_stats["low"]
-        orb_size = orb_high - orb_low
-        orb_mid = (orb_high + orb_low) / 2.0
-
         # bars AFTER orb end
-        bars = self._fetch_1m_bars(orb_end_local, scan_end_local)
-
-        break_dir = "NONE"
-        entry_ts = None
-        entry_price = None
-
-        # entry = first 1m close outside ORB
-        for ts_utc, o, h, l, c in bars:  # Fixed: added 'o' for open
-            c = float(c)
-            if c > orb_high:
-                break_dir = "UP"
-                entry_ts = ts_utc
-                entry_price = c
-                break
-            if c < orb_low:
-                break_dir = "DOWN"
-                entry_ts = ts_utc
-                entry_price = c
-                break
-
-        # GUARDRAIL: Validate entry method (must be at close, not ORB edge)
-        if entry_price is not None:
-            assert entry_price != orb_high, "FATAL: Entry at ORB high (should be at close)"
-            assert entry_price != orb_low, "FATAL: Entry at ORB low (should be at close)"
-
-        if break_dir == "NONE":
-            return {
-                "high": orb_high, "low": orb_low, "size": orb_size,
-                "break_dir": "NONE", "outcome": "NO_TRADE", "r_multiple": None,
-                "mae": None, "mfe": None,
-                "stop_price": None, "risk_ticks": None
-            }
-
-        # ORB edge (anchor point for R calculation)
-        orb_edge = orb_high if break_dir == "UP" else orb_low
-
-        # Calculate stop based on mode
-        if sl_mode == "full":
-            stop = orb_low if break_dir == "UP" else orb_high
-        else:  # half
-            stop = orb_mid
-
-        # ORB-anchored R: distance from ORB edge to stop
-        r_orb = abs(orb_edge - stop)
-        risk_ticks = r_orb / 0.1
-
-        # Guard: R must be > 0
-        if r_orb <= 0:
-            # This should never happen in practice, but guard against it
-            return {
-                "high": orb_high, "low": orb_low, "size": orb_size,
-                "break_dir": break_dir, "outcome": "NO_TRADE", "r_multiple": None,
-                "mae": None, "mfe": None,
-                "stop_price": stop, "risk_ticks": 0.0
-            }
-
-        # ORB-anchored target (NOT entry-anchored)
-        # Entry price is ONLY used for fill simulation, not for TP/R/expectancy
-        target = orb_edge + rr * r_orb if break_dir == "UP" else orb_edge - rr * r_orb
-
-        # Track MAE/MFE from ORB EDGE (will be normalized by r_orb)
-        mae_raw = 0.0  # Maximum adverse excursion from ORB edge (in price units)
-        mfe_raw = 0.0  # Maximum favorable excursion from ORB edge (in price units)
-
-        # start checking AFTER entry bar
-        start_i = 0
-        for i, (ts_utc, _, _, _, _) in enumerate(bars):  # Fixed: 5 columns (o,h,l,c)
-            if ts_utc == entry_ts:
-                start_i = i + 1
-                break
-
-        for ts_utc, o, h, l, c in bars[start_i:]:  # Fixed: 5 columns
-            h = float(h)
-            l = float(l)
-
-            # Update MAE/MFE from ORB EDGE (raw price units, will normalize by r_orb)
-            if break_dir == "UP":
-                # MAE: how far price went below ORB edge (adverse)
-                mae_raw = max(mae_raw, orb_edge - l)
-                # MFE: how far price went above ORB edge (favorable)
-                mfe_raw = max(mfe_raw, h - orb_edge)
-
-                hit_stop = l <= stop
-                hit_target = h >= target
-                if hit_stop and hit_target:
-                    return {
-                        "high": orb_high, "low": orb_low, "size": orb_size,
-                        "break_dir": break_dir, "outcome": "LOSS", "r_multiple": -1.0,
-                        "mae": mae_raw / r_orb, "mfe": mfe_raw / r_orb,
-                        "stop_price": stop, "risk_ticks": risk_ticks
-                    }
-                if hit_target:
-                    return {
-                        "high": orb_high, "low": orb_low, "size": orb_size,
-                        "break_dir": break_dir, "outcome": "WIN", "r_multiple": float(rr),
-                        "mae": mae_raw / r_orb, "mfe": mfe_raw / r_orb,
-                        "stop_price": stop, "risk_ticks": risk_ticks
-                    }
-                if hit_stop:
-                    return {
-                        "high": orb_high, "low": orb_low, "size": orb_size,
-                        "break_dir": break_dir, "outcome": "LOSS", "r_multiple": -1.0,
-                        "mae": mae_raw / r_orb, "mfe": mfe_raw / r_orb,
-                        "stop_price": stop, "risk_ticks": risk_ticks
-                    }
-            else:  # DOWN break
-                # MAE: how far price went above ORB edge (adverse)
-                mae_raw = max(mae_raw, h - orb_edge)
-                # MFE: how far price went below ORB edge (favorable)
-                mfe_raw = max(mfe_raw, orb_edge - l)
-
-                hit_stop = h >= stop
-                hit_target = l <= target
-                if hit_stop and hit_target:
-                    return {
-                        "high": orb_high, "low": orb_low, "size": orb_size,
-                        "break_dir": break_dir, "outcome": "LOSS", "r_multiple": -1.0,
-                        "mae": mae_raw / r_orb, "mfe": mfe_raw / r_orb,
-                        "stop_price": stop, "risk_ticks": risk_ticks
-                    }
-                if hit_target:
-                    return {
-                        "high": orb_high, "low": orb_low, "size": orb_size,
-                        "break_dir": break_dir, "outcome": "WIN", "r_multiple": float(rr),
-                        "mae": mae_raw / r_orb, "mfe": mfe_raw / r_orb,
-                        "stop_price": stop, "risk_ticks": risk_ticks
-                    }
-                if hit_stop:
-                    return {
-                        "high": orb_high, "low": orb_low, "size": orb_size,
-                        "break_dir": break_dir, "outcome": "LOSS", "r_multiple": -1.0,
-                        "mae": mae_raw / r_orb, "mfe": mfe_raw / r_orb,
-                        "stop_price": stop, "risk_ticks": risk_ticks
-                    }
-
-        # No exit
-        return {
-            "high": orb_high, "low": orb_low, "size": orb_size,
-            "break_dir": break_dir, "outcome": "NO_TRADE", "r_multiple": None,
-            "mae": (mae_raw / r_orb) if mae_raw > 0 else None,
-            "mfe": (mfe_raw / r_orb) if mfe_raw > 0 else None,
-            "stop_price": stop, "risk_ticks": risk_ticks
-        }
+        after = bars.slice(orb_end_local, scan_end_local)
+        return _orb_exec_from_arrays(
+            orb_stats["high"], orb_stats["low"],
+            after.high, after.low, after.close,
+            rr=rr, sl_mode=sl_mode,
+        )
 
     def calculate_orb_1m_tradeable(self, orb_start_local: datetime, scan_end_local: datetime, rr: float = RR_DEFAULT, sl_mode: str = SL_MODE) -> Optional[Dict]:
         """
@@ -521,180 +725,24 @@ class FeatureBuilder:
             Returns None if ORB window has no data.
         """
         orb_end_local = orb_start_local + timedelta(minutes=5)
+        bars = self._bars_for(orb_start_local, max(orb_end_local, scan_end_local))
 
-        orb_stats = self._window_stats_1m(orb_start_local, orb_end_local)
+        orb_stats = bars.stats(orb_start_local, orb_end_local)
         if not orb_stats:
             return None
 
-        orb_high = orb_stats["high"]
-        orb_low = orb_stats["low"]
-        orb_mid = (orb_high + orb_low) / 2.0
-
         # Bars AFTER ORB end
-        bars = self._fetch_1m_bars(orb_end_local, scan_end_local)
-
-        # STEP 1: Find signal (first 1m CLOSE outside ORB)
-        signal_found = False
-        signal_bar_index = None
-        break_dir = "NONE"
-
-        for i, (ts_utc, o, h, l, c) in enumerate(bars):  # Fixed: 5 columns
-            c = float(c)
-            if c > orb_high:
-                break_dir = "UP"
-                signal_bar_index = i
-                signal_found = True
-                break
-            if c < orb_low:
-                break_dir = "DOWN"
-                signal_bar_index = i
-                signal_found = True
-                break
-
-        if not signal_found:
-            # No break = no signal = no entry
-            return {
-                "entry_price": None,
-                "stop_price": None,
-                "risk_points": None,
-                "target_price": None,
-                "outcome": "NO_TRADE",
-                "realized_rr": None,
-                "realized_risk_dollars": None,
-                "realized_reward_dollars": None
-            }
-
-        # STEP 2: Entry at NEXT 1m OPEN (B-entry model)
-        if signal_bar_index + 1 >= len(bars):
-            # Signal occurred in last bar of scan window, no next bar = OPEN position
-            return {
-                "entry_price": None,
-                "stop_price": None,
-                "risk_points": None,
-                "target_price": None,
-                "outcome": "OPEN",
-                "realized_rr": None,
-                "realized_risk_dollars": None,
-                "realized_reward_dollars": None
-            }
-
-        # Entry bar is the bar AFTER signal bar
-        entry_bar = bars[signal_bar_index + 1]
-        entry_ts, entry_bar_open, entry_bar_high, entry_bar_low, entry_bar_close = entry_bar
-
-        # B-ENTRY MODEL: Entry price = OPEN of entry bar (NEXT 1m OPEN after signal close)
-        # Slippage is handled separately in cost model ($4.00 per RT)
-        entry_price = float(entry_bar_open)
-
-        # STEP 3: Calculate stop based on mode
-        if sl_mode == "full":
-            stop_price = orb_low if break_dir == "UP" else orb_high
-        else:  # half
-            stop_price = orb_mid
-
-        # STEP 4: Calculate entry-anchored risk (CANONICAL FORMULA)
-        risk_points = abs(entry_price - stop_price)
-
-        if risk_points <= 0:
-            # Should never happen, but guard against it
-            return {
-                "entry_price": entry_price,
-                "stop_price": stop_price,
-                "risk_points": 0.0,
-                "target_price": None,
-                "outcome": "NO_TRADE",  # BUG #6 FIX: Zero risk = invalid setup, not open position
-                "realized_rr": None,
-                "realized_risk_dollars": None,
-                "realized_reward_dollars": None
-            }
-
-        # STEP 5: Calculate target (entry-anchored)
-        if break_dir == "UP":
-            target_price = entry_price + (rr * risk_points)
-        else:
-            target_price = entry_price - (rr * risk_points)
-
-        # STEP 6: Calculate realized RR using cost_model.py
-        try:
-            realized = calculate_realized_rr(
-                instrument='MGC',
-                stop_distance_points=risk_points,
-                rr_theoretical=rr,
-                stress_level='normal'
-            )
-            realized_rr_win = realized['realized_rr']
-            realized_risk_dollars = realized['realized_risk_dollars']
-            realized_reward_dollars = realized['realized_reward_dollars']
-        except Exception:
-            # If cost_model fails, set to None
-            realized_rr_win = None
-            realized_risk_dollars = None
-            realized_reward_dollars = None
-
-        # STEP 7: Check outcome using bars AFTER entry bar (conservative same-bar resolution)
-        outcome = "OPEN"  # Default if no exit found
-
-        for ts_utc, o, h, l, c in bars[signal_bar_index + 2:]:  # Fixed: 5 columns
-            h = float(h)
-            l = float(l)
-
-            if break_dir == "UP":
-                hit_stop = l <= stop_price
-                hit_target = h >= target_price
-
-                if hit_stop and hit_target:
-                    # Both hit in same bar = LOSS (conservative)
-                    outcome = "LOSS"
-                    break
-                if hit_target:
-                    outcome = "WIN"
-                    break
-                if hit_stop:
-                    outcome = "LOSS"
-                    break
-            else:  # DOWN
-                hit_stop = h >= stop_price
-                hit_target = l <= target_price
-
-                if hit_stop and hit_target:
-                    outcome = "LOSS"
-                    break
-                if hit_target:
-                    outcome = "WIN"
-                    break
-                if hit_stop:
-                    outcome = "LOSS"
-                    break
-
-        # STEP 8: Calculate final realized_rr based on outcome
-        # CRITICAL FIX: If costs exceed profit, downgrade WIN to LOSS
-        if outcome == "WIN":
-            if realized_rr_win is not None and realized_rr_win <= 0:
-                # Price hit target but costs ate all profit → not a real win
-                outcome = "LOSS"  # Downgrade to LOSS
-                final_realized_rr = realized_rr_win  # Keep actual RR (0.0 or negative)
-            else:
-                final_realized_rr = realized_rr_win
-        elif outcome == "LOSS":
-            final_realized_rr = -1.0  # Always -1R for losses
-        else:  # OPEN
-            final_realized_rr = None
-
-        return {
-            "entry_price": entry_price,
-            "stop_price": stop_price,
-            "risk_points": risk_points,
-            "target_price": target_price,
-            "outcome": outcome,
-            "realized_rr": final_realized_rr,
-            "realized_risk_dollars": realized_risk_dollars,
-            "realized_reward_dollars": realized_reward_dollars
-        }
+        after = bars.slice(orb_end_local, scan_end_local)
+        return _orb_tradeable_from_arrays(
+            orb_stats["high"], orb_stats["low"],
+            after.open, after.high, after.low, after.close,
+            rr=rr, sl_mode=sl_mode,
+        )
 
     # ---------- RSI ----------
     def calculate_rsi_at(self, at_local: datetime) -> Optional[float]:
         at_utc = at_local.astimezone(TZ_UTC)
-        closes = self.con.execute(
+        closes = self._execute(
             """
             SELECT close
             FROM bars_5m
@@ -706,26 +754,12 @@ class FeatureBuilder:
             [SYMBOL, at_utc],
         ).fetchall()
 
-        if len(closes) < 15:
-            return None
-
         closes = [float(x[0]) for x in reversed(closes)]
-        gains, losses = [], []
-        for i in range(1, len(closes)):
-            ch = closes[i] - closes[i - 1]
-            gains.append(max(ch, 0.0))
-            losses.append(max(-ch, 0.0))
-
-        avg_gain = sum(gains[:RSI_LEN]) / RSI_LEN
-        avg_loss = sum(losses[:RSI_LEN]) / RSI_LEN
-        if avg_loss == 0:
-            return 100.0
-        rs = avg_gain / avg_loss
-        return 100.0 - (100.0 / (1.0 + rs))
+        return _rsi_from_closes(closes)
 
     # ---------- ATR (simple) ----------
     def calculate_atr(self, trade_date: date) -> Optional[float]:
-        rows = self.con.execute(
+        rows = self._execute(
             """
             SELECT asia_high, asia_low
             FROM daily_features
@@ -796,58 +830,52 @@ class FeatureBuilder:
         return "N0_NORMAL"
 
     # ---------- build ----------
-    def build_features(self, trade_date: date) -> bool:
-        print(f"Building features for {trade_date}...")
-
-        pre_asia = self.get_pre_asia(trade_date)
-        pre_london = self.get_pre_london(trade_date)
-        pre_ny = self.get_pre_ny(trade_date)
+    def _sessions_and_orbs(self, trade_date: date) -> Tuple[Tuple[Optional[Dict], ...], Dict, Dict]:
+        """
+        Session stats plus structural/tradeable results for all six ORBs.
 
-        asia_session = self.get_asia_session(trade_date)
-        london_session = self.get_london_session(trade_date)
-        ny_session = self.get_ny_cash_session(trade_date)
+        With an active trade-date window (self._day_bars) this issues no SQL.
+        """
+        sessions = (
+            self.get_pre_asia(trade_date),
+            self.get_pre_london(trade_date),
+            self.get_pre_ny(trade_date),
+            self.get_asia_session(trade_date),
+            self.get_london_session(trade_date),
+            self.get_ny_cash_session(trade_date),
+        )
 
         # EXTENDED SCAN WINDOWS (CORRECTED 2026-01-16):
         # All ORBs scan until next Asia open (09:00 next day) to capture full overnight moves
         # This matches the fix applied to execution_engine.py for MGC
         next_asia_open = _dt_local(trade_date + timedelta(days=1), 9, 0)
 
-        # STRUCTURAL (ORB-anchored) - Discovery lens
-        orb_0900 = self.calculate_orb_1m_exec(_dt_local(trade_date, 9, 0), next_asia_open, sl_mode=self.sl_mode)
-        if orb_0900:
-            orb_0900 = self._add_realized_rr_to_result(orb_0900, RR_DEFAULT)
-
-        orb_1000 = self.calculate_orb_1m_exec(_dt_local(trade_date, 10, 0), next_asia_open, sl_mode=self.sl_mode)
-        if orb_1000:
-            orb_1000 = self._add_realized_rr_to_result(orb_1000, RR_DEFAULT)
-
-        orb_1100 = self.calculate_orb_1m_exec(_dt_local(trade_date, 11, 0), next_asia_open, sl_mode=self.sl_mode)
-        if orb_1100:
-            orb_1100 = self._add_realized_rr_to_result(orb_1100, RR_DEFAULT)
+        orbs = {}
+        tradeables = {}
+        for orb_name, hh, mm, day_offset in ORB_TIMES:
+            orb_start = _dt_local(trade_date + timedelta(days=day_offset), hh, mm)
 
-        orb_1800 = self.calculate_orb_1m_exec(_dt_local(trade_date, 18, 0), next_asia_open, sl_mode=self.sl_mode)
-        if orb_1800:
-            orb_1800 = self._add_realized_rr_to_result(orb_1800, RR_DEFAULT)
+            # STRUCTURAL (ORB-anchored) - Discovery lens
+            orb = self.calculate_orb_1m_exec(orb_start, next_asia_open, sl_mode=self.sl_mode)
+            if orb:
+                orb = self._add_realized_rr_to_result(orb, RR_DEFAULT)
+            orbs[orb_name] = orb
 
-        orb_2300 = self.calculate_orb_1m_exec(_dt_local(trade_date, 23, 0), next_asia_open, sl_mode=self.sl_mode)
-        if orb_2300:
-            orb_2300 = self._add_realized_rr_to_result(orb_2300, RR_DEFAULT)
+            # TRADEABLE (entry-anchored) - Promotion truth
+            tradeables[orb_name] = self.calculate_orb_1m_tradeable(orb_start, next_asia_open, sl_mode=self.sl_mode)
 
-        orb_0030 = self.calculate_orb_1m_exec(_dt_local(trade_date + timedelta(days=1), 0, 30), next_asia_open, sl_mode=self.sl_mode)
-        if orb_0030:
-            orb_0030 = self._add_realized_rr_to_result(orb_0030, RR_DEFAULT)
+        return sessions, orbs, tradeables
 
-        # TRADEABLE (entry-anchored) - Promotion truth
-        orb_0900_tradeable = self.calculate_orb_1m_tradeable(_dt_local(trade_date, 9, 0), next_asia_open, sl_mode=self.sl_mode)
-        orb_1000_tradeable = self.calculate_orb_1m_tradeable(_dt_local(trade_date, 10, 0), next_asia_open, sl_mode=self.sl_mode)
-        orb_1100_tradeable = self.calculate_orb_1m_tradeable(_dt_local(trade_date, 11, 0), next_asia_open, sl_mode=self.sl_mode)
-        orb_1800_tradeable = self.calculate_orb_1m_tradeable(_dt_local(trade_date, 18, 0), next_asia_open, sl_mode=self.sl_mode)
-        orb_2300_tradeable = self.calculate_orb_1m_tradeable(_dt_local(trade_date, 23, 0), next_asia_open, sl_mode=self.sl_mode)
-        orb_0030_tradeable = self.calculate_orb_1m_tradeable(_dt_local(trade_date + timedelta(days=1), 0, 30), next_asia_open, sl_mode=self.sl_mode)
-
-        rsi_at_0030 = self.calculate_rsi_at(_dt_local(trade_date + timedelta(days=1), 0, 30))
-        atr_20 = self.calculate_atr(trade_date)
+    def _feature_row(self, trade_date: date, sessions: Tuple[Optional[Dict], ...],
+                     orbs: Dict[str, Optional[Dict]], tradeables: Dict[str, Optional[Dict]],
+                     rsi_at_0030: Optional[float], atr_20: Optional[float]) -> List:
+        """
+        Assemble one features row in FEATURE_INSERT_SQL column order.
 
+        Shared by build_features (per-day) and build_features_bulk so both paths
+        produce identical rows from identical inputs.
+        """
+        pre_asia, pre_london, pre_ny, asia_session, london_session, ny_session = sessions
         asia_code = self.classify_asia_code(asia_session["range"] if asia_session else None, atr_20)
         london_code = self.classify_london_code(
             london_session["high"] if london_session else None,
@@ -865,247 +893,248 @@ class FeatureBuilder:
             atr_20,
         )
 
-        self.con.execute(
-            f"""
-            INSERT OR REPLACE INTO {self.table_name} (
-                date_local, instrument,
-
-                pre_asia_high, pre_asia_low, pre_asia_range,
-                pre_london_high, pre_london_low, pre_london_range,
-                pre_ny_high, pre_ny_low, pre_ny_range,
-
-                asia_high, asia_low, asia_range,
-                london_high, london_low, london_range,
-                ny_high, ny_low, ny_range,
-                asia_type_code, london_type_code, pre_ny_type_code,
-
-                orb_0900_high, orb_0900_low, orb_0900_size, orb_0900_break_dir, orb_0900_outcome, orb_0900_r_multiple, orb_0900_mae, orb_0900_mfe, orb_0900_stop_price, orb_0900_risk_ticks,
-                orb_0900_realized_rr, orb_0900_realized_risk_dollars, orb_0900_realized_reward_dollars,
-                orb_1000_high, orb_1000_low, orb_1000_size, orb_1000_break_dir, orb_1000_outcome, orb_1000_r_multiple, orb_1000_mae, orb_1000_mfe, orb_1000_stop_price, orb_1000_risk_ticks,
-                orb_1000_realized_rr, orb_1000_realized_risk_dollars, orb_1000_realized_reward_dollars,
-                orb_1100_high, orb_1100_low, orb_1100_size, orb_1100_break_dir, orb_1100_outcome, orb_1100_r_multiple, orb_1100_mae, orb_1100_mfe, orb_1100_stop_price, orb_1100_risk_ticks,
-                orb_1100_realized_rr, orb_1100_realized_risk_dollars, orb_1100_realized_reward_dollars,
-                orb_1800_high, orb_1800_low, orb_1800_size, orb_1800_break_dir, orb_1800_outcome, orb_1800_r_multiple, orb_1800_mae, orb_1800_mfe, orb_1800_stop_price, orb_1800_risk_ticks,
-                orb_1800_realized_rr, orb_1800_realized_risk_dollars, orb_1800_realized_reward_dollars,
-                orb_2300_high, orb_2300_low, orb_2300_size, orb_2300_break_dir, orb_2300_outcome, orb_2300_r_multiple, orb_2300_mae, orb_2300_mfe, orb_2300_stop_price, orb_2300_risk_ticks,
-                orb_2300_realized_rr, orb_2300_realized_risk_dollars, orb_2300_realized_reward_dollars,
-                orb_0030_high, orb_0030_low, orb_0030_size, orb_0030_break_dir, orb_0030_outcome, orb_0030_r_multiple, orb_0030_mae, orb_0030_mfe, orb_0030_stop_price, orb_0030_risk_ticks,
-                orb_0030_realized_rr, orb_0030_realized_risk_dollars, orb_0030_realized_reward_dollars,
-
-                orb_0900_tradeable_entry_price, orb_0900_tradeable_stop_price, orb_0900_tradeable_risk_points, orb_0900_tradeable_target_price, orb_0900_tradeable_outcome, orb_0900_tradeable_realized_rr, orb_0900_tradeable_realized_risk_dollars, orb_0900_tradeable_realized_reward_dollars,
-                orb_1000_tradeable_entry_price, orb_1000_tradeable_stop_price, orb_1000_tradeable_risk_points, orb_1000_tradeable_target_price, orb_1000_tradeable_outcome, orb_1000_tradeable_realized_rr, orb_1000_tradeable_realized_risk_dollars, orb_1000_tradeable_realized_reward_dollars,
-                orb_1100_tradeable_entry_price, orb_1100_tradeable_stop_price, orb_1100_tradeable_risk_points, orb_1100_tradeable_target_price, orb_1100_tradeable_outcome, orb_1100_tradeable_realized_rr, orb_1100_tradeable_realized_risk_dollars, orb_1100_tradeable_realized_reward_dollars,
-                orb_1800_tradeable_entry_price, orb_1800_tradeable_stop_price, orb_1800_tradeable_risk_points, orb_1800_tradeable_target_price, orb_1800_tradeable_outcome, orb_1800_tradeable_realized_rr, orb_1800_tradeable_realized_risk_dollars, orb_1800_tradeable_realized_reward_dollars,
-                orb_2300_tradeable_entry_price, orb_2300_tradeable_stop_price, orb_2300_tradeable_risk_points, orb_2300_tradeable_target_price, orb_2300_tradeable_outcome, orb_2300_tradeable_realized_rr, orb_2300_tradeable_realized_risk_dollars, orb_2300_tradeable_realized_reward_dollars,
-                orb_0030_tradeable_entry_price, orb_0030_tradeable_stop_price, orb_0030_tradeable_risk_points, orb_0030_tradeable_target_price, orb_0030_tradeable_outcome, orb_0030_tradeable_realized_rr, orb_0030_tradeable_realized_risk_dollars, orb_0030_tradeable_realized_reward_dollars,
-
-                rsi_at_0030, rsi_at_orb, atr_20
-            ) VALUES (
-                ?, ?,
-
-                ?, ?, ?,
-                ?, ?, ?,
-                ?, ?, ?,
-
-                ?, ?, ?,
-                ?, ?, ?,
-                ?, ?, ?,
-                ?, ?, ?,
-
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-
-                ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?,
-
-                ?, ?, ?
-            )
-            """,
-            [
-                trade_date, "MGC",
-
-                pre_asia["high"] if pre_asia else None,
-                pre_asia["low"] if pre_asia else None,
-                pre_asia["range"] if pre_asia else None,
-
-                pre_london["high"] if pre_london else None,
-                pre_london["low"] if pre_london else None,
-                pre_london["range"] if pre_london else None,
-
-                pre_ny["high"] if pre_ny else None,
-                pre_ny["low"] if pre_ny else None,
-                pre_ny["range"] if pre_ny else None,
-
-                asia_session["high"] if asia_session else None,
-                asia_session["low"] if asia_session else None,
-                asia_session["range"] if asia_session else None,
-
-                london_session["high"] if london_session else None,
-                london_session["low"] if london_session else None,
-                london_session["range"] if london_session else None,
-
-                ny_session["high"] if ny_session else None,
-                ny_session["low"] if ny_session else None,
-                ny_session["range"] if ny_session else None,
-
-                asia_code, london_code, pre_ny_code,
-
-                orb_0900["high"] if orb_0900 else None,
-                orb_0900["low"] if orb_0900 else None,
-                orb_0900["size"] if orb_0900 else None,
-                orb_0900["break_dir"] if orb_0900 else None,
-                orb_0900["outcome"] if orb_0900 else None,
-                orb_0900["r_multiple"] if orb_0900 else None,
-                orb_0900.get("mae") if orb_0900 else None,
-                orb_0900.get("mfe") if orb_0900 else None,
-                orb_0900.get("stop_price") if orb_0900 else None,
-                orb_0900.get("risk_ticks") if orb_0900 else None,
-                orb_0900.get("realized_rr") if orb_0900 else None,
-                orb_0900.get("realized_risk_dollars") if orb_0900 else None,
-                orb_0900.get("realized_reward_dollars") if orb_0900 else None,
-
-                orb_1000["high"] if orb_1000 else None,
-                orb_1000["low"] if orb_1000 else None,
-                orb_1000["size"] if orb_1000 else None,
-                orb_1000["break_dir"] if orb_1000 else None,
-                orb_1000["outcome"] if orb_1000 else None,
-                orb_1000["r_multiple"] if orb_1000 else None,
-                orb_1000.get("mae") if orb_1000 else None,
-                orb_1000.get("mfe") if orb_1000 else None,
-                orb_1000.get("stop_price") if orb_1000 else None,
-                orb_1000.get("risk_ticks") if orb_1000 else None,
-                orb_1000.get("realized_rr") if orb_1000 else None,
-                orb_1000.get("realized_risk_dollars") if orb_1000 else None,
-                orb_1000.get("realized_reward_dollars") if orb_1000 else None,
-
-                orb_1100["high"] if orb_1100 else None,
-                orb_1100["low"] if orb_1100 else None,
-                orb_1100["size"] if orb_1100 else None,
-                orb_1100["break_dir"] if orb_1100 else None,
-                orb_1100["outcome"] if orb_1100 else None,
-                orb_1100["r_multiple"] if orb_1100 else None,
-                orb_1100.get("mae") if orb_1100 else None,
-                orb_1100.get("mfe") if orb_1100 else None,
-                orb_1100.get("stop_price") if orb_1100 else None,
-                orb_1100.get("risk_ticks") if orb_1100 else None,
-                orb_1100.get("realized_rr") if orb_1100 else None,
-                orb_1100.get("realized_risk_dollars") if orb_1100 else None,
-                orb_1100.get("realized_reward_dollars") if orb_1100 else None,
-
-                orb_1800["high"] if orb_1800 else None,
-                orb_1800["low"] if orb_1800 else None,
-                orb_1800["size"] if orb_1800 else None,
-                orb_1800["break_dir"] if orb_1800 else None,
-                orb_1800["outcome"] if orb_1800 else None,
-                orb_1800["r_multiple"] if orb_1800 else None,
-                orb_1800.get("mae") if orb_1800 else None,
-                orb_1800.get("mfe") if orb_1800 else None,
-                orb_1800.get("stop_price") if orb_1800 else None,
-                orb_1800.get("risk_ticks") if orb_1800 else None,
-                orb_1800.get("realized_rr") if orb_1800 else None,
-                orb_1800.get("realized_risk_dollars") if orb_1800 else None,
-                orb_1800.get("realized_reward_dollars") if orb_1800 else None,
-
-                orb_2300["high"] if orb_2300 else None,
-                orb_2300["low"] if orb_2300 else None,
-                orb_2300["size"] if orb_2300 else None,
-                orb_2300["break_dir"] if orb_2300 else None,
-                orb_2300["outcome"] if orb_2300 else None,
-                orb_2300["r_multiple"] if orb_2300 else None,
-                orb_2300.get("mae") if orb_2300 else None,
-                orb_2300.get("mfe") if orb_2300 else None,
-                orb_2300.get("stop_price") if orb_2300 else None,
-                orb_2300.get("risk_ticks") if orb_2300 else None,
-                orb_2300.get("realized_rr") if orb_2300 else None,
-                orb_2300.get("realized_risk_dollars") if orb_2300 else None,
-                orb_2300.get("realized_reward_dollars") if orb_2300 else None,
-
-                orb_0030["high"] if orb_0030 else None,
-                orb_0030["low"] if orb_0030 else None,
-                orb_0030["size"] if orb_0030 else None,
-                orb_0030["break_dir"] if orb_0030 else None,
-                orb_0030["outcome"] if orb_0030 else None,
-                orb_0030["r_multiple"] if orb_0030 else None,
-                orb_0030.get("mae") if orb_0030 else None,
-                orb_0030.get("mfe") if orb_0030 else None,
-                orb_0030.get("stop_price") if orb_0030 else None,
-                orb_0030.get("risk_ticks") if orb_0030 else None,
-                orb_0030.get("realized_rr") if orb_0030 else None,
-                orb_0030.get("realized_risk_dollars") if orb_0030 else None,
-                orb_0030.get("realized_reward_dollars") if orb_0030 else None,
-
-                orb_0900_tradeable.get("entry_price") if orb_0900_tradeable else None,
-                orb_0900_tradeable.get("stop_price") if orb_0900_tradeable else None,
-                orb_0900_tradeable.get("risk_points") if orb_0900_tradeable else None,
-                orb_0900_tradeable.get("target_price") if orb_0900_tradeable else None,
-                orb_0900_tradeable.get("outcome") if orb_0900_tradeable else None,
-                orb_0900_tradeable.get("realized_rr") if orb_0900_tradeable else None,
-                orb_0900_tradeable.get("realized_risk_dollars") if orb_0900_tradeable else None,
-                orb_0900_tradeable.get("realized_reward_dollars") if orb_0900_tradeable else None,
-
-                orb_1000_tradeable.get("entry_price") if orb_1000_tradeable else None,
-                orb_1000_tradeable.get("stop_price") if orb_1000_tradeable else None,
-                orb_1000_tradeable.get("risk_points") if orb_1000_tradeable else None,
-                orb_1000_tradeable.get("target_price") if orb_1000_tradeable else None,
-                orb_1000_tradeable.get("outcome") if orb_1000_tradeable else None,
-                orb_1000_tradeable.get("realized_rr") if orb_1000_tradeable else None,
-                orb_1000_tradeable.get("realized_risk_dollars") if orb_1000_tradeable else None,
-                orb_1000_tradeable.get("realized_reward_dollars") if orb_1000_tradeable else None,
-
-                orb_1100_tradeable.get("entry_price") if orb_1100_tradeable else None,
-                orb_1100_tradeable.get("stop_price") if orb_1100_tradeable else None,
-                orb_1100_tradeable.get("risk_points") if orb_1100_tradeable else None,
-                orb_1100_tradeable.get("target_price") if orb_1100_tradeable else None,
-                orb_1100_tradeable.get("outcome") if orb_1100_tradeable else None,
-                orb_1100_tradeable.get("realized_rr") if orb_1100_tradeable else None,
-                orb_1100_tradeable.get("realized_risk_dollars") if orb_1100_tradeable else None,
-                orb_1100_tradeable.get("realized_reward_dollars") if orb_1100_tradeable else None,
-
-                orb_1800_tradeable.get("entry_price") if orb_1800_tradeable else None,
-                orb_1800_tradeable.get("stop_price") if orb_1800_tradeable else None,
-                orb_1800_tradeable.get("risk_points") if orb_1800_tradeable else None,
-                orb_1800_tradeable.get("target_price") if orb_1800_tradeable else None,
-                orb_1800_tradeable.get("outcome") if orb_1800_tradeable else None,
-                orb_1800_tradeable.get("realized_rr") if orb_1800_tradeable else None,
-                orb_1800_tradeable.get("realized_risk_dollars") if orb_1800_tradeable else None,
-                orb_1800_tradeable.get("realized_reward_dollars") if orb_1800_tradeable else None,
-
-                orb_2300_tradeable.get("entry_price") if orb_2300_tradeable else None,
-                orb_2300_tradeable.get("stop_price") if orb_2300_tradeable else None,
-                orb_2300_tradeable.get("risk_points") if orb_2300_tradeable else None,
-                orb_2300_tradeable.get("target_price") if orb_2300_tradeable else None,
-                orb_2300_tradeable.get("outcome") if orb_2300_tradeable else None,
-                orb_2300_tradeable.get("realized_rr") if orb_2300_tradeable else None,
-                orb_2300_tradeable.get("realized_risk_dollars") if orb_2300_tradeable else None,
-                orb_2300_tradeable.get("realized_reward_dollars") if orb_2300_tradeable else None,
-
-                orb_0030_tradeable.get("entry_price") if orb_0030_tradeable else None,
-                orb_0030_tradeable.get("stop_price") if orb_0030_tradeable else None,
-                orb_0030_tradeable.get("risk_points") if orb_0030_tradeable else None,
-                orb_0030_tradeable.get("target_price") if orb_0030_tradeable else None,
-                orb_0030_tradeable.get("outcome") if orb_0030_tradeable else None,
-                orb_0030_tradeable.get("realized_rr") if orb_0030_tradeable else None,
-                orb_0030_tradeable.get("realized_risk_dollars") if orb_0030_tradeable else None,
-                orb_0030_tradeable.get("realized_reward_dollars") if orb_0030_tradeable else None,
-
-                rsi_at_0030,
-                rsi_at_0030,  # rsi_at_orb = same as rsi_at_0030
-                atr_20,
-            ],
+        row = [trade_date, "MGC"]
+        for session in sessions:
+            row += [
+                session["high"] if session else None,
+                session["low"] if session else None,
+                session["range"] if session else None,
+            ]
+        row += [asia_code, london_code, pre_ny_code]
+
+        # STRUCTURAL (ORB-anchored)
+        for orb_name, _, _, _ in ORB_TIMES:
+            orb = orbs.get(orb_name)
+            row += [
+                orb["high"] if orb else None,
+                orb["low"] if orb else None,
+                orb["size"] if orb else None,
+                orb["break_dir"] if orb else None,
+                orb["outcome"] if orb else None,
+                orb["r_multiple"] if orb else None,
+                orb.get("mae") if orb else None,
+                orb.get("mfe") if orb else None,
+                orb.get("stop_price") if orb else None,
+                orb.get("risk_ticks") if orb else None,
+                orb.get("realized_rr") if orb else None,
+                orb.get("realized_risk_dollars") if orb else None,
+                orb.get("realized_reward_dollars") if orb else None,
+            ]
+
+        # TRADEABLE (entry-anchored)
+        for orb_name, _, _, _ in ORB_TIMES:
+            tradeable = tradeables.get(orb_name)
+            row += [
+                tradeable.get("entry_price") if tradeable else None,
+                tradeable.get("stop_price") if tradeable else None,
+                tradeable.get("risk_points") if tradeable else None,
+                tradeable.get("target_price") if tradeable else None,
+                tradeable.get("outcome") if tradeable else None,
+                tradeable.get("realized_rr") if tradeable else None,
+                tradeable.get("realized_risk_dollars") if tradeable else None,
+                tradeable.get("realized_reward_dollars") if tradeable else None,
+            ]
+
+        row += [
+            rsi_at_0030,
+            rsi_at_0030,  # rsi_at_orb = same as rsi_at_0030
+            atr_20,
+        ]
+        return row
+
+    def compute_feature_row(self, trade_date: date) -> List:
+        """Compute one features row (FEATURE_INSERT_SQL column order) without writing it."""
+        # One bars_1m query per trade date; every session/ORB calculation slices it
+        self._day_bars = self.load_trade_date_bars(trade_date)
+        try:
+            sessions, orbs, tradeables = self._sessions_and_orbs(trade_date)
+        finally:
+            self._day_bars = None
+
+        rsi_at_0030 = self.calculate_rsi_at(_dt_local(trade_date + timedelta(days=1), 0, 30))
+        atr_20 = self.calculate_atr(trade_date)
+
+        return self._feature_row(trade_date, sessions, orbs, tradeables, rsi_at_0030, atr_20)
+
+    def build_features(self, trade_date: date) -> bool:
+        print(f"Building features for {trade_date}...")
+        trips_before = self.db_round_trips
+
+        row = self.compute_feature_row(trade_date)
+        placeholders = ", ".join(["?"] * len(row))
+        self._execute(
+            FEATURE_INSERT_SQL.format(table_name=self.table_name) + f"({placeholders})",
+            row,
         )
 
         self.con.commit()
-        print("  [OK] Features saved")
+        self.last_round_trips = self.db_round_trips - trips_before
+        print(f"  [OK] Features saved ({self.last_round_trips} DB round trips)")
         return True
 
+    # ---------- bulk (multi-day) build ----------
+    def _load_rsi_closes(self, first_at_local: datetime, last_at_local: datetime) -> Tuple[np.ndarray, List[float]]:
+        """
+        Load the bars_5m closes every calculate_rsi_at call in [first_at, last_at] can see:
+        the 15 closes up to first_at plus everything in (first_at, last_at].
+        """
+        first_utc = first_at_local.astimezone(TZ_UTC)
+        last_utc = last_at_local.astimezone(TZ_UTC)
+
+        head = self._execute(
+            """
+            SELECT epoch_ms(ts_utc), close
+            FROM bars_5m
+            WHERE symbol = ?
+              AND ts_utc <= ?
+            ORDER BY ts_utc DESC
+            LIMIT 15
+            """,
+            [SYMBOL, first_utc],
+        ).fetchall()
+        body = self._execute(
+            """
+            SELECT epoch_ms(ts_utc), close
+            FROM bars_5m
+            WHERE symbol = ?
+              AND ts_utc > ? AND ts_utc <= ?
+            ORDER BY ts_utc
+            """,
+            [SYMBOL, first_utc, last_utc],
+        ).fetchall()
+
+        rows = list(reversed(head)) + body
+        ts = np.array([r[0] for r in rows], dtype=np.int64)
+        closes = [float(r[1]) for r in rows]
+        return ts, closes
+
+    def _load_atr_history(self, start_date: date, end_date: date) -> List[Tuple[date, float]]:
+        """
+        Load the (date, asia range) rows calculate_atr reads, sorted by date.
+
+        When writing to daily_features, the MGC rows inside the rebuild range are
+        dropped here because the bulk build appends freshly computed values instead
+        (exactly what the per-day path sees after writing each earlier day).
+        """
+        rows = self._execute(
+            """
+            SELECT date_local, instrument, asia_high, asia_low
+            FROM daily_features
+            WHERE date_local < ?
+              AND asia_high IS NOT NULL
+            ORDER BY date_local
+            """,
+            [end_date],
+        ).fetchall()
+
+        history = []
+        for d, instrument, high, low in rows:
+            if self.table_name == "daily_features" and instrument == "MGC" and start_date <= d <= end_date:
+                continue
+            history.append((d, float(high) - float(low)))
+        return history
+
+    @staticmethod
+    def _atr_from_history(history: List[Tuple[date, float]], trade_date: date) -> Optional[float]:
+        """Same result as calculate_atr, from an in-memory sorted history."""
+        k = bisect.bisect_left(history, (trade_date,))
+        if k < 20:
+            return None
+        trs = [tr for _, tr in reversed(history[k - 20:k])]
+        return sum(trs) / len(trs)
+
+    def _chunk_components(self, chunk_start: date, chunk_end: date) -> List[Tuple]:
+        """
+        Everything for [chunk_start, chunk_end] that does NOT depend on ATR.
+
+        Loads bars_1m and bars_5m once for the chunk; each day is then computed from
+        a slice of that block. Returns (trade_date, sessions, orbs, tradeables, rsi_at_0030)
+        per day. ATR and the type codes are resolved afterwards in date order by
+        _rows_from_components, so chunks can be computed independently.
+        """
+        month_bars = self._load_bars(
+            _dt_local(chunk_start, 7, 0),
+            _dt_local(chunk_end + timedelta(days=1), 9, 0),
+        )
+        rsi_ts, rsi_closes = self._load_rsi_closes(
+            _dt_local(chunk_start + timedelta(days=1), 0, 30),
+            _dt_local(chunk_end + timedelta(days=1), 0, 30),
+        )
+
+        components = []
+        cur = chunk_start
+        while cur <= chunk_end:
+            next_day = cur + timedelta(days=1)
+
+            self._day_bars = month_bars.slice(_dt_local(cur, 7, 0), _dt_local(next_day, 9, 0))
+            try:
+                sessions, orbs, tradeables = self._sessions_and_orbs(cur)
+            finally:
+                self._day_bars = None
+
+            k = int(np.searchsorted(rsi_ts, _epoch_ms(_dt_local(next_day, 0, 30)), side="right"))
+            rsi_at_0030 = _rsi_from_closes(rsi_closes[max(0, k - 15):k])
+
+            components.append((cur, sessions, orbs, tradeables, rsi_at_0030))
+            cur = next_day
+
+        return components
+
+    def _rows_from_components(self, components: List[Tuple], atr_history: List[Tuple[date, float]]) -> List[List]:
+        """Resolve ATR (in date order) and assemble feature rows for one chunk."""
+        rows = []
+        for trade_date, sessions, orbs, tradeables, rsi_at_0030 in components:
+            atr_20 = self._atr_from_history(atr_history, trade_date)
+
+            # Later days in the range read this day's Asia range (same as per-day path)
+            asia_session = sessions[3]
+            if self.table_name == "daily_features" and asia_session:
+                bisect.insort(atr_history, (trade_date, asia_session["high"] - asia_session["low"]))
+
+            rows.append(self._feature_row(trade_date, sessions, orbs, tradeables, rsi_at_0030, atr_20))
+        return rows
+
+    def _bulk_insert(self, rows: List[List]) -> None:
+        """Upsert many feature rows with one INSERT ... SELECT from a registered DataFrame."""
+        if not rows:
+            return
+
+        columns = _feature_columns()
+        col_list = ", ".join(columns)
+        frame = pd.DataFrame(rows, columns=columns)
+
+        self.con.register("bulk_features_df", frame)
+        try:
+            self._execute(
+                f"INSERT OR REPLACE INTO {self.table_name} ({col_list}) SELECT {col_list} FROM bulk_features_df"
+            )
+        finally:
+            self.con.unregister("bulk_features_df")
+        self.con.commit()
+
+    def build_features_bulk(self, start_date: date, end_date: date) -> int:
+        """
+        Rebuild [start_date, end_date] in month-sized chunks.
+
+        Each chunk loads bars_1m/bars_5m once and computes every session window,
+        ORB box, entry scan and outcome with array slices, then writes all of the
+        chunk's rows with a single bulk upsert. Output matches build_features
+        column for column.
+
+        Returns:
+            Number of rows written
+        """
+        atr_history = self._load_atr_history(start_date, end_date)
+        written = 0
+
+        for chunk_start, chunk_end in month_chunks(start_date, end_date):
+            rows = self._rows_from_components(self._chunk_components(chunk_start, chunk_end), atr_history)
+            self._bulk_insert(rows)
+            written += len(rows)
+            print(f"  [OK] {chunk_start} to {chunk_end}: {len(rows)} days")
+
+        return written
+
     def init_schema(self):
         self.con.execute(
             f"""
@@ -1265,6 +1294,70 @@ class FeatureBuilder:
         self.con.close()
 
 
+def _chunk_components_worker(db_path: str, sl_mode: str, table_name: str,
+                             chunk_start: date, chunk_end: date,
+                             bar_store_root: Optional[str] = None) -> List[Tuple]:
+    """Process-pool entry point: compute one chunk from a read-only connection."""
+    bar_store = BarStore(bar_store_root, symbol=SYMBOL) if bar_store_root else None
+    builder = FeatureBuilder(db_path=db_path, sl_mode=sl_mode, table_name=table_name, read_only=True,
+                             bar_store=bar_store)
+    try:
+        return builder._chunk_components(chunk_start, chunk_end)
+    finally:
+        builder.close()
+
+
+def build_features_parallel(start_date: date, end_date: date, workers: int,
+                            db_path: str = DB_PATH, sl_mode: str = "full",
+                            table_name: str = "daily_features",
+                            bar_store_root: Optional[str] = None) -> int:
+    """
+    Rebuild [start_date, end_date] across `workers` processes (two-pass schedule).
+
+    Pass 1: month chunks are computed in parallel, each worker on its own
+            read-only connection. ATR is NOT computed here - it reads the previous
+            20 days' Asia ranges, which may belong to another worker's chunk.
+    Pass 2: a single writer walks the chunks in date order, resolves ATR and the
+            ATR-dependent type codes from the in-memory history, and upserts one
+            batch per chunk.
+
+    DuckDB allows many read-only processes OR one writer on a file, so the writer
+    only connects once all workers have finished. The caller must not hold an
+    open connection to db_path. With bar_store_root, workers read bars_1m from
+    the memory-mapped bar store (pipeline/bar_store.py) instead.
+
+    Returns:
+        Number of rows written
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = month_chunks(start_date, end_date)
+    print(f"Pass 1: {len(chunks)} chunks across {workers} workers")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_chunk_components_worker, db_path, sl_mode, table_name, chunk_start, chunk_end,
+                        bar_store_root)
+            for chunk_start, chunk_end in chunks
+        ]
+        components = [future.result() for future in futures]
+
+    print("Pass 2: resolving ATR and writing")
+    writer = FeatureBuilder(db_path=db_path, sl_mode=sl_mode, table_name=table_name)
+    written = 0
+    try:
+        atr_history = writer._load_atr_history(start_date, end_date)
+        for (chunk_start, chunk_end), chunk in zip(chunks, components):
+            rows = writer._rows_from_components(chunk, atr_history)
+            writer._bulk_insert(rows)
+            written += len(rows)
+            print(f"  [OK] {chunk_start} to {chunk_end}: {len(rows)} days")
+    finally:
+        writer.close()
+
+    return written
+
+
 def main():
     import argparse
 
@@ -1273,6 +1366,12 @@ def main():
     parser.add_argument("end_date", type=str, nargs="?", default=None, help="End date (YYYY-MM-DD), optional")
     parser.add_argument("--sl-mode", type=str, choices=["full", "half"], default="full",
                         help="Stop loss mode: 'full' (opposite edge) or 'half' (midpoint)")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Load bars once per month and write each month with one bulk insert")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Compute month chunks in N processes (implies bulk writes)")
+    parser.add_argument("--bar-store", type=str, default=None,
+                        help="Read bars_1m from this bar store (python pipeline/bar_store.py sync first)")
 
     args = parser.parse_args()
 
@@ -1286,18 +1385,36 @@ def main():
     print(f"Building features: {start_date} to {end_date}")
     print(f"SL mode: {sl_mode}")
     print(f"Target table: {table_name}")
+    if args.workers > 1:
+        mode = f"parallel ({args.workers} workers)"
+    else:
+        mode = "bulk" if args.bulk else "per-day"
+    print(f"Mode: {mode}")
     print()
 
-    builder = FeatureBuilder(sl_mode=sl_mode, table_name=table_name)
+    bar_store = BarStore(args.bar_store, symbol=SYMBOL) if args.bar_store else None
+    builder = FeatureBuilder(sl_mode=sl_mode, table_name=table_name, bar_store=bar_store)
     builder.init_schema()
 
     # Guardrail: Ensure all required columns exist (auto-migrate if needed)
     builder._ensure_schema_columns(auto_migrate=True)
 
-    cur = start_date
-    while cur <= end_date:
-        builder.build_features(cur)
-        cur += timedelta(days=1)
+    if args.workers > 1:
+        # Workers need read-only access to the file, so release the write connection
+        builder.close()
+        build_features_parallel(start_date, end_date, args.workers,
+                                db_path=DB_PATH, sl_mode=sl_mode, table_name=table_name,
+                                bar_store_root=args.bar_store)
+        print(f"\nCompleted: {start_date} to {end_date}")
+        return
+
+    if args.bulk:
+        builder.build_features_bulk(start_date, end_date)
+    else:
+        cur = start_date
+        while cur <= end_date:
+            builder.build_features(cur)
+            cur += timedelta(days=1)
 
     builder.close()
     print(f"\nCompleted: {start_date} to {end_date}")
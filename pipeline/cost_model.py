@@ -14,7 +14,11 @@ Based on:
 - COST_MODEL_MGC_TRADOVATE.txt (real broker costs)
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
 
 
 # =============================================================================
@@ -243,6 +247,35 @@ def check_minimum_viable_risk(
         )
 
 
+def minimum_viable_risk_mask(
+    stop_distance_points: ArrayLike,
+    point_value: ArrayLike,
+    total_friction: ArrayLike
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    INTEGRITY GATE over arrays: check_minimum_viable_risk for every element.
+
+    Args:
+        stop_distance_points: Stop distances in points (array or scalar)
+        point_value: Dollar value per point (array or scalar)
+        total_friction: Total transaction costs, round-trip (array or scalar)
+
+    Returns:
+        (is_viable, cost_ratio) arrays, broadcast together:
+            - is_viable: False where check_minimum_viable_risk rejects (NaN stops too)
+            - cost_ratio: as check_minimum_viable_risk returns it (0.0 for invalid inputs)
+    """
+    stop, pv, friction = np.broadcast_arrays(
+        np.asarray(stop_distance_points, dtype=float),
+        np.asarray(point_value, dtype=float),
+        np.asarray(total_friction, dtype=float),
+    )
+    valid = (stop > 0) & (pv > 0) & (friction >= 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cost_ratio = np.where(valid, friction / (stop * pv), 0.0)
+    return valid & ~(cost_ratio > MINIMUM_VIABLE_RISK_THRESHOLD), cost_ratio
+
+
 # =============================================================================
 # CORE FUNCTIONS
 # =============================================================================
@@ -336,6 +369,72 @@ def get_cost_model(instrument: str, stress_level: str = 'normal') -> Dict:
     return cost_model
 
 
+def calculate_realized_rr_array(
+    instrument: str,
+    stop_distance_points: ArrayLike,
+    rr_theoretical: ArrayLike,
+    stress_level: Union[str, np.ndarray] = 'normal'
+) -> Dict[str, np.ndarray]:
+    """
+    Realized RR for arrays of trades in one call (same formulas as calculate_realized_rr).
+
+    Stop distances, RR targets and stress levels broadcast against each other;
+    the instrument and every distinct stress level are validated once.
+
+    Args:
+        instrument: 'MGC', 'NQ', or 'MPL'
+        stop_distance_points: Stop distances in points
+        rr_theoretical: Target RR ratios
+        stress_level: Stress level name(s): 'normal', 'moderate', 'severe', 'extreme'
+
+    Returns:
+        dict of arrays:
+            - realized_rr: Realized RR, NaN where calculate_realized_rr would raise
+              (stop <= 0, rr <= 0, or rejected by the integrity gate)
+            - realized_risk_dollars: Risk in dollars (including costs)
+            - realized_reward_dollars: Reward in dollars (net of costs)
+            - target_points: Target distance (rr x stop)
+            - total_friction: Friction applied (per stress level)
+            - cost_ratio, viable: minimum_viable_risk_mask results
+
+    Raises:
+        ValueError if instrument blocked or a stress level is invalid
+    """
+    specs = get_instrument_specs(instrument)
+    point_value = specs['point_value']
+
+    levels = np.asarray(stress_level)
+    names, inverse = np.unique(levels.ravel(), return_inverse=True)
+    frictions = np.array([get_cost_model(instrument, str(name))['total_friction'] for name in names])
+
+    stop, rr, friction = np.broadcast_arrays(
+        np.asarray(stop_distance_points, dtype=float),
+        np.asarray(rr_theoretical, dtype=float),
+        frictions[inverse].reshape(levels.shape),
+    )
+    viable, cost_ratio = minimum_viable_risk_mask(stop, point_value, friction)
+
+    # CANONICAL LOGIC: Costs embedded in risk/reward
+    target_distance_points = rr * stop
+    realized_risk_dollars = (stop * point_value) + friction
+    realized_reward_dollars = (target_distance_points * point_value) - friction
+
+    # Reward at or below zero (costs exceed target): edge fails immediately
+    with np.errstate(invalid="ignore", divide="ignore"):
+        realized_rr = np.where(realized_reward_dollars <= 0, 0.0, realized_reward_dollars / realized_risk_dollars)
+    realized_rr = np.where(viable & (rr > 0), realized_rr, np.nan)
+
+    return {
+        'realized_rr': realized_rr,
+        'realized_risk_dollars': realized_risk_dollars,
+        'realized_reward_dollars': realized_reward_dollars,
+        'target_points': target_distance_points,
+        'total_friction': friction,
+        'cost_ratio': cost_ratio,
+        'viable': viable,
+    }
+
+
 def calculate_realized_rr(
     instrument: str,
     stop_distance_points: float,
@@ -353,6 +452,9 @@ def calculate_realized_rr(
     Costs INCREASE risk (added to stop).
     Costs REDUCE reward (subtracted from target).
 
+    Single-trade wrapper around calculate_realized_rr_array; use the array
+    form in loops.
+
     Args:
         instrument: 'MGC', 'NQ', or 'MPL'
         stop_distance_points: Stop distance in points (e.g., ORB size)
@@ -383,43 +485,28 @@ def calculate_realized_rr(
     if rr_theoretical <= 0:
         raise ValueError("rr_theoretical must be positive")
 
-    # Get specs and costs
-    specs = get_instrument_specs(instrument)
+    result = calculate_realized_rr_array(instrument, stop_distance_points, rr_theoretical, stress_level)
     costs = get_cost_model(instrument, stress_level)
 
-    point_value = specs['point_value']
-    total_friction = costs['total_friction']
-
     # INTEGRITY GATE (MANDATORY): Check minimum viable risk
     # Prevents mathematically impossible trades where costs dominate stop
-    is_viable, cost_ratio, gate_message = check_minimum_viable_risk(
-        stop_distance_points=stop_distance_points,
-        point_value=point_value,
-        total_friction=total_friction
-    )
-
-    if not is_viable:
+    if not result['viable']:
+        point_value = INSTRUMENT_SPECS[instrument]['point_value']
+        _, cost_ratio, gate_message = check_minimum_viable_risk(
+            stop_distance_points=stop_distance_points,
+            point_value=point_value,
+            total_friction=costs['total_friction']
+        )
         raise ValueError(
             f"INTEGRITY GATE REJECTION: {gate_message}\n"
             f"  Instrument: {instrument}\n"
             f"  Stop: {stop_distance_points:.3f} points (${stop_distance_points * point_value:.2f})\n"
-            f"  Costs: ${total_friction:.2f}\n"
+            f"  Costs: ${costs['total_friction']:.2f}\n"
             f"  Cost Ratio: {cost_ratio:.1%} (limit: {MINIMUM_VIABLE_RISK_THRESHOLD:.0%})\n"
             f"  Trade is mathematically unviable - edge destroyed by friction."
         )
 
-    # Target distance = RR × stop distance (theoretical)
-    target_distance_points = rr_theoretical * stop_distance_points
-
-    # CANONICAL LOGIC: Costs embedded in risk/reward
-    realized_risk_dollars = (stop_distance_points * point_value) + total_friction
-    realized_reward_dollars = (target_distance_points * point_value) - total_friction
-
-    # Handle edge case: reward becomes negative (costs exceed target)
-    if realized_reward_dollars <= 0:
-        realized_rr = 0.0  # Edge fails immediately
-    else:
-        realized_rr = realized_reward_dollars / realized_risk_dollars
+    realized_rr = float(result['realized_rr'])
 
     # Calculate deltas
     delta_rr = realized_rr - rr_theoretical
@@ -427,13 +514,13 @@ def calculate_realized_rr(
 
     return {
         'realized_rr': realized_rr,
-        'realized_risk_dollars': realized_risk_dollars,
-        'realized_reward_dollars': realized_reward_dollars,
+        'realized_risk_dollars': float(result['realized_risk_dollars']),
+        'realized_reward_dollars': float(result['realized_reward_dollars']),
         'theoretical_rr': rr_theoretical,
         'delta_rr': delta_rr,
         'delta_pct': delta_pct,
         'stop_points': stop_distance_points,
-        'target_points': target_distance_points,
+        'target_points': float(result['target_points']),
         'instrument': instrument,
         'stress_level': stress_level,
         'costs': costs
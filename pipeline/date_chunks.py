@@ -0,0 +1,23 @@
+"""
+Date Chunks - calendar-month splitting shared by the bulk pipeline jobs
+=======================================================================
+
+FeatureBuilder.build_features_bulk / build_features_parallel and
+populate_validated_trades (--bulk / --workers) load and write one calendar
+month at a time. Both split their date range here so chunk boundaries match.
+"""
+
+from datetime import date, timedelta
+from typing import List, Tuple
+
+
+def month_chunks(start_date: date, end_date: date) -> List[Tuple[date, date]]:
+    """Split [start_date, end_date] into calendar-month chunks."""
+    chunks = []
+    cur = start_date
+    while cur <= end_date:
+        next_month = date(cur.year + (cur.month == 12), cur.month % 12 + 1, 1)
+        chunk_end = min(end_date, next_month - timedelta(days=1))
+        chunks.append((cur, chunk_end))
+        cur = chunk_end + timedelta(days=1)
+    return chunks
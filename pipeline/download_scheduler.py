@@ -0,0 +1,227 @@
+"""
+Download Scheduler - concurrent chunked vendor downloads with a single DB writer
+================================================================================
+
+The backfills (backfill_databento_continuous.py, backfill_range.py) used to
+fetch one day per request in a serial loop. The scheduler splits the pending
+days into multi-day chunks and fetches them with bounded concurrency:
+
+- fetch:   a thread pool of `workers` threads calls fetch_chunk(days) for each
+           chunk, retrying with exponential backoff (per chunk, so one slow or
+           failing chunk never stalls the others)
+- write:   one writer thread applies write_chunk(days, download) in completion
+           order; DuckDB is only ever touched from that thread. The hand-off
+           queue is bounded, so downloads wait when the writer falls behind
+- resume:  after a chunk is written its days are added to a JSON checkpoint
+           file (atomic replace). A rerun skips checkpointed days; chunks that
+           failed are left out and fetched again next time. Only days whose
+           trading day (09:00 local -> next 09:00) has fully closed are
+           checkpointed, so today's partial day is fetched again on every run
+
+fetch_chunk returns a Download (bars + response bytes); write_chunk returns
+the rows it wrote. Progress and the final summary report bytes/sec and
+rows/sec.
+
+Usage:
+    scheduler = DownloadScheduler(fetch_chunk, write_chunk,
+                                  checkpoint_path="data/checkpoints/backfill_mgc.json",
+                                  workers=4, chunk_days=7)
+    stats = scheduler.run(days)     # DownloadStats
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Callable, Iterable, List, Optional, Set
+from zoneinfo import ZoneInfo
+
+CHECKPOINT_DIR = "data/checkpoints"
+TRADING_DAY_START_HOUR = 9  # trading day = 09:00 local -> next 09:00
+
+
+@dataclass
+class Download:
+    """One fetched chunk: whatever the writer needs, plus the bytes received."""
+    bars: Any
+    nbytes: int = 0
+
+
+@dataclass
+class DownloadStats:
+    chunks: int = 0
+    days: int = 0
+    skipped_days: int = 0
+    rows: int = 0
+    nbytes: int = 0
+    retries: int = 0
+    failed: List[List[date]] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.nbytes / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.rows} rows, {self.nbytes / 1e6:.1f} MB in {self.elapsed_sec:.1f}s "
+                f"({self.rows_per_sec:,.0f} rows/s, {self.bytes_per_sec / 1e6:.2f} MB/s) | "
+                f"{self.chunks} chunks, {self.days} days, {self.skipped_days} already done, "
+                f"{self.retries} retries, {len(self.failed)} failed chunks")
+
+
+class Checkpoint:
+    """Completed days of one backfill job, persisted as JSON."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.days: Set[date] = set()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.days = {date.fromisoformat(d) for d in json.load(f).get("completed", [])}
+
+    def __contains__(self, d: date) -> bool:
+        return d in self.days
+
+    def add(self, days: Iterable[date]) -> None:
+        self.days.update(days)
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"completed": sorted(d.isoformat() for d in self.days)}, f, indent=0)
+        os.replace(tmp, self.path)
+
+
+def checkpoint_path(job: str) -> str:
+    """Default checkpoint file for a job name such as 'databento_MGC'."""
+    return os.path.join(CHECKPOINT_DIR, f"backfill_{job}.json")
+
+
+def trading_day_closed(d: date, tz_name: str, now: Optional[datetime] = None) -> bool:
+    """True once trading day d (09:00 local -> next 09:00) has fully closed."""
+    close = datetime.combine(d + timedelta(days=1), dt_time(TRADING_DAY_START_HOUR), tzinfo=ZoneInfo(tz_name))
+    return (now or datetime.now(timezone.utc)) >= close
+
+
+def chunk_days(days: Iterable[date], size: int) -> List[List[date]]:
+    """Split days into runs of consecutive dates, each at most `size` long."""
+    chunks: List[List[date]] = []
+    for d in sorted(set(days)):
+        if chunks and len(chunks[-1]) < size and chunks[-1][-1] + timedelta(days=1) == d:
+            chunks[-1].append(d)
+        else:
+            chunks.append([d])
+    return chunks
+
+
+class DownloadScheduler:
+    def __init__(
+        self,
+        fetch_chunk: Callable[[List[date]], Download],
+        write_chunk: Callable[[List[date], Download], int],
+        checkpoint_path: Optional[str] = None,
+        workers: int = 4,
+        chunk_days: int = 7,
+        max_retries: int = 5,
+        backoff_sec: float = 2.0,
+        retryable: Callable[[Exception], bool] = lambda e: True,
+        tz_local: str = "Australia/Brisbane",
+        verbose: bool = True,
+    ):
+        self.fetch_chunk = fetch_chunk
+        self.write_chunk = write_chunk
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.workers = max(1, workers)
+        self.chunk_days = max(1, chunk_days)
+        self.max_retries = max(1, max_retries)
+        self.backoff_sec = backoff_sec
+        self.retryable = retryable
+        self.tz_local = tz_local
+        self.verbose = verbose
+        self._lock = threading.Lock()
+
+    def _fetch_with_retries(self, days: List[date], stats: DownloadStats) -> Download:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return self.fetch_chunk(days)
+            except Exception as e:
+                if attempt == self.max_retries or not self.retryable(e):
+                    raise
+                with self._lock:
+                    stats.retries += 1
+                time.sleep(self.backoff_sec * 2 ** (attempt - 1))
+        raise AssertionError("unreachable")
+
+    def run(self, days: Iterable[date]) -> DownloadStats:
+        """Fetch and write every day not yet in the checkpoint."""
+        days = sorted(set(days))
+        pending = [d for d in days if d not in self.checkpoint]
+        stats = DownloadStats(skipped_days=len(days) - len(pending))
+        chunks = chunk_days(pending, self.chunk_days)
+        started = time.perf_counter()
+
+        results: "queue.Queue" = queue.Queue(maxsize=2 * self.workers)
+        writer_error: List[BaseException] = []
+        stop = threading.Event()
+
+        def writer():
+            while True:
+                item = results.get()
+                if item is None:
+                    return
+                chunk, download = item
+                if stop.is_set():
+                    continue  # drain after a write failure
+                try:
+                    rows = self.write_chunk(chunk, download)
+                    # Days still trading can gain bars: leave them for the next run
+                    self.checkpoint.add(d for d in chunk if trading_day_closed(d, self.tz_local))
+                except BaseException as e:
+                    writer_error.append(e)
+                    stop.set()
+                    continue
+                stats.chunks += 1
+                stats.days += len(chunk)
+                stats.rows += rows
+                stats.nbytes += download.nbytes
+                if self.verbose:
+                    elapsed = time.perf_counter() - started
+                    print(f"  [OK] {chunk[0]} -> {chunk[-1]}: {rows} rows, {download.nbytes / 1e3:.0f} KB "
+                          f"({stats.rows / elapsed:,.0f} rows/s, {stats.nbytes / elapsed / 1e6:.2f} MB/s)")
+
+        def fetch(chunk: List[date]) -> None:
+            if stop.is_set():
+                return
+            try:
+                download = self._fetch_with_retries(chunk, stats)
+            except Exception as e:
+                with self._lock:
+                    stats.failed.append(chunk)
+                if self.verbose:
+                    print(f"  [FAIL] {chunk[0]} -> {chunk[-1]}: {e}")
+                return
+            results.put((chunk, download))
+
+        writer_thread = threading.Thread(target=writer, name="download-writer", daemon=True)
+        writer_thread.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="download") as pool:
+                list(pool.map(fetch, chunks))
+        finally:
+            results.put(None)
+            writer_thread.join()
+
+        stats.failed.sort()
+        stats.elapsed_sec = time.perf_counter() - started
+        if writer_error:
+            raise writer_error[0]
+        return stats
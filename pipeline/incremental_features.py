@@ -0,0 +1,495 @@
+# incremental_features.py
+"""
+Incremental Feature Maintenance - recompute only what new bars invalidated
+==========================================================================
+
+Backfills (upsert_bars_frame in ingest_dbn.py, used by backfill_range.py
+and backfill_databento_continuous*.py) record the exact UTC range of bars they
+wrote in bar_change_log. This module turns pending log entries into the minimal
+set of daily_features cells to recompute, instead of re-running the builder
+over whole date spans.
+
+Invalidation rules (trade date D reads bars D 07:00 -> D+1 09:00 local):
+- SESSION  stats are invalid if the change overlaps that session's window
+- ORB      results are invalid if the change lands in [ORB start, D+1 09:00),
+           because every ORB scans for its exit until the next Asia open
+- RSI      (rsi_at_0030) is invalid if the change overlaps the 5m bars it reads,
+           including the 1m bars aggregated into the 00:30 bucket itself
+- ATR      atr_20 of every later date up to the 20th later Asia session reads
+           the Asia range of D, so an Asia change invalidates their atr_20 and
+           type codes
+
+Rows that do not exist yet (gap fill) are inserted in full. Existing rows only
+have the invalidated columns updated. Dates are processed in ascending order
+so atr_20 always reads already-updated Asia ranges.
+
+Applied state is tracked per features table (applied_at for daily_features,
+applied_half_at for daily_features_half). calculate_atr always reads
+daily_features, so a --sl-mode half run first applies pending changes to
+daily_features and only then rewrites daily_features_half.
+
+Usage:
+  python pipeline/incremental_features.py --dry-run   # report, change nothing
+  python pipeline/incremental_features.py             # apply pending changes
+  python pipeline/incremental_features.py --sl-mode half
+"""
+
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.build_daily_features import (
+    DB_PATH, FEATURE_INSERT_SQL, ORB_TIMES, RSI_LEN, SESSION_WINDOWS, SYMBOL, TZ_LOCAL, TZ_UTC,
+    FeatureBuilder, _dt_local, _feature_columns, session_bounds,
+)
+
+# Sessions whose stats feed the deterministic type codes
+TYPE_CODE_SESSIONS = {"asia", "london", "pre_ny"}
+TYPE_CODE_COLUMNS = ["asia_type_code", "london_type_code", "pre_ny_type_code"]
+
+ATR_LOOKBACK_ROWS = 20
+
+# bars_5m buckets are labelled by their start; the 00:30 bucket holds 1m bars up to 00:34
+RSI_BUCKET = timedelta(minutes=5)
+
+# Features table -> bar_change_log column recording when a change was applied to it
+APPLIED_COLUMNS = {
+    "daily_features": "applied_at",
+    "daily_features_half": "applied_half_at",
+}
+
+CHANGE_LOG_SCHEMA_SQL = """
+    CREATE SEQUENCE IF NOT EXISTS bar_change_log_seq;
+    CREATE TABLE IF NOT EXISTS bar_change_log (
+        change_id BIGINT PRIMARY KEY DEFAULT nextval('bar_change_log_seq'),
+        symbol VARCHAR NOT NULL,
+        bars_table VARCHAR NOT NULL,
+        source VARCHAR,
+        first_ts_utc TIMESTAMPTZ NOT NULL,
+        last_ts_utc TIMESTAMPTZ NOT NULL,
+        row_count INTEGER NOT NULL,
+        recorded_at TIMESTAMPTZ DEFAULT current_timestamp,
+        applied_at TIMESTAMPTZ,
+        applied_half_at TIMESTAMPTZ
+    );
+    ALTER TABLE bar_change_log ADD COLUMN IF NOT EXISTS applied_half_at TIMESTAMPTZ;
+"""
+
+
+@dataclass
+class BarChange:
+    """One backfill write: bars [first_ts_utc, last_ts_utc] (inclusive) were upserted."""
+    change_id: int
+    symbol: str
+    bars_table: str
+    source: Optional[str]
+    first_ts_utc: datetime
+    last_ts_utc: datetime
+    row_count: int
+
+
+@dataclass
+class DateInvalidation:
+    """What must be recomputed for one trade date."""
+    trade_date: date
+    sessions: Set[str] = field(default_factory=set)
+    orbs: Set[str] = field(default_factory=set)
+    rsi: bool = False
+    atr: bool = False  # atr_20 dependent of an earlier Asia change
+
+    def merge(self, other: "DateInvalidation") -> None:
+        self.sessions |= other.sessions
+        self.orbs |= other.orbs
+        self.rsi = self.rsi or other.rsi
+        self.atr = self.atr or other.atr
+
+    def columns(self) -> List[str]:
+        """Feature columns to rewrite, in FEATURE_INSERT_SQL order."""
+        wanted = set()
+        for name, _, _ in SESSION_WINDOWS:
+            if name in self.sessions:
+                wanted |= {f"{name}_high", f"{name}_low", f"{name}_range"}
+        if self.atr or self.sessions & TYPE_CODE_SESSIONS:
+            wanted |= set(TYPE_CODE_COLUMNS)
+        for orb_name in self.orbs:
+            wanted |= {c for c in _feature_columns() if c.startswith(f"orb_{orb_name}_")}
+        if self.rsi:
+            wanted |= {"rsi_at_0030", "rsi_at_orb"}
+        if self.atr:
+            wanted.add("atr_20")
+        return [c for c in _feature_columns() if c in wanted]
+
+
+# ---------- change log ----------
+
+def ensure_change_log(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(CHANGE_LOG_SCHEMA_SQL)
+
+
+def _table_exists(con: duckdb.DuckDBPyConnection, table_name: str) -> bool:
+    return con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?", [table_name]
+    ).fetchone()[0] > 0
+
+
+def _applied_column(table_name: str) -> str:
+    if table_name not in APPLIED_COLUMNS:
+        raise ValueError(f"No change log tracking for features table {table_name!r}")
+    return APPLIED_COLUMNS[table_name]
+
+
+def _as_utc(ts) -> datetime:
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=TZ_UTC)
+    return ts.astimezone(TZ_UTC)
+
+
+def record_bar_change(con: duckdb.DuckDBPyConnection, symbol: str, timestamps: Iterable,
+                      source: Optional[str] = None, bars_table: str = "bars_1m",
+                      row_count: Optional[int] = None) -> Optional[int]:
+    """
+    Record the UTC range of bars an upsert just wrote.
+
+    timestamps: the ts_utc values written (ISO strings or aware datetimes).
+    row_count: rows written, when timestamps is only the first and last ts
+               (bulk writers); defaults to len(timestamps).
+    Returns the change_id, or None if nothing was written.
+    """
+    parsed = [_as_utc(ts) for ts in timestamps]
+    if not parsed:
+        return None
+
+    ensure_change_log(con)
+    row = con.execute(
+        """
+        INSERT INTO bar_change_log (symbol, bars_table, source, first_ts_utc, last_ts_utc, row_count)
+        VALUES (?, ?, ?, ?, ?, ?)
+        RETURNING change_id
+        """,
+        [symbol, bars_table, source, min(parsed), max(parsed), row_count or len(parsed)],
+    ).fetchone()
+    return row[0]
+
+
+def pending_changes(con: duckdb.DuckDBPyConnection, symbol: str = SYMBOL,
+                    bars_table: str = "bars_1m",
+                    features_table: str = "daily_features") -> List[BarChange]:
+    """Changes not yet applied to features_table. Read-only: a missing log means none."""
+    applied_column = _applied_column(features_table)
+    if not _table_exists(con, "bar_change_log"):
+        return []
+    columns = {r[0] for r in con.execute(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = 'bar_change_log'"
+    ).fetchall()}
+    if applied_column not in columns:
+        # Log predates per-table tracking: nothing has been applied to this table yet
+        applied_filter = "TRUE"
+    else:
+        applied_filter = f"{applied_column} IS NULL"
+    rows = con.execute(
+        f"""
+        SELECT change_id, symbol, bars_table, source, first_ts_utc, last_ts_utc, row_count
+        FROM bar_change_log
+        WHERE {applied_filter}
+          AND symbol = ?
+          AND bars_table = ?
+        ORDER BY change_id
+        """,
+        [symbol, bars_table],
+    ).fetchall()
+    return [
+        BarChange(cid, sym, tbl, src, _as_utc(first), _as_utc(last), n)
+        for cid, sym, tbl, src, first, last, n in rows
+    ]
+
+
+def mark_applied(con: duckdb.DuckDBPyConnection, changes: List[BarChange],
+                 features_table: str = "daily_features") -> None:
+    applied_column = _applied_column(features_table)
+    if not changes:
+        return
+    ensure_change_log(con)
+    placeholders = ", ".join(["?"] * len(changes))
+    con.execute(
+        f"UPDATE bar_change_log SET {applied_column} = current_timestamp "
+        f"WHERE change_id IN ({placeholders})",
+        [c.change_id for c in changes],
+    )
+
+
+# ---------- invalidation planning ----------
+
+def _overlaps(first: datetime, last: datetime, start: datetime, end: datetime) -> bool:
+    """Inclusive bar range [first, last] vs half-open window [start, end)."""
+    return first < end and last >= start
+
+
+def invalidations_for_range(first_ts_utc: datetime, last_ts_utc: datetime) -> Dict[date, DateInvalidation]:
+    """
+    Sessions and ORBs invalidated by bars written in [first_ts_utc, last_ts_utc].
+
+    Pure time arithmetic; RSI and ATR dependents need the database (see plan_invalidations).
+    """
+    first_local = first_ts_utc.astimezone(TZ_LOCAL)
+    last_local = last_ts_utc.astimezone(TZ_LOCAL)
+
+    plan: Dict[date, DateInvalidation] = {}
+    d = first_local.date() - timedelta(days=1)
+    while d <= last_local.date():
+        window_start = _dt_local(d, 7, 0)
+        window_end = _dt_local(d + timedelta(days=1), 9, 0)
+        if _overlaps(first_local, last_local, window_start, window_end):
+            inv = DateInvalidation(d)
+            for name, _, _ in SESSION_WINDOWS:
+                if _overlaps(first_local, last_local, *session_bounds(d, name)):
+                    inv.sessions.add(name)
+            for orb_name, hh, mm, day_offset in ORB_TIMES:
+                orb_start = _dt_local(d + timedelta(days=day_offset), hh, mm)
+                if _overlaps(first_local, last_local, orb_start, window_end):
+                    inv.orbs.add(orb_name)
+            plan[d] = inv
+        d += timedelta(days=1)
+    return plan
+
+
+def _rsi_window_start(con: duckdb.DuckDBPyConnection, at_local: datetime) -> Optional[datetime]:
+    """Timestamp of the oldest 5m bar calculate_rsi_at reads for at_local."""
+    row = con.execute(
+        f"""
+        SELECT MIN(ts_utc) FROM (
+            SELECT ts_utc FROM bars_5m
+            WHERE symbol = ? AND ts_utc <= ?
+            ORDER BY ts_utc DESC
+            LIMIT {RSI_LEN + 1}
+        )
+        """,
+        [SYMBOL, at_local.astimezone(TZ_UTC)],
+    ).fetchone()
+    return _as_utc(row[0]) if row and row[0] is not None else None
+
+
+def _atr_dependents(con: duckdb.DuckDBPyConnection, trade_date: date) -> List[date]:
+    """
+    Dates whose atr_20 window includes trade_date (calculate_atr reads daily_features).
+
+    Every date (weekends too) gets an atr_20 from the 20 Asia rows before it, so the
+    dependents are all dates up to and including the 20th later Asia row.
+    """
+    if not _table_exists(con, "daily_features"):
+        return []
+    rows = con.execute(
+        f"""
+        WITH next_asia AS (
+            SELECT date_local
+            FROM daily_features
+            WHERE date_local > ?
+              AND asia_high IS NOT NULL
+            ORDER BY date_local
+            LIMIT {ATR_LOOKBACK_ROWS}
+        )
+        SELECT DISTINCT date_local
+        FROM daily_features
+        WHERE date_local > ?
+          AND (
+            (SELECT COUNT(*) FROM next_asia) < {ATR_LOOKBACK_ROWS}
+            OR date_local <= (SELECT MAX(date_local) FROM next_asia)
+          )
+        ORDER BY date_local
+        """,
+        [trade_date, trade_date],
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def plan_invalidations(con: duckdb.DuckDBPyConnection, changes: List[BarChange]) -> Dict[date, DateInvalidation]:
+    """Merge every pending change into one per-date recompute plan."""
+    plan: Dict[date, DateInvalidation] = {}
+
+    def add(inv: DateInvalidation) -> None:
+        if inv.trade_date in plan:
+            plan[inv.trade_date].merge(inv)
+        else:
+            plan[inv.trade_date] = inv
+
+    for change in changes:
+        for inv in invalidations_for_range(change.first_ts_utc, change.last_ts_utc).values():
+            add(inv)
+
+        # rsi_at_0030 reads the last RSI_LEN+1 5m bars at D+1 00:30 (further back over gaps);
+        # the newest of them is the 00:30 bucket, built from 1m bars up to 00:34
+        d = change.first_ts_utc.astimezone(TZ_LOCAL).date() - timedelta(days=1)
+        while d <= change.last_ts_utc.astimezone(TZ_LOCAL).date() + timedelta(days=1):
+            at_local = _dt_local(d + timedelta(days=1), 0, 30)
+            rsi_start = _rsi_window_start(con, at_local)
+            if (rsi_start is not None and change.first_ts_utc < at_local + RSI_BUCKET
+                    and change.last_ts_utc >= rsi_start):
+                add(DateInvalidation(d, rsi=True))
+            d += timedelta(days=1)
+
+    for trade_date in sorted(d for d, inv in plan.items() if "asia" in inv.sessions):
+        for dependent in _atr_dependents(con, trade_date):
+            add(DateInvalidation(dependent, atr=True))
+
+    return plan
+
+
+def format_plan_report(changes: List[BarChange], plan: Dict[date, DateInvalidation]) -> str:
+    lines = [f"Pending bar changes: {len(changes)}"]
+    for c in changes:
+        lines.append(
+            f"  #{c.change_id} {c.symbol} {c.bars_table} "
+            f"{c.first_ts_utc:%Y-%m-%d %H:%M}Z -> {c.last_ts_utc:%Y-%m-%d %H:%M}Z "
+            f"({c.row_count} rows, {c.source or 'unknown'})"
+        )
+
+    lines.append(f"Invalidated trade dates: {len(plan)}")
+    orb_order = [name for name, _, _, _ in ORB_TIMES]
+    session_order = [name for name, _, _ in SESSION_WINDOWS]
+    for d in sorted(plan):
+        inv = plan[d]
+        parts = []
+        if inv.sessions:
+            parts.append("sessions=" + ",".join(s for s in session_order if s in inv.sessions))
+        if inv.orbs:
+            parts.append("orbs=" + ",".join(o for o in orb_order if o in inv.orbs))
+        if inv.rsi:
+            parts.append("rsi")
+        if inv.atr:
+            parts.append("atr/type-codes")
+        lines.append(f"  {d}  {'  '.join(parts)}  ({len(inv.columns())} columns)")
+    return "\n".join(lines)
+
+
+# ---------- apply ----------
+
+def _existing_dates(builder: FeatureBuilder, dates: List[date]) -> Set[date]:
+    if not dates:
+        return set()
+    rows = builder.con.execute(
+        f"""
+        SELECT date_local FROM {builder.table_name}
+        WHERE instrument = ? AND date_local BETWEEN ? AND ?
+        """,
+        [SYMBOL, min(dates), max(dates)],
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
+def _atr_only_values(builder: FeatureBuilder, trade_date: date) -> Dict:
+    """atr_20 and type codes for a date whose bars did not change (no bar window load)."""
+    asia_high, asia_low, asia_range, london_high, london_low, pre_ny_high, pre_ny_low = builder.con.execute(
+        f"""
+        SELECT asia_high, asia_low, asia_range, london_high, london_low, pre_ny_high, pre_ny_low
+        FROM {builder.table_name}
+        WHERE date_local = ? AND instrument = ?
+        """,
+        [trade_date, SYMBOL],
+    ).fetchone()
+    atr_20 = builder.calculate_atr(trade_date)
+    return {
+        "asia_type_code": builder.classify_asia_code(asia_range, atr_20),
+        "london_type_code": builder.classify_london_code(london_high, london_low, asia_high, asia_low),
+        "pre_ny_type_code": builder.classify_pre_ny_code(
+            pre_ny_high, pre_ny_low, london_high, london_low, asia_high, asia_low, atr_20
+        ),
+        "atr_20": atr_20,
+    }
+
+
+def apply_invalidations(builder: FeatureBuilder, plan: Dict[date, DateInvalidation]) -> Dict[str, int]:
+    """Recompute the planned cells. Returns counts of inserted / updated rows."""
+    dates = sorted(plan)
+    existing = _existing_dates(builder, dates)
+    columns = _feature_columns()
+    counts = {"inserted": 0, "updated": 0}
+
+    for d in dates:
+        inv = plan[d]
+        if d not in existing:
+            row = builder.compute_feature_row(d)
+            placeholders = ", ".join(["?"] * len(row))
+            builder._execute(
+                FEATURE_INSERT_SQL.format(table_name=builder.table_name) + f"({placeholders})", row
+            )
+            counts["inserted"] += 1
+            continue
+
+        if inv.sessions or inv.orbs or inv.rsi:
+            values = dict(zip(columns, builder.compute_feature_row(d)))
+        else:
+            values = _atr_only_values(builder, d)
+
+        targets = inv.columns()
+        assignments = ", ".join(f"{c} = ?" for c in targets)
+        builder._execute(
+            f"UPDATE {builder.table_name} SET {assignments} WHERE date_local = ? AND instrument = ?",
+            [values[c] for c in targets] + [d, SYMBOL],
+        )
+        counts["updated"] += 1
+
+    builder.con.commit()
+    return counts
+
+
+def update_features_incremental(db_path: str = DB_PATH, sl_mode: str = "full",
+                                dry_run: bool = False) -> Dict[date, DateInvalidation]:
+    """
+    Apply every pending bar change to the features table.
+
+    A half-SL run first brings daily_features up to date, because atr_20 and
+    the type codes of both tables are computed from daily_features Asia ranges.
+
+    With dry_run=True prints the invalidation report from a read-only
+    connection and leaves the database (including the pending change log) untouched.
+    """
+    table_name = "daily_features_half" if sl_mode == "half" else "daily_features"
+    if table_name != "daily_features" and not dry_run:
+        update_features_incremental(db_path=db_path, sl_mode="full")
+
+    builder = FeatureBuilder(db_path=db_path, sl_mode=sl_mode, table_name=table_name, read_only=dry_run)
+    try:
+        if not dry_run:
+            builder.init_schema()
+            builder._ensure_schema_columns(auto_migrate=True)
+
+        changes = pending_changes(builder.con, features_table=table_name)
+        plan = plan_invalidations(builder.con, changes)
+        print(format_plan_report(changes, plan))
+
+        if dry_run:
+            print("\n[DRY RUN] No features rewritten")
+            return plan
+
+        counts = apply_invalidations(builder, plan)
+        mark_applied(builder.con, changes, features_table=table_name)
+        builder.con.commit()
+        print(f"\n[OK] {counts['inserted']} rows inserted, {counts['updated']} rows updated "
+              f"in {table_name} ({builder.db_round_trips} DB round trips)")
+        return plan
+    finally:
+        builder.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recompute features invalidated by newly ingested bars")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report which dates and ORBs would be recomputed, change nothing")
+    parser.add_argument("--sl-mode", type=str, choices=["full", "half"], default="full",
+                        help="Stop loss mode: 'full' (daily_features) or 'half' (daily_features_half)")
+    parser.add_argument("--db", type=str, default=DB_PATH, help="DuckDB path")
+    args = parser.parse_args()
+
+    update_features_incremental(db_path=args.db, sl_mode=args.sl_mode, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
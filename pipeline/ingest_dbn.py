@@ -0,0 +1,314 @@
+"""
+Offline DBN Ingestion - bulk load local Databento files into the bars tables
+============================================================================
+
+backfill_databento_continuous*.py download bars from the vendor API. This
+loader reads already downloaded .dbn / .dbn.zst files instead (the dbn/ folder
+inspected by inspect_dbn.py and check_dbn_symbols.py) and keeps every step
+columnar:
+
+- front contract: per trade day (09:00 -> 09:00 local, as the backfills use),
+  the outright with the most volume; spreads ('-' in the symbol) are ignored.
+  Ties go to the alphabetically first contract. One groupby over the file.
+- 1m upsert: one trade month at a time, the DataFrame is registered with
+  DuckDB and written with a single INSERT OR REPLACE ... SELECT.
+- 5m rebuild: once per contiguous range touched, after all months are in.
+
+Files are read in name order (Databento names carry the date range). The
+last trade month of each file is held back and merged with the next file, so
+a day split across two files still gets a single front contract and each
+month is written once. Files must not overlap; rerunning a folder is safe
+(upserts are idempotent).
+
+Each month write is recorded in bar_change_log, so bars_1m ingests are
+followed by update_features_incremental() unless --skip-features is given.
+
+Usage:
+    python pipeline/ingest_dbn.py dbn                                  # bars_1m / MGC
+    python pipeline/ingest_dbn.py dbn --table bars_1m_nq --symbol NQ
+    python pipeline/ingest_dbn.py dbn/glbx-mdp3-20251201-20251219.ohlcv-1m.dbn.zst
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.incremental_features import record_bar_change, update_features_incremental
+
+DB_PATH = "data/db/gold.db"
+DBN_DIR = "dbn"
+SYMBOL = "MGC"
+TZ_LOCAL = "Australia/Brisbane"
+
+BARS_TABLES = ("bars_1m", "bars_1m_nq", "bars_1m_mpl")
+BAR_COLUMNS = ["ts_utc", "source_symbol", "open", "high", "low", "close", "volume"]
+
+# Trade day used for the front-contract pick (matches local_day_to_utc_window)
+TRADE_DAY_START = pd.Timedelta(hours=9)
+# Touched ranges closer than this are rebuilt as one 5m range
+REBUILD_MERGE_GAP = timedelta(days=7)
+
+BARS_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        ts_utc TIMESTAMPTZ NOT NULL,
+        symbol VARCHAR NOT NULL,
+        source_symbol VARCHAR,
+        open DOUBLE,
+        high DOUBLE,
+        low DOUBLE,
+        close DOUBLE,
+        volume BIGINT,
+        PRIMARY KEY (symbol, ts_utc)
+    );
+"""
+
+
+def bars_5m_table(table_1m: str) -> str:
+    """bars_1m -> bars_5m, bars_1m_nq -> bars_5m_nq, bars_1m_mpl -> bars_5m_mpl."""
+    if table_1m not in BARS_TABLES:
+        raise ValueError(f"Unknown bars table {table_1m!r} (expected one of {', '.join(BARS_TABLES)})")
+    return table_1m.replace("_1m", "_5m", 1)
+
+
+def dbn_files(path: str) -> List[Path]:
+    """A single file, or every .dbn / .dbn.zst file in a folder, in name order."""
+    p = Path(path)
+    if p.is_file():
+        return [p]
+    return sorted(f for f in p.iterdir() if f.name.endswith((".dbn", ".dbn.zst")))
+
+
+def read_dbn(path: Path) -> pd.DataFrame:
+    """
+    One ohlcv-1m DBN file as a DataFrame: ts_utc (aware UTC), symbol, open, high, low, close, volume.
+
+    Prices come back as floats (DBNStore.to_df's default price_type).
+    """
+    import databento as db
+
+    store = db.DBNStore.from_file(str(path))
+    if not str(store.schema).startswith("ohlcv-1m"):
+        raise ValueError(f"{path.name}: expected ohlcv-1m records, got {store.schema}")
+    df = store.to_df().reset_index()
+    df = df.rename(columns={"ts_event": "ts_utc"})
+    return df[["ts_utc", "symbol", "open", "high", "low", "close", "volume"]]
+
+
+def _outrights(raw: pd.DataFrame, tz_local: str) -> pd.DataFrame:
+    """Outright contract bars with their trade day, duplicates (same contract and minute) dropped."""
+    df = raw[~raw["symbol"].astype(str).str.contains("-", regex=False)]
+    df = df.assign(
+        symbol=df["symbol"].astype(str),
+        trade_day=(df["ts_utc"].dt.tz_convert(tz_local).dt.tz_localize(None) - TRADE_DAY_START).dt.floor("D"),
+    )
+    return df.drop_duplicates(["symbol", "ts_utc"], keep="last")
+
+
+def front_contract_bars(raw: pd.DataFrame, tz_local: str = TZ_LOCAL) -> pd.DataFrame:
+    """
+    Bars of each trade day's front (highest-volume outright) contract.
+
+    Returns BAR_COLUMNS plus trade_day (naive datetime64, local date), sorted by ts_utc.
+    """
+    return _front_of(_outrights(raw, tz_local))
+
+
+def _front_of(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS + ["trade_day"])
+    volume = df.groupby(["trade_day", "symbol"], sort=False)["volume"].sum().reset_index()
+    front = (
+        volume.sort_values(["trade_day", "volume", "symbol"], ascending=[True, False, True])
+        .drop_duplicates("trade_day")[["trade_day", "symbol"]]
+    )
+    bars = df.merge(front, on=["trade_day", "symbol"])
+    bars = bars.rename(columns={"symbol": "source_symbol"}).sort_values("ts_utc", ignore_index=True)
+    return bars[BAR_COLUMNS + ["trade_day"]]
+
+
+def upsert_bars_frame(con: duckdb.DuckDBPyConnection, bars: pd.DataFrame, symbol: str,
+                      table: str = "bars_1m", source: str = "databento") -> int:
+    """
+    Upsert a frame of BAR_COLUMNS into a 1m bars table as `symbol`, in one statement.
+
+    The write is recorded in bar_change_log for incremental feature maintenance.
+    """
+    if bars.empty:
+        return 0
+    con.register("_ingest_bars", bars[BAR_COLUMNS])
+    try:
+        con.execute(
+            f"""
+            INSERT OR REPLACE INTO {table}
+            (ts_utc, symbol, source_symbol, open, high, low, close, volume)
+            SELECT ts_utc, ?, source_symbol, open, high, low, close, volume
+            FROM _ingest_bars
+            """,
+            [symbol],
+        )
+    finally:
+        con.unregister("_ingest_bars")
+    first, last = bars["ts_utc"].min(), bars["ts_utc"].max()
+    record_bar_change(con, symbol, [first.to_pydatetime(), last.to_pydatetime()],
+                      source=source, bars_table=table, row_count=len(bars))
+    return len(bars)
+
+
+def rebuild_5m_range(con: duckdb.DuckDBPyConnection, symbol: str, start_utc: datetime,
+                     end_utc: datetime, table: str = "bars_1m") -> None:
+    """Replace the 5m bars in [start_utc, end_utc) with aggregates of the 1m table."""
+    table_5m = bars_5m_table(table)
+    con.execute(
+        f"""
+        DELETE FROM {table_5m}
+        WHERE symbol = ?
+          AND ts_utc >= CAST(? AS TIMESTAMPTZ)
+          AND ts_utc <  CAST(? AS TIMESTAMPTZ)
+        """,
+        [symbol, start_utc, end_utc],
+    )
+    con.execute(
+        f"""
+        INSERT INTO {table_5m} (ts_utc, symbol, source_symbol, open, high, low, close, volume)
+        SELECT
+            CAST(to_timestamp(floor(epoch(ts_utc) / 300) * 300) AS TIMESTAMPTZ) AS ts_5m,
+            symbol,
+            arg_max(source_symbol, ts_utc) AS source_symbol,
+            arg_min(open, ts_utc)  AS open,
+            max(high)              AS high,
+            min(low)               AS low,
+            arg_max(close, ts_utc) AS close,
+            sum(volume)            AS volume
+        FROM {table}
+        WHERE symbol = ?
+          AND ts_utc >= CAST(? AS TIMESTAMPTZ)
+          AND ts_utc <  CAST(? AS TIMESTAMPTZ)
+        GROUP BY 1, 2
+        """,
+        [symbol, start_utc, end_utc],
+    )
+
+
+def _merge_ranges(ranges: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    merged: List[Tuple[datetime, datetime]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + REBUILD_MERGE_GAP:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def ingest_frames(con: duckdb.DuckDBPyConnection, frames: Iterable[pd.DataFrame], symbol: str = SYMBOL,
+                  table: str = "bars_1m", tz_local: str = TZ_LOCAL, verbose: bool = False) -> Dict:
+    """
+    Ingest raw multi-contract frames (read_dbn output) in chronological order.
+
+    Returns {"rows", "months", "days", "ranges"}; ranges are the UTC [start, end)
+    spans whose 5m bars were rebuilt.
+    """
+    bars_5m_table(table)  # validate before writing anything
+    con.execute(BARS_SCHEMA_SQL.format(table=table) + BARS_SCHEMA_SQL.format(table=bars_5m_table(table)))
+
+    stats = {"rows": 0, "months": 0, "days": 0, "ranges": []}
+    touched: List[Tuple[datetime, datetime]] = []
+
+    def write(df: pd.DataFrame) -> None:
+        bars = _front_of(df)
+        if bars.empty:
+            return
+        stats["days"] += bars["trade_day"].nunique()
+        for month, chunk in bars.groupby(bars["trade_day"].dt.to_period("M"), sort=True):
+            con.begin()
+            try:
+                written = upsert_bars_frame(con, chunk, symbol, table=table)
+                con.commit()
+            except Exception:
+                con.rollback()
+                raise
+            stats["rows"] += written
+            stats["months"] += 1
+            first = chunk["ts_utc"].min().floor("5min").to_pydatetime()
+            last = chunk["ts_utc"].max().floor("5min").to_pydatetime() + timedelta(minutes=5)
+            touched.append((first, last))
+            if verbose:
+                fronts = ", ".join(chunk["source_symbol"].unique())
+                print(f"  [OK] {table}/{symbol} {month}: {written} bars (front: {fronts})")
+
+    carry: Optional[pd.DataFrame] = None
+    for raw in frames:
+        df = _outrights(raw, tz_local)
+        if carry is not None:
+            df = pd.concat([carry, df], ignore_index=True).drop_duplicates(["symbol", "ts_utc"], keep="last")
+        if df.empty:
+            carry = None
+            continue
+        # The last trade month may continue in the next file
+        month = df["trade_day"].dt.to_period("M")
+        held = month == month.max()
+        carry = df[held]
+        write(df[~held])
+    if carry is not None:
+        write(carry)
+
+    stats["ranges"] = _merge_ranges(touched)
+    for start, end in stats["ranges"]:
+        rebuild_5m_range(con, symbol, start, end, table=table)
+    return stats
+
+
+def ingest_dbn_files(con: duckdb.DuckDBPyConnection, paths: List[Path], symbol: str = SYMBOL,
+                     table: str = "bars_1m", tz_local: str = TZ_LOCAL, verbose: bool = True) -> Dict:
+    """ingest_frames over DBN files, reading one file at a time."""
+    def frames():
+        for path in paths:
+            if verbose:
+                print(f"Reading {path.name}")
+            yield read_dbn(path)
+
+    return ingest_frames(con, frames(), symbol=symbol, table=table, tz_local=tz_local, verbose=verbose)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk ingest local Databento DBN files")
+    parser.add_argument("path", nargs="?", default=DBN_DIR, help="DBN file or folder of .dbn/.dbn.zst files")
+    parser.add_argument("--db", default=DB_PATH, help="DuckDB path")
+    parser.add_argument("--table", default="bars_1m", choices=BARS_TABLES, help="1m bars table")
+    parser.add_argument("--symbol", default=SYMBOL, help="Logical (continuous) symbol to store")
+    parser.add_argument("--tz", default=TZ_LOCAL, help="Local timezone for trade days")
+    parser.add_argument("--skip-features", action="store_true",
+                        help="Do not update daily_features after a bars_1m ingest")
+    args = parser.parse_args()
+
+    paths = dbn_files(args.path)
+    if not paths:
+        print(f"No .dbn / .dbn.zst files found in {args.path}")
+        return 1
+
+    con = duckdb.connect(args.db)
+    try:
+        stats = ingest_dbn_files(con, paths, symbol=args.symbol, table=args.table, tz_local=args.tz)
+    finally:
+        con.close()
+
+    for start, end in stats["ranges"]:
+        print(f"  [OK] rebuilt {bars_5m_table(args.table)} {start.isoformat()} -> {end.isoformat()}")
+    print(f"OK: {stats['rows']} bars over {stats['days']} trade days "
+          f"({stats['months']} months) from {len(paths)} files into {args.table}/{args.symbol}")
+
+    if args.table == "bars_1m" and stats["rows"] and not args.skip_features:
+        # Recompute only the features invalidated by the bars written above
+        update_features_incremental(db_path=args.db)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
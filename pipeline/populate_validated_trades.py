@@ -14,18 +14,34 @@ KEY FEATURES:
 - Supports multiple RR values per ORB time (e.g., 1000 ORB: RR=1.5/2.0/2.5/3.0)
 - Uses shared loader (CHECK.TXT Req #6)
 
+BULK MODE (--bulk / --workers N):
+- Bars and ORBs are loaded once per month chunk (one query each), not per strategy
+- Each ORB's break / entry is found once per date and shared by every setup on
+  that orb_time; each distinct (sl_mode, rr) is resolved once
+- Each chunk is written with one DataFrame upsert
+- --workers N computes month chunks in N processes (read-only connections),
+  then a single writer upserts them in date order
+
 Usage:
-    python populate_validated_trades.py               # All dates, all strategies
-    python populate_validated_trades.py 2025-01-10    # Single date, all strategies
+    python populate_validated_trades.py                          # All dates, all strategies
+    python populate_validated_trades.py 2025-01-10               # Single date, all strategies
+    python populate_validated_trades.py 2024-01-01 2025-12-31 --bulk
+    python populate_validated_trades.py --workers 8              # All dates, bulk, 8 processes
 """
 
+import argparse
 import duckdb
 import sys
 from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
+import pandas as pd
+
 sys.path.insert(0, 'C:/Users/sydne/OneDrive/Desktop/MPX3')
 from pipeline.cost_model import COST_MODELS, calculate_realized_rr
+from pipeline.date_chunks import month_chunks
 from pipeline.load_validated_setups import load_validated_setups
 
 TZ_LOCAL = ZoneInfo("Australia/Brisbane")
@@ -39,11 +55,36 @@ MGC_COSTS = COST_MODELS['MGC']
 MGC_POINT_VALUE = MGC_COSTS['point_value']
 MGC_FRICTION = MGC_COSTS['total_friction']
 
+ORB_TIMES = ('0900', '1000', '1100', '1800', '2300', '0030')
+
+# Scan end times per ORB (local time)
+SCAN_END_TIMES = {
+    '0900': (18, 0),   # 09:00 ORB scans until 18:00
+    '1000': (18, 0),   # 10:00 ORB scans until 18:00
+    '1100': (18, 0),   # 11:00 ORB scans until 18:00
+    '1800': (23, 0),   # 18:00 ORB scans until 23:00
+    '2300': (2, 0),    # 23:00 ORB scans until 02:00 next day
+    '0030': (9, 0)     # 00:30 ORB scans until 09:00 same day
+}
+
+TRADE_COLUMNS = (
+    "date_local", "setup_id", "instrument", "orb_time", "entry_price", "stop_price", "target_price",
+    "exit_price", "risk_points", "target_points", "risk_dollars", "outcome", "realized_rr", "mae", "mfe",
+)
+
 
 def _dt_local(d: date, hh: int, mm: int) -> datetime:
     return datetime(d.year, d.month, d.day, hh, mm, tzinfo=TZ_LOCAL)
 
 
+def _scan_end_local(trade_date: date, orb_time: str) -> datetime:
+    """End of the outcome scan for an ORB (next day for 2300/0030 ORBs)."""
+    scan_hh, scan_mm = SCAN_END_TIMES[orb_time]
+    if scan_hh < 9:  # Next day (for 2300/0030 ORBs)
+        return _dt_local(trade_date + timedelta(days=1), scan_hh, scan_mm)
+    return _dt_local(trade_date, scan_hh, scan_mm)
+
+
 def _fetch_1m_bars(conn, start_local: datetime, end_local: datetime):
     """Fetch 1-minute bars for a time window."""
     start_utc = start_local.astimezone(TZ_UTC)
@@ -63,11 +104,21 @@ def _fetch_1m_bars(conn, start_local: datetime, end_local: datetime):
     return rows
 
 
-def calculate_tradeable_for_strategy(conn, trade_date: date, setup_id: int, orb_time: str,
-                                      orb_high: float, orb_low: float, scan_end_local: datetime,
-                                      rr: float, sl_mode: str):
+def _no_trade(orb_time: str, entry_price=None, stop_price=None, risk_points=None) -> dict:
+    return {
+        "instrument": SYMBOL, "orb_time": orb_time,
+        "entry_price": entry_price, "stop_price": stop_price, "target_price": None, "exit_price": None,
+        "risk_points": risk_points, "target_points": None, "risk_dollars": None,
+        "outcome": "NO_TRADE", "realized_rr": None, "mae": None, "mfe": None,
+    }
+
+
+def _evaluate_orb(orb_time: str, orb_high: float, orb_low: float, opens: np.ndarray, highs: np.ndarray,
+                  lows: np.ndarray, closes: np.ndarray,
+                  params: Dict[Tuple[str, float], List[int]]) -> Dict[Tuple[str, float], dict]:
     """
-    Calculate tradeable metrics for a single strategy using B-entry model.
+    Results for every (sl_mode, rr) on one ORB span (bars from ORB end to scan
+    end); the break / entry is found once and shared.
 
     B-ENTRY MODEL:
     - Signal: First 1m CLOSE outside ORB
@@ -77,6 +128,76 @@ def calculate_tradeable_for_strategy(conn, trade_date: date, setup_id: int, orb_
     - Target: entry +/- RR * risk
     - Outcome: WIN/LOSS/OPEN/NO_TRADE
     """
+    breaks = np.flatnonzero((closes > orb_high) | (closes < orb_low))
+    if len(breaks) == 0 or breaks[0] + 1 >= len(closes):
+        return {key: _no_trade(orb_time) for key in params}
+
+    signal = int(breaks[0])
+    break_dir = "UP" if closes[signal] > orb_high else "DOWN"
+    entry_price = float(opens[signal + 1])
+    scan_high, scan_low = highs[signal + 2:], lows[signal + 2:]
+    orb_mid = (orb_high + orb_low) / 2.0
+
+    results = {}
+    for sl_mode, rr in params:
+        if sl_mode == "full":
+            stop_price = orb_low if break_dir == "UP" else orb_high
+        else:  # half
+            stop_price = orb_mid
+        risk_points = abs(entry_price - stop_price)
+        if risk_points == 0:
+            results[(sl_mode, rr)] = _no_trade(orb_time, entry_price, stop_price, 0.0)
+            continue
+
+        target_points = rr * risk_points
+        if break_dir == "UP":
+            target_price = entry_price + target_points
+            adverse = (entry_price - scan_low) / risk_points
+            favorable = (scan_high - entry_price) / risk_points
+            stop_hit, target_hit = scan_low <= stop_price, scan_high >= target_price
+        else:
+            target_price = entry_price - target_points
+            adverse = (scan_high - entry_price) / risk_points
+            favorable = (entry_price - scan_low) / risk_points
+            stop_hit, target_hit = scan_high >= stop_price, scan_low <= target_price
+
+        # Excursions count bars up to and including the exit bar; stop wins a same-bar tie
+        exits = np.flatnonzero(stop_hit | target_hit)
+        if len(exits):
+            end = int(exits[0]) + 1
+            outcome = "LOSS" if stop_hit[exits[0]] else "WIN"
+            exit_price = stop_price if outcome == "LOSS" else target_price
+        else:
+            end, outcome, exit_price = len(scan_high), "OPEN", None
+        mae = min(0.0, float(-adverse[:end].max())) if end else 0.0
+        mfe = max(0.0, float(favorable[:end].max())) if end else 0.0
+
+        if outcome == "WIN":
+            realized_reward_dollars = (target_points * MGC_POINT_VALUE) - MGC_FRICTION
+            realized_risk_dollars = (risk_points * MGC_POINT_VALUE) + MGC_FRICTION
+            realized_rr = realized_reward_dollars / realized_risk_dollars if realized_risk_dollars > 0 else 0.0
+        elif outcome == "LOSS":
+            realized_rr = -1.0
+        else:
+            realized_rr = None
+
+        results[(sl_mode, rr)] = {
+            "instrument": SYMBOL, "orb_time": orb_time,
+            "entry_price": entry_price, "stop_price": stop_price, "target_price": target_price,
+            "exit_price": exit_price, "risk_points": risk_points, "target_points": target_points,
+            "risk_dollars": (risk_points * MGC_POINT_VALUE) + MGC_FRICTION,
+            "outcome": outcome, "realized_rr": realized_rr, "mae": mae, "mfe": mfe,
+        }
+    return results
+
+
+def calculate_tradeable_for_strategy(conn, trade_date: date, setup_id: int, orb_time: str,
+                                      orb_high: float, orb_low: float, scan_end_local: datetime,
+                                      rr: float, sl_mode: str):
+    """
+    Calculate tradeable metrics for a single strategy using B-entry model
+    (rules in _evaluate_orb), from the bars between ORB end and scan end.
+    """
     if orb_high is None or orb_low is None:
         return None  # No ORB formed
 
@@ -88,177 +209,10 @@ def calculate_tradeable_for_strategy(conn, trade_date: date, setup_id: int, orb_
     if not bars:
         return None  # No bars available
 
-    # Convert to list of tuples (keep ts_utc as datetime for comparison)
-    bars = [(ts_utc, float(o), float(h), float(l), float(c)) for ts_utc, o, h, l, c in bars]
-
-    # STEP 1: Detect break direction
-    break_dir = None
-    signal_bar_index = None
-
-    for i, bar in enumerate(bars):
-        ts_utc, bar_open, bar_high, bar_low, bar_close = bar
-
-        if bar_close > orb_high:
-            break_dir = "UP"
-            signal_bar_index = i
-            break
-        elif bar_close < orb_low:
-            break_dir = "DOWN"
-            signal_bar_index = i
-            break
-
-    if break_dir is None:
-        # No break detected
-        return {
-            "setup_id": setup_id,
-            "instrument": SYMBOL,
-            "orb_time": orb_time,
-            "entry_price": None,
-            "stop_price": None,
-            "target_price": None,
-            "exit_price": None,
-            "risk_points": None,
-            "target_points": None,
-            "risk_dollars": None,
-            "outcome": "NO_TRADE",
-            "realized_rr": None,
-            "mae": None,
-            "mfe": None
-        }
-
-    # STEP 2: Calculate entry price (B-entry model: NEXT 1m OPEN)
-    if signal_bar_index + 1 >= len(bars):
-        # No entry bar available (signal at last bar)
-        return {
-            "setup_id": setup_id,
-            "instrument": SYMBOL,
-            "orb_time": orb_time,
-            "entry_price": None,
-            "stop_price": None,
-            "target_price": None,
-            "exit_price": None,
-            "risk_points": None,
-            "target_points": None,
-            "risk_dollars": None,
-            "outcome": "NO_TRADE",
-            "realized_rr": None,
-            "mae": None,
-            "mfe": None
-        }
-
-    entry_bar = bars[signal_bar_index + 1]
-    entry_ts, entry_bar_open, entry_bar_high, entry_bar_low, entry_bar_close = entry_bar
-
-    # B-ENTRY: Entry at NEXT 1m OPEN
-    entry_price = float(entry_bar_open)
-
-    # STEP 3: Calculate stop based on mode
-    orb_mid = (orb_high + orb_low) / 2.0
-    if sl_mode == "full":
-        stop_price = orb_low if break_dir == "UP" else orb_high
-    else:  # half
-        stop_price = orb_mid
-
-    # STEP 4: Calculate entry-anchored risk
-    risk_points = abs(entry_price - stop_price)
-
-    if risk_points == 0:
-        # Zero risk - invalid setup
-        return {
-            "setup_id": setup_id,
-            "instrument": SYMBOL,
-            "orb_time": orb_time,
-            "entry_price": entry_price,
-            "stop_price": stop_price,
-            "target_price": None,
-            "exit_price": None,
-            "risk_points": 0.0,
-            "target_points": None,
-            "risk_dollars": None,
-            "outcome": "NO_TRADE",
-            "realized_rr": None,
-            "mae": None,
-            "mfe": None
-        }
-
-    # STEP 5: Calculate target using strategy-specific RR
-    target_points = rr * risk_points
-    if break_dir == "UP":
-        target_price = entry_price + target_points
-    else:
-        target_price = entry_price - target_points
-
-    # STEP 6: Calculate risk in dollars (with friction)
-    risk_dollars = (risk_points * MGC_POINT_VALUE) + MGC_FRICTION
-
-    # STEP 7: Scan remaining bars for outcome
-    outcome = "OPEN"
-    exit_price = None
-    mae = 0.0
-    mfe = 0.0
-
-    for bar in bars[signal_bar_index + 2:]:  # Start after entry bar
-        ts_utc, bar_open, bar_high, bar_low, bar_close = bar
-
-        # Calculate excursion (in R)
-        if break_dir == "UP":
-            adverse_excursion = (entry_price - bar_low) / risk_points  # Drawdown
-            favorable_excursion = (bar_high - entry_price) / risk_points  # Profit
-        else:
-            adverse_excursion = (bar_high - entry_price) / risk_points  # Drawdown
-            favorable_excursion = (entry_price - bar_low) / risk_points  # Profit
-
-        mae = min(mae, -adverse_excursion)  # Most negative
-        mfe = max(mfe, favorable_excursion)  # Most positive
-
-        # Check for stop or target hit
-        if break_dir == "UP":
-            if bar_low <= stop_price:
-                outcome = "LOSS"
-                exit_price = stop_price
-                break
-            elif bar_high >= target_price:
-                outcome = "WIN"
-                exit_price = target_price
-                break
-        else:
-            if bar_high >= stop_price:
-                outcome = "LOSS"
-                exit_price = stop_price
-                break
-            elif bar_low <= target_price:
-                outcome = "WIN"
-                exit_price = target_price
-                break
-
-    # STEP 8: Calculate realized RR
-    if outcome == "WIN":
-        # WIN: Full reward achieved (target hit)
-        realized_reward_dollars = (target_points * MGC_POINT_VALUE) - MGC_FRICTION
-        realized_risk_dollars = (risk_points * MGC_POINT_VALUE) + MGC_FRICTION
-        realized_rr = realized_reward_dollars / realized_risk_dollars if realized_risk_dollars > 0 else 0.0
-    elif outcome == "LOSS":
-        # LOSS: Full risk taken (stop hit)
-        realized_rr = -1.0  # Lose 1R (by definition)
-    else:
-        realized_rr = None  # OPEN outcome
-
-    return {
-        "setup_id": setup_id,
-        "instrument": SYMBOL,
-        "orb_time": orb_time,
-        "entry_price": entry_price,
-        "stop_price": stop_price,
-        "target_price": target_price,
-        "exit_price": exit_price,
-        "risk_points": risk_points,
-        "target_points": target_points,
-        "risk_dollars": risk_dollars,
-        "outcome": outcome,
-        "realized_rr": realized_rr,
-        "mae": mae,
-        "mfe": mfe
-    }
+    opens, highs, lows, closes = np.asarray([bar[1:] for bar in bars], dtype=np.float64).T
+    key = (sl_mode, rr)
+    result = _evaluate_orb(orb_time, float(orb_high), float(orb_low), opens, highs, lows, closes, {key: [setup_id]})
+    return {"setup_id": setup_id, **result[key]}
 
 
 def populate_date(conn, trade_date: date, strategies: list):
@@ -294,16 +248,6 @@ def populate_date(conn, trade_date: date, strategies: list):
         '0030': (row[10], row[11])
     }
 
-    # Scan end times per ORB (local time)
-    scan_end_times = {
-        '0900': (18, 0),   # 09:00 ORB scans until 18:00
-        '1000': (18, 0),   # 10:00 ORB scans until 18:00
-        '1100': (18, 0),   # 11:00 ORB scans until 18:00
-        '1800': (23, 0),   # 18:00 ORB scans until 23:00
-        '2300': (2, 0),    # 23:00 ORB scans until 02:00 next day
-        '0030': (9, 0)     # 00:30 ORB scans until 09:00 same day
-    }
-
     # Process each strategy
     trades_inserted = 0
     for strategy in strategies:
@@ -320,11 +264,7 @@ def populate_date(conn, trade_date: date, strategies: list):
             continue
 
         # Calculate scan end time
-        scan_hh, scan_mm = scan_end_times[orb_time]
-        if scan_hh < 9:  # Next day (for 2300/0030 ORBs)
-            scan_end_local = _dt_local(trade_date + timedelta(days=1), scan_hh, scan_mm)
-        else:
-            scan_end_local = _dt_local(trade_date, scan_hh, scan_mm)
+        scan_end_local = _scan_end_local(trade_date, orb_time)
 
         # Calculate tradeable metrics
         result = calculate_tradeable_for_strategy(
@@ -356,7 +296,162 @@ def populate_date(conn, trade_date: date, strategies: list):
         print(f"  [OK] {trade_date}: {trades_inserted} trades inserted")
 
 
+# =============================================================================
+# BULK MODE
+# =============================================================================
+
+def _group_setups(strategies: list) -> Dict[str, Dict[Tuple[str, float], List[int]]]:
+    """orb_time -> (sl_mode, rr) -> setup ids (setups with equal params share one result)."""
+    groups: Dict[str, Dict[Tuple[str, float], List[int]]] = {}
+    for strategy in strategies:
+        key = (strategy['sl_mode'], strategy['rr'])
+        groups.setdefault(strategy['orb_time'], {}).setdefault(key, []).append(strategy['id'])
+    return groups
+
+
+def compute_chunk(conn, chunk_start: date, chunk_end: date, strategies: list) -> pd.DataFrame:
+    """
+    validated_trades rows for [chunk_start, chunk_end] from two queries
+    (ORBs from daily_features, every bar the chunk's scans can touch).
+
+    Returns:
+        DataFrame with TRADE_COLUMNS
+    """
+    groups = _group_setups(strategies)
+    orb_columns = ", ".join(f"orb_{t}_high, orb_{t}_low" for t in ORB_TIMES)
+    orb_rows = conn.execute(
+        f"""
+        SELECT date_local, {orb_columns}
+        FROM daily_features
+        WHERE instrument = ? AND date_local BETWEEN ? AND ?
+        ORDER BY date_local
+        """,
+        [SYMBOL, chunk_start, chunk_end],
+    ).fetchall()
+    if not orb_rows:
+        return pd.DataFrame(columns=list(TRADE_COLUMNS))
+
+    # Earliest scan starts 00:35 on the first date; latest ends 09:00 after the last
+    bars = conn.execute(
+        """
+        SELECT epoch_ms(ts_utc) AS ts, open, high, low, close
+        FROM bars_1m
+        WHERE symbol = ?
+          AND ts_utc >= ? AND ts_utc < ?
+        ORDER BY ts_utc
+        """,
+        [SYMBOL, _dt_local(chunk_start, 0, 0).astimezone(TZ_UTC),
+         _dt_local(chunk_end + timedelta(days=1), 9, 0).astimezone(TZ_UTC)],
+    ).fetchnumpy()
+    ts = np.asarray(bars["ts"], dtype=np.int64)
+    opens, highs, lows, closes = (np.asarray(bars[c], dtype=np.float64) for c in ("open", "high", "low", "close"))
+
+    rows = []
+    for row in orb_rows:
+        trade_date = row[0]
+        for i, orb_time in enumerate(ORB_TIMES):
+            orb_high, orb_low = row[1 + 2 * i], row[2 + 2 * i]
+            if orb_time not in groups or orb_high is None or orb_low is None:
+                continue
+            orb_hh, orb_mm = int(orb_time[:2]), int(orb_time[2:])
+            start_ms = int((_dt_local(trade_date, orb_hh, orb_mm) + timedelta(minutes=5)).timestamp() * 1000)
+            end_ms = int(_scan_end_local(trade_date, orb_time).timestamp() * 1000)
+            lo, hi = np.searchsorted(ts, start_ms, side="left"), np.searchsorted(ts, end_ms, side="left")
+            if lo == hi:
+                continue  # No bars available
+            params = groups[orb_time]
+            results = _evaluate_orb(orb_time, float(orb_high), float(orb_low),
+                                    opens[lo:hi], highs[lo:hi], lows[lo:hi], closes[lo:hi], params)
+            for key, setup_ids in params.items():
+                for setup_id in setup_ids:
+                    rows.append({"date_local": trade_date, "setup_id": setup_id, **results[key]})
+
+    frame = pd.DataFrame(rows, columns=list(TRADE_COLUMNS))
+    return frame.sort_values(["date_local", "setup_id"], ignore_index=True)
+
+
+def upsert_trades(conn, trades: pd.DataFrame) -> int:
+    """Write a chunk of validated_trades rows with one INSERT OR REPLACE."""
+    if trades.empty:
+        return 0
+    columns = ", ".join(TRADE_COLUMNS)
+    conn.register("trades_chunk", trades)
+    try:
+        conn.execute(f"INSERT OR REPLACE INTO validated_trades ({columns}) SELECT {columns} FROM trades_chunk")
+    finally:
+        conn.unregister("trades_chunk")
+    return len(trades)
+
+
+def populate_range(conn, start_date: date, end_date: date, strategies: list) -> int:
+    """
+    Bulk-populate validated_trades for [start_date, end_date], one month chunk at a time.
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+    for chunk_start, chunk_end in month_chunks(start_date, end_date):
+        n = upsert_trades(conn, compute_chunk(conn, chunk_start, chunk_end, strategies))
+        written += n
+        print(f"  [OK] {chunk_start} to {chunk_end}: {n} trades upserted")
+    return written
+
+
+def _compute_chunk_worker(db_path: str, chunk_start: date, chunk_end: date, strategies: list) -> pd.DataFrame:
+    """Process-pool entry point: compute one chunk from a read-only connection."""
+    conn = duckdb.connect(db_path, read_only=True)
+    try:
+        return compute_chunk(conn, chunk_start, chunk_end, strategies)
+    finally:
+        conn.close()
+
+
+def populate_range_parallel(start_date: date, end_date: date, strategies: list, workers: int,
+                            db_path: str = DB_PATH) -> int:
+    """
+    Bulk-populate [start_date, end_date] with month chunks computed across `workers` processes.
+
+    DuckDB allows many read-only processes OR one writer on a file, so the writer
+    only connects once all workers have finished. The caller must not hold an
+    open connection to db_path.
+
+    Returns:
+        Number of rows written
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = month_chunks(start_date, end_date)
+    print(f"Computing {len(chunks)} chunks across {workers} workers")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_compute_chunk_worker, db_path, chunk_start, chunk_end, strategies)
+                   for chunk_start, chunk_end in chunks]
+        frames = [future.result() for future in futures]
+
+    conn = duckdb.connect(db_path)
+    written = 0
+    try:
+        for (chunk_start, chunk_end), trades in zip(chunks, frames):
+            n = upsert_trades(conn, trades)
+            written += n
+            print(f"  [OK] {chunk_start} to {chunk_end}: {n} trades upserted")
+    finally:
+        conn.close()
+    return written
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Populate validated_trades from validated_setups")
+    parser.add_argument("start_date", type=str, nargs="?", default=None,
+                        help="Start date (YYYY-MM-DD), optional - default: all dates")
+    parser.add_argument("end_date", type=str, nargs="?", default=None,
+                        help="End date (YYYY-MM-DD), optional - default: start_date")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Load bars once per month and write each month with one upsert")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Compute month chunks in N processes (implies --bulk)")
+    args = parser.parse_args()
+
     conn = duckdb.connect(DB_PATH)
 
     # Load ALL strategies from validated_setups (not just first per ORB)
@@ -368,34 +463,48 @@ def main():
     print()
 
     # Determine date range
-    if len(sys.argv) > 1:
-        # Single date mode
-        single_date = date.fromisoformat(sys.argv[1])
-        dates = [single_date]
-        print(f"[INFO] Processing single date: {single_date}")
+    if args.start_date:
+        start_date = date.fromisoformat(args.start_date)
+        end_date = date.fromisoformat(args.end_date) if args.end_date else start_date
     else:
-        # All dates mode
-        rows = conn.execute(
-            """
-            SELECT DISTINCT date_local
-            FROM daily_features
-            WHERE instrument = ?
-            ORDER BY date_local
-            """,
+        start_date, end_date = conn.execute(
+            "SELECT MIN(date_local), MAX(date_local) FROM daily_features WHERE instrument = ?",
             [SYMBOL],
-        ).fetchall()
-        dates = [row[0] for row in rows]
-        print(f"[INFO] Processing all dates: {len(dates)} dates")
+        ).fetchone()
+        if start_date is None:
+            print("[SKIP] No daily_features rows")
+            conn.close()
+            return
+    print(f"[INFO] Processing {start_date} to {end_date}")
 
     print()
     print("=" * 80)
     print("POPULATING VALIDATED_TRADES")
     print("=" * 80)
 
-    for trade_date in dates:
-        populate_date(conn, trade_date, strategies)
-
-    conn.close()
+    if args.workers > 1:
+        # Workers need read-only access to the file, so release the write connection
+        conn.close()
+        written = populate_range_parallel(start_date, end_date, strategies, args.workers, db_path=DB_PATH)
+        print(f"[INFO] {written} trades upserted")
+    elif args.bulk:
+        written = populate_range(conn, start_date, end_date, strategies)
+        print(f"[INFO] {written} trades upserted")
+        conn.close()
+    else:
+        rows = conn.execute(
+            """
+            SELECT DISTINCT date_local
+            FROM daily_features
+            WHERE instrument = ? AND date_local BETWEEN ? AND ?
+            ORDER BY date_local
+            """,
+            [SYMBOL, start_date, end_date],
+        ).fetchall()
+        dates = [row[0] for row in rows] if args.end_date or not args.start_date else [start_date]
+        for trade_date in dates:
+            populate_date(conn, trade_date, strategies)
+        conn.close()
 
     print()
     print("=" * 80)
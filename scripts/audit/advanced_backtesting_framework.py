@@ -58,6 +58,7 @@ from scipy import stats
 sys.path.insert(0, 'C:/Users/sydne/OneDrive/Desktop/MPX3')
 
 from pipeline.cost_model import get_cost_model, calculate_realized_rr
+from trading_app.monte_carlo_engine import draw_r_paths
 
 DB_PATH = 'data/db/gold.db'
 
@@ -219,15 +220,11 @@ def test_2_monte_carlo(trades_df: pd.DataFrame, setup_id: int) -> Dict:
 
     # Run 10,000 simulations
     simulations = 10000
-    random_exps = []
-
-    np.random.seed(42)  # Reproducibility
-
-    for _ in range(simulations):
-        shuffled = np.random.choice(realized_rr_values, size=len(realized_rr_values), replace=True)
-        random_exps.append(shuffled.mean())
-
-    random_exps = np.array(random_exps)
+    # All resamples at once: (simulations x trades) matrix, seeded for reproducibility
+    random_exps = draw_r_paths(
+        simulations, len(realized_rr_values), r_multiples=realized_rr_values,
+        rng=np.random.default_rng(42)
+    ).mean(axis=1, dtype=np.float64)
 
     # Calculate percentile of actual result
     percentile = (random_exps < actual_exp).sum() / len(random_exps) * 100
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Add throughput columns to search_runs table
+
+AutoSearchEngine can score across a process pool (run_search(workers=N)).
+Each run records:
+- workers: number of scoring processes
+- combos_per_sec: combinations scored per second of run time
+- worker_stats_json: per-worker utilisation (share of pool wall time spent scoring)
+
+Idempotent: only missing columns are added.
+"""
+
+import sys
+import os
+from pathlib import Path
+import duckdb
+
+# Change to project root
+project_root = Path(__file__).parent.parent.parent
+os.chdir(project_root)
+
+DB_PATH = "data/db/gold.db"
+
+NEW_COLUMNS = [
+    ("workers", "INTEGER DEFAULT 1"),
+    ("combos_per_sec", "DOUBLE"),
+    ("worker_stats_json", "JSON"),
+]
+
+
+def migrate(db_path: str = DB_PATH):
+    """Add throughput columns to search_runs"""
+
+    print("="*70)
+    print("MIGRATION: Add Throughput Columns to search_runs")
+    print("="*70)
+    print()
+
+    conn = duckdb.connect(db_path)
+
+    table_exists = conn.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_name = 'search_runs'
+    """).fetchone()[0] > 0
+
+    if not table_exists:
+        print("[WARNING] search_runs table does not exist")
+        print("Run scripts/migrations/create_auto_search_tables.py first")
+        conn.close()
+        return 1
+
+    existing_cols = {row[0] for row in conn.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_name = 'search_runs'
+    """).fetchall()}
+
+    for name, column_type in NEW_COLUMNS:
+        if name in existing_cols:
+            print(f"  SKIP - {name} already exists")
+            continue
+        conn.execute(f"ALTER TABLE search_runs ADD COLUMN {name} {column_type}")
+        print(f"  [OK] {name} added")
+
+    print()
+    print("="*70)
+    print("MIGRATION COMPLETE")
+    print("="*70)
+    print()
+
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(migrate())
@@ -47,7 +47,10 @@ def create_auto_search_tables(db_path: str = "data/db/gold.db"):
             candidates_found INTEGER DEFAULT 0,
             candidates_skipped INTEGER DEFAULT 0,
             total_tested INTEGER DEFAULT 0,
-            error_message VARCHAR
+            error_message VARCHAR,
+            workers INTEGER DEFAULT 1,
+            combos_per_sec DOUBLE,
+            worker_stats_json JSON
         )
     """)
     print("  [OK] search_runs created")
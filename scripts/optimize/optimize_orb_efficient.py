@@ -4,7 +4,8 @@ OPTIMIZED ORB OPTIMIZATION - Efficient Version
 Fixes CPU overload by:
 1. Pre-loading all 1-minute bars for each day (single query per day)
 2. Caching bars in memory
-3. Testing all stop/RR combos on cached data (no repeated queries)
+3. Testing all stop/RR combos on cached data in ONE pass per day
+   (strategies/grid_simulator.py first-touch kernel)
 4. Processing one ORB at a time
 5. Saving intermediate results
 
@@ -16,6 +17,11 @@ import duckdb
 import pandas as pd
 from datetime import datetime, timedelta
 import json
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from strategies.grid_simulator import build_grid, simulate_grid
 
 DB_PATH = 'data/db/gold.db'
 SYMBOL = 'MGC'
@@ -25,64 +31,33 @@ SLIPPAGE_TICKS = 5
 TICK_SIZE = 0.1
 POINT_VALUE = 10.0
 
-def simulate_with_stop_and_costs(bars_1m, orb_high, orb_low, rr, stop_fraction):
-    """Simulate with fractional stop and realistic costs"""
+def simulate_grid_with_costs(bars_1m, orb_high, orb_low, grid):
+    """
+    Simulate every stop/RR grid point on one day with realistic costs.
+
+    Returns one net R (or None when there is no entry) per grid point.
+    """
     if len(bars_1m) == 0:
-        return None
+        return [None] * len(grid)
 
-    orb_size = orb_high - orb_low
+    # Entry at the first close outside the ORB, raw close (costs applied below)
+    res = simulate_grid(
+        bars_1m['high'].to_numpy(), bars_1m['low'].to_numpy(), bars_1m['close'].to_numpy(),
+        orb_high, orb_low, grid, slippage_ticks=0, cost_gate=False,
+    )
 
-    # Find entry (close outside)
-    entry_idx = None
-    for i in range(len(bars_1m)):
-        close = float(bars_1m.iloc[i]['close'])
-
-        if close > orb_high or close < orb_low:
-            direction = 'UP' if close > orb_high else 'DOWN'
-            entry = close
-            entry_idx = i
-            break
-
-    if entry_idx is None:
-        return None
-
-    # Stop at fraction of ORB from entry
-    risk = orb_size * stop_fraction
-
-    if direction == 'UP':
-        stop = entry - risk
-    else:
-        stop = entry + risk
-
-    target = entry + (rr * risk) if direction == 'UP' else entry - (rr * risk)
-
-    # Check outcome
-    for j in range(entry_idx + 1, len(bars_1m)):
-        high = float(bars_1m.iloc[j]['high'])
-        low = float(bars_1m.iloc[j]['low'])
-
-        if direction == 'UP':
-            if low <= stop:
-                outcome_r = -1.0
-                break
-            elif high >= target:
-                outcome_r = rr
-                break
-        else:
-            if high >= stop:
-                outcome_r = -1.0
-                break
-            elif low <= target:
-                outcome_r = rr
-                break
-    else:
-        outcome_r = 0.0
-
-    # Subtract costs
+    orb_size = orb_high - orb_low
     cost_dollars = COMMISSION + SLIPPAGE_TICKS * TICK_SIZE * POINT_VALUE
-    cost_r = cost_dollars / (risk * POINT_VALUE)
-
-    return outcome_r - cost_r
+    results = []
+    for point, outcome, outcome_r in zip(grid, res.outcome, res.r_multiple):
+        if outcome == 'SKIPPED_NO_ENTRY':
+            results.append(None)
+            continue
+        # Subtract costs
+        risk = orb_size * point.sl_mode
+        cost_r = cost_dollars / (risk * POINT_VALUE)
+        results.append(float(outcome_r) - cost_r)
+    return results
 
 
 if len(sys.argv) < 2:
@@ -188,55 +163,56 @@ RR_VALUES = [1.5, 2.0, 3.0, 4.0, 6.0, 8.0]
 print("Testing all stop/RR combinations...")
 print()
 
+grid = build_grid(rr_values=RR_VALUES, sl_modes=STOP_FRACTIONS)
+
+# Every stop/RR combination for a day in one kernel call
+results_by_point = [[] for _ in grid]
+for idx, row in df_days.iterrows():
+    date_str = str(row['date_local'])
+    orb_high = row['orb_high']
+    orb_low = row['orb_low']
+
+    # Get cached bars for this day
+    bars = bars_by_day.get(date_str)
+
+    if bars is not None and len(bars) > 0:
+        for results, r_result in zip(results_by_point, simulate_grid_with_costs(bars, orb_high, orb_low, grid)):
+            if r_result is not None:
+                results.append(r_result)
+
 all_results = []
 completed = 0
-total_combos = len(STOP_FRACTIONS) * len(RR_VALUES)
-
-for stop_frac in STOP_FRACTIONS:
-    for rr in RR_VALUES:
-        completed += 1
-
-        # Test this combination on ALL days using cached bars
-        results = []
-
-        for idx, row in df_days.iterrows():
-            date_str = str(row['date_local'])
-            orb_high = row['orb_high']
-            orb_low = row['orb_low']
-
-            # Get cached bars for this day
-            bars = bars_by_day.get(date_str)
-
-            if bars is not None and len(bars) > 0:
-                r_result = simulate_with_stop_and_costs(bars, orb_high, orb_low, rr, stop_frac)
-
-                if r_result is not None:
-                    results.append(r_result)
-
-        if len(results) > 0:
-            count = len(results)
-            total_r = sum(results)
-            avg_r = total_r / count
-            wins = len([r for r in results if r > 0])
-            wr = wins / count * 100
-            be_wr = 100 / (rr + 1)
-
-            all_results.append({
-                'stop_frac': stop_frac,
-                'rr': rr,
-                'trades': count,
-                'wr': wr,
-                'be_wr': be_wr,
-                'avg_r': avg_r,
-                'total_r': total_r
-            })
-
-            # Progress update
-            status = f"[{completed}/{total_combos}] Stop={stop_frac:.2f}, RR={rr:.1f}: {count} trades, {wr:.1f}% WR, {avg_r:+.3f} avg R"
-            if avg_r > 0.10:
-                print(f"{status} *** PROFITABLE ***")
-            elif completed % 6 == 0:  # Print every 6th (each stop fraction)
-                print(status)
+total_combos = len(grid)
+
+for point, results in zip(grid, results_by_point):
+    stop_frac = point.sl_mode
+    rr = point.rr
+    completed += 1
+
+    if len(results) > 0:
+        count = len(results)
+        total_r = sum(results)
+        avg_r = total_r / count
+        wins = len([r for r in results if r > 0])
+        wr = wins / count * 100
+        be_wr = 100 / (rr + 1)
+
+        all_results.append({
+            'stop_frac': stop_frac,
+            'rr': rr,
+            'trades': count,
+            'wr': wr,
+            'be_wr': be_wr,
+            'avg_r': avg_r,
+            'total_r': total_r
+        })
+
+        # Progress update
+        status = f"[{completed}/{total_combos}] Stop={stop_frac:.2f}, RR={rr:.1f}: {count} trades, {wr:.1f}% WR, {avg_r:+.3f} avg R"
+        if avg_r > 0.10:
+            print(f"{status} *** PROFITABLE ***")
+        elif completed % 6 == 0:  # Print every 6th (each stop fraction)
+            print(status)
 
 print()
 print("="*80)
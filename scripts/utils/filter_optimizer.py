@@ -35,6 +35,9 @@ USAGE:
     # Export results to CSV:
     python filter_optimizer.py --orb 0900 --rr 1.5 --export results.csv
 
+    # Re-simulate MGC outcomes at the requested RR/stop (execution engine model):
+    python filter_optimizer.py --orb 0900 --rr 2.5 --sl-mode half --resimulate
+
 OUTPUT:
     Filter Optimization Report
     ==========================
@@ -72,6 +75,7 @@ from scipy import stats
 import argparse
 
 from trading_app.config import DB_PATH, TZ_LOCAL
+from strategies.grid_simulator import GridPoint, simulate_grid_days
 
 
 @dataclass
@@ -130,6 +134,7 @@ class FilterOptimizer:
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
         self.conn = duckdb.connect(db_path, read_only=True)
+        self._edge_data_cache: Dict[Tuple, pd.DataFrame] = {}
 
         # Validation parameters
         self.MIN_TRAIN_TRADES = 30  # Minimum trades in train set
@@ -151,11 +156,20 @@ class FilterOptimizer:
         orb_time: str,
         instrument: str = 'MGC',
         min_date: Optional[date] = None,
-        max_date: Optional[date] = None
+        max_date: Optional[date] = None,
+        rr: Optional[float] = None,
+        sl_mode: Optional[str] = None,
+        resimulate: bool = False
     ) -> pd.DataFrame:
         """
         Get all data for an edge from daily_features.
 
+        By default outcome and r_multiple are the stored daily_features columns
+        (build-time RR/stop). With resimulate=True (opt-in) they are re-simulated
+        for rr/sl_mode with the grid simulator, which uses the execution engine's
+        fill model, slippage and cost gate - results differ from the stored
+        outcomes. Re-simulation is MGC-only; other instruments keep the stored outcomes.
+
         Returns DataFrame with columns:
         - date_local
         - orb_size (orb_{time}_size)
@@ -170,6 +184,12 @@ class FilterOptimizer:
         - asia_type
         - london_type
         """
+        resimulate = resimulate and rr is not None and instrument == 'MGC'
+        key = (orb_time, instrument, min_date, max_date, rr, sl_mode) if resimulate \
+            else (orb_time, instrument, min_date, max_date)
+        if key in self._edge_data_cache:
+            return self._edge_data_cache[key]
+
         outcome_col = f"orb_{orb_time}_outcome"
         r_col = f"orb_{orb_time}_r_multiple"
         size_col = f"orb_{orb_time}_size"
@@ -190,9 +210,9 @@ class FilterOptimizer:
                 london_type
             FROM daily_features
             WHERE instrument = ?
-              AND {outcome_col} IN ('WIN', 'LOSS')
-              AND {r_col} IS NOT NULL
         """
+        if not resimulate:
+            query += f" AND {outcome_col} IN ('WIN', 'LOSS') AND {r_col} IS NOT NULL"
 
         params = [instrument]
 
@@ -207,6 +227,16 @@ class FilterOptimizer:
         query += " ORDER BY date_local"
 
         df = self.conn.execute(query, params).df()
+
+        if resimulate and len(df) > 0:
+            grid = [GridPoint(rr=rr, sl_mode=sl_mode or 'full')]
+            dates = [d.date() if hasattr(d, 'date') else d for d in df['date_local']]
+            by_date = simulate_grid_days(self.conn, dates, orb_time, grid)
+            df['outcome'] = [by_date[d].outcome[0] for d in dates]
+            df['r_multiple'] = [float(by_date[d].r_multiple[0]) for d in dates]
+            df = df[df['outcome'].isin(['WIN', 'LOSS'])].reset_index(drop=True)
+
+        self._edge_data_cache[key] = df
         return df
 
     def split_train_test(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -226,10 +256,11 @@ class FilterOptimizer:
         orb_time: str,
         rr: float,
         sl_mode: str,
-        instrument: str = 'MGC'
+        instrument: str = 'MGC',
+        resimulate: bool = False
     ) -> EdgeBaseline:
         """Calculate baseline performance (no filters)"""
-        df = self.get_edge_data(orb_time, instrument)
+        df = self.get_edge_data(orb_time, instrument, rr=rr, sl_mode=sl_mode, resimulate=resimulate)
 
         if len(df) == 0:
             raise ValueError(f"No data found for {orb_time} ORB")
@@ -474,7 +505,8 @@ class FilterOptimizer:
         rr: float,
         sl_mode: str,
         instrument: str = 'MGC',
-        top_n: int = 10
+        top_n: int = 10,
+        resimulate: bool = False
     ) -> Tuple[EdgeBaseline, List[FilterResult]]:
         """
         Optimize filters for a single edge.
@@ -485,6 +517,8 @@ class FilterOptimizer:
             sl_mode: Stop loss mode (full, half)
             instrument: Instrument (MGC, NQ, MPL)
             top_n: Number of top filters to return
+            resimulate: Re-simulate outcomes at rr/sl_mode instead of using
+                        the stored daily_features outcomes (MGC only)
 
         Returns:
             (baseline, top_filters)
@@ -494,14 +528,14 @@ class FilterOptimizer:
         print(f"{'='*70}\n")
 
         # Get data and calculate baseline
-        df = self.get_edge_data(orb_time, instrument)
+        df = self.get_edge_data(orb_time, instrument, rr=rr, sl_mode=sl_mode, resimulate=resimulate)
         print(f"Total data points: {len(df)}")
 
         train, test = self.split_train_test(df)
         print(f"Train set: {len(train)} trades ({len(train)/len(df)*100:.0f}%)")
         print(f"Test set: {len(test)} trades ({len(test)/len(df)*100:.0f}%)\n")
 
-        baseline = self.calculate_baseline(orb_time, rr, sl_mode, instrument)
+        baseline = self.calculate_baseline(orb_time, rr, sl_mode, instrument, resimulate=resimulate)
 
         print("BASELINE PERFORMANCE:")
         print(f"  Train: {baseline.train_win_rate:.1f}% WR, {baseline.train_avg_r:+.2f}R avg, {baseline.train_trades} trades, {baseline.train_annual_r:+.0f}R/year")
@@ -600,6 +634,9 @@ def main():
     parser.add_argument('--top-n', type=int, default=10, help='Number of top filters to show')
     parser.add_argument('--export', type=str, help='Export results to CSV file')
     parser.add_argument('--optimize-all', action='store_true', help='Optimize all ORBs (0900, 1000, 1100, 1800, 2300, 0030)')
+    parser.add_argument('--resimulate', action='store_true',
+                        help='Re-simulate outcomes at --rr/--sl-mode with the execution engine (MGC only) '
+                             'instead of using stored daily_features outcomes')
 
     args = parser.parse_args()
 
@@ -616,7 +653,8 @@ def main():
                     rr=args.rr,
                     sl_mode=args.sl_mode,
                     instrument=args.instrument,
-                    top_n=args.top_n
+                    top_n=args.top_n,
+                    resimulate=args.resimulate
                 )
 
                 optimizer.print_results(baseline, results)
@@ -636,7 +674,8 @@ def main():
             rr=args.rr,
             sl_mode=args.sl_mode,
             instrument=args.instrument,
-            top_n=args.top_n
+            top_n=args.top_n,
+            resimulate=args.resimulate
         )
 
         optimizer.print_results(baseline, results)
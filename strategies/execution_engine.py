@@ -28,6 +28,12 @@ Usage:
         asia_tp_cap_ticks=150,  # Asia ORB target cap
     )
 
+Batch usage (one candidate over many dates, a handful of queries in total):
+    from execution_engine import simulate_orb_trades_batch
+
+    results = simulate_orb_trades_batch(con, dates, orb="1000", rr=2.0)
+    # -> List[TradeResult], same order as dates, identical to per-date calls
+
 Result format:
 {
     'outcome': 'WIN' | 'LOSS' | 'NO_TRADE',
@@ -47,23 +53,27 @@ Result format:
 """
 
 import duckdb
-from datetime import date, timedelta
-from typing import Dict, Optional, Any
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Any, List, Tuple
 from dataclasses import dataclass, asdict
 import json
 import sys
 import os
 
+import numpy as np
+
 # Add project root to path for cost_model import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from strategies.execution_modes import (
     ExecutionMode,
-    attempt_market_on_close_fill,
     attempt_limit_at_orb_fill,
-    attempt_limit_retrace_fill
+    attempt_limit_retrace_fill,
+    first_confirmed_close,
+    FillResult,
 )
 from pipeline.cost_model import calculate_realized_rr, calculate_expectancy
+from pipeline.bar_store import BarStore, epoch_ms_to_local, local_to_epoch_ms
 
 SYMBOL = "MGC"
 TICK_SIZE = 0.1
@@ -131,148 +141,19 @@ def _orb_scan_end_local(orb: str, d: date) -> str:
     return f"{next_day.strftime('%Y-%m-%d')} 09:00:00"
 
 
-def simulate_orb_trade(
-    con: duckdb.DuckDBPyConnection,
-    date_local: date,
-    orb: str,
-    mode: str = "1m",           # '1m' or '5m'
-    confirm_bars: int = 1,       # consecutive closes required
-    rr: float = 1.0,
-    sl_mode: str = "full",       # 'full' or 'half'
-    buffer_ticks: float = 0,     # entry buffer (DEPRECATED - use slippage_ticks instead)
-    entry_delay_bars: int = 0,   # wait N bars after confirmation (NOT IMPLEMENTED YET)
-    max_stop_ticks: float = 999999,  # filter: skip if stop > this
-    asia_tp_cap_ticks: float = 999999,  # Asia ORB target cap
-    apply_size_filter: bool = False,  # filter: skip if ORB too large vs ATR
-    size_filter_threshold: float = None,  # threshold for size filter (orb_size_norm)
-    exec_mode: ExecutionMode = ExecutionMode.MARKET_ON_CLOSE,  # NEW: Execution mode
-    slippage_ticks: float = 1.5,  # NEW: Slippage (only for MARKET_ON_CLOSE)
-    commission_per_contract: float = 1.0,  # NEW: Commission per contract
-) -> TradeResult:
-    """
-    Simulate a single ORB trade using realistic execution.
-
-    ENTRY METHOD: First `confirm_bars` consecutive closes outside ORB (not ORB edge).
-    STOP PLACEMENT: 'full' = opposite ORB edge, 'half' = ORB midpoint (clamped).
-    TARGET CALCULATION: entry +/- RR * risk.
-    SAME-BAR TP+SL: Conservative (both hit in same bar => LOSS).
-
-    Returns TradeResult with outcome, prices, and execution metadata.
-    """
-    # Log execution parameters
-    execution_params = {
-        'date_local': str(date_local),
-        'orb': orb,
-        'mode': mode,
-        'confirm_bars': confirm_bars,
-        'rr': rr,
-        'sl_mode': sl_mode,
-        'buffer_ticks': buffer_ticks,
-        'entry_delay_bars': entry_delay_bars,
-        'max_stop_ticks': max_stop_ticks,
-        'asia_tp_cap_ticks': asia_tp_cap_ticks,
-    }
-    execution_mode = f"{mode}_confirm{confirm_bars}_rr{rr}_{sl_mode}"
+def _as_date(d) -> date:
+    """Normalize date-likes (date, datetime, pandas Timestamp, 'YYYY-MM-DD') to date."""
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return date.fromisoformat(str(d)[:10])
 
-    # Validate inputs
-    assert orb in ORB_TIMES, f"Invalid ORB: {orb}"
-    assert mode in ("1m", "5m"), f"Invalid mode: {mode}"
-    assert sl_mode in ("full", "half"), f"Invalid sl_mode: {sl_mode}"
-    assert confirm_bars >= 1, f"confirm_bars must be >= 1"
-    assert rr > 0, f"RR must be > 0"
 
+def _scan_window_local(orb: str, date_local: date) -> Tuple[str, str]:
+    """(start, end] local timestamps scanned for the entry and exit of one ORB trade."""
     h, m = ORB_TIMES[orb]
 
-    # Get ORB levels from daily_features
-    row = con.execute(f"""
-        SELECT orb_{orb}_high, orb_{orb}_low
-        FROM daily_features
-        WHERE date_local = ?
-    """, [date_local]).fetchone()
-
-    if not row or row[0] is None or row[1] is None:
-        return TradeResult(
-            outcome='SKIPPED_NO_ORB',
-            direction=None,
-            entry_ts=None,
-            entry_price=None,
-            stop_price=None,
-            target_price=None,
-            stop_ticks=None,
-            r_multiple=0.0,
-            entry_delay_bars=0,
-            mae_r=None,
-            mfe_r=None,
-            execution_mode=execution_mode,
-            execution_params=execution_params,
-            slippage_ticks=0.0,
-            commission=0.0,
-            cost_r=0.0,
-            fill_ts=None,
-            realized_rr=None,
-            realized_risk_dollars=None,
-            realized_reward_dollars=None,
-            realized_expectancy=None
-        )
-
-    orb_high, orb_low = row
-    orb_range = orb_high - orb_low
-    if orb_range <= 0:
-        return TradeResult(
-            outcome='SKIPPED_NO_ORB',
-            direction=None,
-            entry_ts=None,
-            entry_price=None,
-            stop_price=None,
-            target_price=None,
-            stop_ticks=None,
-            r_multiple=0.0,
-            entry_delay_bars=0,
-            mae_r=None,
-            mfe_r=None,
-            execution_mode=execution_mode,
-            execution_params=execution_params,
-            slippage_ticks=0.0,
-            commission=0.0,
-            cost_r=0.0,
-            fill_ts=None,
-            realized_rr=None,
-            realized_risk_dollars=None,
-            realized_reward_dollars=None,
-            realized_expectancy=None
-        )
-
-    # Apply ORB size filter (NO LOOKAHEAD - ORB computed at orb close, before entry)
-    if apply_size_filter and size_filter_threshold is not None:
-        # Get ATR for normalization
-        atr_row = con.execute(f"""
-            SELECT atr_20
-            FROM daily_features
-            WHERE date_local = ?
-        """, [date_local]).fetchone()
-
-        if atr_row and atr_row[0] is not None and atr_row[0] > 0:
-            atr = atr_row[0]
-            orb_size_norm = orb_range / atr
-
-            # Reject if ORB too large (exhaustion pattern)
-            if orb_size_norm > size_filter_threshold:
-                return TradeResult(
-                    outcome='SKIPPED_LARGE_ORB',
-                    direction=None,
-                    entry_ts=None,
-                    entry_price=None,
-                    stop_price=None,
-                    target_price=None,
-                    stop_ticks=None,
-                    r_multiple=0.0,
-                    entry_delay_bars=0,
-                    mae_r=None,
-                    mfe_r=None,
-                    execution_mode=execution_mode,
-                    execution_params=execution_params
-                )
-
     # Start scanning AFTER the 5-min ORB completes
     start_min = m + 5
     # Handle date rollover for 00:30 ORB (belongs to D+1 local)
@@ -280,12 +161,37 @@ def simulate_orb_trade(
     start_ts_local = f"{start_date.strftime('%Y-%m-%d')} {h:02d}:{start_min:02d}:00"
 
     # End time for scan (limits runtime)
-    end_ts_local = _orb_scan_end_local(orb, date_local)
+    return start_ts_local, _orb_scan_end_local(orb, date_local)
 
-    # Choose bar timeframe
-    bars_table = "bars_1m" if mode == "1m" else "bars_5m"
 
-    bars = con.execute(f"""
+class BarSpan:
+    """
+    Bars of one scan window as parallel arrays, ordered by local time.
+
+    ts_local is naive Australia/Brisbane time (datetime64[us]), matching
+    `ts_utc AT TIME ZONE 'Australia/Brisbane'` in DuckDB.
+    """
+
+    def __init__(self, ts_local: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray):
+        self.ts_local = ts_local
+        self.high = high
+        self.low = low
+        self.close = close
+
+    def __len__(self) -> int:
+        return len(self.ts_local)
+
+    def ts_str(self, i: int) -> str:
+        return str(self.ts_local[i].item())
+
+    def rows(self) -> List[Tuple]:
+        """(ts_local, high, low, close) tuples, the shape execution_modes fill functions take."""
+        return list(zip(self.ts_local.tolist(), self.high.tolist(), self.low.tolist(), self.close.tolist()))
+
+
+def _load_bar_span(con: duckdb.DuckDBPyConnection, bars_table: str,
+                   start_ts_local: str, end_ts_local: str) -> BarSpan:
+    data = con.execute(f"""
         SELECT
           (ts_utc AT TIME ZONE 'Australia/Brisbane') AS ts_local,
           high, low, close
@@ -294,54 +200,173 @@ def simulate_orb_trade(
           AND (ts_utc AT TIME ZONE 'Australia/Brisbane') > CAST(? AS TIMESTAMP)
           AND (ts_utc AT TIME ZONE 'Australia/Brisbane') <= CAST(? AS TIMESTAMP)
         ORDER BY ts_local
-    """, [SYMBOL, start_ts_local, end_ts_local]).fetchall()
-
-    if not bars:
-        return TradeResult(
-            outcome='SKIPPED_NO_BARS',
-            direction=None,
-            entry_ts=None,
-            entry_price=None,
-            stop_price=None,
-            target_price=None,
-            stop_ticks=None,
-            r_multiple=0.0,
-            entry_delay_bars=0,
-            mae_r=None,
-            mfe_r=None,
-            execution_mode=execution_mode,
-            execution_params=execution_params,
-            slippage_ticks=0.0,
-            commission=0.0,
-            cost_r=0.0,
-            fill_ts=None,
-            realized_rr=None,
-            realized_risk_dollars=None,
-            realized_reward_dollars=None,
-            realized_expectancy=None
+    """, [SYMBOL, start_ts_local, end_ts_local]).fetchnumpy()
+    return BarSpan(data["ts_local"], data["high"], data["low"], data["close"])
+
+
+def _load_bar_spans(con: duckdb.DuckDBPyConnection, bars_table: str,
+                    windows: Dict[date, Tuple[str, str]],
+                    bar_store: Optional[BarStore] = None) -> Dict[date, BarSpan]:
+    """
+    Bars of every (start, end] window in one range-join query.
+
+    With a bar store for bars_table, windows the store covers are sliced from it;
+    windows past the last sync (store lags DuckDB) or overlapping bars rewritten
+    since it still come from the query.
+    """
+    if not windows:
+        return {}
+    spans = {}
+    if bar_store is not None and bars_table == bar_store.table:
+        bar_store.refresh_changes(con)
+        for d, (start_ts_local, end_ts_local) in windows.items():
+            start_ms, end_ms = local_to_epoch_ms(start_ts_local), local_to_epoch_ms(end_ts_local)
+            if bar_store.covers(start_ms, end_ms):
+                spans[d] = _bar_store_span(bar_store, start_ts_local, end_ts_local)
+        windows = {d: w for d, w in windows.items() if d not in spans}
+        if not windows:
+            return spans
+    keys = sorted(windows)
+    starts = [windows[d][0] for d in keys]
+    ends = [windows[d][1] for d in keys]
+
+    data = con.execute(f"""
+        WITH w AS (
+            SELECT
+              unnest(?::DATE[]) AS date_local,
+              unnest(?::TIMESTAMP[]) AS start_ts,
+              unnest(?::TIMESTAMP[]) AS end_ts
+        ),
+        b AS (
+            SELECT
+              (ts_utc AT TIME ZONE 'Australia/Brisbane') AS ts_local,
+              high, low, close
+            FROM {bars_table}
+            WHERE symbol = ?
+              AND (ts_utc AT TIME ZONE 'Australia/Brisbane') > CAST(? AS TIMESTAMP)
+              AND (ts_utc AT TIME ZONE 'Australia/Brisbane') <= CAST(? AS TIMESTAMP)
         )
+        SELECT w.date_local, b.ts_local, b.high, b.low, b.close
+        FROM b
+        JOIN w ON b.ts_local > w.start_ts AND b.ts_local <= w.end_ts
+        ORDER BY w.date_local, b.ts_local
+    """, [keys, starts, ends, SYMBOL, min(starts), max(ends)]).fetchnumpy()
+
+    day_col = data["date_local"].astype("datetime64[D]")
+    bounds = np.searchsorted(day_col, np.array(keys, dtype="datetime64[D]"), side="left")
+    bounds = np.append(bounds, len(day_col))
+    for i, d in enumerate(keys):
+        spans[d] = BarSpan(
+            data["ts_local"][bounds[i]:bounds[i + 1]],
+            data["high"][bounds[i]:bounds[i + 1]],
+            data["low"][bounds[i]:bounds[i + 1]],
+            data["close"][bounds[i]:bounds[i + 1]],
+        )
+    return spans
 
-    # Attempt fill based on execution mode
+
+def _bar_store_span(bar_store: BarStore, start_ts_local: str, end_ts_local: str) -> BarSpan:
+    """(start, end] local window as a BarSpan; high/low/close are memory-mapped views."""
+    block = bar_store.window(local_to_epoch_ms(start_ts_local), local_to_epoch_ms(end_ts_local), closed="right")
+    return BarSpan(epoch_ms_to_local(block.ts), block.high, block.low, block.close)
+
+
+def _skipped_result(
+    outcome: str,
+    execution_mode: str,
+    execution_params: dict,
+    direction: Optional[str] = None,
+    entry_ts: Optional[str] = None,
+    entry_price: Optional[float] = None,
+    stop_price: Optional[float] = None,
+    stop_ticks: Optional[float] = None,
+    entry_delay_bars: int = 0,
+) -> TradeResult:
+    """TradeResult for a date that produced no position (no costs, no realized RR)."""
+    return TradeResult(
+        outcome=outcome,
+        direction=direction,
+        entry_ts=entry_ts,
+        entry_price=entry_price,
+        stop_price=stop_price,
+        target_price=None,
+        stop_ticks=stop_ticks,
+        r_multiple=0.0,
+        entry_delay_bars=entry_delay_bars,
+        mae_r=None,
+        mfe_r=None,
+        execution_mode=execution_mode,
+        execution_params=execution_params,
+        slippage_ticks=0.0,
+        commission=0.0,
+        cost_r=0.0,
+        fill_ts=None,
+        realized_rr=None,
+        realized_risk_dollars=None,
+        realized_reward_dollars=None,
+        realized_expectancy=None
+    )
+
+
+def _pre_entry_skip(
+    orb_high: Optional[float],
+    orb_low: Optional[float],
+    atr: Optional[float],
+    apply_size_filter: bool,
+    size_filter_threshold: Optional[float],
+) -> Optional[str]:
+    """Skip outcome decided from daily_features alone (before any bars), else None."""
+    if orb_high is None or orb_low is None:
+        return 'SKIPPED_NO_ORB'
+
+    orb_range = orb_high - orb_low
+    if orb_range <= 0:
+        return 'SKIPPED_NO_ORB'
+
+    # Apply ORB size filter (NO LOOKAHEAD - ORB computed at orb close, before entry)
+    if apply_size_filter and size_filter_threshold is not None:
+        if atr is not None and atr > 0:
+            orb_size_norm = orb_range / atr
+
+            # Reject if ORB too large (exhaustion pattern)
+            if orb_size_norm > size_filter_threshold:
+                return 'SKIPPED_LARGE_ORB'
+
+    return None
+
+
+def _attempt_fill(
+    span: BarSpan,
+    exec_mode: ExecutionMode,
+    orb_high: float,
+    orb_low: float,
+    confirm_bars: int,
+    slippage_ticks: float,
+) -> FillResult:
+    """Entry fill for the chosen execution mode."""
     if exec_mode == ExecutionMode.MARKET_ON_CLOSE:
-        fill = attempt_market_on_close_fill(
-            bars=bars,
-            orb_high=orb_high,
-            orb_low=orb_low,
-            confirm_bars=confirm_bars,
-            slippage_ticks=slippage_ticks,
-            tick_size=TICK_SIZE
-        )
+        # Vectorized attempt_market_on_close_fill
+        idx, direction = first_confirmed_close(span.close, orb_high, orb_low, confirm_bars)
+        if idx is None:
+            return FillResult(filled=False, fill_price=None, fill_ts=None, fill_idx=None,
+                              slippage_ticks=0.0, direction=None)
+
+        close = float(span.close[idx])
+        slippage_price = slippage_ticks * TICK_SIZE
+        fill_price = close + slippage_price if direction == "UP" else close - slippage_price
+        return FillResult(filled=True, fill_price=fill_price, fill_ts=span.ts_str(idx), fill_idx=idx,
+                          slippage_ticks=slippage_ticks, direction=direction)
     elif exec_mode == ExecutionMode.LIMIT_AT_ORB:
-        fill = attempt_limit_at_orb_fill(
-            bars=bars,
+        return attempt_limit_at_orb_fill(
+            bars=span.rows(),
             orb_high=orb_high,
             orb_low=orb_low,
             tick_size=TICK_SIZE,
             penetration_ticks=2.0  # CONSERVATIVE: Require 2 ticks penetration (queue penalty)
         )
     elif exec_mode == ExecutionMode.LIMIT_RETRACE:
-        fill = attempt_limit_retrace_fill(
-            bars=bars,
+        return attempt_limit_retrace_fill(
+            bars=span.rows(),
             orb_high=orb_high,
             orb_low=orb_low,
             confirm_bars=confirm_bars,
@@ -351,30 +376,77 @@ def simulate_orb_trade(
     else:
         raise ValueError(f"Invalid execution mode: {exec_mode}")
 
+
+def _resolve_exit(
+    high: np.ndarray,
+    low: np.ndarray,
+    direction: str,
+    entry_price: float,
+    stop_price: float,
+    target_price: float,
+    rr: float,
+) -> Tuple[str, float, float, float]:
+    """
+    Outcome scan over the bars after entry (HIGH/LOW-based, vectorized).
+
+    Conservative: if stop and target are both hit in the same bar => LOSS.
+    MAE/MFE include the exit bar. Returns (outcome, r_multiple, max_fav_ticks, max_adv_ticks).
+    """
+    if direction == "UP":
+        fav = (high - entry_price) / TICK_SIZE
+        adv = (entry_price - low) / TICK_SIZE
+        hit_stop = low <= stop_price
+        hit_target = high >= target_price
+    else:  # DOWN
+        fav = (entry_price - low) / TICK_SIZE
+        adv = (high - entry_price) / TICK_SIZE
+        hit_stop = high >= stop_price
+        hit_target = low <= target_price
+
+    exits = np.flatnonzero(hit_stop | hit_target)
+    if len(exits):
+        k = int(exits[0])
+        if hit_stop[k]:
+            outcome, r_mult = "LOSS", -1.0
+        else:
+            outcome, r_mult = "WIN", float(rr)
+        fav = fav[:k + 1]
+        adv = adv[:k + 1]
+    else:
+        outcome, r_mult = "NO_TRADE", 0.0
+
+    max_fav_ticks = max(0.0, float(fav.max())) if len(fav) else 0.0
+    max_adv_ticks = max(0.0, float(adv.max())) if len(adv) else 0.0
+    return outcome, r_mult, max_fav_ticks, max_adv_ticks
+
+
+def _trade_from_span(
+    orb: str,
+    orb_high: float,
+    orb_low: float,
+    span: BarSpan,
+    confirm_bars: int,
+    rr: float,
+    sl_mode: str,
+    buffer_ticks: float,
+    max_stop_ticks: float,
+    asia_tp_cap_ticks: float,
+    exec_mode: ExecutionMode,
+    slippage_ticks: float,
+    commission_per_contract: float,
+    execution_mode: str,
+    execution_params: dict,
+) -> TradeResult:
+    """Entry, stop, target, outcome and costs for one date, given its ORB and bars."""
+    if len(span) == 0:
+        return _skipped_result('SKIPPED_NO_BARS', execution_mode, execution_params)
+
+    # Attempt fill based on execution mode
+    fill = _attempt_fill(span, exec_mode, orb_high, orb_low, confirm_bars, slippage_ticks)
+
     if not fill.filled:
-        return TradeResult(
-            outcome='SKIPPED_NO_ENTRY',
-            direction=fill.direction,
-            entry_ts=None,
-            entry_price=None,
-            stop_price=None,
-            target_price=None,
-            stop_ticks=None,
-            r_multiple=0.0,
-            entry_delay_bars=0,
-            mae_r=None,
-            mfe_r=None,
-            execution_mode=execution_mode,
-            execution_params=execution_params,
-            slippage_ticks=0.0,
-            commission=0.0,
-            cost_r=0.0,
-            fill_ts=None,
-            realized_rr=None,
-            realized_risk_dollars=None,
-            realized_reward_dollars=None,
-            realized_expectancy=None
-        )
+        return _skipped_result('SKIPPED_NO_ENTRY', execution_mode, execution_params,
+                               direction=fill.direction)
 
     # Fill successful - extract values
     entry_price = fill.fill_price
@@ -420,29 +492,10 @@ def simulate_orb_trade(
 
     # Filter: max stop
     if stop_ticks > max_stop_ticks:
-        return TradeResult(
-            outcome='SKIPPED_BIG_STOP',
-            direction=direction,
-            entry_ts=entry_ts,
-            entry_price=entry_price,
-            stop_price=stop_price,
-            target_price=None,
-            stop_ticks=stop_ticks,
-            r_multiple=0.0,
-            entry_delay_bars=entry_idx + 1,
-            mae_r=None,
-            mfe_r=None,
-            execution_mode=execution_mode,
-            execution_params=execution_params,
-            slippage_ticks=0.0,
-            commission=0.0,
-            cost_r=0.0,
-            fill_ts=None,
-            realized_rr=None,
-            realized_risk_dollars=None,
-            realized_reward_dollars=None,
-            realized_expectancy=None
-        )
+        return _skipped_result('SKIPPED_BIG_STOP', execution_mode, execution_params,
+                               direction=direction, entry_ts=entry_ts, entry_price=entry_price,
+                               stop_price=stop_price, stop_ticks=stop_ticks,
+                               entry_delay_bars=entry_idx + 1)
 
     # INTEGRITY GATE (MANDATORY): Check minimum viable risk
     # Prevents mathematically impossible trades where costs dominate stop
@@ -460,29 +513,11 @@ def simulate_orb_trade(
     )
 
     if not is_viable:
-        return TradeResult(
-            outcome='SKIPPED_COST_GATE',
-            direction=direction,
-            entry_ts=entry_ts,
-            entry_price=entry_price,
-            stop_price=stop_price,
-            target_price=None,
-            stop_ticks=stop_ticks,
-            r_multiple=0.0,
-            entry_delay_bars=entry_idx + 1,
-            mae_r=None,
-            mfe_r=None,
-            execution_mode=execution_mode,
-            execution_params={**execution_params, 'rejection_reason': gate_message},
-            slippage_ticks=0.0,
-            commission=0.0,
-            cost_r=0.0,
-            fill_ts=None,
-            realized_rr=None,
-            realized_risk_dollars=None,
-            realized_reward_dollars=None,
-            realized_expectancy=None
-        )
+        return _skipped_result('SKIPPED_COST_GATE', execution_mode,
+                               {**execution_params, 'rejection_reason': gate_message},
+                               direction=direction, entry_ts=entry_ts, entry_price=entry_price,
+                               stop_price=stop_price, stop_ticks=stop_ticks,
+                               entry_delay_bars=entry_idx + 1)
 
     # Target = entry +/- RR * risk
     risk = abs(entry_price - stop_price)
@@ -497,55 +532,10 @@ def simulate_orb_trade(
             target_price = max(target_price, entry_price - cap)
 
     # Outcome scan (HIGH/LOW-based, conservative: if both hit same bar => LOSS)
-    outcome = "NO_TRADE"
-    r_mult = 0.0
-    max_fav_ticks = 0.0
-    max_adv_ticks = 0.0
-
-    for _, high, low, close in bars[entry_idx + 1:]:
-        high = float(high)
-        low = float(low)
-
-        if direction == "UP":
-            max_fav_ticks = max(max_fav_ticks, (high - entry_price) / TICK_SIZE)
-            max_adv_ticks = max(max_adv_ticks, (entry_price - low) / TICK_SIZE)
-
-            hit_stop = low <= stop_price
-            hit_target = high >= target_price
-
-            # Conservative: both hit in same bar => LOSS
-            if hit_stop and hit_target:
-                outcome = "LOSS"
-                r_mult = -1.0
-                break
-            if hit_target:
-                outcome = "WIN"
-                r_mult = float(rr)
-                break
-            if hit_stop:
-                outcome = "LOSS"
-                r_mult = -1.0
-                break
-        else:  # DOWN
-            max_fav_ticks = max(max_fav_ticks, (entry_price - low) / TICK_SIZE)
-            max_adv_ticks = max(max_adv_ticks, (high - entry_price) / TICK_SIZE)
-
-            hit_stop = high >= stop_price
-            hit_target = low <= target_price
-
-            # Conservative: both hit in same bar => LOSS
-            if hit_stop and hit_target:
-                outcome = "LOSS"
-                r_mult = -1.0
-                break
-            if hit_target:
-                outcome = "WIN"
-                r_mult = float(rr)
-                break
-            if hit_stop:
-                outcome = "LOSS"
-                r_mult = -1.0
-                break
+    outcome, r_mult, max_fav_ticks, max_adv_ticks = _resolve_exit(
+        span.high[entry_idx + 1:], span.low[entry_idx + 1:],
+        direction, entry_price, stop_price, target_price, rr,
+    )
 
     entry_delay_bars_val = entry_idx + 1  # bars after ORB end until entry trigger
     mae_r = (max_adv_ticks / stop_ticks) if stop_ticks and stop_ticks > 0 else None
@@ -608,6 +598,179 @@ def simulate_orb_trade(
     )
 
 
+def _execution_params(date_local, orb: str, mode: str, confirm_bars: int, rr: float, sl_mode: str,
+                      buffer_ticks: float, entry_delay_bars: int, max_stop_ticks: float,
+                      asia_tp_cap_ticks: float) -> dict:
+    # Log execution parameters
+    return {
+        'date_local': str(date_local),
+        'orb': orb,
+        'mode': mode,
+        'confirm_bars': confirm_bars,
+        'rr': rr,
+        'sl_mode': sl_mode,
+        'buffer_ticks': buffer_ticks,
+        'entry_delay_bars': entry_delay_bars,
+        'max_stop_ticks': max_stop_ticks,
+        'asia_tp_cap_ticks': asia_tp_cap_ticks,
+    }
+
+
+def _validate_inputs(orb: str, mode: str, sl_mode: str, confirm_bars: int, rr: float) -> None:
+    assert orb in ORB_TIMES, f"Invalid ORB: {orb}"
+    assert mode in ("1m", "5m"), f"Invalid mode: {mode}"
+    assert sl_mode in ("full", "half"), f"Invalid sl_mode: {sl_mode}"
+    assert confirm_bars >= 1, f"confirm_bars must be >= 1"
+    assert rr > 0, f"RR must be > 0"
+
+
+def simulate_orb_trade(
+    con: duckdb.DuckDBPyConnection,
+    date_local: date,
+    orb: str,
+    mode: str = "1m",           # '1m' or '5m'
+    confirm_bars: int = 1,       # consecutive closes required
+    rr: float = 1.0,
+    sl_mode: str = "full",       # 'full' or 'half'
+    buffer_ticks: float = 0,     # entry buffer (DEPRECATED - use slippage_ticks instead)
+    entry_delay_bars: int = 0,   # wait N bars after confirmation (NOT IMPLEMENTED YET)
+    max_stop_ticks: float = 999999,  # filter: skip if stop > this
+    asia_tp_cap_ticks: float = 999999,  # Asia ORB target cap
+    apply_size_filter: bool = False,  # filter: skip if ORB too large vs ATR
+    size_filter_threshold: float = None,  # threshold for size filter (orb_size_norm)
+    exec_mode: ExecutionMode = ExecutionMode.MARKET_ON_CLOSE,  # NEW: Execution mode
+    slippage_ticks: float = 1.5,  # NEW: Slippage (only for MARKET_ON_CLOSE)
+    commission_per_contract: float = 1.0,  # NEW: Commission per contract
+) -> TradeResult:
+    """
+    Simulate a single ORB trade using realistic execution.
+
+    ENTRY METHOD: First `confirm_bars` consecutive closes outside ORB (not ORB edge).
+    STOP PLACEMENT: 'full' = opposite ORB edge, 'half' = ORB midpoint (clamped).
+    TARGET CALCULATION: entry +/- RR * risk.
+    SAME-BAR TP+SL: Conservative (both hit in same bar => LOSS).
+
+    Returns TradeResult with outcome, prices, and execution metadata.
+    For many dates of the same configuration use simulate_orb_trades_batch.
+    """
+    execution_params = _execution_params(date_local, orb, mode, confirm_bars, rr, sl_mode, buffer_ticks,
+                                         entry_delay_bars, max_stop_ticks, asia_tp_cap_ticks)
+    execution_mode = f"{mode}_confirm{confirm_bars}_rr{rr}_{sl_mode}"
+
+    # Validate inputs
+    _validate_inputs(orb, mode, sl_mode, confirm_bars, rr)
+
+    # Get ORB levels from daily_features
+    row = con.execute(f"""
+        SELECT orb_{orb}_high, orb_{orb}_low
+        FROM daily_features
+        WHERE date_local = ?
+    """, [date_local]).fetchone()
+    orb_high, orb_low = row if row else (None, None)
+
+    # ATR is only needed for the ORB size filter
+    atr = None
+    if (apply_size_filter and size_filter_threshold is not None
+            and orb_high is not None and orb_low is not None and orb_high - orb_low > 0):
+        atr_row = con.execute(f"""
+            SELECT atr_20
+            FROM daily_features
+            WHERE date_local = ?
+        """, [date_local]).fetchone()
+        atr = atr_row[0] if atr_row else None
+
+    skip = _pre_entry_skip(orb_high, orb_low, atr, apply_size_filter, size_filter_threshold)
+    if skip:
+        return _skipped_result(skip, execution_mode, execution_params)
+
+    start_ts_local, end_ts_local = _scan_window_local(orb, date_local)
+
+    # Choose bar timeframe
+    bars_table = "bars_1m" if mode == "1m" else "bars_5m"
+    span = _load_bar_span(con, bars_table, start_ts_local, end_ts_local)
+
+    return _trade_from_span(
+        orb, orb_high, orb_low, span, confirm_bars, rr, sl_mode, buffer_ticks, max_stop_ticks,
+        asia_tp_cap_ticks, exec_mode, slippage_ticks, commission_per_contract,
+        execution_mode, execution_params,
+    )
+
+
+def simulate_orb_trades_batch(
+    con: duckdb.DuckDBPyConnection,
+    dates: List[date],
+    orb: str,
+    mode: str = "1m",
+    confirm_bars: int = 1,
+    rr: float = 1.0,
+    sl_mode: str = "full",
+    buffer_ticks: float = 0,
+    entry_delay_bars: int = 0,
+    max_stop_ticks: float = 999999,
+    asia_tp_cap_ticks: float = 999999,
+    apply_size_filter: bool = False,
+    size_filter_threshold: float = None,
+    exec_mode: ExecutionMode = ExecutionMode.MARKET_ON_CLOSE,
+    slippage_ticks: float = 1.5,
+    commission_per_contract: float = 1.0,
+    bar_store: Optional[BarStore] = None,
+) -> List[TradeResult]:
+    """
+    Simulate one ORB configuration over many dates.
+
+    Returns one TradeResult per input date, in input order, identical to calling
+    simulate_orb_trade for each date. Instead of three queries per date it issues
+    two in total: ORB levels + ATR for all dates, then the bars of every scan
+    window in one range join. Entries and exits are resolved with numpy.
+
+    With bar_store (pipeline/bar_store.py, mode '1m'), scan windows are sliced
+    from the memory-mapped bar store instead of the range join.
+    """
+    _validate_inputs(orb, mode, sl_mode, confirm_bars, rr)
+    execution_mode = f"{mode}_confirm{confirm_bars}_rr{rr}_{sl_mode}"
+
+    dates = list(dates)
+    if not dates:
+        return []
+    keys = [_as_date(d) for d in dates]
+    unique_keys = sorted(set(keys))
+
+    # ORB levels + ATR for every date (first row per date, as fetchone() would)
+    levels: Dict[date, Tuple] = {}
+    for d, orb_high, orb_low, atr in con.execute(f"""
+        SELECT date_local, orb_{orb}_high, orb_{orb}_low, atr_20
+        FROM daily_features
+        WHERE date_local IN (SELECT unnest(?::DATE[]))
+    """, [unique_keys]).fetchall():
+        levels.setdefault(d, (orb_high, orb_low, atr))
+
+    skips = {
+        d: _pre_entry_skip(*levels.get(d, (None, None, None)), apply_size_filter, size_filter_threshold)
+        for d in unique_keys
+    }
+
+    bars_table = "bars_1m" if mode == "1m" else "bars_5m"
+    spans = _load_bar_spans(
+        con, bars_table, {d: _scan_window_local(orb, d) for d in unique_keys if skips[d] is None}, bar_store
+    )
+
+    results = []
+    for date_local, d in zip(dates, keys):
+        execution_params = _execution_params(date_local, orb, mode, confirm_bars, rr, sl_mode, buffer_ticks,
+                                             entry_delay_bars, max_stop_ticks, asia_tp_cap_ticks)
+        if skips[d]:
+            results.append(_skipped_result(skips[d], execution_mode, execution_params))
+            continue
+
+        orb_high, orb_low, _ = levels[d]
+        results.append(_trade_from_span(
+            orb, orb_high, orb_low, spans[d], confirm_bars, rr, sl_mode, buffer_ticks, max_stop_ticks,
+            asia_tp_cap_ticks, exec_mode, slippage_ticks, commission_per_contract,
+            execution_mode, execution_params,
+        ))
+    return results
+
+
 # Logging helper
 def log_execution(result: TradeResult, verbose: bool = False):
     """Log execution result with mode and parameters"""
@@ -17,6 +17,8 @@ from enum import Enum
 from typing import Optional, Tuple, List
 from dataclasses import dataclass
 
+import numpy as np
+
 
 class ExecutionMode(Enum):
     """
@@ -134,6 +136,34 @@ def attempt_market_on_close_fill(
     )
 
 
+def first_confirmed_close(
+    closes: np.ndarray,
+    orb_high: float,
+    orb_low: float,
+    confirm_bars: int
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Vectorized MARKET_ON_CLOSE signal: index and direction of the first bar that
+    completes `confirm_bars` consecutive closes outside the ORB on the same side.
+
+    Same rule as attempt_market_on_close_fill (a close inside the ORB or on the
+    other side restarts the count). Returns (None, None) if no signal fires.
+    """
+    side = np.where(closes > orb_high, 1, np.where(closes < orb_low, -1, 0))
+    if confirm_bars == 1:
+        hits = np.flatnonzero(side != 0)
+    else:
+        # Run length of identical consecutive sides
+        idx = np.arange(len(side))
+        run_start = np.concatenate(([True], side[1:] != side[:-1]))
+        run_len = idx - np.maximum.accumulate(np.where(run_start, idx, 0)) + 1
+        hits = np.flatnonzero((side != 0) & (run_len >= confirm_bars))
+    if len(hits) == 0:
+        return None, None
+    i = int(hits[0])
+    return i, ("UP" if side[i] > 0 else "DOWN")
+
+
 def attempt_limit_at_orb_fill(
     bars: List[Tuple],
     orb_high: float,
@@ -0,0 +1,370 @@
+"""
+PARAMETER-GRID ORB SIMULATOR
+============================
+
+Evaluates many execution parameter combinations against ONE day's bars in a
+single pass, with the same rules as execution_engine.py:
+- Entry per ExecutionMode (first confirmed close / ORB penetration / retrace)
+- Stop at FULL (opposite edge), HALF (midpoint, clamped) or a fraction of the
+  ORB size measured from entry (sl_mode given as a float, used by the
+  stop-fraction optimizers)
+- Target = entry +/- RR * risk (Asia TP cap optional)
+- Same-bar TP+SL resolves conservatively as LOSS
+- MAE/MFE up to and including the exit bar
+
+How the grid shares work:
+1. Entries are computed once per (exec_mode, confirm_bars).
+2. Running max(high) / min(low) after each distinct entry bar are computed once.
+3. For every (buffer_ticks, sl_mode) the stop's first-touch bar is one
+   searchsorted, and the first-touch bars of ALL rr targets are one vectorized
+   searchsorted.
+
+So a full stop x RR sweep costs about as much as one simulation.
+
+Usage:
+    from strategies.grid_simulator import build_grid, simulate_grid
+
+    grid = build_grid(rr_values=[1.0, 1.5, 2.0, 3.0], sl_modes=["full", "half"], confirm_bars=[1, 2])
+
+    # One day's arrays (bars after the ORB window, in time order)
+    result = simulate_grid(high, low, close, orb_high, orb_low, grid, orb="1000")
+
+    # Or many days straight from the database (2 queries in total)
+    by_date = simulate_grid_days(con, dates, "1000", grid)
+    for point, outcome, r in zip(result.grid, result.outcome, result.r_multiple):
+        ...
+"""
+
+import itertools
+from datetime import date
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import duckdb
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.execution_engine import (
+    SYMBOL, TICK_SIZE, POINT_VALUE, _as_date, _is_asia, _load_bar_spans, _scan_window_local,
+)
+from strategies.execution_modes import (
+    ExecutionMode,
+    attempt_limit_at_orb_fill,
+    attempt_limit_retrace_fill,
+    first_confirmed_close,
+)
+from pipeline.bar_store import BarStore
+from pipeline.cost_model import check_minimum_viable_risk, COST_MODELS
+
+
+@dataclass(frozen=True)
+class GridPoint:
+    """One parameter combination."""
+    rr: float
+    sl_mode: Union[str, float] = "full"  # 'full', 'half', or stop fraction of ORB size from entry
+    confirm_bars: int = 1
+    buffer_ticks: float = 0
+    exec_mode: ExecutionMode = ExecutionMode.MARKET_ON_CLOSE
+
+
+def build_grid(
+    rr_values: Iterable[float],
+    sl_modes: Iterable[Union[str, float]] = ("full",),
+    confirm_bars: Iterable[int] = (1,),
+    buffer_ticks: Iterable[float] = (0,),
+    exec_modes: Iterable[ExecutionMode] = (ExecutionMode.MARKET_ON_CLOSE,),
+) -> List[GridPoint]:
+    """Cartesian product of parameter values."""
+    return [
+        GridPoint(rr=rr, sl_mode=sl, confirm_bars=cb, buffer_ticks=buf, exec_mode=mode)
+        for mode, cb, buf, sl, rr in itertools.product(
+            exec_modes, confirm_bars, buffer_ticks, sl_modes, rr_values
+        )
+    ]
+
+
+@dataclass
+class GridResult:
+    """
+    Per-grid-point results, all arrays aligned with `grid`.
+
+    Missing values are NaN (floats) or -1 (indices). Outcomes use the
+    execution_engine vocabulary: WIN, LOSS, NO_TRADE, SKIPPED_NO_ENTRY,
+    SKIPPED_BIG_STOP, SKIPPED_COST_GATE.
+    """
+    grid: List[GridPoint]
+    outcome: np.ndarray
+    direction: np.ndarray
+    entry_idx: np.ndarray       # bar index of the entry fill
+    exit_idx: np.ndarray        # bar index of the stop/target touch
+    entry_price: np.ndarray
+    stop_price: np.ndarray
+    target_price: np.ndarray
+    stop_ticks: np.ndarray
+    r_multiple: np.ndarray      # RR on WIN, -1.0 on LOSS, 0.0 otherwise (THEORETICAL)
+    mae_r: np.ndarray
+    mfe_r: np.ndarray
+    cost_r: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        def _opt(x):
+            return None if np.isnan(x) else float(x)
+
+        return {
+            "grid_point": self.grid[i],
+            "outcome": self.outcome[i],
+            "direction": self.direction[i],
+            "entry_idx": int(self.entry_idx[i]) if self.entry_idx[i] >= 0 else None,
+            "exit_idx": int(self.exit_idx[i]) if self.exit_idx[i] >= 0 else None,
+            "entry_price": _opt(self.entry_price[i]),
+            "stop_price": _opt(self.stop_price[i]),
+            "target_price": _opt(self.target_price[i]),
+            "stop_ticks": _opt(self.stop_ticks[i]),
+            "r_multiple": float(self.r_multiple[i]),
+            "mae_r": _opt(self.mae_r[i]),
+            "mfe_r": _opt(self.mfe_r[i]),
+            "cost_r": float(self.cost_r[i]),
+        }
+
+
+def _empty_result(grid: List[GridPoint], outcome: str = "SKIPPED_NO_ENTRY") -> GridResult:
+    n = len(grid)
+    nan = np.full(n, np.nan)
+    return GridResult(
+        grid=grid,
+        outcome=np.full(n, outcome, dtype=object),
+        direction=np.full(n, None, dtype=object),
+        entry_idx=np.full(n, -1),
+        exit_idx=np.full(n, -1),
+        entry_price=nan.copy(),
+        stop_price=nan.copy(),
+        target_price=nan.copy(),
+        stop_ticks=nan.copy(),
+        r_multiple=np.zeros(n),
+        mae_r=nan.copy(),
+        mfe_r=nan.copy(),
+        cost_r=np.zeros(n),
+    )
+
+
+def _fill(high: np.ndarray, low: np.ndarray, close: np.ndarray, orb_high: float, orb_low: float,
+          exec_mode: ExecutionMode, confirm_bars: int, slippage_ticks: float
+          ) -> Tuple[Optional[int], Optional[float], Optional[str], float]:
+    """(entry_idx, fill_price, direction, slippage_ticks) - same fills as execution_engine."""
+    if exec_mode == ExecutionMode.MARKET_ON_CLOSE:
+        idx, direction = first_confirmed_close(close, orb_high, orb_low, confirm_bars)
+        if idx is None:
+            return None, None, None, 0.0
+        fill_close = float(close[idx])
+        slippage_price = slippage_ticks * TICK_SIZE
+        price = fill_close + slippage_price if direction == "UP" else fill_close - slippage_price
+        return idx, price, direction, slippage_ticks
+
+    rows = list(zip(range(len(close)), high.tolist(), low.tolist(), close.tolist()))
+    if exec_mode == ExecutionMode.LIMIT_AT_ORB:
+        fill = attempt_limit_at_orb_fill(rows, orb_high, orb_low, TICK_SIZE, penetration_ticks=2.0)
+    elif exec_mode == ExecutionMode.LIMIT_RETRACE:
+        fill = attempt_limit_retrace_fill(rows, orb_high, orb_low, confirm_bars, TICK_SIZE,
+                                          adverse_slippage_ticks=slippage_ticks)
+    else:
+        raise ValueError(f"Invalid execution mode: {exec_mode}")
+    if not fill.filled:
+        return None, None, fill.direction, 0.0
+    return fill.fill_idx, fill.fill_price, fill.direction, fill.slippage_ticks
+
+
+def _stop_price(sl_mode: Union[str, float], direction: str, entry_price: float,
+                orb_high: float, orb_low: float) -> float:
+    if sl_mode == "half":
+        orb_mid = (orb_high + orb_low) / 2.0
+        if direction == "UP":
+            return max(orb_low, orb_mid)  # clamped to ORB low
+        return min(orb_high, orb_mid)  # clamped to ORB high
+    if sl_mode == "full":
+        return orb_low if direction == "UP" else orb_high
+    # Stop at fraction of ORB from entry
+    risk = (orb_high - orb_low) * float(sl_mode)
+    return entry_price - risk if direction == "UP" else entry_price + risk
+
+
+def simulate_grid(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    orb_high: float,
+    orb_low: float,
+    grid: Sequence[GridPoint],
+    orb: Optional[str] = None,
+    slippage_ticks: float = 1.5,
+    commission_per_contract: float = 1.0,
+    max_stop_ticks: float = 999999,
+    asia_tp_cap_ticks: float = 999999,
+    cost_gate: bool = True,
+) -> GridResult:
+    """
+    Simulate every grid point on one day's scan-window bars.
+
+    high/low/close: bars after the ORB window closes, in time order (the same
+    bars execution_engine scans). orb: ORB name, only needed for the Asia TP cap.
+    cost_gate: apply the minimum-viable-risk integrity gate (execution_engine
+    always does; research scripts with their own cost model can turn it off).
+    """
+    grid = list(grid)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    if len(close) == 0:
+        return _empty_result(grid, "SKIPPED_NO_BARS")
+    res = _empty_result(grid)
+
+    cap = asia_tp_cap_ticks * TICK_SIZE if (orb is not None and _is_asia(orb) and asia_tp_cap_ticks < 999999) else None
+    total_friction = COST_MODELS[SYMBOL]['total_friction']
+    paths: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    groups: Dict[Tuple, Dict[Tuple, List[int]]] = {}
+    for i, p in enumerate(grid):
+        groups.setdefault((p.exec_mode, p.confirm_bars), {}).setdefault((p.buffer_ticks, p.sl_mode), []).append(i)
+
+    for (exec_mode, confirm_bars), stops in groups.items():
+        entry_idx, fill_price, direction, fill_slippage = _fill(
+            high, low, close, orb_high, orb_low, exec_mode, confirm_bars, slippage_ticks
+        )
+        if entry_idx is None:
+            for idxs in stops.values():
+                res.direction[idxs] = direction
+            continue
+
+        # Running extremes after entry, shared by every stop/target of this entry
+        if entry_idx not in paths:
+            paths[entry_idx] = (np.maximum.accumulate(high[entry_idx + 1:]),
+                                np.minimum.accumulate(low[entry_idx + 1:]))
+        run_high, run_low = paths[entry_idx]
+        neg_run_low = -run_low
+        n_after = len(run_high)
+
+        for (buffer_ticks, sl_mode), idxs in stops.items():
+            idxs = np.asarray(idxs)
+            entry_price = fill_price
+            if buffer_ticks > 0:
+                entry_price = entry_price + buffer_ticks * TICK_SIZE if direction == "UP" else entry_price - buffer_ticks * TICK_SIZE
+            stop_price = _stop_price(sl_mode, direction, entry_price, orb_high, orb_low)
+            stop_ticks = abs(entry_price - stop_price) / TICK_SIZE
+
+            res.direction[idxs] = direction
+            res.entry_idx[idxs] = entry_idx
+            res.entry_price[idxs] = entry_price
+            res.stop_price[idxs] = stop_price
+            res.stop_ticks[idxs] = stop_ticks
+
+            if stop_ticks > max_stop_ticks:
+                res.outcome[idxs] = "SKIPPED_BIG_STOP"
+                continue
+            if cost_gate:
+                is_viable, _, _ = check_minimum_viable_risk(
+                    stop_distance_points=stop_ticks * TICK_SIZE,
+                    point_value=POINT_VALUE,
+                    total_friction=total_friction,
+                )
+                if not is_viable:
+                    res.outcome[idxs] = "SKIPPED_COST_GATE"
+                    continue
+
+            rr = np.array([grid[i].rr for i in idxs], dtype=float)
+            risk = abs(entry_price - stop_price)
+            if direction == "UP":
+                targets = entry_price + rr * risk
+                if cap is not None:
+                    targets = np.minimum(targets, entry_price + cap)
+                t_stop = int(np.searchsorted(neg_run_low, -stop_price, side="left"))
+                t_target = np.searchsorted(run_high, targets, side="left")
+            else:
+                targets = entry_price - rr * risk
+                if cap is not None:
+                    targets = np.maximum(targets, entry_price - cap)
+                t_stop = int(np.searchsorted(run_high, stop_price, side="left"))
+                t_target = np.searchsorted(neg_run_low, -targets, side="left")
+
+            # Conservative: stop on or before the target bar => LOSS
+            loss = (t_stop < n_after) & (t_stop <= t_target)
+            win = ~loss & (t_target < n_after)
+            exit_after = np.where(loss, t_stop, np.where(win, t_target, n_after - 1))
+
+            res.target_price[idxs] = targets
+            res.outcome[idxs] = np.where(loss, "LOSS", np.where(win, "WIN", "NO_TRADE"))
+            res.r_multiple[idxs] = np.where(loss, -1.0, np.where(win, rr, 0.0))
+            res.exit_idx[idxs] = np.where(loss | win, entry_idx + 1 + exit_after, -1)
+
+            if n_after:
+                k = np.maximum(exit_after, 0)
+                if direction == "UP":
+                    max_fav = np.maximum(0.0, (run_high[k] - entry_price) / TICK_SIZE)
+                    max_adv = np.maximum(0.0, (entry_price - run_low[k]) / TICK_SIZE)
+                else:
+                    max_fav = np.maximum(0.0, (entry_price - run_low[k]) / TICK_SIZE)
+                    max_adv = np.maximum(0.0, (run_high[k] - entry_price) / TICK_SIZE)
+            else:
+                max_fav = max_adv = np.zeros(len(idxs))
+            if stop_ticks > 0:
+                res.mae_r[idxs] = max_adv / stop_ticks
+                res.mfe_r[idxs] = max_fav / stop_ticks
+
+            # Cost in R (slippage + commission / risk)
+            risk_dollars = stop_ticks * TICK_SIZE * POINT_VALUE
+            total_cost_dollars = fill_slippage * TICK_SIZE * POINT_VALUE + commission_per_contract
+            res.cost_r[idxs] = total_cost_dollars / risk_dollars if risk_dollars > 0 else 0.0
+
+    return res
+
+
+def simulate_grid_days(
+    con: duckdb.DuckDBPyConnection,
+    dates: Iterable[date],
+    orb: str,
+    grid: Sequence[GridPoint],
+    mode: str = "1m",
+    bar_store: Optional[BarStore] = None,
+    **kwargs,
+) -> Dict[date, GridResult]:
+    """
+    simulate_grid over many dates, reading ORB levels from daily_features and
+    bars the way execution_engine.simulate_orb_trades_batch does (two queries,
+    or one plus bar store slices when bar_store is given).
+
+    Dates without a valid ORB get outcome SKIPPED_NO_ORB for every grid point.
+    kwargs are passed through to simulate_grid.
+    """
+    grid = list(grid)
+    keys = sorted({_as_date(d) for d in dates})
+    if not keys:
+        return {}
+
+    # First row per date, as execution_engine reads it
+    rows: Dict[date, Tuple] = {}
+    for d, orb_high, orb_low in con.execute(f"""
+        SELECT date_local, orb_{orb}_high, orb_{orb}_low
+        FROM daily_features
+        WHERE date_local IN (SELECT unnest(?::DATE[]))
+    """, [keys]).fetchall():
+        rows.setdefault(d, (orb_high, orb_low))
+    levels = {
+        d: (orb_high, orb_low) for d, (orb_high, orb_low) in rows.items()
+        if orb_high is not None and orb_low is not None and orb_high > orb_low
+    }
+
+    bars_table = "bars_1m" if mode == "1m" else "bars_5m"
+    spans = _load_bar_spans(con, bars_table, {d: _scan_window_local(orb, d) for d in levels}, bar_store)
+
+    results = {}
+    for d in keys:
+        if d not in levels:
+            results[d] = _empty_result(grid, "SKIPPED_NO_ORB")
+            continue
+        span = spans[d]
+        results[d] = simulate_grid(span.high, span.low, span.close, *levels[d], grid, orb=orb, **kwargs)
+    return results
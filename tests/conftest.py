@@ -4,10 +4,15 @@ Pytest configuration and shared fixtures for testing framework.
 This file provides reusable test fixtures for all test modules.
 """
 
+import math
+import shutil
 import pytest
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime
+import duckdb
+import numpy as np
+import pandas as pd
 import pytz
 
 # Add project root and trading_app to Python path
@@ -21,6 +26,9 @@ from strategy_engine import StrategyEngine, StrategyEvaluation, ActionType, Stra
 from setup_detector import SetupDetector
 from data_loader import LiveDataLoader
 import config
+from pipeline.build_daily_features import FeatureBuilder, _feature_columns
+from scripts.migrations.create_auto_search_tables import create_auto_search_tables
+from benchmarks.synthetic_market import SEARCH_SETTINGS, add_what_if_columns
 
 
 @pytest.fixture
@@ -292,10 +300,6 @@ def test_db_path():
 # NEW FIXTURES FOR TRADING APP TESTS
 # ==============================================================================
 
-import duckdb
-from datetime import date, timedelta
-
-
 @pytest.fixture
 def test_db(tmp_path):
     """Temporary DuckDB test database with schema"""
@@ -510,3 +514,198 @@ def populated_test_db(test_db, sample_market_data, sample_validated_setups):
     conn.close()
     yield test_db  # Return the db path
     # Database cleanup handled by test_db fixture
+
+
+# ==============================================================================
+# SYNTHETIC BAR / FEATURE DATABASES (pipeline, execution, search and cache tests)
+# ==============================================================================
+
+# Feature range built over the synthetic bars (spans a month boundary)
+START = date(2025, 1, 6)
+END = date(2025, 2, 14)
+
+# Combinations one AutoSearchEngine run over SEARCH_SETTINGS scores (no filter + each SIZE range)
+SEARCH_COMBOS = (
+    len(SEARCH_SETTINGS['orb_times']) * len(SEARCH_SETTINGS['rr_targets'])
+    * (1 + len(SEARCH_SETTINGS['filter_ranges']['SIZE']))
+)
+
+_VIEW_ORBS = ("0900", "1000", "1100", "1800", "2300", "0030")
+
+
+def make_bars_db(db_path: str, seed: int = 7) -> None:
+    """Random-walk 1m bars (weekdays only) plus derived bars_5m."""
+    rng = np.random.default_rng(seed)
+    con = duckdb.connect(db_path)
+    for table in ("bars_1m", "bars_5m"):
+        con.execute(f"""
+            CREATE TABLE {table} (
+                ts_utc TIMESTAMPTZ NOT NULL,
+                symbol VARCHAR NOT NULL,
+                source_symbol VARCHAR,
+                open DOUBLE, high DOUBLE, low DOUBLE, close DOUBLE,
+                volume BIGINT,
+                PRIMARY KEY (symbol, ts_utc)
+            )
+        """)
+
+    ts = pd.date_range("2024-12-01", "2025-02-17", freq="1min", inclusive="left", tz="UTC")
+    ts = ts[ts.dayofweek < 5]
+    n = len(ts)
+    closes = np.round(2650.0 + np.cumsum(rng.normal(0, 0.6, n)), 1)
+    opens = np.concatenate([[2650.0], closes[:-1]])
+    highs = np.round(np.maximum(opens, closes) + np.abs(rng.normal(0, 0.3, n)), 1)
+    lows = np.round(np.minimum(opens, closes) - np.abs(rng.normal(0, 0.3, n)), 1)
+    bars = pd.DataFrame({
+        "ts_utc": ts, "symbol": "MGC", "source_symbol": "MGCG5",
+        "open": opens, "high": highs, "low": lows, "close": closes,
+        "volume": rng.integers(1, 200, n),
+    })
+
+    con.register("bars_df", bars)
+    con.execute("INSERT INTO bars_1m SELECT * FROM bars_df")
+    con.unregister("bars_df")
+    con.execute("""
+        INSERT INTO bars_5m
+        SELECT
+          to_timestamp(floor(epoch(ts_utc) / 300) * 300) AS ts_5m,
+          symbol,
+          arg_max(source_symbol, ts_utc),
+          arg_min(open, ts_utc),
+          max(high),
+          min(low),
+          arg_max(close, ts_utc),
+          sum(volume)
+        FROM bars_1m
+        GROUP BY 1, 2
+    """)
+    con.close()
+
+
+def build_features(db_path: str, start: date = START, end: date = END, sl_mode: str = "full") -> None:
+    """Bulk-build daily_features (daily_features_half for sl_mode='half') over [start, end]."""
+    table_name = "daily_features_half" if sl_mode == "half" else "daily_features"
+    builder = FeatureBuilder(db_path=db_path, sl_mode=sl_mode, table_name=table_name)
+    builder.init_schema()
+    builder._ensure_schema_columns(auto_migrate=True)
+    builder.build_features_bulk(start, end)
+    builder.close()
+
+
+def fetch_feature_rows(db_path: str, table_name: str = "daily_features"):
+    """(feature columns, rows ordered by date_local) of a features table."""
+    columns = _feature_columns()
+    con = duckdb.connect(db_path)
+    rows = con.execute(
+        f"SELECT {', '.join(columns)} FROM {table_name} ORDER BY date_local"
+    ).fetchall()
+    con.close()
+    return columns, rows
+
+
+def same_value(a, b) -> bool:
+    """Equality where None only matches None and NaN matches NaN."""
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (math.isnan(a) and math.isnan(b))
+    return a == b
+
+
+def make_views_db(path: str):
+    """Minimal daily_features / v_orb_trades / bars_1m for the query_engine views (open connection)."""
+    con = duckdb.connect(path)
+    orb_cols = ", ".join(f"orb_{o}_{c} DOUBLE" for o in _VIEW_ORBS for c in ("high", "low", "size"))
+    con.execute(f"""
+        CREATE TABLE daily_features (
+            date_local DATE, instrument VARCHAR, asia_type_code VARCHAR, london_type_code VARCHAR,
+            pre_ny_type_code VARCHAR, asia_range DOUBLE, london_range DOUBLE, pre_ny_range DOUBLE,
+            atr_20 DOUBLE, {orb_cols}
+        );
+        CREATE TABLE v_orb_trades (
+            date_local DATE, instrument VARCHAR, orb_time VARCHAR, break_dir VARCHAR,
+            outcome VARCHAR, r_multiple DOUBLE
+        );
+        CREATE TABLE bars_1m (ts_utc TIMESTAMPTZ, symbol VARCHAR, close DOUBLE);
+    """)
+    days = pd.date_range("2025-01-06", periods=20, freq="D").date
+    for i, d in enumerate(days):
+        orbs = ", ".join(f"{2650 + i}, {2648 + i}, 2.0" for _ in _VIEW_ORBS)
+        con.execute(f"""INSERT INTO daily_features VALUES (?, 'MGC', ?, ?, NULL, 5, 6, 7, 20, {orbs})""",
+                    [d, "A1" if i % 2 else "A2", "L1" if i % 3 else "L2"])
+        for j, orb in enumerate(_VIEW_ORBS[:3]):
+            outcome = ("WIN", "LOSS", "NO_TRADE")[(i + j) % 3]
+            r = {"WIN": 1.0, "LOSS": -1.0, "NO_TRADE": None}[outcome]
+            con.execute("INSERT INTO v_orb_trades VALUES (?, 'MGC', ?, ?, ?, ?)",
+                        [d, orb, "UP" if (i + j) % 2 else "DOWN", outcome, r])
+    return con
+
+
+class CountingConnection:
+    """Records execute() SQL (whitespace collapsed); everything else passes through."""
+
+    def __init__(self, con):
+        self.con = con
+        self.sql = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.sql)
+
+    def execute(self, sql, *args, **kwargs):
+        self.sql.append(" ".join(sql.split()))
+        return self.con.execute(sql, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.con, name)
+
+
+@pytest.fixture(scope="session")
+def bars_db(tmp_path_factory):
+    """Synthetic bars only. Read-only: copy it before writing."""
+    db_path = str(tmp_path_factory.mktemp("bars") / "bars.db")
+    make_bars_db(db_path)
+    return db_path
+
+
+@pytest.fixture(scope="session")
+def features_db(bars_db, tmp_path_factory):
+    """Synthetic bars plus daily_features over [START, END]. Read-only: copy it before writing."""
+    db_path = str(tmp_path_factory.mktemp("features") / "features.db")
+    shutil.copy(bars_db, db_path)
+    build_features(db_path)
+    return db_path
+
+
+@pytest.fixture(scope="session")
+def what_if_db(features_db, tmp_path_factory):
+    """features_db plus the daily_features columns the What-If queries read."""
+    db_path = str(tmp_path_factory.mktemp("what_if") / "features.db")
+    shutil.copy(features_db, db_path)
+
+    con = duckdb.connect(db_path)
+    add_what_if_columns(con)
+    con.close()
+    return db_path
+
+
+@pytest.fixture(scope="session")
+def search_base_db(features_db, tmp_path_factory):
+    """features_db plus the auto-search and search_knowledge tables. Read-only: use search_db to write."""
+    db_path = str(tmp_path_factory.mktemp("search") / "base.db")
+    shutil.copy(features_db, db_path)
+    create_auto_search_tables(db_path)
+    with open(PROJECT_ROOT / "pipeline" / "schema_search_knowledge.sql", encoding="utf-8") as f:
+        schema = f.read()
+    con = duckdb.connect(db_path)
+    con.execute(schema)
+    con.close()
+    return db_path
+
+
+@pytest.fixture
+def search_db(search_base_db, tmp_path):
+    """Writable per-test copy of search_base_db."""
+    db_path = str(tmp_path / "search.db")
+    shutil.copy(search_base_db, db_path)
+    return db_path
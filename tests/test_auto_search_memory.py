@@ -0,0 +1,113 @@
+"""
+Tests for AutoSearchEngine search_memory dedup and buffered writes.
+
+Known hashes are loaded once per run, results are flushed in bulk, and
+everything flushed before a timeout or crash is kept and skipped on the
+next run.
+"""
+
+import duckdb
+import pytest
+
+import auto_search_engine
+from auto_search_engine import AutoSearchEngine, HashBloomFilter, SearchMemoryIndex, compute_param_hash
+from tests.conftest import SEARCH_COMBOS, SEARCH_SETTINGS, CountingConnection
+
+
+def _counts(con):
+    return tuple(
+        con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("search_candidates", "search_memory", "search_knowledge")
+    )
+
+
+def test_second_run_skips_everything_without_point_queries(search_db):
+    con = CountingConnection(duckdb.connect(search_db))
+    first = AutoSearchEngine(con).run_search('MGC', SEARCH_SETTINGS, max_seconds=120)
+    assert first['stats']['tested'] == SEARCH_COMBOS
+    assert first['stats']['promising'] > 0
+    promising = first['stats']['promising']
+    assert _counts(con) == (promising, promising, promising)
+
+    # No per-combination lookups or inserts
+    assert not any(sql.startswith("SELECT 1 FROM search_memory") for sql in con.sql)
+    assert sum(sql.startswith("INSERT INTO search_memory") for sql in con.sql) == 1
+
+    second = AutoSearchEngine(con).run_search('MGC', SEARCH_SETTINGS, max_seconds=120)
+    assert second['stats']['skipped'] == promising
+    assert second['stats']['tested'] == SEARCH_COMBOS - promising
+    assert _counts(con)[1] == promising
+    con.close()
+
+
+def test_crash_keeps_checkpointed_work(search_db, monkeypatch):
+    monkeypatch.setattr(auto_search_engine, 'CHECKPOINT_ROWS', 3)
+    con = duckdb.connect(search_db)
+    engine = AutoSearchEngine(con)
+
+    real_score = engine._score_candidate
+    calls = {'n': 0}
+
+    def flaky_score(combo, settings):
+        calls['n'] += 1
+        if calls['n'] == 10:
+            raise RuntimeError("worker died")
+        return real_score(combo, settings)
+
+    engine._score_candidate = flaky_score
+    with pytest.raises(RuntimeError):
+        engine.run_search('MGC', SEARCH_SETTINGS, max_seconds=120)
+
+    # Everything scored before the crash was flushed (checkpoints + final flush)
+    saved = _counts(con)[1]
+    assert saved == engine.stats['promising'] > 0
+    status, tested = con.execute("SELECT status, total_tested FROM search_runs").fetchone()
+    assert status == 'FAILED' and tested == 9
+
+    # A fresh run resumes: flushed combinations are skipped
+    resumed = AutoSearchEngine(con).run_search('MGC', SEARCH_SETTINGS, max_seconds=120)
+    assert resumed['stats']['skipped'] == saved
+    con.close()
+
+
+def test_failed_flush_leaves_nothing_half_written(search_db):
+    con = duckdb.connect(search_db)
+    engine = AutoSearchEngine(con)
+    engine.run_search('MGC', SEARCH_SETTINGS, max_seconds=120)
+    before = _counts(con)
+
+    # A candidate with a NULL rr_target violates NOT NULL in search_candidates
+    engine._pending_candidates.append({
+        'id': 1, 'run_id': 'x', 'created_at': None, 'instrument': 'MGC', 'setup_family': 'ORB_BASELINE',
+        'orb_time': '0900', 'rr_target': None, 'filters_json': '{}', 'param_hash': 'f' * 16,
+        'score_proxy': 0.0, 'sample_size': 1, 'win_rate_proxy': None, 'expected_r_proxy': None,
+        'notes': '', 'profitable_trade_rate': None, 'target_hit_rate': None,
+    })
+    engine._pending_memory['f' * 16] = {
+        'memory_id': 1, 'param_hash': 'f' * 16, 'instrument': 'MGC', 'setup_family': 'ORB_BASELINE',
+        'filters_json': '{}', 'first_seen_at': None, 'last_seen_at': None, 'test_count': 1, 'best_score': 0.0,
+    }
+    with pytest.raises(duckdb.Error):
+        engine._flush_pending()
+    assert _counts(con) == before
+    assert engine._pending_rows() == 2  # still buffered
+    con.close()
+
+
+def test_bloom_filter_index_for_large_tables(search_db):
+    con = duckdb.connect(search_db)
+    AutoSearchEngine(con).run_search('MGC', SEARCH_SETTINGS, max_seconds=120)
+    known = [r[0] for r in con.execute("SELECT param_hash FROM search_memory").fetchall()]
+
+    index = SearchMemoryIndex(con, 'MGC', max_set_size=0)
+    assert index.bloom is not None and not index.known
+    assert all(h in index for h in known)
+    assert compute_param_hash({'instrument': 'MGC', 'orb_time': 'none'}) not in index
+
+    bloom = HashBloomFilter(1000, error_rate=0.01)
+    hashes = [compute_param_hash({'orb_time': str(i)}) for i in range(2000)]
+    for h in hashes[:1000]:
+        bloom.add(h)
+    assert all(h in bloom for h in hashes[:1000])
+    assert sum(h in bloom for h in hashes[1000:]) < 50
+    con.close()
@@ -0,0 +1,117 @@
+"""
+Tests for AutoSearchEngine parallel mode (run_search(workers=N)).
+
+Workers score from a connection-free snapshot; the coordinator writes every
+table, so results must match the sequential engine exactly.
+"""
+import json
+import pickle
+import shutil
+
+import duckdb
+import pytest
+
+import auto_search_engine
+from auto_search_engine import AutoSearchEngine
+from search_scoring import PathScoringBackend
+from tests.conftest import SEARCH_COMBOS, SEARCH_SETTINGS
+
+
+@pytest.fixture
+def twin_dbs(search_db, tmp_path):
+    twin = str(tmp_path / "twin.db")
+    shutil.copy(search_db, twin)
+    return search_db, twin
+
+
+def _candidates(con):
+    return con.execute("""
+        SELECT param_hash, score_proxy, sample_size, profitable_trade_rate, target_hit_rate
+        FROM search_candidates ORDER BY param_hash
+    """).fetchall()
+
+
+def test_parallel_matches_sequential(twin_dbs):
+    seq_path, par_path = twin_dbs
+
+    seq_con = duckdb.connect(seq_path)
+    sequential = AutoSearchEngine(seq_con).run_search('MGC', SEARCH_SETTINGS, max_seconds=120)
+
+    par_con = duckdb.connect(par_path)
+    parallel = AutoSearchEngine(par_con).run_search('MGC', SEARCH_SETTINGS, max_seconds=120, workers=2)
+
+    assert parallel['stats']['tested'] == sequential['stats']['tested'] == SEARCH_COMBOS
+    assert parallel['stats']['promising'] == sequential['stats']['promising']
+    assert [c.param_hash for c in parallel['candidates']] == [c.param_hash for c in sequential['candidates']]
+    assert _candidates(par_con) == _candidates(seq_con)
+    for table in ("search_memory", "search_knowledge"):
+        query = f"SELECT param_hash FROM {table} ORDER BY param_hash"
+        assert par_con.execute(query).fetchall() == seq_con.execute(query).fetchall()
+
+    # Throughput and per-worker utilisation are recorded on the run
+    status, workers, rate, worker_stats = par_con.execute("""
+        SELECT status, workers, combos_per_sec, worker_stats_json FROM search_runs
+    """).fetchone()
+    assert status == 'COMPLETED' and workers == 2 and rate > 0
+    utilisation = json.loads(worker_stats)
+    assert 1 <= len(utilisation) <= 2
+    assert all(0 < u <= 1 for u in utilisation.values())
+
+    # Second parallel run: everything already in memory
+    again = AutoSearchEngine(par_con).run_search('MGC', SEARCH_SETTINGS, max_seconds=120, workers=2)
+    assert again['stats']['skipped'] == parallel['stats']['promising']
+    seq_con.close()
+    par_con.close()
+
+
+def test_parallel_timeout_keeps_scored_work(search_db):
+    con = duckdb.connect(search_db)
+    result = AutoSearchEngine(con).run_search('MGC', SEARCH_SETTINGS, max_seconds=0, workers=2)
+    status, tested = con.execute("SELECT status, total_tested FROM search_runs").fetchone()
+    assert status == 'TIMEOUT'
+    assert tested == result['stats']['tested'] < SEARCH_COMBOS
+    con.close()
+
+
+_real_score_shard = auto_search_engine._score_shard
+
+
+def _score_first_shard_only(shard, deadline):
+    """Workers that run out of time after the first shard"""
+    return _real_score_shard(shard, deadline if shard[0][0] == 0 else 0.0)
+
+
+def test_reused_engine_reports_timeout_of_later_run(search_db, monkeypatch):
+    con = duckdb.connect(search_db)
+    engine = AutoSearchEngine(con)
+    engine.run_search('MGC', SEARCH_SETTINGS, max_seconds=120, workers=2)
+
+    monkeypatch.setattr(auto_search_engine, '_score_shard', _score_first_shard_only)
+    settings = dict(SEARCH_SETTINGS, rr_targets=[2.5, 4.0])
+    result = engine.run_search('MGC', settings, max_seconds=120, workers=2)
+
+    # Counters start again at zero; the earlier run's tested count must not hide the timeout
+    assert 0 < result['stats']['tested'] < 4 * 2 * 4
+    status = con.execute("SELECT status FROM search_runs WHERE run_id = ?", [result['run_id']]).fetchone()[0]
+    assert status == 'TIMEOUT'
+    con.close()
+
+
+def test_budget_uses_epsilon_exploration(search_db):
+    con = duckdb.connect(search_db)
+    settings = dict(SEARCH_SETTINGS, budget=20)
+    result = AutoSearchEngine(con).run_search('MGC', settings, max_seconds=120, workers=2)
+    assert 0 < result['stats']['tested'] <= 20
+    con.close()
+
+
+def test_snapshot_is_detached(search_base_db):
+    con = duckdb.connect(search_base_db, read_only=True)
+    backend = PathScoringBackend(con)
+    snapshot = pickle.loads(pickle.dumps(backend.snapshot(['0900', '2300'])))
+    con.close()
+
+    assert snapshot.conn is None
+    assert snapshot.score('2300', 2.0, {'orb_size': 0.5}) == backend.score('2300', 2.0, {'orb_size': 0.5})
+    with pytest.raises(ValueError):
+        snapshot.paths('1000')
@@ -0,0 +1,206 @@
+"""
+Tests for pipeline/bar_store.py (memory-mapped columnar bars_1m export).
+
+The store must hand back exactly the bars DuckDB would, as views into the
+memory-mapped files, and sync must only rewrite months that changed.
+Feature builds and the execution engine give identical results from it.
+"""
+import os
+import shutil
+from datetime import date, datetime, timedelta
+
+import duckdb
+import numpy as np
+import pytest
+
+from pipeline.bar_store import BarStore, local_to_epoch_ms, sync_bar_store, trade_dates
+from pipeline.build_daily_features import FeatureBuilder, _feature_columns
+from pipeline.incremental_features import record_bar_change
+from strategies.execution_engine import simulate_orb_trades_batch
+from tests.conftest import END, START
+
+
+@pytest.fixture
+def store_root(bars_db, tmp_path):
+    root = str(tmp_path / "store")
+    con = duckdb.connect(bars_db, read_only=True)
+    sync_bar_store(con, root=root)
+    con.close()
+    return root
+
+
+def _db_bars(con, start_ms, end_ms):
+    return con.execute("""
+        SELECT epoch_ms(ts_utc), open, high, low, close, volume
+        FROM bars_1m
+        WHERE symbol = 'MGC' AND epoch_ms(ts_utc) >= ? AND epoch_ms(ts_utc) < ?
+        ORDER BY ts_utc
+    """, [start_ms, end_ms]).fetchnumpy()
+
+
+def test_store_matches_duckdb(bars_db, store_root):
+    store = BarStore(store_root)
+    con = duckdb.connect(bars_db, read_only=True)
+    assert store.months() == ["2024-12", "2025-01", "2025-02"]
+
+    total = sum(len(store.day(date(2024, 11, 30) + timedelta(days=i))) for i in range(80))
+    assert total == con.execute("SELECT COUNT(*) FROM bars_1m").fetchone()[0]
+
+    # A trade date is D 07:00 -> D+1 07:00 local, served as memmap views
+    d = date(2025, 1, 31)
+    day = store.day(d)
+    start_ms = local_to_epoch_ms(datetime(2025, 1, 31, 7, 0))
+    expected = _db_bars(con, start_ms, start_ms + 86_400_000)
+    assert len(day) == len(expected["close"]) > 0
+    assert isinstance(day.close.base, np.memmap) or isinstance(day.close, np.memmap)
+    assert (trade_dates(day.ts) == np.datetime64(d)).all()
+    for col, key in zip(("ts", "open", "high", "low", "close", "volume"), expected):
+        assert np.array_equal(getattr(day, col), expected[key])
+
+    # Window across the month boundary (concatenated) and right-closed windows
+    start_ms = local_to_epoch_ms("2025-01-31 18:00:00")
+    end_ms = local_to_epoch_ms("2025-02-03 09:00:00")
+    window = store.window(start_ms, end_ms)
+    assert np.array_equal(window.ts, _db_bars(con, start_ms, end_ms)["epoch_ms(ts_utc)"])
+    right = store.window(start_ms, end_ms, closed="right")
+    assert np.array_equal(right.ts, _db_bars(con, start_ms + 1, end_ms + 1)["epoch_ms(ts_utc)"])
+    assert len(store.day(date(2026, 1, 5))) == 0
+    con.close()
+
+
+def test_sync_rewrites_only_changed_months(bars_db, store_root, tmp_path):
+    db_path = str(tmp_path / "edit.db")
+    shutil.copy(bars_db, db_path)
+    con = duckdb.connect(db_path)
+    assert sync_bar_store(con, root=store_root) == {}
+
+    # Correct one January bar in place (same row count) and append new February bars
+    con.execute("""
+        UPDATE bars_1m SET close = close + 0.1
+        WHERE ts_utc = (SELECT MIN(ts_utc) FROM bars_1m WHERE ts_utc >= TIMESTAMPTZ '2025-01-15 00:00:00+00')
+    """)
+    con.execute("""
+        INSERT INTO bars_1m
+        SELECT ts_utc + INTERVAL 7 DAY, symbol, source_symbol, open, high, low, close, volume
+        FROM bars_1m WHERE ts_utc >= TIMESTAMPTZ '2025-02-14 00:00:00+00'
+    """)
+    written = sync_bar_store(con, root=store_root)
+    assert sorted(written) == ["2025-01", "2025-02"]
+
+    store = BarStore(store_root)
+    start_ms = local_to_epoch_ms(datetime(2024, 12, 1, 7, 0))
+    end_ms = local_to_epoch_ms(datetime(2025, 3, 1, 7, 0))
+    assert np.array_equal(store.window(start_ms, end_ms).close, _db_bars(con, start_ms, end_ms)["close"])
+    assert not any(name.endswith((".tmp", ".old")) for name in os.listdir(store.path))
+    con.close()
+
+
+def test_feature_build_from_store_matches_duckdb(bars_db, store_root, tmp_path):
+    columns = _feature_columns()
+    rows = {}
+    for name, store in (("db", None), ("store", BarStore(store_root))):
+        db_path = str(tmp_path / f"{name}.db")
+        shutil.copy(bars_db, db_path)
+        builder = FeatureBuilder(db_path=db_path, bar_store=store)
+        builder.init_schema()
+        builder._ensure_schema_columns(auto_migrate=True)
+        builder.build_features_bulk(START, END)
+        rows[name] = builder.con.execute(
+            f"SELECT {', '.join(columns)} FROM daily_features ORDER BY date_local"
+        ).fetchall()
+        builder.close()
+
+    assert len(rows["db"]) == (END - START).days + 1
+    assert rows["store"] == rows["db"]
+
+
+def test_stale_store_falls_back_to_duckdb(bars_db, store_root, tmp_path):
+    """Bars ingested after the last sync are read from DuckDB, not silently dropped."""
+    columns = _feature_columns()
+    new_start, new_end = date(2025, 2, 17), date(2025, 2, 21)
+    rows = {}
+    for name, store in (("db", None), ("store", BarStore(store_root))):
+        db_path = str(tmp_path / f"{name}.db")
+        shutil.copy(bars_db, db_path)
+        con = duckdb.connect(db_path)
+        con.execute("""
+            INSERT INTO bars_1m
+            SELECT ts_utc + INTERVAL 7 DAY, symbol, source_symbol, open, high, low, close, volume
+            FROM bars_1m WHERE ts_utc >= TIMESTAMPTZ '2025-02-10 00:00:00+00'
+        """)
+        con.close()
+
+        builder = FeatureBuilder(db_path=db_path, bar_store=store)
+        builder.init_schema()
+        builder._ensure_schema_columns(auto_migrate=True)
+        builder.build_features_bulk(new_start, new_end)
+        rows[name] = builder.con.execute(
+            f"SELECT {', '.join(columns)} FROM daily_features ORDER BY date_local"
+        ).fetchall()
+
+        dates = [new_start + timedelta(days=i) for i in range((new_end - new_start).days + 1)]
+        rows[f"{name}_trades"] = [
+            r.to_dict() for r in simulate_orb_trades_batch(builder.con, dates, "1000", rr=2.0, bar_store=store)
+        ]
+        builder.close()
+
+    store = BarStore(store_root)
+    assert not store.covers(local_to_epoch_ms(datetime(2025, 2, 18, 7, 0)),
+                            local_to_epoch_ms(datetime(2025, 2, 19, 9, 0)))
+    assert any(r[columns.index("asia_high")] is not None for r in rows["db"])
+    assert rows["store"] == rows["db"]
+    assert rows["store_trades"] == rows["db_trades"]
+
+
+@pytest.mark.parametrize("orb", ["1000", "2300", "0030"])
+def test_execution_engine_from_store(bars_db, store_root, tmp_path, orb):
+    db_path = str(tmp_path / "features.db")
+    shutil.copy(bars_db, db_path)
+    builder = FeatureBuilder(db_path=db_path)
+    builder.init_schema()
+    builder._ensure_schema_columns(auto_migrate=True)
+    builder.build_features_bulk(START, END)
+    builder.close()
+
+    con = duckdb.connect(db_path, read_only=True)
+    dates = [START + timedelta(days=i) for i in range((END - START).days + 1)]
+    from_db = simulate_orb_trades_batch(con, dates, orb, rr=2.0)
+    from_store = simulate_orb_trades_batch(con, dates, orb, rr=2.0, bar_store=BarStore(store_root))
+    con.close()
+    assert [r.to_dict() for r in from_store] == [r.to_dict() for r in from_db]
+
+
+def test_rewritten_bars_fall_back_to_duckdb_until_resync(features_db, store_root, tmp_path):
+    """Bars rewritten inside the synced range (logged in bar_change_log) are not served stale."""
+    db_path = str(tmp_path / "rewrite.db")
+    shutil.copy(features_db, db_path)  # same bars as the store's source
+    con = duckdb.connect(db_path)
+    day, other = date(2025, 1, 20), date(2025, 1, 22)
+    written = con.execute("""
+        UPDATE bars_1m SET high = high + 5
+        WHERE ts_utc >= TIMESTAMPTZ '2025-01-20 01:00:00+00' AND ts_utc < TIMESTAMPTZ '2025-01-20 02:00:00+00'
+        RETURNING ts_utc
+    """).fetchall()
+    record_bar_change(con, "MGC", [r[0] for r in written], source="test")
+
+    store = BarStore(store_root)
+    assert store.refresh_changes(con) == 1
+    day_ms = local_to_epoch_ms(datetime(day.year, day.month, day.day, 7, 0))
+    other_ms = local_to_epoch_ms(datetime(other.year, other.month, other.day, 7, 0))
+    assert not store.covers(day_ms, day_ms + 86_400_000)
+    assert store.covers(other_ms, other_ms + 86_400_000)
+
+    # Readers take the rewritten window from DuckDB
+    results = {
+        name: [r.to_dict() for r in simulate_orb_trades_batch(con, [day, other], "1100", rr=2.0, bar_store=s)]
+        for name, s in (("db", None), ("store", store))
+    }
+    assert results["store"] == results["db"]
+
+    # A sync exports the rewrite and records the change as seen
+    assert sorted(sync_bar_store(con, root=store_root)) == ["2025-01"]
+    store = BarStore(store_root)
+    assert store.refresh_changes(con) == 0
+    assert store.covers(day_ms, day_ms + 86_400_000)
+    assert np.array_equal(store.day(day).high, _db_bars(con, day_ms, day_ms + 86_400_000)["high"])
+    con.close()
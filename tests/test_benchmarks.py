@@ -0,0 +1,68 @@
+"""
+Tests for the synthetic-market benchmark suite (benchmarks/).
+
+The generator must be deterministic and respect sessions, rolls and OHLC
+invariants; the runner must record provenance and flag regressions past
+the threshold only.
+"""
+import json
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import run_benchmarks
+from benchmarks.synthetic_market import SPECS, generate_bars
+
+
+def test_generator_is_deterministic_and_well_formed():
+    spec = SPECS['MGC']
+    bars = generate_bars(spec, date(2025, 1, 1), date(2025, 3, 31), seed=11)
+    pd.testing.assert_frame_equal(bars, generate_bars(spec, date(2025, 1, 1), date(2025, 3, 31), seed=11))
+    assert not bars.equals(generate_bars(spec, date(2025, 1, 1), date(2025, 3, 31), seed=12))
+
+    ts = bars['ts_utc']
+    assert (ts.dt.hour != 22).all() and (ts.dt.dayofweek != 5).all()  # daily break, Saturday
+    assert ts.is_monotonic_increasing and ts.is_unique
+    assert (bars['high'] >= bars[['open', 'close']].max(axis=1)).all()
+    assert (bars['low'] <= bars[['open', 'close']].min(axis=1)).all()
+    assert np.allclose(bars['close'] / spec.tick_size, np.round(bars['close'] / spec.tick_size))
+
+    # Front month rolls on roll_day of the month before expiry: G5 -> J5 on Jan 20
+    symbols = bars.groupby(ts.dt.date)['source_symbol'].first()
+    assert symbols[date(2025, 1, 17)] == "MGCG5" and symbols[date(2025, 1, 20)] == "MGCJ5"
+    assert list(dict.fromkeys(bars['source_symbol'])) == ["MGCG5", "MGCJ5", "MGCM5"]
+
+
+def test_find_regressions_uses_threshold_and_noise_floor():
+    baseline = {'git_commit': 'abc', 'metrics': {'a@1y': {'seconds': 1.0}, 'b@1y': {'seconds': 0.001}}}
+    results = {'metrics': {
+        'a@1y': {'seconds': 1.3},
+        'b@1y': {'seconds': 0.01},  # 10x, but inside the noise floor
+        'c@1y': {'seconds': 9.0},   # not in the baseline
+    }}
+    assert run_benchmarks.find_regressions(results, baseline, threshold=0.5) == []
+    regressions = run_benchmarks.find_regressions(results, baseline, threshold=0.25)
+    assert [r['metric'] for r in regressions] == ['a@1y']
+    assert regressions[0]['baseline_commit'] == 'abc'
+
+
+def test_runner_writes_results_and_fails_on_regression(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_benchmarks, "get_git_commit", lambda: "deadbee")
+    output, baseline = tmp_path / "results.json", tmp_path / "baseline.json"
+    args = ["--sizes", "0.05", "--repeat", "1", "--only", "what_if", "simulate_orb_trade",
+            "--output", str(output), "--baseline", str(baseline), "--workdir", str(tmp_path)]
+
+    assert run_benchmarks.main(args + ["--update-baseline"]) == 0
+    results = json.loads(output.read_text())
+    assert results['git_commit'] == "deadbee"
+    assert set(results['metrics']) == {"what_if@0.05y", "simulate_orb_trade@0.05y"}
+    assert all(m['items'] > 0 for m in results['metrics'].values())
+    assert json.loads(baseline.read_text())['metrics'].keys() == results['metrics'].keys()
+
+    stored = json.loads(baseline.read_text())
+    for metric in stored['metrics'].values():
+        metric['seconds'] = 0.0
+    baseline.write_text(json.dumps(stored))
+    monkeypatch.setattr(run_benchmarks, "NOISE_FLOOR_S", 0.0)
+    assert run_benchmarks.main(args) == 1
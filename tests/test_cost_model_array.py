@@ -0,0 +1,91 @@
+"""
+Tests for the array API of pipeline/cost_model.py.
+
+calculate_realized_rr_array must reproduce the canonical per-trade formulas
+bit for bit (including the integrity gate and the reward <= 0 case), and
+calculate_realized_rr must stay a wrapper with the same results and errors.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from pipeline.cost_model import (
+    COST_MODELS,
+    MINIMUM_VIABLE_RISK_THRESHOLD,
+    SLIPPAGE_STRESS_MULTIPLIERS,
+    calculate_realized_rr,
+    calculate_realized_rr_array,
+    check_minimum_viable_risk,
+    minimum_viable_risk_mask,
+)
+
+STOPS = [0.0, -1.0, 0.3, 0.5, 2.0, 2.8, 2.824, 3.0, 7.77, 25.0]
+RRS = [0.0, 0.1, 0.2, 1.0, 1.5, 2.0, 8.0]
+LEVELS = list(SLIPPAGE_STRESS_MULTIPLIERS)
+
+
+def _reference(stop, rr, level):
+    """Canonical formulas as written per trade (CANONICAL_LOGIC.txt lines 76-98)"""
+    costs = COST_MODELS['MGC']
+    friction = (costs['commission_rt'] + costs['spread_double']
+                + costs['slippage_rt'] / SLIPPAGE_STRESS_MULTIPLIERS['normal'] * SLIPPAGE_STRESS_MULTIPLIERS[level])
+    if stop <= 0 or rr <= 0 or friction / (stop * 10.0) > MINIMUM_VIABLE_RISK_THRESHOLD:
+        return None
+    reward = (rr * stop) * 10.0 - friction
+    risk = stop * 10.0 + friction
+    return (0.0 if reward <= 0 else reward / risk), risk, reward
+
+
+def test_array_matches_reference_exactly():
+    grid = list(itertools.product(STOPS, RRS, LEVELS))
+    stops, rrs, levels = (np.array(col) for col in zip(*grid))
+    result = calculate_realized_rr_array('MGC', stops, rrs, levels)
+
+    for i, (stop, rr, level) in enumerate(grid):
+        expected = _reference(stop, rr, level)
+        if expected is None:
+            assert np.isnan(result['realized_rr'][i])
+            continue
+        assert (result['realized_rr'][i], result['realized_risk_dollars'][i],
+                result['realized_reward_dollars'][i]) == expected
+    assert (result['realized_rr'] == 0.0).any()  # costs exceed the target somewhere
+
+    # Broadcasting: one stress level for all, scalar RR
+    one = calculate_realized_rr_array('MGC', stops, 1.5, 'severe')
+    assert one['realized_rr'].shape == stops.shape
+    assert np.array_equal(one['total_friction'], np.full(len(stops), COST_MODELS['MGC']['commission_rt'] + 2.0 + 12.0))
+
+
+def test_viable_mask_matches_scalar_gate():
+    stops = np.array([-1.0, 0.0, np.nan, 0.1, 2.79, 2.8, 2.81, 10.0])
+    for friction in (0.0, 8.4, 16.4):
+        viable, ratio = minimum_viable_risk_mask(stops, 10.0, friction)
+        for i, stop in enumerate(stops):
+            if np.isnan(stop):
+                assert not viable[i]
+                continue
+            is_viable, cost_ratio, _ = check_minimum_viable_risk(stop, 10.0, friction)
+            assert (bool(viable[i]), ratio[i]) == (is_viable, cost_ratio)
+
+
+def test_scalar_wrapper_results_and_errors():
+    for stop, rr, level in itertools.product([2.824, 3.0, 7.77], [0.2, 1.5, 3.0], LEVELS):
+        expected = _reference(stop, rr, level)
+        if expected is None:
+            with pytest.raises(ValueError, match="INTEGRITY GATE REJECTION"):
+                calculate_realized_rr('MGC', stop, rr, level)
+            continue
+        result = calculate_realized_rr('MGC', stop, rr, level)
+        assert (result['realized_rr'], result['realized_risk_dollars'], result['realized_reward_dollars']) == expected
+        assert type(result['realized_rr']) is float
+        assert result['target_points'] == rr * stop
+        assert result['costs']['stress_level'] == level
+
+    for bad in ((0.0, 1.5), (2.0, 0.0)):
+        with pytest.raises(ValueError, match="must be positive"):
+            calculate_realized_rr('MGC', *bad)
+    with pytest.raises(ValueError, match="BLOCKED"):
+        calculate_realized_rr_array('NQ', [2.0], [1.5])
+    with pytest.raises(ValueError, match="Invalid stress_level"):
+        calculate_realized_rr_array('MGC', [2.0], [1.5], ['normal', 'panic'])
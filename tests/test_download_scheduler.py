@@ -0,0 +1,209 @@
+"""
+Tests for pipeline/download_scheduler.py and the chunked ProjectX backfill.
+
+A local stub HTTP server stands in for the ProjectX API (login, contracts,
+retrieveBars) and injects transient 503s and a permanent 400. Chunks must be
+fetched concurrently, written by one thread, checkpointed, and skipped on a
+rerun; retried chunks still land, failed ones are fetched again next time.
+"""
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zoneinfo import ZoneInfo
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.backfill_range import Cfg, ProjectX, backfill_days
+from pipeline.download_scheduler import (
+    Checkpoint, Download, DownloadScheduler, chunk_days, trading_day_closed,
+)
+from pipeline.ingest_dbn import BARS_SCHEMA_SQL
+
+DAYS = [date(2025, 1, 6) + timedelta(days=i) for i in range(14)]
+
+
+def _synthetic_bars():
+    ts = pd.date_range("2025-01-05 23:00", "2025-01-19 23:00", freq="1min", inclusive="left", tz="UTC")
+    ts = ts[ts.dayofweek < 5]
+    rng = np.random.default_rng(5)
+    close = np.round(2650 + np.cumsum(rng.normal(0, 0.5, len(ts))), 1)
+    return pd.DataFrame({
+        "ts_utc": ts, "open": close - 0.1, "high": close + 0.4, "low": close - 0.4, "close": close,
+        "volume": rng.integers(1, 100, len(ts)),
+    })
+
+
+class StubProjectX:
+    """ThreadingHTTPServer serving the three ProjectX endpoints the backfill uses."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.requests = []
+        self.transient = {}   # startTime -> remaining 503s
+        self.permanent = set()  # startTime -> always 400
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status, body = stub.handle(self.path, payload)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def handle(self, path, payload):
+        if path == "/api/Auth/loginKey":
+            return 200, {"success": True, "token": "stub-token"}
+        if path == "/api/Contract/available":
+            return 200, {"success": True, "contracts": [{"id": "CON.F.US.MGC.G25", "name": "MGCG5",
+                                                         "activeContract": True}]}
+        assert path == "/api/History/retrieveBars"
+        start = payload["startTime"]
+        with self.lock:
+            self.requests.append(start)
+            if start in self.permanent:
+                return 400, {"success": False}
+            if self.transient.get(start, 0) > 0:
+                self.transient[start] -= 1
+                return 503, {"success": False}
+        time.sleep(0.05)
+        sel = self.bars[(self.bars["ts_utc"] >= pd.Timestamp(start)) &
+                        (self.bars["ts_utc"] < pd.Timestamp(payload["endTime"]))]
+        bars = [{"t": t.isoformat(), "o": o, "h": h, "l": l, "c": c, "v": int(v)}
+                for t, o, h, l, c, v in sel.itertuples(index=False)]
+        return 200, {"success": True, "bars": bars[::-1]}  # newest first, as the API returns
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubProjectX(_synthetic_bars())
+    yield server
+    server.close()
+
+
+def _chunk_start(d):
+    return pd.Timestamp(d.isoformat() + " 09:00", tz="Australia/Brisbane").tz_convert("UTC") \
+        .isoformat().replace("+00:00", "Z")
+
+
+def test_chunked_backfill_against_stub_server(stub, tmp_path):
+    cfg = Cfg(base_url=stub.url, username="u", api_key="k")
+    px = ProjectX(cfg)
+    px.login_key()
+    contracts = px.list_available_contracts()["contracts"]
+
+    con = duckdb.connect(str(tmp_path / "bars.db"))
+    con.execute(BARS_SCHEMA_SQL.format(table="bars_1m"))
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    # Week 1 needs two retries; week 2 is rejected outright
+    stub.transient[_chunk_start(DAYS[0])] = 2
+    stub.permanent.add(_chunk_start(DAYS[7]))
+    stats = backfill_days(cfg, px, contracts, DAYS, con, workers=2, chunk_days=7,
+                          checkpoint=checkpoint, backoff_sec=0.01, verbose=False)
+
+    assert stats.retries == 2 and stats.failed == [DAYS[7:]]
+    assert stats.chunks == 1 and stats.days == 7
+    assert stats.rows > 0 and stats.nbytes > 0
+    assert stats.rows_per_sec > 0 and stats.bytes_per_sec > 0
+    assert Checkpoint(checkpoint).days == set(DAYS[:7])
+
+    # Rerun: only the failed chunk is fetched again
+    stub.permanent.clear()
+    sent = len(stub.requests)
+    stats = backfill_days(cfg, px, contracts, DAYS, con, workers=2, chunk_days=7,
+                          checkpoint=checkpoint, backoff_sec=0.01, verbose=False)
+    assert stub.requests[sent:] == [_chunk_start(DAYS[7])]
+    assert stats.skipped_days == 7 and stats.failed == []
+    assert Checkpoint(checkpoint).days == set(DAYS)
+
+    expected = stub.bars[stub.bars["ts_utc"] < pd.Timestamp(_chunk_start(DAYS[-1] + timedelta(days=1)))]
+    stored = con.execute("""
+        SELECT ts_utc, symbol, source_symbol, close, volume FROM bars_1m ORDER BY ts_utc
+    """).fetchdf()
+    assert len(stored) == len(expected)
+    assert (stored["close"].to_numpy() == expected["close"].to_numpy()).all()
+    assert set(stored["source_symbol"]) == {"MGCG5"} and set(stored["symbol"]) == {"MGC"}
+    assert con.execute("SELECT SUM(row_count) FROM bar_change_log WHERE source = 'projectx'").fetchone()[0] \
+        == len(expected)
+    con.close()
+
+
+def test_scheduler_concurrency_and_single_writer(tmp_path):
+    days = [d for d in DAYS if d != date(2025, 1, 10)]  # gap splits the run
+    assert chunk_days(days, 3) == [DAYS[0:3], DAYS[3:4], DAYS[5:8], DAYS[8:11], DAYS[11:14]]
+
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+    writers = set()
+
+    def fetch(chunk):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return Download(bars=len(chunk), nbytes=1000 * len(chunk))
+
+    def write(chunk, download):
+        writers.add(threading.current_thread().name)
+        return download.bars * 10
+
+    scheduler = DownloadScheduler(fetch, write, checkpoint_path=str(tmp_path / "cp.json"),
+                                  workers=3, chunk_days=3, verbose=False)
+    stats = scheduler.run(days)
+    assert 1 < active["max"] <= 3
+    assert writers == {"download-writer"}
+    assert (stats.chunks, stats.days, stats.rows, stats.nbytes) == (5, 13, 130, 13000)
+
+    # Everything checkpointed: nothing to fetch
+    again = DownloadScheduler(fetch, write, checkpoint_path=str(tmp_path / "cp.json"), verbose=False).run(days)
+    assert (again.chunks, again.skipped_days) == (0, 13)
+
+
+def test_open_trading_day_is_not_checkpointed(tmp_path):
+    tz = "Australia/Brisbane"
+    today = datetime.now(ZoneInfo(tz)).date()
+    days = [today - timedelta(days=3), today]
+    assert trading_day_closed(days[0], tz) and not trading_day_closed(today, tz)
+    assert trading_day_closed(today, tz, now=datetime.combine(today + timedelta(days=1), datetime.min.time(),
+                                                              tzinfo=ZoneInfo(tz)) + timedelta(hours=9))
+
+    fetched = []
+
+    def fetch(chunk):
+        fetched.append(chunk)
+        return Download(bars=len(chunk))
+
+    cp = str(tmp_path / "cp.json")
+    DownloadScheduler(fetch, lambda chunk, download: download.bars, checkpoint_path=cp,
+                      tz_local=tz, verbose=False).run(days)
+    assert Checkpoint(cp).days == {days[0]}
+
+    # An incremental rerun fetches the rest of today's bars
+    fetched.clear()
+    stats = DownloadScheduler(fetch, lambda chunk, download: download.bars, checkpoint_path=cp,
+                              tz_local=tz, verbose=False).run(days)
+    assert fetched == [[today]] and stats.skipped_days == 1
@@ -0,0 +1,98 @@
+"""
+Tests for the edge_registry similarity index (trading_app/edge_utils.py).
+
+Indexed lookups and the all-pairs scan must return exactly what scoring
+every pair of fingerprints returns, and the index must follow inserts.
+"""
+import itertools
+import random
+
+import duckdb
+import pytest
+
+from edge_utils import (
+    SIMILARITY_INDEX_TABLE,
+    calculate_similarity_score,
+    create_candidate,
+    find_near_duplicate_pairs,
+    find_similar_edges,
+)
+from pipeline.create_edge_registry import create_edge_registry_table
+
+TRIGGERS = ("ORB breakout", "tight consolidation breakout", "momentum trend", "reversal", "plain")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    db_path = str(tmp_path / "registry.db")
+    create_edge_registry_table(db_path)
+    con = duckdb.connect(db_path)
+    rng = random.Random(3)
+    for _ in range(300):
+        create_candidate(
+            con,
+            instrument=rng.choice(("MGC", "NQ", "MPL")),
+            orb_time=rng.choice(("0900", "1000", "1100", "1800", "2300", "0030")),
+            direction=rng.choice(("LONG", "SHORT", "BOTH")),
+            trigger_definition=rng.choice(TRIGGERS),
+            rr=rng.choice((1.0, 1.5, 2.0, 3.0)),
+            sl_mode=rng.choice(("FULL", "HALF")),
+            orb_filter=rng.choice((None, 0.05, 0.1)),
+        )
+    yield con
+    con.close()
+
+
+def _fingerprints(con):
+    return dict(con.execute(
+        "SELECT edge_id, similarity_fingerprint FROM edge_registry WHERE similarity_fingerprint IS NOT NULL"
+    ).fetchall())
+
+
+def _brute_force(fingerprints, edge_id, min_similarity):
+    scores = [(other, calculate_similarity_score(fingerprints[edge_id], fp))
+              for other, fp in fingerprints.items() if other != edge_id]
+    return sorted(((e, s) for e, s in scores if s >= min_similarity), key=lambda x: (-x[1], x[0]))
+
+
+@pytest.mark.parametrize("min_similarity", [0.3, 0.5, 0.8, 1.0])
+def test_indexed_lookup_matches_brute_force(registry, min_similarity):
+    fingerprints = _fingerprints(registry)
+    assert registry.execute(f"SELECT COUNT(DISTINCT edge_id) FROM {SIMILARITY_INDEX_TABLE}").fetchone()[0] \
+        == len(fingerprints)
+
+    for edge_id in list(fingerprints)[:25]:
+        found = find_similar_edges(registry, edge_id, min_similarity=min_similarity, limit=1000)
+        assert [(r['edge_id'], r['similarity_score']) for r in found] \
+            == _brute_force(fingerprints, edge_id, min_similarity)
+
+
+def test_near_duplicate_pairs_match_brute_force(registry):
+    fingerprints = _fingerprints(registry)
+    for min_similarity in (0.6, 0.8):
+        expected = set()
+        for a, b in itertools.combinations(sorted(fingerprints), 2):
+            score = calculate_similarity_score(fingerprints[a], fingerprints[b])
+            if score >= min_similarity:
+                expected.add((a, b, score))
+        pairs = find_near_duplicate_pairs(registry, min_similarity)
+        assert {(p['edge_id_a'], p['edge_id_b'], p['similarity_score']) for p in pairs} == expected
+        assert len(pairs) == len(expected) > 0
+
+    with pytest.raises(ValueError):
+        find_near_duplicate_pairs(registry, 0.0)
+
+
+def test_index_built_on_first_use_and_follows_inserts(registry):
+    registry.execute(f"DROP TABLE {SIMILARITY_INDEX_TABLE}")
+    edge_id = next(iter(_fingerprints(registry)))
+    assert find_similar_edges(registry, edge_id, limit=3)  # rebuilt from edge_registry
+
+    new_id, _ = create_candidate(registry, 'MGC', '0900', 'LONG', 'ORB breakout', 9.0, 'FULL')
+    found = find_similar_edges(registry, new_id, min_similarity=0.5, limit=1000)
+    assert [(r['edge_id'], r['similarity_score']) for r in found] \
+        == _brute_force(_fingerprints(registry), new_id, 0.5)
+    assert registry.execute(
+        f"SELECT COUNT(*) FROM {SIMILARITY_INDEX_TABLE} WHERE edge_id = ?", [new_id]
+    ).fetchone()[0] == 6  # MGC, ORB0900, LONG, BREAKOUT, RR9.0, SL_FULL
+
@@ -0,0 +1,97 @@
+"""
+Tests for strategies.execution_engine.simulate_orb_trades_batch.
+
+The batch API must return exactly the TradeResult objects that per-date
+simulate_orb_trade calls return, in input order, while issuing a fixed
+number of queries regardless of how many dates are simulated.
+"""
+from datetime import timedelta
+
+import duckdb
+import numpy as np
+import pytest
+
+from strategies.execution_engine import simulate_orb_trade, simulate_orb_trades_batch
+from strategies.execution_modes import ExecutionMode, attempt_market_on_close_fill, first_confirmed_close
+from tests.conftest import END, START, CountingConnection
+
+DATES = [START + timedelta(days=i) for i in range((END - START).days + 1)]
+
+
+@pytest.mark.parametrize("orb", ["0900", "1100", "2300", "0030"])
+@pytest.mark.parametrize("params", [
+    {},
+    {"rr": 2.5, "sl_mode": "half"},
+    {"confirm_bars": 3, "rr": 1.5, "max_stop_ticks": 30, "asia_tp_cap_ticks": 40},
+    {"mode": "5m", "confirm_bars": 2},
+    {"exec_mode": ExecutionMode.LIMIT_AT_ORB},
+    {"exec_mode": ExecutionMode.LIMIT_RETRACE, "confirm_bars": 2},
+])
+def test_batch_matches_per_date_simulation(features_db, orb, params):
+    con = duckdb.connect(features_db, read_only=True)
+    batch = simulate_orb_trades_batch(con, DATES, orb, **params)
+    single = [simulate_orb_trade(con, d, orb, **params) for d in DATES]
+    con.close()
+
+    assert len(batch) == len(DATES)
+    assert batch == single
+    assert any(r.entry_price is not None for r in batch)
+
+
+def test_batch_uses_fixed_number_of_queries(features_db):
+    con = CountingConnection(duckdb.connect(features_db, read_only=True))
+    results = simulate_orb_trades_batch(con, DATES, "1000", rr=2.0)
+    assert len(results) == len(DATES)
+    assert any(r.outcome in ("WIN", "LOSS") for r in results)
+    assert con.calls == 2  # ORB levels + ATR, then all scan windows
+    con.con.close()
+
+
+def test_batch_keeps_input_order_and_duplicates(features_db):
+    con = duckdb.connect(features_db, read_only=True)
+    dates = [DATES[10], DATES[3], DATES[10]]
+    results = simulate_orb_trades_batch(con, dates, "0900")
+    assert [r.execution_params["date_local"] for r in results] == [str(d) for d in dates]
+    assert results[0] == results[2] == simulate_orb_trade(con, DATES[10], "0900")
+    assert simulate_orb_trades_batch(con, [], "0900") == []
+    con.close()
+
+
+@pytest.mark.parametrize("confirm_bars", [1, 2, 3])
+def test_first_confirmed_close_matches_loop(confirm_bars):
+    rng = np.random.default_rng(confirm_bars)
+    for _ in range(200):
+        closes = np.round(100.0 + rng.normal(0, 1.0, 30), 1)
+        bars = [(i, c + 0.5, c - 0.5, c) for i, c in enumerate(closes.tolist())]
+        fill = attempt_market_on_close_fill(bars, 100.5, 99.5, confirm_bars, 0.0, 0.1)
+        idx, direction = first_confirmed_close(closes, 100.5, 99.5, confirm_bars)
+        assert (idx, direction) == (fill.fill_idx, fill.direction)
+
+
+def test_real_validation_skips_only_failing_dates_when_batch_fails(features_db, monkeypatch):
+    import strategies.execution_engine as execution_engine
+    from trading_app.edge_utils import run_real_validation
+
+    edge = {"instrument": "MGC", "orb_time": "1000", "direction": "BOTH", "rr": 2.0,
+            "sl_mode": "FULL", "filters_applied": "{}"}
+    con = duckdb.connect(features_db, read_only=True)
+    baseline = run_real_validation(con, edge)
+
+    failing = DATES[7]
+    real_simulate = execution_engine.simulate_orb_trade
+
+    def broken_batch(*args, **kwargs):
+        raise RuntimeError("batch query failed")
+
+    def flaky_simulate(*args, **kwargs):
+        if kwargs["date_local"] == failing:
+            raise RuntimeError("bad date")
+        return real_simulate(*args, **kwargs)
+
+    monkeypatch.setattr(execution_engine, "simulate_orb_trades_batch", broken_batch)
+    monkeypatch.setattr(execution_engine, "simulate_orb_trade", flaky_simulate)
+    fallback = run_real_validation(con, edge)
+    con.close()
+
+    assert baseline["sample_size"] > 0
+    assert baseline["sample_size"] - 1 <= fallback["sample_size"] <= baseline["sample_size"]
@@ -0,0 +1,116 @@
+"""
+Tests for strategies.grid_simulator.
+
+Every grid point must reproduce what simulate_orb_trade returns for the same
+parameters (outcome, prices, R, MAE/MFE, costs), and fractional stops must
+match the per-day loop the ORB optimizer scripts used.
+"""
+from datetime import timedelta
+
+import duckdb
+import numpy as np
+import pytest
+
+from strategies.execution_engine import simulate_orb_trades_batch
+from strategies.execution_modes import ExecutionMode
+from strategies.grid_simulator import build_grid, simulate_grid, simulate_grid_days
+from tests.conftest import END, START
+
+DATES = [START + timedelta(days=i) for i in range((END - START).days + 1)]
+
+
+def _close(a, b):
+    if a is None or b is None:
+        return a is None and b is None
+    return a == pytest.approx(b, abs=1e-9)
+
+
+@pytest.mark.parametrize("orb", ["0900", "1100", "2300", "0030"])
+@pytest.mark.parametrize("exec_mode", list(ExecutionMode))
+def test_grid_matches_simulate_orb_trade(features_db, orb, exec_mode):
+    grid = build_grid(
+        rr_values=[1.0, 2.0, 3.5],
+        sl_modes=["full", "half"],
+        confirm_bars=[1, 2],
+        buffer_ticks=[0, 2],
+        exec_modes=[exec_mode],
+    )
+    kwargs = {"max_stop_ticks": 60, "asia_tp_cap_ticks": 80}
+    con = duckdb.connect(features_db, read_only=True)
+    by_date = simulate_grid_days(con, DATES, orb, grid, **kwargs)
+
+    traded = 0
+    for i, p in enumerate(grid):
+        expected = simulate_orb_trades_batch(con, DATES, orb, confirm_bars=p.confirm_bars, rr=p.rr,
+                                             sl_mode=p.sl_mode, buffer_ticks=p.buffer_ticks,
+                                             exec_mode=p.exec_mode, **kwargs)
+        for d, exp in zip(DATES, expected):
+            got = by_date[d].row(i)
+            ctx = f"{d} {p}"
+            assert got["outcome"] == exp.outcome, ctx
+            assert got["direction"] == exp.direction, ctx
+            assert _close(got["entry_price"], exp.entry_price), ctx
+            assert _close(got["stop_price"], exp.stop_price), ctx
+            assert _close(got["stop_ticks"], exp.stop_ticks), ctx
+            if exp.outcome in ("WIN", "LOSS", "NO_TRADE"):
+                traded += 1
+                assert _close(got["target_price"], exp.target_price), ctx
+                assert got["r_multiple"] == exp.r_multiple, ctx
+                assert _close(got["mae_r"], exp.mae_r), ctx
+                assert _close(got["mfe_r"], exp.mfe_r), ctx
+                assert _close(got["cost_r"], exp.cost_r), ctx
+                assert got["entry_idx"] + 1 == exp.entry_delay_bars, ctx
+    con.close()
+    assert traded > 0
+
+
+def _loop_fraction_stop(high, low, close, orb_high, orb_low, rr, stop_fraction):
+    """The per-bar loop the optimize_orb_* scripts used (first close outside ORB)."""
+    orb_size = orb_high - orb_low
+    for i in range(len(close)):
+        if close[i] > orb_high or close[i] < orb_low:
+            direction = "UP" if close[i] > orb_high else "DOWN"
+            entry = close[i]
+            risk = orb_size * stop_fraction
+            stop = entry - risk if direction == "UP" else entry + risk
+            target = entry + rr * risk if direction == "UP" else entry - rr * risk
+            for j in range(i + 1, len(close)):
+                if direction == "UP":
+                    if low[j] <= stop:
+                        return "LOSS"
+                    if high[j] >= target:
+                        return "WIN"
+                else:
+                    if high[j] >= stop:
+                        return "LOSS"
+                    if low[j] <= target:
+                        return "WIN"
+            return "NO_TRADE"
+    return "SKIPPED_NO_ENTRY"
+
+
+def test_fractional_stops_match_optimizer_loop():
+    rng = np.random.default_rng(3)
+    fractions = [0.25, 0.5, 1.0]
+    rrs = [1.5, 3.0, 6.0]
+    grid = build_grid(rr_values=rrs, sl_modes=fractions)
+    for _ in range(100):
+        close = np.round(100.0 + np.cumsum(rng.normal(0, 0.3, 240)), 1)
+        high = np.round(close + np.abs(rng.normal(0, 0.2, 240)), 1)
+        low = np.round(close - np.abs(rng.normal(0, 0.2, 240)), 1)
+        res = simulate_grid(high, low, close, 100.5, 99.5, grid, slippage_ticks=0, cost_gate=False)
+        for i, p in enumerate(grid):
+            assert res.outcome[i] == _loop_fraction_stop(high, low, close, 100.5, 99.5, p.rr, p.sl_mode)
+
+
+def test_empty_and_no_orb_days(features_db):
+    grid = build_grid(rr_values=[1.0, 2.0])
+    res = simulate_grid([], [], [], 10.0, 9.0, grid)
+    assert list(res.outcome) == ["SKIPPED_NO_BARS"] * 2
+
+    con = duckdb.connect(features_db, read_only=True)
+    # Dates outside daily_features have no ORB
+    missing = END + timedelta(days=30)
+    by_date = simulate_grid_days(con, [missing], "0900", grid)
+    con.close()
+    assert list(by_date[missing].outcome) == ["SKIPPED_NO_ORB"] * 2
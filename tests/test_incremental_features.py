@@ -0,0 +1,168 @@
+"""
+Tests for incremental feature maintenance (pipeline/incremental_features.py).
+
+Rewriting a slice of bars and applying the change log must leave
+daily_features identical to a full rebuild over the same bars, while only
+touching the invalidated dates.
+"""
+from datetime import date, datetime
+
+import duckdb
+
+from pipeline.build_daily_features import TZ_UTC
+from pipeline.incremental_features import (
+    BarChange, invalidations_for_range, pending_changes, plan_invalidations, record_bar_change,
+    update_features_incremental,
+)
+from tests.conftest import build_features, fetch_feature_rows, make_bars_db, same_value
+
+# 2025-01-20 11:00-11:59 Brisbane: inside Asia and the 1100 ORB window
+CHANGE_FIRST = datetime(2025, 1, 20, 1, 0, tzinfo=TZ_UTC)
+CHANGE_LAST = datetime(2025, 1, 20, 1, 59, tzinfo=TZ_UTC)
+
+
+def _rewrite_bars(db_path: str, record: bool) -> None:
+    """Widen the highs of one hour of bars (as a corrected backfill would)."""
+    con = duckdb.connect(db_path)
+    written = con.execute(
+        """
+        UPDATE bars_1m SET high = high + 5.0
+        WHERE symbol = 'MGC' AND ts_utc BETWEEN ? AND ?
+        RETURNING ts_utc
+        """,
+        [CHANGE_FIRST, CHANGE_LAST],
+    ).fetchall()
+    con.execute("DELETE FROM bars_5m")
+    con.execute("""
+        INSERT INTO bars_5m
+        SELECT to_timestamp(floor(epoch(ts_utc) / 300) * 300), symbol, arg_max(source_symbol, ts_utc),
+               arg_min(open, ts_utc), max(high), min(low), arg_max(close, ts_utc), sum(volume)
+        FROM bars_1m
+        GROUP BY 1, 2
+    """)
+    if record:
+        record_bar_change(con, "MGC", [r[0] for r in written], source="test")
+    con.close()
+
+
+def test_invalidations_for_range_maps_utc_to_trade_dates_and_orbs():
+    # 2025-01-15 14:00Z = 2025-01-16 00:00 Brisbane: Pre-NY of trade date 01-15
+    plan = invalidations_for_range(datetime(2025, 1, 15, 14, 0, tzinfo=TZ_UTC),
+                                   datetime(2025, 1, 15, 14, 10, tzinfo=TZ_UTC))
+    assert list(plan) == [date(2025, 1, 15)]
+    inv = plan[date(2025, 1, 15)]
+    assert inv.sessions == {"pre_ny"}
+    # Every ORB that started before the change scans through it; 0030 starts later
+    assert inv.orbs == {"0900", "1000", "1100", "1800", "2300"}
+
+    # 07:30 Brisbane is both D-1's overnight scan and D's Pre-Asia
+    plan = invalidations_for_range(datetime(2025, 1, 15, 21, 30, tzinfo=TZ_UTC),
+                                   datetime(2025, 1, 15, 21, 30, tzinfo=TZ_UTC))
+    assert sorted(plan) == [date(2025, 1, 15), date(2025, 1, 16)]
+    assert plan[date(2025, 1, 15)].sessions == set()
+    assert len(plan[date(2025, 1, 15)].orbs) == 6
+    assert plan[date(2025, 1, 16)].sessions == {"pre_asia"}
+    assert plan[date(2025, 1, 16)].orbs == set()
+
+
+def test_incremental_update_matches_full_rebuild(tmp_path):
+    incremental_db = str(tmp_path / "incremental.db")
+    full_db = str(tmp_path / "full.db")
+    make_bars_db(incremental_db)
+    make_bars_db(full_db)
+
+    build_features(incremental_db)
+    _rewrite_bars(incremental_db, record=True)
+
+    # Dry run reports but leaves features and the change log alone
+    _, before = fetch_feature_rows(incremental_db)
+    plan = update_features_incremental(db_path=incremental_db, dry_run=True)
+    _, after_dry_run = fetch_feature_rows(incremental_db)
+    assert after_dry_run == before
+
+    inv = plan[date(2025, 1, 20)]
+    assert "asia" in inv.sessions
+    assert inv.orbs == {"0900", "1000", "1100"}
+    assert "orb_1800_outcome" not in inv.columns()
+    assert all(plan[d].atr and not plan[d].sessions for d in plan if d > date(2025, 1, 20))
+    assert len(plan) < len(before)
+
+    update_features_incremental(db_path=incremental_db)
+
+    _rewrite_bars(full_db, record=False)
+    build_features(full_db)
+
+    columns, expected = fetch_feature_rows(full_db)
+    _, actual = fetch_feature_rows(incremental_db)
+    assert actual != before
+    assert len(actual) == len(expected)
+    for exp_row, act_row in zip(expected, actual):
+        for col, exp, act in zip(columns, exp_row, act_row):
+            assert same_value(exp, act), f"{exp_row[0]} {col}: full={exp!r} incremental={act!r}"
+
+    con = duckdb.connect(incremental_db)
+    assert pending_changes(con) == []
+    con.close()
+
+
+def test_dry_run_has_no_side_effects(tmp_path):
+    db_path = str(tmp_path / "bars.db")
+    make_bars_db(db_path)
+    _rewrite_bars(db_path, record=True)
+
+    con = duckdb.connect(db_path)
+    tables_before = con.execute("SELECT table_name FROM information_schema.tables ORDER BY 1").fetchall()
+    con.close()
+
+    plan = update_features_incremental(db_path=db_path, dry_run=True)
+    assert date(2025, 1, 20) in plan
+
+    con = duckdb.connect(db_path)
+    tables_after = con.execute("SELECT table_name FROM information_schema.tables ORDER BY 1").fetchall()
+    assert tables_after == tables_before
+    assert len(pending_changes(con)) == 1
+    con.close()
+
+
+def test_rsi_invalidated_by_change_inside_0030_bucket(tmp_path):
+    db_path = str(tmp_path / "bars.db")
+    make_bars_db(db_path)
+    con = duckdb.connect(db_path)
+    # 2025-01-21 00:32 Brisbane: aggregated into the 00:30 5m bar read by rsi_at_0030 of 01-20
+    at = datetime(2025, 1, 20, 14, 32, tzinfo=TZ_UTC)
+    change = BarChange(1, "MGC", "bars_1m", "test", at, at, 1)
+    plan = plan_invalidations(con, [change])
+    con.close()
+    assert plan[date(2025, 1, 20)].rsi
+
+
+def test_half_run_applies_full_table_first(tmp_path):
+    incremental_db = str(tmp_path / "incremental.db")
+    full_db = str(tmp_path / "full.db")
+    make_bars_db(incremental_db)
+    make_bars_db(full_db)
+
+    for db_path in (incremental_db, full_db):
+        build_features(db_path)
+        build_features(db_path, sl_mode="half")
+    _rewrite_bars(incremental_db, record=True)
+
+    # Only the half table is requested; daily_features must be brought up to date first
+    update_features_incremental(db_path=incremental_db, sl_mode="half")
+
+    _rewrite_bars(full_db, record=False)
+    build_features(full_db)
+    build_features(full_db, sl_mode="half")
+
+    for table_name in ("daily_features", "daily_features_half"):
+        columns, expected = fetch_feature_rows(full_db, table_name)
+        _, actual = fetch_feature_rows(incremental_db, table_name)
+        assert len(actual) == len(expected)
+        for exp_row, act_row in zip(expected, actual):
+            for col, exp, act in zip(columns, exp_row, act_row):
+                assert same_value(exp, act), f"{table_name} {exp_row[0]} {col}: full={exp!r} incremental={act!r}"
+
+    con = duckdb.connect(incremental_db)
+    assert pending_changes(con) == []
+    assert pending_changes(con, features_table="daily_features_half") == []
+    con.close()
@@ -0,0 +1,133 @@
+"""
+Tests for pipeline/ingest_dbn.py (offline bulk DBN ingestion).
+
+Raw frames are built in the shape read_dbn() returns (databento itself is not
+needed). The front contract must match the per-day pick of the network
+backfills, splitting the input into files must not change what is written,
+and every trade month is one set-based upsert.
+"""
+from datetime import timedelta
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.ingest_dbn import front_contract_bars, ingest_frames
+from tests.conftest import CountingConnection
+
+TZ = "Australia/Brisbane"
+ROLL_DAY = pd.Timestamp("2025-02-03")  # first trade day MGCJ5 out-trades MGCG5
+
+
+def _raw_bars(seed=11):
+    """Two outrights plus a calendar spread, 2025-01-27 09:00 -> 2025-02-08 09:00 local."""
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2025-01-26 23:00", "2025-02-07 23:00", freq="1min", inclusive="left", tz="UTC")
+    ts = ts[ts.dayofweek < 5]
+    frames = []
+    for symbol, base in (("MGCG5", 2750.0), ("MGCJ5", 2770.0), ("MGCG5-MGCJ5", -20.0)):
+        close = np.round(base + np.cumsum(rng.normal(0, 0.5, len(ts))), 1)
+        volume = rng.integers(1, 100, len(ts))
+        after_roll = (ts.tz_convert(TZ).tz_localize(None) - pd.Timedelta(hours=9)) >= ROLL_DAY
+        if symbol == "MGCG5":
+            volume = np.where(after_roll, volume, volume * 10)
+        elif symbol == "MGCJ5":
+            volume = np.where(after_roll, volume * 10, volume)
+        else:
+            volume = volume * 100  # spreads never count as the front
+        frames.append(pd.DataFrame({
+            "ts_utc": ts, "symbol": symbol,
+            "open": close - 0.2, "high": close + 0.5, "low": close - 0.5, "close": close,
+            "volume": volume,
+        }))
+    # Databento files interleave contracts by timestamp
+    return pd.concat(frames).sort_values(["ts_utc", "symbol"], ignore_index=True)
+
+
+@pytest.fixture
+def con(tmp_path):
+    con = duckdb.connect(str(tmp_path / "bars.db"))
+    yield con
+    con.close()
+
+
+def _per_day_front(raw):
+    """The backfills' pick: one 09:00 -> 09:00 window at a time, most volume among outrights."""
+    local_day = (raw["ts_utc"].dt.tz_convert(TZ).dt.tz_localize(None) - pd.Timedelta(hours=9)).dt.floor("D")
+    picks = {}
+    for day, df in raw.groupby(local_day):
+        outrights = df[~df["symbol"].str.contains("-")]
+        picks[day] = outrights.groupby("symbol")["volume"].sum().sort_values(ascending=False).index[0]
+    return picks
+
+
+def test_front_contract_matches_per_day_pick():
+    raw = _raw_bars()
+    bars = front_contract_bars(raw, TZ)
+    picks = _per_day_front(raw)
+
+    assert dict(bars.groupby("trade_day")["source_symbol"].first()) == picks
+    assert bars.groupby("trade_day")["source_symbol"].nunique().max() == 1
+    assert picks[ROLL_DAY - timedelta(days=3)] == "MGCG5" and picks[ROLL_DAY] == "MGCJ5"
+    assert bars["ts_utc"].is_monotonic_increasing and not bars["ts_utc"].duplicated().any()
+    local_day = (raw["ts_utc"].dt.tz_convert(TZ).dt.tz_localize(None) - pd.Timedelta(hours=9)).dt.floor("D")
+    assert len(bars) == (raw["symbol"] == local_day.map(picks)).sum()
+
+
+def test_split_files_ingest_like_one_file(tmp_path):
+    raw = _raw_bars()
+    results = {}
+    # Cut points inside trade days (01:00 and 15:00 local), as UTC-dated files would
+    cuts = [pd.Timestamp("2025-01-29 15:00", tz="UTC"), pd.Timestamp("2025-02-04 05:00", tz="UTC")]
+    parts = [raw[raw["ts_utc"] < cuts[0]],
+             raw[(raw["ts_utc"] >= cuts[0]) & (raw["ts_utc"] < cuts[1])],
+             raw[raw["ts_utc"] >= cuts[1]]]
+
+    for name, frames in (("one", [raw]), ("split", parts)):
+        con = CountingConnection(duckdb.connect(str(tmp_path / f"{name}.db")))
+        stats = ingest_frames(con, frames, symbol="MGC", table="bars_1m_mpl", tz_local=TZ)
+        assert stats["months"] == 2 and stats["days"] == len(_per_day_front(raw))
+        assert sum(sql.startswith("INSERT OR REPLACE INTO bars_1m_mpl") for sql in con.sql) == 2
+        assert len(stats["ranges"]) == 1  # 5m rebuilt once
+        results[name] = {
+            table: con.execute(f"SELECT * FROM {table} ORDER BY ts_utc").fetchall()
+            for table in ("bars_1m_mpl", "bars_5m_mpl")
+        }
+        log = con.execute("""
+            SELECT bars_table, source, row_count FROM bar_change_log ORDER BY first_ts_utc
+        """).fetchall()
+        assert [r[:2] for r in log] == [("bars_1m_mpl", "databento")] * 2
+        assert sum(r[2] for r in log) == stats["rows"] == len(results[name]["bars_1m_mpl"])
+        con.close()
+
+    assert results["split"] == results["one"]
+
+    expected = front_contract_bars(raw, TZ)
+    bars_1m = results["one"]["bars_1m_mpl"]
+    assert [r[2] for r in bars_1m] == list(expected["source_symbol"])
+    assert [r[6] for r in bars_1m] == list(expected["close"])
+    assert {r[1] for r in bars_1m} == {"MGC"}
+
+
+def test_5m_rebuild_and_idempotent_rerun(con):
+    raw = _raw_bars()
+    ingest_frames(con, [raw], symbol="MGC", tz_local=TZ)
+    first = con.execute("SELECT * FROM bars_1m ORDER BY ts_utc").fetchall()
+
+    five = con.execute("""
+        SELECT ts_utc, open, high, low, close, volume FROM bars_5m ORDER BY ts_utc
+    """).fetchdf()
+    bars = front_contract_bars(raw, TZ).set_index("ts_utc")
+    expected = bars.resample("5min").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    ).dropna()
+    assert len(five) == len(expected)
+    assert np.allclose(five[["open", "high", "low", "close"]].to_numpy(),
+                       expected[["open", "high", "low", "close"]].to_numpy())
+    assert (five["volume"].to_numpy() == expected["volume"].to_numpy()).all()
+
+    stats = ingest_frames(con, [raw], symbol="MGC", tz_local=TZ)
+    assert stats["rows"] == len(first)
+    assert con.execute("SELECT * FROM bars_1m ORDER BY ts_utc").fetchall() == first
+    assert con.execute("SELECT COUNT(*) FROM bars_5m").fetchone()[0] == len(expected)
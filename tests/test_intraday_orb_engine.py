@@ -0,0 +1,167 @@
+"""
+Tests for trading_app/intraday_orb_engine.py (streaming ORB state).
+
+Fed bar by bar, the engine must agree with the batch calculators in
+build_daily_features.py: at the end of every trade date with the stored
+features, and mid-session with calculate_orb_1m_* run up to the last bar seen.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import duckdb
+import pytest
+
+from intraday_orb_engine import IntradayOrbEngine, trade_date_for
+from live_scanner import LiveScanner
+from market_scanner import MarketScanner
+from pipeline.build_daily_features import FeatureBuilder, ORB_TIMES, _dt_local, session_bounds
+from tests.conftest import START
+
+DAYS = [START + timedelta(days=i) for i in range(10)]
+
+
+def _bars(db_path, start_local, end_local):
+    con = duckdb.connect(db_path, read_only=True)
+    df = con.execute("""
+        SELECT ts_utc, open, high, low, close, volume FROM bars_1m
+        WHERE ts_utc >= ? AND ts_utc < ? ORDER BY ts_utc
+    """, [start_local, end_local]).fetchdf()
+    con.close()
+    return df
+
+
+def test_end_of_day_matches_batch(bars_db):
+    engine = IntradayOrbEngine()
+    builder = FeatureBuilder(db_path=bars_db, read_only=True)
+    bars = _bars(bars_db, _dt_local(DAYS[0], 7, 0), _dt_local(DAYS[-1] + timedelta(days=1), 9, 0))
+
+    checked = 0
+    for d in DAYS:
+        end = _dt_local(d + timedelta(days=1), 9, 0)
+        engine.feed(bars[bars["ts_utc"] < end])
+        day = engine.day(d)
+        if day is None:
+            continue  # weekend: no bars opened this trade date
+
+        for name in ("pre_asia", "pre_london", "pre_ny", "asia", "london", "ny"):
+            assert day.session_stats(name) == builder._window_stats_1m(*session_bounds(d, name)), (d, name)
+
+        for orb_name, hh, mm, offset in ORB_TIMES:
+            start = _dt_local(d + timedelta(days=offset), hh, mm)
+            orb = day.orbs[orb_name]
+            assert orb.exec_result() == builder.calculate_orb_1m_exec(start, end), (d, orb_name)
+            assert orb.tradeable_result() == builder.calculate_orb_1m_tradeable(start, end), (d, orb_name)
+            checked += orb.tradeable_result() is not None
+    builder.close()
+    assert checked > 30
+
+
+@pytest.mark.parametrize("sl_mode,rr", [("full", 1.0), ("half", 2.5)])
+def test_mid_session_matches_batch_up_to_last_bar(bars_db, sl_mode, rr):
+    d = DAYS[1]
+    bars = _bars(bars_db, _dt_local(d, 7, 0), _dt_local(d + timedelta(days=1), 9, 0))
+    engine = IntradayOrbEngine(rr=rr, sl_mode=sl_mode)
+    builder = FeatureBuilder(db_path=bars_db, read_only=True)
+
+    statuses = set()
+    for i in range(0, len(bars), 37):
+        engine.feed(bars.iloc[:i + 1])
+        now = bars["ts_utc"].iloc[i] + timedelta(minutes=1)
+        for orb_name, hh, mm, offset in ORB_TIMES:
+            start = _dt_local(d + timedelta(days=offset), hh, mm)
+            orb = engine.orb(orb_name, d)
+            statuses.add(orb.status(engine.now_ms))
+            if now <= start:
+                assert orb.tradeable_result() is None
+                continue
+            assert orb.exec_result() == builder.calculate_orb_1m_exec(start, now, rr=rr, sl_mode=sl_mode)
+            assert orb.tradeable_result() == builder.calculate_orb_1m_tradeable(start, now, rr=rr, sl_mode=sl_mode)
+    builder.close()
+    assert {"PENDING", "FORMING", "WAITING", "LOSS"} <= statuses
+
+
+def test_duplicate_bars_and_day_rollover(bars_db):
+    d = DAYS[2]
+    bars = _bars(bars_db, _dt_local(d, 7, 0), _dt_local(d + timedelta(days=1), 9, 0))
+    engine = IntradayOrbEngine()
+    assert engine.feed(bars) == len(bars)
+    assert engine.feed(bars) == 0  # polling overlap is ignored
+
+    # D+1 07:00-09:00 bars belong to both trade dates
+    assert engine.day() is engine.day(d + timedelta(days=1))
+    assert engine.day(d).orbs["0030"].exec_result() is not None
+    assert engine.day().session_stats("pre_asia") is not None
+    assert trade_date_for(engine.last_ts) == d + timedelta(days=1)
+
+
+def test_live_scanner_reads_engine_without_db(bars_db):
+    d = DAYS[3]
+    bars = _bars(bars_db, _dt_local(d, 7, 0), _dt_local(d, 11, 3))
+    engine = IntradayOrbEngine(atr_20=10.0)
+    engine.feed(bars)
+
+    state = LiveScanner(None, orb_engine=engine).get_current_market_state('MGC')
+    assert state['date_local'] == d
+    assert state['available_orbs'] == ['0900', '1000']
+    orb = state['orb_data']['1000']
+    assert orb == engine.day().orb_snapshot('1000', atr_20=10.0)
+    assert orb['size_norm'] == orb['size'] / 10.0
+    assert state['orb_data']['atr_20'] == 10.0
+
+
+def test_market_scanner_reads_engine_without_db(bars_db):
+    d = DAYS[3]
+    bars = _bars(bars_db, _dt_local(d, 7, 0), _dt_local(d, 19, 0))
+    engine = IntradayOrbEngine(atr_20=10.0)
+    engine.feed(bars)
+
+    conditions = MarketScanner(db_path="missing.db", orb_engine=engine).get_today_conditions()
+    asia = engine.day().session_stats('asia')
+    assert conditions['date_local'] == d and conditions['data_available']
+    assert conditions['asia_travel'] == asia['range']
+    assert conditions['london_type_code'] == engine.day().type_codes(10.0)['london_type_code']
+    assert conditions['orb_sizes']['1000'] == engine.day().orbs['1000'].box()['size']
+    assert conditions['orb_sizes']['2300'] is None and conditions['orb_broken']['2300'] is False
+
+
+def test_strategy_engine_stands_down_after_streamed_trade_closes(bars_db, monkeypatch):
+    import strategy_engine
+    from strategy_engine import ActionType, StrategyEngine, StrategyState
+
+    engine = IntradayOrbEngine()
+    loader = SimpleNamespace(
+        orb_engine=engine,
+        check_orb_size_filter=lambda high, low, orb_name: {"pass": True, "atr": 10.0},
+        get_latest_bar=lambda: {"close": engine.last_close},
+        get_position_size_multiplier=lambda orb_name, passed: 1.0,
+    )
+    strategy = StrategyEngine.__new__(StrategyEngine)
+    strategy.loader = loader
+    strategy.instrument = 'MGC'
+    strategy.orb_configs = {'1000': {'tier': 'DAY', 'rr': 1.0, 'sl_mode': 'FULL'}}
+    monkeypatch.setattr(strategy, '_get_setup_info', lambda orb_name: None)
+
+    class _EngineClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(engine.now_ms / 1000, tz)
+
+    monkeypatch.setattr(strategy_engine, 'datetime', _EngineClock)
+
+    actions = {}
+    for d in DAYS:
+        bars = _bars(bars_db, _dt_local(d, 7, 0), _dt_local(d, 23, 0))
+        for _, bar in bars.iterrows():
+            engine.on_bar(bar.to_dict())
+            orb = engine.orb('1000')
+            if orb.signal_close is None or not orb.is_formed(engine.now_ms):
+                continue
+            status = orb.status(engine.now_ms)
+            evaluation = strategy._check_orb('1000')
+            actions.setdefault(status, set()).add((evaluation.action, evaluation.state))
+        if {'WIN', 'LOSS'} & set(actions):
+            break
+
+    assert (ActionType.ENTER, StrategyState.READY) in actions['SIGNAL']
+    closed = actions.get('WIN', set()) | actions.get('LOSS', set())
+    assert closed == {(ActionType.STAND_DOWN, StrategyState.EXITED)}
@@ -0,0 +1,131 @@
+"""
+Tests for LiveDataLoader's ring-buffer bar window and delta polling.
+
+Range queries on the ring buffer must agree with the old mask-based
+DataFrame answers, and after the first load each poll only reads bars from
+the last stored timestamp on.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+from config import TZ_UTC
+from data_loader import BarRingBuffer, LiveDataLoader
+from tests.conftest import CountingConnection
+
+T0 = 1_736_000_000_000 - 1_736_000_000_000 % 60_000
+
+
+def _random_bars(n, seed=3, start_ms=T0):
+    rng = np.random.default_rng(seed)
+    close = np.round(2650 + np.cumsum(rng.normal(0, 0.5, n)), 1)
+    return pd.DataFrame({
+        "ts": start_ms + 60_000 * np.arange(n, dtype=np.int64),
+        "open": close - 0.1,
+        "high": close + np.round(rng.uniform(0, 1, n), 1),
+        "low": close - np.round(rng.uniform(0, 1, n), 1),
+        "close": close,
+        "volume": rng.integers(0, 50, n),
+    })
+
+
+def _extend(ring, bars):
+    return ring.extend(*(bars[c].to_numpy() for c in ("ts", "open", "high", "low", "close", "volume")))
+
+
+def _expected(bars, start_ms, end_ms):
+    sel = bars[(bars["ts"] >= start_ms) & (bars["ts"] < end_ms)]
+    if sel.empty:
+        return None, None
+    pv = ((sel["high"] + sel["low"] + sel["close"]) / 3 * sel["volume"]).sum()
+    vwap = None if sel["volume"].sum() == 0 else pv / sel["volume"].sum()
+    return (sel["high"].max(), sel["low"].min()), vwap
+
+
+@pytest.mark.parametrize("capacity", [50, 1000])
+def test_ring_buffer_matches_masks(capacity):
+    bars = _random_bars(300)
+    ring = BarRingBuffer(capacity=capacity)
+    assert _extend(ring, bars) == 300
+    kept = bars.iloc[-min(capacity, 300):]
+    assert len(ring) == len(kept) and ring.evicted == 300 - len(kept)
+    assert np.array_equal(ring.column("close"), kept["close"].to_numpy())
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        a, b = sorted(rng.integers(kept["ts"].iloc[0] - 120_000, kept["ts"].iloc[-1] + 120_000, 2))
+        high_low, vwap = _expected(kept, a, b)
+        assert ring.high_low(a, b) == high_low
+        if vwap is None:
+            assert ring.vwap(a, b) is None
+        else:
+            assert ring.vwap(a, b) == pytest.approx(vwap)
+
+    frame = ring.to_frame(*ring.span(int(kept["ts"].iloc[5]), int(kept["ts"].iloc[9])))
+    assert list(frame["close"]) == list(kept["close"].iloc[5:9])
+    assert str(frame["ts_local"].dt.tz) == "Australia/Brisbane"
+
+
+def test_ring_buffer_replaces_forming_bar():
+    bars = _random_bars(10)
+    ring = BarRingBuffer(capacity=8)
+    _extend(ring, bars)
+
+    # Same timestamp re-sent (forming bar completed): replaced, running totals stay consistent
+    last = bars.iloc[-1]
+    assert ring.upsert(int(last["ts"]), 1.0, 3000.0, 1.0, 2000.0, 7)
+    assert not ring.upsert(int(bars["ts"].iloc[0]), 1.0, 1.0, 1.0, 1.0, 1)  # older: ignored
+    fixed = bars.copy()
+    fixed.iloc[-1, 1:] = [1.0, 3000.0, 1.0, 2000.0, 7]
+    high_low, vwap = _expected(fixed.iloc[-8:], 0, T0 * 2)
+    assert ring.high_low(0, T0 * 2) == high_low
+    assert ring.vwap(0, T0 * 2) == pytest.approx(vwap)
+    assert len(ring) == 8
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    monkeypatch.setenv("FORCE_LOCAL_DB", "1")
+    monkeypatch.setattr(data_loader, "DB_PATH", str(tmp_path / "live.db"))
+    monkeypatch.setattr(data_loader, "PROJECTX_USERNAME", None)
+    loader = LiveDataLoader("MGC")
+    yield loader
+    loader.close()
+
+
+def test_delta_polling_reads_only_new_bars(loader):
+    now_min = int(datetime.now(TZ_UTC).timestamp()) // 60 * 60_000
+    bars = _random_bars(120, start_ms=now_min - 200 * 60_000)
+    loader._upsert_live_bars(bars.iloc[:100])
+
+    first = loader.fetch_latest_bars(lookback_minutes=240)
+    assert list(first["close"]) == list(bars["close"].iloc[:100])
+
+    loader.con = CountingConnection(loader.con)
+    loader._upsert_live_bars(bars.iloc[100:])
+    assert sum(sql.startswith("INSERT OR REPLACE INTO live_bars") for sql in loader.con.sql) == 1
+
+    second = loader.fetch_latest_bars(lookback_minutes=240)
+    assert list(second["close"]) == list(bars["close"])
+    reads = [sql for sql in loader.con.sql if sql.startswith("SELECT epoch_ms(ts_utc)")]
+    assert len(reads) == 1
+
+    # Same answers as the DB for range queries
+    start = datetime.fromtimestamp((bars["ts"].iloc[10]) / 1000, TZ_UTC)
+    end = start + timedelta(minutes=30)
+    db = loader.con.execute("""
+        SELECT max(high), min(low), sum((high + low + close) / 3 * volume) / sum(volume)
+        FROM live_bars WHERE ts_utc >= ? AND ts_utc < ?
+    """, [start, end]).fetchone()
+    hl = loader.get_session_high_low(start, end)
+    assert (hl["high"], hl["low"]) == db[:2]
+    assert loader.calculate_vwap(start, end) == pytest.approx(db[2])
+    assert len(loader.get_bars_in_range(start, end)) == 30
+    assert loader.get_latest_bar()["close"] == bars["close"].iloc[-1]
+    assert len(loader.bars_df) == 120
+
+    # Nothing new: empty delta, window unchanged
+    assert len(loader.fetch_latest_bars(lookback_minutes=240)) == 120
@@ -0,0 +1,126 @@
+"""
+Tests for trading_app/monte_carlo_engine.py (vectorized drawdown simulation).
+
+Every path must breach, stop and end exactly where stepping calculate_drawdown
+trade by trade says it does, for all three drawdown models. Breach
+probability for a symmetric walk is checked against the reflection principle.
+"""
+import math
+import time
+
+import numpy as np
+import pytest
+
+from trading_app.drawdown_engine import DrawdownRequest, calculate_drawdown, simulate_breach_risk
+from trading_app.monte_carlo_engine import MonteCarloRequest, draw_r_paths, simulate_drawdown
+from trading_app.risk_engine import RiskRequest, calculate_risk
+
+START = 50000.0
+
+
+def _reference(request, paths):
+    """Step calculate_drawdown after every trade; (breach_at, final, max_dd) per path."""
+    k = request.trades_per_day
+    out = []
+    for r in paths:
+        balance, hwm, peak, max_dd = START, START, START, 0.0
+        breach_at = None
+        for i, x in enumerate(r):
+            balance += float(x) * request.risk_per_trade
+            peak = max(peak, balance)
+            max_dd = max(max_dd, peak - balance)
+            state = calculate_drawdown(DrawdownRequest(
+                drawdown_model=request.drawdown_model, starting_balance=START,
+                max_drawdown_size=request.max_drawdown_size, current_balance=balance,
+                high_water_mark=hwm, previous_close_balance=hwm, is_intraday=True,
+            ))
+            if state.effective_capital <= 0:
+                breach_at = i
+                break
+            if request.profit_target is not None and balance - START >= request.profit_target:
+                break
+            if request.drawdown_model == 'TRAILING_INTRADAY':
+                hwm = state.new_high_water_mark
+            elif request.drawdown_model == 'TRAILING_EOD' and (i + 1) % k == 0:
+                hwm = calculate_drawdown(DrawdownRequest(
+                    drawdown_model='TRAILING_EOD', starting_balance=START,
+                    max_drawdown_size=request.max_drawdown_size, current_balance=balance,
+                    high_water_mark=hwm, previous_close_balance=hwm, is_intraday=False,
+                )).new_high_water_mark
+        out.append((breach_at, balance, max_dd))
+    return out
+
+
+@pytest.mark.parametrize("model", ['STATIC', 'TRAILING_INTRADAY', 'TRAILING_EOD'])
+@pytest.mark.parametrize("profit_target", [None, 600.0])
+def test_paths_match_stepping_drawdown_engine(model, profit_target):
+    request = MonteCarloRequest(
+        drawdown_model=model, starting_balance=START, max_drawdown_size=500.0, risk_per_trade=100.0,
+        r_multiples=(-1.0, -1.0, 1.5), profit_target=profit_target,
+        n_paths=400, n_trades=40, trades_per_day=3, seed=7,
+    )
+    paths = draw_r_paths(400, 40, r_multiples=request.r_multiples, rng=np.random.default_rng(7))
+    ref = _reference(request, paths)
+    result = simulate_drawdown(request)
+
+    breached = [b for b, _, _ in ref if b is not None]
+    assert 0 < len(breached) < 400
+    assert result.breach_probability == len(breached) / 400
+    assert result.time_to_breach_mean == pytest.approx(np.mean(breached) + 1)
+    assert result.expected_final_balance == pytest.approx(np.mean([f for _, f, _ in ref]))
+    expected_dd = np.quantile([d for _, _, d in ref], list(result.max_drawdown_quantiles))
+    assert list(result.max_drawdown_quantiles.values()) == pytest.approx(list(expected_dd))
+    if profit_target is None:
+        assert result.target_probability == 0.0
+    else:
+        assert result.target_probability > 0
+
+
+def test_static_breach_probability_matches_reflection_principle():
+    # Symmetric +-1R walk, floor 10R below start: P(min S_n <= -a) = 2 P(S_n < -a) + P(S_n = -a)
+    n, a = 100, 10
+    pmf = {2 * w - n: math.comb(n, w) / 2 ** n for w in range(n + 1)}
+    expected = 2 * sum(p for s, p in pmf.items() if s < -a) + pmf[-a]
+
+    result = simulate_drawdown(MonteCarloRequest(
+        drawdown_model='STATIC', starting_balance=START, max_drawdown_size=1000.0, risk_per_trade=100.0,
+        win_rate=0.5, payoff_ratio=1.0, n_paths=100_000, n_trades=n,
+    ))
+    assert result.breach_probability == pytest.approx(expected, abs=0.01)
+    assert result.max_drawdown_quantiles[0.5] > 0
+
+
+def test_deterministic_for_seed_and_latency():
+    request = MonteCarloRequest(
+        drawdown_model='TRAILING_EOD', starting_balance=START, max_drawdown_size=2000.0,
+        risk_per_trade=200.0, win_rate=0.45, payoff_ratio=1.5, n_paths=100_000, n_trades=100,
+        trades_per_day=2,
+    )
+    started = time.perf_counter()
+    first = simulate_drawdown(request)
+    elapsed = time.perf_counter() - started
+
+    assert simulate_drawdown(request) == first
+    assert simulate_drawdown(MonteCarloRequest(**{**request.__dict__, 'seed': 1})) != first
+    assert elapsed < 2.0  # ~0.1s on a workstation; loose for shared CI
+
+
+def test_breach_risk_from_current_state_and_risk_engine():
+    # At the trailing floor already: every path is breached before trading
+    at_floor = DrawdownRequest(drawdown_model='TRAILING_INTRADAY', starting_balance=START,
+                               max_drawdown_size=2000.0, current_balance=50500.0, high_water_mark=52500.0)
+    result = simulate_breach_risk(at_floor, risk_per_trade=100.0, win_rate=0.6, payoff_ratio=2.0,
+                                  n_paths=1000)
+    assert result.breach_probability == 1.0 and result.time_to_breach_mean == 0
+
+    base = dict(effective_capital=1000.0, risk_percent=0.10, win_rate=0.40, payoff_ratio=1.5,
+                stop_distance_points=1.0, point_value=10.0)
+    closed_form = calculate_risk(RiskRequest(**base))
+    assert closed_form.calculation_metadata['ror_method'] == 'gamblers_ruin'
+
+    simulated = calculate_risk(RiskRequest(**base, monte_carlo_paths=20_000, drawdown_model='TRAILING_INTRADAY'))
+    assert simulated.calculation_metadata['ror_method'] == 'monte_carlo'
+    assert simulated.calculation_metadata['monte_carlo']['n_paths'] == 20_000
+    assert 0.5 < simulated.risk_of_ruin <= 1.0
+    assert simulated.risk_level == 'CRITICAL'
+    assert simulated.position_size == closed_form.position_size
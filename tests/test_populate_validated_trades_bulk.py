@@ -0,0 +1,102 @@
+"""
+Tests for the bulk / parallel modes of pipeline/populate_validated_trades.py.
+
+Bulk and parallel population must write exactly the rows the per-date path
+writes (one calculate_tradeable_for_strategy call per setup per date), over
+synthetic bars spanning several month chunks and every ORB time, with
+setups that share an orb_time.
+"""
+import shutil
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from benchmarks.synthetic_market import create_scratch_db, date_range_for
+from pipeline import populate_validated_trades as pvt
+from pipeline.build_daily_features import FeatureBuilder
+
+YEARS = 0.2
+SCHEMA = Path(__file__).resolve().parents[1] / "pipeline" / "schema_validated_trades.sql"
+SETUPS = [
+    (1, '0900', 1.5, 'full'), (2, '0900', 2.0, 'half'), (3, '1000', 2.0, 'full'), (4, '1000', 3.0, 'full'),
+    (5, '1100', 8.0, 'full'), (6, '1800', 1.5, 'half'), (7, '2300', 1.5, 'full'), (8, '0030', 2.0, 'half'),
+]
+
+
+@pytest.fixture(scope="module")
+def source_db(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("vt") / "source.db")
+    create_scratch_db(db_path, YEARS, instruments=('MGC',))
+    builder = FeatureBuilder(db_path=db_path)
+    builder.init_schema()
+    builder._ensure_schema_columns(auto_migrate=True)
+    builder.build_features_bulk(*date_range_for(YEARS))
+    builder.close()
+
+    con = duckdb.connect(db_path)
+    con.executemany(
+        "INSERT INTO validated_setups (id, instrument, orb_time, rr, sl_mode, win_rate, expected_r, sample_size) "
+        "VALUES (?, 'MGC', ?, ?, ?, 0.5, 0.1, 100)",
+        SETUPS,
+    )
+    con.execute(SCHEMA.read_text(encoding="utf-8"))
+    con.close()
+    return db_path
+
+
+def _strategies():
+    return [{'id': i, 'orb_time': t, 'rr': rr, 'sl_mode': sl} for i, t, rr, sl in SETUPS]
+
+
+def _trades(db_path):
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        return con.execute(
+            f"SELECT {', '.join(pvt.TRADE_COLUMNS)} FROM validated_trades ORDER BY date_local, setup_id"
+        ).fetchall()
+    finally:
+        con.close()
+
+
+@pytest.mark.parametrize("mode", ["bulk", "parallel"])
+def test_bulk_matches_per_date(tmp_path, source_db, mode):
+    per_date_db, bulk_db = str(tmp_path / "per_date.db"), str(tmp_path / f"{mode}.db")
+    shutil.copy(source_db, per_date_db)
+    shutil.copy(source_db, bulk_db)
+    start, end = date_range_for(YEARS)
+
+    con = duckdb.connect(per_date_db)
+    for (trade_date,) in con.execute("SELECT date_local FROM daily_features ORDER BY date_local").fetchall():
+        pvt.populate_date(con, trade_date, _strategies())
+    con.close()
+
+    if mode == "parallel":
+        written = pvt.populate_range_parallel(start, end, _strategies(), workers=2, db_path=bulk_db)
+    else:
+        con = duckdb.connect(bulk_db)
+        pvt.populate_range(con, start, end, _strategies())
+        written = pvt.populate_range(con, start, end, _strategies())  # upsert: rerun replaces rows
+        con.close()
+
+    expected, actual = _trades(per_date_db), _trades(bulk_db)
+    assert written == len(expected) == len(actual)
+    assert {row[1] for row in expected} == {s[0] for s in SETUPS}
+    assert {row[11] for row in expected} >= {'WIN', 'LOSS', 'OPEN'}
+    assert actual == expected
+
+
+def test_compute_chunk_queries_once_per_chunk(source_db):
+    statements = []
+    con = duckdb.connect(source_db, read_only=True)
+
+    class Recorder:
+        def execute(self, sql, params=None):
+            statements.append(sql)
+            return con.execute(sql, params)
+
+    end = date_range_for(YEARS)[1]
+    trades = pvt.compute_chunk(Recorder(), end.replace(day=1), end, _strategies())
+    con.close()
+    assert len(statements) == 2
+    assert len(trades) > 0 and list(trades.columns) == list(pvt.TRADE_COLUMNS)
@@ -0,0 +1,130 @@
+"""
+Tests for analysis/query_engine.py strategy application.
+
+filtered_out_reason must match the old row-by-row checks for every preset,
+the close-confirmation aggregate must only be rebuilt when orb_trades_1m_exec
+changes, and each view must fetch only the columns it reads.
+"""
+import dataclasses
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import query_engine, result_cache
+from tests.conftest import CountingConnection, make_views_db
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    monkeypatch.setattr(result_cache, "_default_cache", None)
+    monkeypatch.setattr(result_cache, "_default_enabled", False)
+
+
+@pytest.fixture
+def views_path(tmp_path):
+    path = str(tmp_path / "views.db")
+    con = make_views_db(path)
+    con.execute("""
+        CREATE TABLE orb_trades_1m_exec (date_local DATE, orb VARCHAR, close_confirmations INTEGER);
+        INSERT INTO orb_trades_1m_exec
+        SELECT date_local, orb_time, (row_number() OVER ()) % 4 FROM v_orb_trades;
+        UPDATE daily_features SET orb_1000_size = 12.0 WHERE day(date_local) % 2 = 0;
+    """)
+    con.close()
+    return path
+
+
+def _row_reason(row, strategy):
+    """Old path: first failing check per row."""
+    if not row["break_occurred"]:
+        return "no_break"
+    if not row["confirm_pass"]:
+        return "confirm_not_met"
+    if strategy.retest_required and not row["retest_hit"]:
+        return "retest_not_met"
+    if strategy.retest_required and strategy.entry_model == "break_retest_reject" and not row["rejection_hit"]:
+        return "rejection_not_met"
+    if strategy.max_stop_ticks is not None and pd.notnull(row["stop_ticks"]) and row["stop_ticks"] > strategy.max_stop_ticks:
+        return "stop_too_large"
+    return None
+
+
+@pytest.mark.parametrize("preset", list(query_engine.PRESETS))
+@pytest.mark.parametrize("max_stop_ticks", [None, 5])
+def test_vectorized_reasons_match_row_checks(views_path, preset, max_stop_ticks):
+    strategy = dataclasses.replace(query_engine.PRESETS[preset], max_stop_ticks=max_stop_ticks)
+    con = duckdb.connect(views_path)
+    base = query_engine._fetch_base_frame(con, query_engine.filters_from_dict({}))
+    base.loc[base.index[:3], "orb_size"] = np.nan
+    df = query_engine._apply_strategy(base, strategy)
+
+    expected = [_row_reason(row, strategy) for _, row in df.iterrows()]
+    assert [r if isinstance(r, str) else None for r in df["filtered_out_reason"]] == expected
+    assert len(set(expected)) > 1
+    assert "filtered_out_reason" not in base  # input frame untouched
+    con.close()
+
+
+def test_exec_aggregate_refreshed_only_when_source_changes(views_path):
+    con = CountingConnection(duckdb.connect(views_path))
+    assert query_engine.refresh_exec_confirmations(con) == "temp." + query_engine.EXEC_CONFIRMS_TABLE
+    rebuilds = lambda: sum("CREATE OR REPLACE TEMP TABLE" in sql for sql in con.sql)
+    assert rebuilds() == 1
+
+    filters = query_engine.filters_from_dict({})
+    df = query_engine.strategy_dataset(con, filters, query_engine.default_strategy())
+    assert rebuilds() == 1
+    assert df["close_confirmations"].notna().all()
+
+    con.execute("UPDATE orb_trades_1m_exec SET close_confirmations = 9 WHERE orb = '0900'")
+    df = query_engine.strategy_dataset(con, filters, query_engine.default_strategy())
+    assert rebuilds() == 2
+    assert (df.loc[df["orb_time"] == "0900", "close_confirmations"] == 9).all()
+    # Connection-local: nothing persistent is added to the database
+    assert con.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name LIKE 'orb_exec%' AND NOT temporary"
+    ).fetchone()[0] == 0
+    con.close()
+
+    # Read-only sessions work the same; a database without the source gets NULLs
+    con = duckdb.connect(views_path)
+    con.execute("UPDATE orb_trades_1m_exec SET close_confirmations = 2")
+    con.close()
+    read_only = duckdb.connect(views_path, read_only=True)
+    assert query_engine.refresh_exec_confirmations(read_only) == "temp." + query_engine.EXEC_CONFIRMS_TABLE
+    df = query_engine.strategy_dataset(read_only, filters, query_engine.default_strategy())
+    assert (df["close_confirmations"] == 2).all()
+    read_only.close()
+
+    bare = make_views_db(views_path.replace("views.db", "bare.db"))
+    df = query_engine.strategy_dataset(bare, filters, query_engine.default_strategy())
+    assert df["close_confirmations"].isna().all() and df["confirm_pass"].any()
+    bare.close()
+
+
+def test_views_fetch_only_their_columns(views_path):
+    con = CountingConnection(duckdb.connect(views_path))
+    filters = query_engine.filters_from_dict({"orb_times": ["0900", "1000"]})
+    strategy = query_engine.default_strategy()
+    full = query_engine.strategy_dataset(con, filters, strategy)
+
+    con.sql.clear()
+    query_engine.equity_curve_with_strategy(con, filters, strategy)
+    fetch = [sql for sql in con.sql if "FROM v_orb_trades" in sql]
+    assert len(fetch) == 1
+    assert "AS orb_time" in fetch[0] and "AS r_multiple" in fetch[0]
+    assert "AS atr_20" not in fetch[0] and "AS asia_type_code" not in fetch[0]
+
+    heat = query_engine.heatmap_with_strategy(con, filters, strategy)
+    trades = full[full["eligible_trade"]]
+    assert heat["count_rows"].sum() == len(trades.dropna(subset=["asia_type_code", "london_type_code"]))
+
+    funnel = query_engine.entry_funnel(con, filters, strategy)
+    assert funnel["trades"] == int(full["eligible_trade"].sum())
+    assert funnel["total_orbs"] == len(full)
+
+    with pytest.raises(ValueError):
+        query_engine._fetch_base_frame(con, filters, columns=("no_such_column",))
+    con.close()
@@ -0,0 +1,154 @@
+"""
+Tests for the trade ledger in trading_app/research_runner.py.
+
+run_candidate must simulate each candidate once (one batch call, no
+per-date simulate_orb_trade calls), and the backtest, walk-forward, regime
+and stress results derived from that ledger must equal per-date
+simulation of the same slices.
+"""
+import json
+import statistics
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "trading_app"))
+
+from benchmarks.synthetic_market import create_scratch_db, date_range_for
+from pipeline.build_daily_features import FeatureBuilder
+from pipeline.cost_model import get_cost_model
+from research_runner import ResearchRunner
+from strategies import execution_engine
+from strategies.execution_engine import ExecutionMode
+
+YEARS = 0.3
+FILTER_SPEC = {'orb_time': '1800', 'rr': 1.5, 'sl_mode': 'HALF', 'orb_size_filter': 0.5}
+TEST_CONFIG = {'walk_forward_windows': 3}
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("research") / "gold.db")
+    create_scratch_db(path, YEARS, instruments=('MGC',))
+    builder = FeatureBuilder(db_path=path)
+    builder.init_schema()
+    builder._ensure_schema_columns(auto_migrate=True)
+    builder.build_features_bulk(*date_range_for(YEARS))
+    builder.close()
+
+    con = duckdb.connect(path)
+    con.execute("""
+        CREATE TABLE edge_candidates (
+            candidate_id INTEGER PRIMARY KEY,
+            instrument VARCHAR, name VARCHAR, hypothesis_text VARCHAR,
+            feature_spec_json JSON, filter_spec_json JSON,
+            test_window_start DATE, test_window_end DATE,
+            metrics_json JSON, robustness_json JSON,
+            status VARCHAR DEFAULT 'DRAFT',
+            code_version VARCHAR, data_version VARCHAR, test_config_json JSON
+        )
+    """)
+    con.execute(
+        "INSERT INTO edge_candidates (candidate_id, instrument, name, hypothesis_text, filter_spec_json, test_config_json) "
+        "VALUES (1, 'MGC', 'Asia close ORB', 'test', ?, ?)",
+        [json.dumps(FILTER_SPEC), json.dumps(TEST_CONFIG)],
+    )
+    con.close()
+    return path
+
+
+@pytest.fixture
+def runner(db_path, monkeypatch):
+    monkeypatch.setattr(ResearchRunner, "get_connection",
+                        lambda self, read_only=True: duckdb.connect(db_path, read_only=read_only))
+    return ResearchRunner()
+
+
+def _per_date_trades(db_path):
+    """Reference: simulate_orb_trade per filtered date, WIN/LOSS only, with ATR."""
+    cost_model = get_cost_model('MGC')
+    con = duckdb.connect(db_path, read_only=True)
+    rows = con.execute("""
+        SELECT date_local, atr_20 FROM daily_features
+        WHERE orb_1800_high IS NOT NULL AND orb_1800_low IS NOT NULL
+          AND orb_1800_break_dir IS NOT NULL AND orb_1800_break_dir != 'NONE'
+          AND orb_1800_size <= atr_20 * ?
+        ORDER BY date_local
+    """, [FILTER_SPEC['orb_size_filter']]).fetchall()
+    trades = []
+    for date_local, atr in rows:
+        result = execution_engine.simulate_orb_trade(
+            con=con, date_local=date_local, orb='1800', mode='1m', confirm_bars=1,
+            rr=FILTER_SPEC['rr'], sl_mode='half', exec_mode=ExecutionMode.MARKET_ON_CLOSE,
+            slippage_ticks=cost_model['slippage_ticks'],
+            commission_per_contract=cost_model['commission_rt'] / 2,
+        )
+        trades.append((atr, result if result.outcome in ('WIN', 'LOSS') else None))
+    con.close()
+    return trades
+
+
+def _avg(results, multiplier=1.0):
+    r_values = [t.r_multiple - t.cost_r * multiplier for t in results]
+    return sum(r_values) / len(r_values)
+
+
+def test_run_candidate_simulates_once(runner, db_path, monkeypatch):
+    calls = {'batch': 0, 'single': 0}
+    real_batch, real_single = execution_engine.simulate_orb_trades_batch, execution_engine.simulate_orb_trade
+
+    def count(name, fn):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(execution_engine, "simulate_orb_trades_batch", count('batch', real_batch))
+    monkeypatch.setattr(execution_engine, "simulate_orb_trade", count('single', real_single))
+
+    assert runner.run_candidate(1)
+    assert calls == {'batch': 1, 'single': 0}
+
+    con = duckdb.connect(db_path, read_only=True)
+    status, metrics, robustness = con.execute(
+        "SELECT status, metrics_json, robustness_json FROM edge_candidates WHERE candidate_id = 1").fetchone()
+    con.close()
+    assert status == 'TESTED'
+    assert json.loads(metrics)['n_trades'] > 0
+    assert json.loads(robustness)['walk_forward_periods'] == TEST_CONFIG['walk_forward_windows']
+
+
+def test_ledger_slices_match_per_date_simulation(runner, db_path):
+    candidate = runner.load_candidate(1)
+    ledger = runner.build_trade_ledger(candidate)
+    metrics = runner.run_backtest(candidate, ledger)
+    robustness = runner.run_robustness_checks(candidate, ledger)
+
+    per_date = _per_date_trades(db_path)
+    closed = [t for _, t in per_date if t is not None]
+    assert len(ledger.trades) == len(per_date)
+    assert metrics.n_trades == len(closed) > 0
+    assert metrics.avg_r == _avg(closed)
+    assert metrics.win_rate == sum(t.outcome == 'WIN' for t in closed) / len(closed)
+
+    # Walk-forward windows over the filtered dates
+    size = len(per_date) // 3
+    windows = [per_date[:size], per_date[size:2 * size], per_date[2 * size:]]
+    wf = [_avg(w) if w else 0.0 for w in ([t for _, t in window if t] for window in windows)]
+    assert robustness.walk_forward_avg_r == statistics.mean(wf)
+    assert robustness.walk_forward_std_r == statistics.stdev(wf)
+
+    # ATR regimes and re-costed stress tests
+    median_atr = statistics.median(atr for atr, _ in per_date)
+    high_vol = [t for atr, t in per_date if t and atr > median_atr]
+    assert robustness.regime_split_results['high_vol'] == {
+        "avg_r": _avg(high_vol), "n": len(high_vol),
+        "win_rate": sum(t.outcome == 'WIN' for t in high_vol) / len(high_vol)}
+    assert robustness.stress_25_exp_r == _avg(closed, 1.25)
+    assert robustness.stress_50_exp_r == _avg(closed, 1.50)
+
+    # Without a ledger each method builds its own, with identical results
+    assert runner.run_backtest(candidate) == metrics
+    assert runner.run_robustness_checks(candidate) == robustness
@@ -0,0 +1,121 @@
+"""
+Tests for analysis/result_cache.py and the cached query_engine / What-If views.
+
+Results must persist across cache instances (app restarts), be evicted least
+recently used first once over max_bytes, and never be served after the data
+fingerprint of the namespace's source tables changes.
+"""
+import duckdb
+import pandas as pd
+import pytest
+
+from analysis import query_engine, result_cache, what_if_engine
+from analysis.result_cache import ResultCache, data_fingerprint
+from tests.conftest import CountingConnection, make_views_db
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    monkeypatch.setattr(result_cache, "_default_cache", cache)
+    monkeypatch.setattr(result_cache, "_default_enabled", True)
+    yield cache
+    cache.close()
+
+
+def test_lru_eviction_counters_and_persistence(tmp_path):
+    path = str(tmp_path / "lru.sqlite")
+    cache = ResultCache(path, max_bytes=3000)
+    for i in range(3):
+        cache.put("ns", (i,), "fp1", b"x" * 900)
+    assert cache.get("ns", (0,), "fp1") == b"x" * 900  # 0 is now the most recent
+
+    cache.put("ns", (3,), "fp1", b"x" * 900)  # over budget: 1 is the LRU entry
+    assert cache.get("ns", (1,), "fp1") is None
+    assert cache.get("ns", (0,), "fp1") is not None and cache.get("ns", (3,), "fp1") is not None
+    assert cache.get("ns", (0,), "fp2") is None  # other fingerprint, other entry
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (3, 2, 1, 3)
+    cache.close()
+
+    reopened = ResultCache(path, max_bytes=3000)
+    assert reopened.get("ns", (3,), "fp1") == b"x" * 900
+    assert reopened.get_or_compute("ns", (9,), "fp1", lambda: {"v": 9}) == {"v": 9}
+    assert reopened.stats()["hits"] == 1 and reopened.stats()["misses"] == 1
+    reopened.close()
+
+
+def test_query_engine_views_hit_cache_until_data_changes(tmp_path, cache):
+    con = CountingConnection(make_views_db(str(tmp_path / "views.db")))
+    filters = query_engine.filters_from_dict({"orb_times": ["0900", "1000"]})
+    strategy = query_engine.default_strategy()
+
+    first = query_engine.headline_stats_with_strategy(con, filters, strategy)
+    heat = query_engine.heatmap_with_strategy(con, filters, strategy)
+    equity = query_engine.equity_curve_with_strategy(con, filters, strategy)
+    assert first["trades"] > 0 and not heat.empty and not equity.empty
+
+    con.sql.clear()
+    assert query_engine.headline_stats_with_strategy(con, filters, strategy) == first
+    pd.testing.assert_frame_equal(query_engine.heatmap_with_strategy(con, filters, strategy), heat)
+    pd.testing.assert_frame_equal(query_engine.equity_curve_with_strategy(con, filters, strategy), equity)
+    assert all(sql.startswith("SELECT COUNT(*)") for sql in con.sql)  # fingerprint checks only
+    assert cache.stats()["hits"] == 3
+
+    # Other filters are a different key; new data is a different fingerprint
+    other = query_engine.filters_from_dict({"orb_times": ["1100"]})
+    assert query_engine.headline_stats_with_strategy(con, other, strategy) != first
+    before = data_fingerprint(con, "query_engine")
+    con.execute("INSERT INTO v_orb_trades VALUES ('2025-01-06', 'MGC', '0900', 'UP', 'WIN', 1.0)")
+    assert data_fingerprint(con, "query_engine") != before
+    assert query_engine.headline_stats_with_strategy(con, filters, strategy)["trades"] == first["trades"] + 1
+    con.close()
+
+
+def test_fingerprint_tracks_each_namespace_source_table(tmp_path):
+    con = make_views_db(str(tmp_path / "views.db"))
+    query, what_if = data_fingerprint(con, "query_engine"), data_fingerprint(con, "what_if")
+
+    # Rebuild with the same row count and newest date: only the content hash moves
+    con.execute("UPDATE daily_features SET atr_20 = 21")
+    assert data_fingerprint(con, "query_engine") != query
+    assert data_fingerprint(con, "what_if") != what_if
+    query, what_if = data_fingerprint(con, "query_engine"), data_fingerprint(con, "what_if")
+
+    con.execute("UPDATE v_orb_trades SET outcome = 'LOSS', r_multiple = -1.0 WHERE outcome = 'WIN'")
+    assert data_fingerprint(con, "query_engine") != query
+    query = data_fingerprint(con, "query_engine")
+
+    con.execute("CREATE TABLE orb_trades_1m_exec (date_local DATE, orb VARCHAR, close_confirmations INTEGER)")
+    assert data_fingerprint(con, "query_engine") != query
+    query = data_fingerprint(con, "query_engine")
+    con.execute("INSERT INTO orb_trades_1m_exec VALUES ('2025-01-06', '0900', 2)")
+    assert data_fingerprint(con, "query_engine") != query
+
+    # bars_1m feeds What-If only
+    query = data_fingerprint(con, "query_engine")
+    con.execute("INSERT INTO bars_1m VALUES ('2025-02-01 00:00:00+00', 'MGC', 2700)")
+    assert data_fingerprint(con, "query_engine") == query
+    assert data_fingerprint(con, "what_if") != what_if
+    con.close()
+
+
+def test_what_if_results_survive_restart(what_if_db, tmp_path):
+    path = str(tmp_path / "what_if.sqlite")
+    con = duckdb.connect(what_if_db, read_only=True)
+    args = ('MGC', '1000', 'BOTH', 2.0, 'FULL')
+
+    engine = what_if_engine.WhatIfEngine(con, result_cache=ResultCache(path))
+    engine.clear_cache()
+    first = engine.analyze_conditions(*args, conditions={'orb_size_min': 0.1})
+    assert engine.get_cache_stats()['trade_table_misses'] == 1
+
+    # New process: empty in-memory caches, same cache file
+    what_if_engine._TRADE_TABLES.clear()
+    restarted = what_if_engine.WhatIfEngine(con, result_cache=ResultCache(path))
+    again = restarted.analyze_conditions(*args, conditions={'orb_size_min': 0.1})
+    stats = restarted.get_cache_stats()
+    assert stats['trade_table_misses'] == 0 and stats['disk_cache']['hits'] == 1
+    assert again['conditional'].to_dict() == first['conditional'].to_dict()
+    assert again['cache_key'] == first['cache_key']
+    con.close()
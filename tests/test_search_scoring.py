@@ -0,0 +1,111 @@
+"""
+Tests for trading_app/search_scoring.py (AutoSearchEngine scoring backend).
+
+Path scoring must reproduce the tradeable model exactly: at the stored RR it
+equals the daily_features tradeable columns, and at any other RR / stop mode
+it equals calculate_orb_1m_tradeable run with that RR.
+"""
+from datetime import timedelta
+
+import duckdb
+import numpy as np
+import pytest
+
+from auto_search_engine import AutoSearchEngine, SearchSettings
+from pipeline.build_daily_features import FeatureBuilder, _dt_local
+from search_scoring import ORB_TIMES, PathScoringBackend
+from tests.conftest import END, START
+
+
+def _nan_to_none(x):
+    return None if np.isnan(x) else float(x)
+
+
+@pytest.mark.parametrize("orb", list(ORB_TIMES))
+def test_stored_rr_matches_daily_features(features_db, orb):
+    con = duckdb.connect(features_db, read_only=True)
+    outcome, realized = PathScoringBackend(con).outcomes(orb, 1.0)
+    rows = con.execute(f"""
+        SELECT orb_{orb}_tradeable_outcome, orb_{orb}_tradeable_realized_rr
+        FROM daily_features ORDER BY date_local
+    """).fetchall()
+    con.close()
+
+    assert len(rows) == len(outcome)
+    for (exp_outcome, exp_rr), got_outcome, got_rr in zip(rows, outcome, realized):
+        assert _nan_to_none(got_rr) == exp_rr
+        if exp_rr is not None:
+            assert got_outcome == exp_outcome
+
+
+@pytest.mark.parametrize("orb", ["1000", "2300"])
+@pytest.mark.parametrize("rr,sl_mode", [(2.5, "full"), (4.0, "half"), (1.5, "half")])
+def test_any_rr_matches_tradeable_model(features_db, orb, rr, sl_mode):
+    con = duckdb.connect(features_db, read_only=True)
+    outcome, realized = PathScoringBackend(con, sl_mode=sl_mode).outcomes(orb, rr)
+    con.close()
+
+    builder = FeatureBuilder(db_path=features_db, read_only=True)
+    hh, mm = ORB_TIMES[orb]
+    for i in range((END - START).days + 1):
+        d = START + timedelta(days=i)
+        expected = builder.calculate_orb_1m_tradeable(
+            _dt_local(d, hh, mm), _dt_local(d + timedelta(days=1), 9, 0), rr=rr, sl_mode=sl_mode,
+        )
+        exp_rr = expected["realized_rr"] if expected else None
+        assert _nan_to_none(realized[i]) == exp_rr, d
+        if exp_rr is not None:
+            assert outcome[i] == expected["outcome"], d
+    builder.close()
+
+
+def test_filters_select_days(features_db):
+    con = duckdb.connect(features_db, read_only=True)
+    backend = PathScoringBackend(con)
+    size = con.execute("""
+        SELECT orb_1800_size / atr_20 FROM daily_features ORDER BY date_local
+    """).fetchall()
+    types = [r[0] for r in con.execute("SELECT asia_type_code FROM daily_features ORDER BY date_local").fetchall()]
+
+    size = np.array([np.nan if s[0] is None else s[0] for s in size])
+    with np.errstate(invalid="ignore"):
+        assert (backend.filter_mask("1800", {"orb_size": 0.2}) == (size <= 0.2)).all()
+        assert (backend.filter_mask("1800", {"orb_size": [0.05, 0.2]}) == ((size >= 0.05) & (size <= 0.2))).all()
+    assert list(backend.filter_mask("1800", {"session_type": "A0_NORMAL"})) == [t == "A0_NORMAL" for t in types]
+
+    base = backend.score("1800", 2.0)
+    filtered = backend.score("1800", 2.0, {"orb_size": 0.2, "session_type": ["A0_NORMAL", "A1_TIGHT"]})
+    assert 0 < filtered["sample_size"] < base["sample_size"]
+    with pytest.raises(ValueError):
+        backend.filter_mask("1800", {"unknown": 1})
+    con.close()
+
+
+def test_engine_scores_every_rr_target(features_db):
+    con = duckdb.connect(features_db, read_only=True)
+    engine = AutoSearchEngine(con)
+    settings = SearchSettings(
+        orb_times=["0900", "2300"],
+        rr_targets=[1.0, 2.0, 3.0],
+        filter_types=["SIZE"],
+        filter_ranges={"SIZE": [0.1, 0.3]},
+        min_sample_size=1,
+    )
+    combos = engine._generate_combinations(settings)
+    assert len(combos) == 2 * 3 * 3
+    assert sorted({c["rr_target"] for c in combos}) == [1.0, 2.0, 3.0]
+
+    backend = PathScoringBackend(con)
+    for combo in combos:
+        score = engine._score_candidate(combo, settings)
+        expected = backend.score(combo["orb_time"], combo["rr_target"], combo["filters"])
+        if expected["sample_size"] == 0:
+            assert score is None
+            continue
+        assert score["sample_size"] == expected["sample_size"]
+        assert score["expected_r"] == expected["avg_realized_rr"]
+    # Different RR targets now give different scores
+    scores = {c["rr_target"]: engine._score_candidate(c, settings)["expected_r"]
+              for c in combos if c["orb_time"] == "2300" and not c["filters"]}
+    assert len(set(scores.values())) == 3
+    con.close()
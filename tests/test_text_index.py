@@ -0,0 +1,132 @@
+"""
+Tests for trading_app/text_index.py and the searches built on it
+(AIMemoryManager.search_history, TradingMemory.search_lessons).
+
+Scores must equal textbook BM25 over the same tokens, the index must follow
+inserts / deletes (and pick up rows written around it), and filters and
+pagination must apply before ranking is cut.
+"""
+import math
+from collections import Counter
+from datetime import date, timedelta
+
+import duckdb
+import pytest
+
+import ai_memory
+from trading_app.memory import TradingMemory
+from trading_app.text_index import BM25_B, BM25_K1, TextIndex, tokenize
+
+DOCS = {
+    1: "Asia sweep then clean London break, took the 0900 long",
+    2: "Skipped: thin liquidity, no sweep",
+    3: "Asia sweep asia sweep - waited for the retest",
+    4: "Chased the breakout, stop too wide",
+    5: "",
+}
+
+
+def _reference_bm25(docs, query):
+    tokens = {doc_id: tokenize(text) for doc_id, text in docs.items()}
+    avg_length = sum(len(t) for t in tokens.values()) / len(tokens)
+    scores = {}
+    for term in set(tokenize(query)):
+        df = sum(term in t for t in tokens.values())
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for doc_id, doc_tokens in tokens.items():
+            tf = Counter(doc_tokens)[term]
+            if tf:
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * len(doc_tokens) / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+    return scores
+
+
+def test_scores_match_reference_bm25():
+    conn = duckdb.connect()
+    index = TextIndex("notes")
+    index.ensure_schema(conn)
+    index.add_many(conn, list(DOCS.items()))
+    index.add(conn, 1, DOCS[1])  # already indexed: no-op
+
+    for query in ("asia sweep", "London breakout stop", "retest", "nothing matches"):
+        expected = _reference_bm25(DOCS, query)
+        hits = index.search(conn, query, limit=10)
+        assert [doc_id for doc_id, _ in hits] == sorted(expected, key=lambda d: (-expected[d], -d))
+        assert dict(hits) == pytest.approx(expected)
+
+    index.remove(conn, "SELECT 3")
+    remaining = {k: v for k, v in DOCS.items() if k != 3}
+    assert dict(index.search(conn, "asia sweep")) == pytest.approx(_reference_bm25(remaining, "asia sweep"))
+    assert index.search(conn, "   ") == []
+
+
+@pytest.fixture
+def chat_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "chat.db")
+    # Legacy table: id without a default, rows written before the index existed
+    conn = duckdb.connect(path)
+    conn.execute("""
+        CREATE TABLE ai_chat_history (
+            id INTEGER PRIMARY KEY, timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            session_id VARCHAR, role VARCHAR, content TEXT, context_data JSON,
+            instrument VARCHAR, tags VARCHAR[]
+        );
+        INSERT INTO ai_chat_history (id, session_id, role, content, instrument)
+        VALUES (7, 's0', 'user', 'old note about the asia sweep', 'MGC');
+    """)
+    conn.close()
+    monkeypatch.setattr(ai_memory, "get_database_connection", lambda: duckdb.connect(path))
+    return path
+
+
+def test_chat_history_search_ranks_filters_and_pages(chat_db):
+    manager = ai_memory.AIMemoryManager()
+    messages = [
+        ("s1", "MGC", "asia sweep into the 0900 ORB, asia sweep again"),
+        ("s1", "MGC", "london range was tight"),
+        ("s2", "NQ", "asia sweep on NQ"),
+        ("s2", "MGC", "thinking about the asia open"),
+    ]
+    for session_id, instrument, content in messages:
+        manager.save_message(session_id, "user", content, instrument=instrument)
+
+    hits = manager.search_history("asia sweep")
+    assert [h["content"] for h in hits][:2] == [messages[0][2], messages[2][2]]
+    assert len(hits) == 4 and hits[-1]["content"] == messages[3][2]  # 'asia' only
+    assert "old note about the asia sweep" in [h["content"] for h in hits]  # indexed at init
+    assert all(a["score"] >= b["score"] for a, b in zip(hits, hits[1:]))
+
+    assert {h["instrument"] for h in manager.search_history("asia sweep", instrument="NQ")} == {"NQ"}
+    assert {h["session_id"] for h in manager.search_history("asia", session_id="s2")} == {"s2"}
+    page1 = manager.search_history("asia sweep", limit=2)
+    page2 = manager.search_history("asia sweep", limit=2, offset=2)
+    assert page1 + page2 == hits
+
+    manager.clear_session("s1")
+    assert all(h["session_id"] != "s1" for h in manager.search_history("asia sweep london"))
+    assert manager.search_history("london") == []
+
+
+def test_search_lessons_follows_store_trade(test_db):
+    memory = TradingMemory(db_path=test_db)
+    today = date.today()
+    lessons = [
+        ("0900", "Asia sweep then clean break - textbook"),
+        ("1000", "Asia sweep failed, chop all morning"),
+        ("0900", "Late entry, should wait for the close"),
+    ]
+    for i, (orb_time, lesson) in enumerate(lessons):
+        assert memory.store_trade(date_local=today - timedelta(days=i), orb_time=orb_time,
+                                  outcome="WIN", lesson_learned=lesson)
+
+    # A row written without store_trade is picked up on the next search
+    conn = duckdb.connect(test_db)
+    conn.execute("""INSERT INTO trade_journal (date_local, orb_time, instrument, outcome, lesson_learned)
+                    VALUES (?, '1100', 'MGC', 'LOSS', 'Ignored the asia sweep signal')""", [today])
+    conn.close()
+
+    hits = memory.search_lessons("asia sweep")
+    assert len(hits) == 3 and "Ignored the asia sweep signal" in [h["lesson_learned"] for h in hits]
+    assert [h["orb_time"] for h in memory.search_lessons("asia sweep", orb_time="0900")] == ["0900"]
+    assert memory.search_lessons("asia sweep", limit=1, offset=1)[0]["id"] == hits[1]["id"]
+    assert memory.search_lessons("asia", instrument="NQ") == []
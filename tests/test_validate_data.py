@@ -0,0 +1,171 @@
+"""
+Tests for pipeline/validate_data.py.
+
+A full audit must find issues injected anywhere; a routine (watermarked)
+run must only scan data since the last pass without CRITICAL issues
+(including bars rewritten by ingestion), keep reporting CRITICAL issues until
+fixed, and use one read-only connection for all checks.
+"""
+import shutil
+from datetime import timedelta
+
+import duckdb
+import pytest
+
+from benchmarks.synthetic_market import create_scratch_db, date_range_for
+from pipeline import validate_data
+from pipeline.build_daily_features import FeatureBuilder
+from pipeline.incremental_features import record_bar_change
+from pipeline.validate_data import WATERMARK_TABLE, DataValidator
+
+YEARS = 0.2
+START, END = date_range_for(YEARS)
+
+
+@pytest.fixture(scope="module")
+def source_db(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("validate") / "source.db")
+    create_scratch_db(db_path, YEARS, instruments=('MGC',))
+    builder = FeatureBuilder(db_path=db_path)
+    builder.init_schema()
+    builder._ensure_schema_columns(auto_migrate=True)
+    builder.build_features_bulk(START, END)
+    builder.close()
+    return db_path
+
+
+@pytest.fixture
+def db_path(tmp_path, source_db):
+    path = str(tmp_path / "gold.db")
+    shutil.copy(source_db, path)
+    return path
+
+
+def _run(db_path, **kwargs):
+    validator = DataValidator(db_path, **kwargs)
+    validator.run_all_checks()
+    validator.close()
+    return [i for i in validator.issues if i.severity != "INFO"]
+
+
+def _corrupt_bar(con, day, sql_set):
+    con.execute(f"""
+        UPDATE bars_1m SET {sql_set}
+        WHERE ts_utc = (SELECT MIN(ts_utc) FROM bars_1m WHERE DATE(ts_utc AT TIME ZONE 'Australia/Brisbane') = ?)
+    """, [day])
+
+
+def test_full_audit_reports_injected_issues(db_path):
+    assert _run(db_path) == []
+
+    day = START + timedelta(days=10)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    con = duckdb.connect(db_path)
+    _corrupt_bar(con, day, "low = high + 1")
+    _corrupt_bar(con, day + timedelta(days=1), "volume = 0")
+    con.execute("DELETE FROM daily_features WHERE date_local = ?", [day])
+    con.execute("""UPDATE daily_features SET orb_1000_size = orb_1000_size + 5
+                   WHERE date_local = (SELECT MIN(date_local) FROM daily_features
+                                       WHERE date_local > ? AND orb_1000_size IS NOT NULL)""", [day])
+    con.close()
+
+    issues = _run(db_path, full=True)
+    assert sorted((i.check, i.severity) for i in issues) == [
+        ("date_gaps", "WARNING"), ("orb_integrity", "WARNING"),
+        ("price_anomalies", "CRITICAL"), ("volume_anomalies", "WARNING")]
+    assert [i.date_local for i in issues if i.check == "date_gaps"] == [day]
+    assert all(i.affected_rows == 1 for i in issues)
+
+
+def test_routine_runs_scan_from_watermark(db_path):
+    cutoff = END - timedelta(days=5)
+    con = duckdb.connect(db_path)
+    con.execute("CREATE TABLE held_bars AS SELECT * FROM bars_1m WHERE ts_utc >= ?", [str(cutoff)])
+    con.execute("DELETE FROM bars_1m WHERE ts_utc >= ?", [str(cutoff)])
+    con.execute("CREATE TABLE held_features AS SELECT * FROM daily_features WHERE date_local >= ?", [cutoff])
+    con.execute("DELETE FROM daily_features WHERE date_local >= ?", [cutoff])
+    con.close()
+
+    assert _run(db_path) == []  # first pass: full audit, sets the watermark
+
+    con = duckdb.connect(db_path)
+    _corrupt_bar(con, START + timedelta(days=3), "low = high + 1")  # already validated
+    con.execute("INSERT INTO bars_1m SELECT * FROM held_bars")
+    con.execute("INSERT INTO daily_features SELECT * FROM held_features")
+    _corrupt_bar(con, END - timedelta(days=1), "open = 0")  # new data
+    con.close()
+
+    routine = [i.description for i in _run(db_path)]
+    assert routine == [f"Found 1 bars with zero or negative prices since {END - timedelta(days=6)}"]
+    assert [i.description for i in _run(db_path)] == routine  # CRITICAL: watermark did not advance
+
+    assert {i.description for i in _run(db_path, full=True)} == {
+        "Found 1 bars with zero or negative prices", "Found 1 bars where low > high (impossible)"}
+
+
+def test_ingested_rewrites_are_revalidated_until_fixed(db_path):
+    assert _run(db_path) == []
+
+    def negate_open():
+        con = duckdb.connect(db_path)
+        written = con.execute("""
+            UPDATE bars_1m SET open = -open
+            WHERE ts_utc = (SELECT MIN(ts_utc) FROM bars_1m
+                            WHERE DATE(ts_utc AT TIME ZONE 'Australia/Brisbane') = ?)
+            RETURNING ts_utc
+        """, [START + timedelta(days=3)]).fetchall()
+        change_id = record_bar_change(con, "MGC", [r[0] for r in written], source="test")
+        con.close()
+        return change_id
+
+    # Old bars rewritten by a backfill: behind the bar / feature watermark, but logged
+    negate_open()
+    issues = _run(db_path)
+    assert [(i.check, i.severity) for i in issues] == [("price_anomalies", "CRITICAL")]
+    assert _run(db_path) == issues  # CRITICAL still open: watermark held back
+
+    fixed = negate_open()
+    assert _run(db_path) == []
+    con = duckdb.connect(db_path, read_only=True)
+    assert con.execute(f"SELECT change_id FROM {WATERMARK_TABLE}").fetchone()[0] == fixed
+    con.close()
+
+
+def test_warnings_do_not_hold_back_the_watermark(db_path):
+    holiday = END - timedelta(days=10)
+    while holiday.weekday() >= 5:
+        holiday += timedelta(days=1)
+    con = duckdb.connect(db_path)
+    con.execute("DELETE FROM daily_features WHERE date_local = ?", [holiday])
+    con.execute("""DELETE FROM bars_1m WHERE (ts_utc AT TIME ZONE 'Australia/Brisbane') - INTERVAL 9 HOUR
+                   BETWEEN ?::TIMESTAMP AND ?::TIMESTAMP + INTERVAL 1 DAY - INTERVAL 1 MICROSECOND""",
+                [holiday, holiday])
+    con.close()
+
+    # An exchange holiday is a weekday gap (WARNING): reported, but the watermark advances
+    issues = _run(db_path)
+    assert [(i.check, i.severity, i.date_local) for i in issues] == [("date_gaps", "WARNING", holiday)]
+    con = duckdb.connect(db_path, read_only=True)
+    assert con.execute(f"SELECT features_date FROM {WATERMARK_TABLE}").fetchone()[0] == END
+    con.close()
+    assert _run(db_path) == []  # routine run scans only from the watermark
+
+
+def test_checks_share_one_read_only_connection(db_path, monkeypatch):
+    connects = []
+    real_connect = duckdb.connect
+    monkeypatch.setattr(validate_data.duckdb, "connect",
+                        lambda *a, **k: connects.append(k.get("read_only", False)) or real_connect(*a, **k))
+
+    _run(db_path)
+    _run(db_path, workers=1)
+    _run(db_path, update_watermark=False)
+    # One read-only scan per run; the watermark is written on its own short-lived connection
+    assert connects == [True, False, True, False, True]
+
+    con = real_connect(db_path, read_only=True)
+    bars_ts, features_date = con.execute(
+        f"SELECT bars_ts_utc, features_date FROM {WATERMARK_TABLE} WHERE instrument = 'MGC'").fetchone()
+    con.close()
+    assert features_date == END and bars_ts is not None
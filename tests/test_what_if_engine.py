@@ -0,0 +1,138 @@
+"""
+Tests for analysis/what_if_engine.py (simulate once, mask many).
+
+Each setup is simulated once into a TradeTable; condition sets and direction
+are masks over it. Results must match simulating the matched and non-matched
+date sets separately, and a new condition set must not touch the bars.
+"""
+import shutil
+
+import duckdb
+import numpy as np
+import pytest
+
+from analysis import result_cache
+from analysis.what_if_engine import WhatIfEngine
+from strategies.execution_engine import simulate_orb_trades_batch
+from tests.conftest import CountingConnection
+
+# Data version check: database path, then daily_features, bars_1m and bar_change_log fingerprints
+VERSION_QUERIES = 4
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    """Keep the shared disk result cache out of these tests."""
+    monkeypatch.setattr(result_cache, "_default_cache", None)
+    monkeypatch.setattr(result_cache, "_default_enabled", False)
+
+
+@pytest.fixture
+def engine(what_if_db):
+    con = duckdb.connect(what_if_db, read_only=True)
+    engine = WhatIfEngine(con)
+    engine.clear_cache()
+    yield engine
+    engine.clear_cache()
+    con.close()
+
+
+def _reference_trades(con, orb, direction, rr, keep):
+    """Old path: filter feature rows in Python, then simulate the kept dates."""
+    rows = con.execute(f"""
+        SELECT date_local, atr_20, orb_{orb}_size, orb_{orb}_break_dir, london_type
+        FROM daily_features WHERE instrument = 'MGC' AND orb_{orb}_size IS NOT NULL
+        ORDER BY date_local
+    """).fetchall()
+    dates = [d for d, atr, size, brk, london in rows
+             if brk not in (None, 'NONE') and direction in ('BOTH', brk) and keep(atr, size, london)]
+    results = simulate_orb_trades_batch(con, dates, orb, rr=rr, sl_mode='full')
+    return [(d, r.outcome, r.r_multiple, r.cost_r) for d, r in zip(dates, results)]
+
+
+def _summary(metrics):
+    return [(t['date_local'], t['outcome'], t['r_multiple'], t['cost_r']) for t in metrics.trades]
+
+
+@pytest.mark.parametrize("direction", ['BOTH', 'UP'])
+def test_masks_match_separate_simulation(engine, direction):
+    conditions = {'orb_size_min': 0.1, 'london_types': ['L1_SWEEP_HIGH', 'L2_SWEEP_LOW']}
+    result = engine.analyze_conditions('MGC', '1000', direction, 2.0, 'FULL', conditions=conditions)
+
+    def matched(atr, size, london):
+        return size / atr >= 0.1 and london in conditions['london_types']
+
+    completed = lambda trades: [t for t in trades if t[1] in ('WIN', 'LOSS')]
+    con = engine.conn
+    assert _summary(result['baseline']) == completed(_reference_trades(con, '1000', direction, 2.0, lambda *a: True))
+    assert _summary(result['conditional']) == completed(_reference_trades(con, '1000', direction, 2.0, matched))
+    assert _summary(result['non_matched']) == completed(
+        _reference_trades(con, '1000', direction, 2.0, lambda *a: not matched(*a)))
+    assert 0 < result['conditional'].sample_size < result['baseline'].sample_size
+
+
+def test_new_conditions_reuse_the_simulated_table(what_if_db):
+    con = CountingConnection(duckdb.connect(what_if_db, read_only=True))
+    engine = WhatIfEngine(con)
+    engine.clear_cache()
+
+    first = engine.analyze_conditions('MGC', '0900', 'BOTH', 1.5, 'FULL', conditions={'orb_size_min': 0.1})
+    calls = con.calls
+    assert calls == VERSION_QUERIES + 3  # data version, features, ORB levels, scan windows
+
+    for conditions in ({'orb_size_max': 0.12}, {'orb_size_percentile_min': 50}, {'asia_types': ['A0_NORMAL']}):
+        result = engine.analyze_conditions('MGC', '0900', 'DOWN', 1.5, 'FULL', conditions=conditions)
+        assert result['conditional'].sample_size + result['non_matched'].sample_size \
+            == result['baseline'].sample_size
+    assert con.calls == calls + 3 * VERSION_QUERIES  # one data-version check per analysis
+
+    # A second engine (new session) shares the table; use_cache=False re-simulates
+    other = WhatIfEngine(con)
+    again = other.analyze_conditions('MGC', '0900', 'BOTH', 1.5, 'FULL', conditions={'orb_size_min': 0.1})
+    assert other.get_cache_stats()['trade_table_hits'] == 1
+    assert again['conditional'].expected_r == first['conditional'].expected_r
+    fresh = other.analyze_conditions('MGC', '0900', 'BOTH', 1.5, 'FULL',
+                                     conditions={'orb_size_min': 0.1}, use_cache=False)
+    assert _summary(fresh['conditional']) == _summary(first['conditional'])
+    engine.clear_cache()
+    con.con.close()
+
+
+def test_orb_size_percentile_matches_window_rank(engine):
+    table = engine.get_trade_table('MGC', '1000', 2.0, 'FULL')
+    sizes = list(table.features['orb_size'])
+    percentile = table.orb_size_percentile(5)
+
+    assert np.isnan(percentile[0])
+    for i in range(1, len(sizes)):
+        window = sizes[max(0, i - 5):i]
+        assert percentile[i] == pytest.approx(sum(x < sizes[i] for x in window) / len(window) * 100)
+
+
+def test_in_place_feature_rewrite_is_not_served_stale(what_if_db, tmp_path):
+    db_path = str(tmp_path / "what_if.db")
+    shutil.copy(what_if_db, db_path)
+    con = duckdb.connect(db_path)
+    engine = WhatIfEngine(con)
+    engine.clear_cache()
+    conditions = {'orb_size_min': 0.1}
+
+    before = engine.analyze_conditions('MGC', '1000', 'BOTH', 2.0, 'FULL', conditions=conditions)
+    traded = [t['date_local'] for t in before['conditional'].trades]
+    newest = con.execute("SELECT MAX(date_local) FROM daily_features").fetchone()[0]
+
+    # Rebuild in place: same rows and newest date, one break removed
+    con.execute("UPDATE daily_features SET orb_1000_break_dir = 'NONE' WHERE date_local = ?", [traded[0]])
+    assert con.execute("SELECT MAX(date_local) FROM daily_features").fetchone()[0] == newest
+
+    # A new engine reads the shared trade table; the first engine also has its memory cache
+    after = [
+        _summary(analyzer.analyze_conditions('MGC', '1000', 'BOTH', 2.0, 'FULL', conditions=conditions)['conditional'])
+        for analyzer in (WhatIfEngine(con), engine)
+    ]
+    expected = _summary(engine.analyze_conditions(
+        'MGC', '1000', 'BOTH', 2.0, 'FULL', conditions=conditions, use_cache=False)['conditional'])
+    assert len(expected) == len(traded) - 1
+    assert after == [expected, expected]
+    engine.clear_cache()
+    con.close()
@@ -195,6 +195,20 @@ Recent Metrics:
 
         return response.strip()
 
+    def get_lessons_summary(self, question: str) -> str:
+        """Journal lessons most relevant to the question"""
+        lessons = self.memory.search_lessons(question, limit=5)
+
+        if not lessons:
+            return "No matching lessons in the trade journal."
+
+        response = "**Relevant Lessons from the Journal:**\n\n"
+        for i, lesson in enumerate(lessons, 1):
+            response += f"{i}. {lesson['date_local']} {lesson['orb_time']} ORB ({lesson['outcome']}): "
+            response += f"{lesson['lesson_learned']}\n"
+
+        return response.strip()
+
     def analyze_today(self) -> str:
         """Analyze today's market conditions"""
         # Get market scanner results
@@ -227,6 +241,7 @@ Summary: {scan_results['summary']}
         - "System health"
         - "Market regime"
         - "Learned patterns"
+        - "Lessons about [topic]"
         - "Analyze today"
         """
         q = question.lower()
@@ -251,6 +266,10 @@ Summary: {scan_results['summary']}
         if "regime" in q or "market condition" in q:
             return self.get_regime_summary()
 
+        # Journal search ("lessons about asia sweeps")
+        if "lesson" in q or "journal" in q:
+            return self.get_lessons_summary(question)
+
         # Pattern queries
         if "pattern" in q or "learned" in q:
             return self.get_learned_patterns_summary()
@@ -268,6 +287,7 @@ Summary: {scan_results['summary']}
 - "System health"
 - "Market regime"
 - "Learned patterns"
+- "Lessons about Asia sweeps"
 - "Analyze today"
 
 Ask me anything about your trading performance, edge health, or market conditions!
@@ -2,6 +2,8 @@
 AI Memory Manager - Persistent conversation history in DuckDB
 
 Uses canonical DB routing (cloud-aware via cloud_mode.get_database_connection).
+Message content is indexed as it is saved (text_index.TextIndex), so
+search_history ranks matches with BM25 instead of scanning every message.
 """
 
 from datetime import datetime
@@ -10,9 +12,12 @@ import json
 import logging
 
 from cloud_mode import get_database_connection
+from text_index import TextIndex
 
 logger = logging.getLogger(__name__)
 
+CHAT_INDEX = TextIndex("ai_chat_history")
+
 
 class AIMemoryManager:
     """Manages persistent AI conversation history in canonical DB (cloud-aware)"""
@@ -25,9 +30,14 @@ class AIMemoryManager:
         """Create ai_chat_history table if not exists"""
         try:
             conn = get_database_connection()
+            try:
+                next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM ai_chat_history").fetchone()[0]
+            except Exception:
+                next_id = 1  # New database
+            conn.execute(f"CREATE SEQUENCE IF NOT EXISTS ai_chat_history_id_seq START {next_id}")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS ai_chat_history (
-                    id INTEGER PRIMARY KEY,
+                    id INTEGER PRIMARY KEY DEFAULT nextval('ai_chat_history_id_seq'),
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     session_id VARCHAR,
                     role VARCHAR,
@@ -39,6 +49,10 @@ class AIMemoryManager:
             """)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_timestamp ON ai_chat_history(timestamp)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_session ON ai_chat_history(session_id)")
+            CHAT_INDEX.ensure_schema(conn)
+            indexed = CHAT_INDEX.sync(conn, "ai_chat_history", "id", "content")
+            if indexed:
+                logger.info(f"Indexed {indexed} existing chat messages")
             conn.close()
             logger.info("AI memory schema initialized in canonical DB")
         except Exception as e:
@@ -49,10 +63,13 @@ class AIMemoryManager:
         """Save a single message to history"""
         try:
             conn = get_database_connection()
-            conn.execute("""
-                INSERT INTO ai_chat_history (session_id, role, content, context_data, instrument, tags)
-                VALUES ($1, $2, $3, $4, $5, $6)
-            """, [session_id, role, content, json.dumps(context_data or {}), instrument, tags or []])
+            # Explicit id: tables created before the sequence default have none
+            message_id = conn.execute("""
+                INSERT INTO ai_chat_history (id, session_id, role, content, context_data, instrument, tags)
+                VALUES (nextval('ai_chat_history_id_seq'), $1, $2, $3, $4, $5, $6)
+                RETURNING id
+            """, [session_id, role, content, json.dumps(context_data or {}), instrument, tags or []]).fetchone()[0]
+            CHAT_INDEX.add(conn, message_id, content)
             conn.close()
         except Exception as e:
             logger.error(f"Error saving message to memory: {e}")
@@ -85,29 +102,34 @@ class AIMemoryManager:
             logger.error(f"Error loading session history: {e}")
             return []
 
-    def search_history(self, query: str, instrument: str = None, limit: int = 10) -> List[Dict]:
-        """Search conversation history by content"""
+    def search_history(self, query: str, instrument: str = None, limit: int = 10,
+                       session_id: str = None, offset: int = 0) -> List[Dict]:
+        """
+        Search conversation history by content
+
+        Ranked by BM25 over the query terms (messages matching more / rarer
+        terms first, then newest); page with limit / offset.
+        """
         try:
             conn = get_database_connection()
+            CHAT_INDEX.sync(conn, "ai_chat_history", "id", "content")
 
-            # Use DuckDB parameter syntax ($1, $2, etc.)
+            conditions, params = [], []
             if instrument:
-                sql = """
-                    SELECT session_id, role, content, timestamp, instrument, tags
-                    FROM ai_chat_history
-                    WHERE content LIKE $1
-                      AND instrument = $2
-                    ORDER BY timestamp DESC LIMIT $3
-                """
-                result = conn.execute(sql, [f"%{query}%", instrument, limit]).fetchall()
-            else:
-                sql = """
-                    SELECT session_id, role, content, timestamp, instrument, tags
-                    FROM ai_chat_history
-                    WHERE content LIKE $1
-                    ORDER BY timestamp DESC LIMIT $2
-                """
-                result = conn.execute(sql, [f"%{query}%", limit]).fetchall()
+                conditions.append("t.instrument = ?")
+                params.append(instrument)
+            if session_id:
+                conditions.append("t.session_id = ?")
+                params.append(session_id)
+
+            result = CHAT_INDEX.search(
+                conn, query, limit=limit, offset=offset,
+                table="ai_chat_history",
+                where_sql=f"WHERE {' AND '.join(conditions)}" if conditions else "",
+                params=params,
+                columns="t.session_id, t.role, t.content, t.timestamp, t.instrument, t.tags",
+                order_by="t.timestamp DESC",
+            )
 
             conn.close()
 
@@ -118,7 +140,8 @@ class AIMemoryManager:
                     "content": row[2],
                     "timestamp": row[3],
                     "instrument": row[4],
-                    "tags": row[5]
+                    "tags": row[5],
+                    "score": row[6]
                 }
                 for row in result
             ]
@@ -172,6 +195,7 @@ class AIMemoryManager:
         """Clear all messages for a session"""
         try:
             conn = get_database_connection()
+            CHAT_INDEX.remove(conn, "SELECT id FROM ai_chat_history WHERE session_id = ?", [session_id])
             conn.execute("DELETE FROM ai_chat_history WHERE session_id = $1", [session_id])
             conn.close()
             logger.info(f"Cleared session: {session_id}")
@@ -845,10 +845,14 @@ with tab_research:
         else:
             entry_rule_value = "LIMIT_ORDER"
 
-        # RR Targets (proxy mode - no RR-specific data)
-        rr_targets = [None]  # NULL = proxy mode
-        st.info("📊 **Stored Model Proxy** (from daily_features tradeable columns)")
-        st.caption("⚠️ These metrics use a single stored model per ORB time. Entry: 1st close outside ORB. For RR-specific results, use validated_setups.")
+        # RR Targets (scored from precomputed ORB paths - any RR)
+        rr_targets = st.multiselect(
+            "RR Targets",
+            options=[1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 6.0, 8.0],
+            default=[1.0, 1.5, 2.0, 3.0],
+            key="quick_search_rr_targets"
+        )
+        st.caption("Tradeable model: 1st close outside ORB, entry at next open, realized RR after costs. Every RR is re-scored from bar paths.")
 
         # Filters
 
@@ -871,7 +875,7 @@ with tab_research:
             )
             filter_settings = {
                 'filter_types': ['orb_size'],
-                'filter_ranges': {'orb_size': (0.0, orb_filter_threshold / 100.0)}
+                'filter_ranges': {'orb_size': [orb_filter_threshold / 100.0]}  # max ORB size / ATR
             }
         else:
             filter_settings = {}
@@ -2,13 +2,14 @@
 Auto Search Engine - Deterministic Edge Discovery
 
 Generates edge candidates without bias using systematic parameter search.
-Stores search memory to prevent repeats. Fast scoring using daily_features.
+Stores search memory to prevent repeats. Fast in-memory scoring of any RR
+target and filter (search_scoring.PathScoringBackend).
 
 Hard constraints:
 - Deterministic (no LLM)
 - 300 second timeout
 - No Streamlit freezing (periodic yield)
-- Uses daily_features (NOT daily_features_v2)
+- Uses daily_features (NOT daily_features_v2) + bars_1m paths
 
 Usage:
     from auto_search_engine import AutoSearchEngine
@@ -19,23 +20,32 @@ Usage:
         settings={'family': 'ORB_L4', 'rr_range': [1.5, 2.0, 2.5]},
         max_seconds=300
     )
+
+    # Score across 4 processes (coordinator still does all the writes)
+    results = engine.run_search('MGC', settings, max_seconds=300, workers=4)
 """
 
 import duckdb
 import hashlib
 import json
+import os
 import time
 import uuid
+import numpy as np
+import pandas as pd
 from typing import Dict, List, Optional, Any
 from datetime import datetime, date
 from dataclasses import dataclass
 import logging
 import math
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Import audit3 modules
 from result_classifier import classify_result, RULESET_VERSION
 from priority_engine import PriorityEngine, PRIORITY_VERSION
 from provenance import create_provenance_dict
+from search_scoring import PathScoringBackend
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +63,7 @@ class SearchSettings:
     min_expected_r: float = 0.15
     date_start: Optional[date] = None
     date_end: Optional[date] = None
+    budget: Optional[int] = None  # Combinations per run via ε-exploration (None = all)
 
     def __post_init__(self):
         # Defaults
@@ -186,6 +197,155 @@ RULESET_VERSION = "1.0"
 PRIORITY_VERSION = "1.0"
 EPSILON = 0.15  # Exploration budget (15% of each chunk)
 
+# Buffered writes: flush search_candidates / search_memory / search_knowledge
+# rows in bulk every CHECKPOINT_ROWS buffered rows or CHECKPOINT_SECONDS
+CHECKPOINT_ROWS = 500
+CHECKPOINT_SECONDS = 15.0
+# Above this many known hashes, search_memory is held as a Bloom filter
+MEMORY_SET_MAX = 1_000_000
+# Parallel mode: work queue granularity (small shards keep workers busy to the deadline)
+SHARDS_PER_WORKER = 8
+
+
+class HashBloomFilter:
+    """
+    Bloom filter over hex param hashes (SHA256 prefixes, already uniform).
+
+    No false negatives; positives must be confirmed against search_memory.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, param_hash: str) -> List[int]:
+        # Double hashing on the two 32-bit halves of the 64-bit hash prefix
+        value = int(param_hash[:16], 16)
+        h1, h2 = value >> 32, (value & 0xFFFFFFFF) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, param_hash: str):
+        for pos in self._positions(param_hash):
+            self.bits[pos >> 3] |= np.uint8(1 << (pos & 7))
+
+    def __contains__(self, param_hash: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(param_hash))
+
+
+class SearchMemoryIndex:
+    """
+    Known search_memory hashes for one instrument, loaded once per run.
+
+    Held as a set, or as a Bloom filter (confirmed by a point query on a hit)
+    when the table is larger than MEMORY_SET_MAX. Hashes added during the run
+    are always tracked exactly.
+    """
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection, instrument: str, max_set_size: int = MEMORY_SET_MAX):
+        self.conn = conn
+        self.instrument = instrument
+        self.added = set()
+
+        count = conn.execute(
+            "SELECT COUNT(*) FROM search_memory WHERE instrument = ?", [instrument]
+        ).fetchone()[0]
+        self.bloom = HashBloomFilter(count) if count > max_set_size else None
+        self.known = set()
+
+        cursor = conn.execute("SELECT param_hash FROM search_memory WHERE instrument = ?", [instrument])
+        while True:
+            rows = cursor.fetchmany(100_000)
+            if not rows:
+                break
+            for (param_hash,) in rows:
+                if self.bloom is not None:
+                    self.bloom.add(param_hash)
+                else:
+                    self.known.add(param_hash)
+
+    def add(self, param_hash: str):
+        self.added.add(param_hash)
+
+    def __contains__(self, param_hash: str) -> bool:
+        if param_hash in self.added or param_hash in self.known:
+            return True
+        if self.bloom is None or param_hash not in self.bloom:
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM search_memory WHERE param_hash = ? LIMIT 1", [param_hash]
+        ).fetchone() is not None
+
+
+def score_combination(
+    backend: PathScoringBackend,
+    combo: Dict,
+    min_sample_size: int
+) -> Optional[Dict]:
+    """
+    Score one combination from precomputed ORB paths
+
+    Tradeable model (1st close outside ORB, entry at next open), realized RR
+    after costs. Any RR target and filter (orb_size, pre_orb_travel,
+    session_type) is scored in memory. rr_target=None scores the stored
+    model RR (1.0), matching the daily_features tradeable columns.
+    """
+    orb_time = combo['orb_time']
+    rr_target = combo['rr_target']
+
+    try:
+        result = backend.score(
+            orb_time,
+            rr=rr_target if rr_target is not None else 1.0,
+            filters=combo.get('filters', {})
+        )
+
+        if result['sample_size'] >= min_sample_size:
+            expected_r = result['avg_realized_rr']
+
+            return {
+                'sample_size': result['sample_size'],
+                'profitable_trade_rate': result['profitable_trade_rate'],
+                'target_hit_rate': result['target_hit_rate'],
+                'expected_r': expected_r,
+                'score_proxy': expected_r
+            }
+
+    except Exception as e:
+        logger.warning(f"Failed to score {orb_time} RR={rr_target}: {e}")
+        return None
+
+    return None
+
+
+# Worker process state (set once per process by _init_search_worker)
+_worker_backend: Optional[PathScoringBackend] = None
+_worker_min_sample_size: int = 30
+
+
+def _init_search_worker(backend: PathScoringBackend, min_sample_size: int):
+    """Process-pool initializer: receive the read-only path snapshot once."""
+    global _worker_backend, _worker_min_sample_size
+    _worker_backend = backend
+    _worker_min_sample_size = min_sample_size
+
+
+def _score_shard(shard: List[tuple], deadline: float) -> Dict:
+    """
+    Process-pool entry point: score (index, combo) pairs until the deadline.
+
+    Returns the scores (index, score) and the time spent scoring. Workers never
+    write to the database - the coordinator owns every table.
+    """
+    started = time.time()
+    scores = []
+    for index, combo in shard:
+        if time.time() > deadline:
+            break
+        scores.append((index, score_combination(_worker_backend, combo, _worker_min_sample_size)))
+    return {'pid': os.getpid(), 'busy_seconds': time.time() - started, 'scores': scores}
+
 
 class AutoSearchEngine:
     """Deterministic edge discovery engine"""
@@ -194,18 +354,37 @@ class AutoSearchEngine:
         self.conn = db_connection
         self.start_time = None
         self.max_seconds = 300
-        self.stats = {
+        self._scoring_backends: Dict[tuple, PathScoringBackend] = {}
+
+        # search_memory hashes (loaded at run start) and buffered writes
+        self.memory_index: Optional[SearchMemoryIndex] = None
+        self._pending_candidates: List[Dict] = []
+        self._pending_memory: Dict[str, Dict] = {}
+        self._pending_knowledge: Dict[str, Dict] = {}
+        self._last_flush = time.time()
+        self._provenance: Optional[Dict] = None
+        self._run_metric_columns: Optional[bool] = None
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict:
+        """Per-run counters (reset by every run_search call)"""
+        return {
             'tested': 0,
             'skipped': 0,
             'promising': 0,
-            'time_elapsed': 0.0
+            'time_elapsed': 0.0,
+            'combos_per_sec': 0.0,
+            'workers': 1,
+            'worker_utilisation': {}
         }
 
     def run_search(
         self,
         instrument: str = 'MGC',
         settings: Optional[Dict] = None,
-        max_seconds: int = 300
+        max_seconds: int = 300,
+        workers: int = 1
     ) -> Dict:
         """
         Run automated edge discovery search
@@ -214,12 +393,15 @@ class AutoSearchEngine:
             instrument: Trading instrument
             settings: Search settings dict (or use defaults)
             max_seconds: Timeout (hard stop)
+            workers: Scoring processes (>1 shards the work queue across a
+                process pool; this process still does all the writes)
 
         Returns:
             Dict with run_id, stats, candidates
         """
         self.start_time = time.time()
         self.max_seconds = max_seconds
+        self.stats = self._new_stats()
 
         # Parse settings
         if settings is None:
@@ -235,19 +417,29 @@ class AutoSearchEngine:
             min_sample_size=settings.get('min_sample_size', 30),
             min_expected_r=settings.get('min_expected_r', 0.15),
             date_start=settings.get('date_start'),
-            date_end=settings.get('date_end')
+            date_end=settings.get('date_end'),
+            budget=settings.get('budget')
         )
+        self.stats['workers'] = max(1, workers)
 
         # Create run record
         run_id = str(uuid.uuid4())
         self._create_run_record(run_id, instrument, settings)
 
+        # Known hashes for this instrument (one query instead of one per combination)
+        self.memory_index = SearchMemoryIndex(self.conn, instrument)
+        self._last_flush = time.time()
+
         # Generate candidates
         candidates = []
         try:
-            candidates = self._generate_candidates(run_id, search_settings)
+            if workers > 1:
+                candidates = self._generate_candidates_parallel(run_id, search_settings, workers)
+            else:
+                candidates = self._generate_candidates(run_id, search_settings)
 
-            # Update run record (COMPLETED)
+            # Flush buffered rows, then update run record (COMPLETED)
+            self._flush_pending()
             self._update_run_record(
                 run_id,
                 status='COMPLETED',
@@ -259,6 +451,7 @@ class AutoSearchEngine:
 
         except TimeoutError as e:
             logger.warning(f"Search timeout: {e}")
+            self._flush_pending()
             self._update_run_record(
                 run_id,
                 status='TIMEOUT',
@@ -271,14 +464,24 @@ class AutoSearchEngine:
 
         except Exception as e:
             logger.error(f"Search failed: {e}")
+            # Keep the work scored so far (committed rows are skipped on the next run)
+            try:
+                self._flush_pending()
+            except Exception as flush_error:
+                logger.error(f"Failed to flush buffered search results: {flush_error}")
             self._update_run_record(
                 run_id,
                 status='FAILED',
                 duration=time.time() - self.start_time,
+                candidates_found=self.stats['promising'],
+                candidates_skipped=self.stats['skipped'],
+                total_tested=self.stats['tested'],
                 error_message=str(e)
             )
             raise
 
+        self.stats['time_elapsed'] = time.time() - self.start_time
+
         return {
             'run_id': run_id,
             'status': 'COMPLETED',
@@ -304,7 +507,8 @@ class AutoSearchEngine:
         total_tested: int = 0,
         error_message: Optional[str] = None
     ):
-        """Update search_runs record"""
+        """Update search_runs record (plus throughput and worker utilisation)"""
+        self.stats['combos_per_sec'] = total_tested / duration if duration > 0 else 0.0
         self.conn.execute("""
             UPDATE search_runs
             SET status = ?,
@@ -316,6 +520,30 @@ class AutoSearchEngine:
             WHERE run_id = ?
         """, [status, duration, candidates_found, candidates_skipped, total_tested, error_message, run_id])
 
+        if self._has_run_metric_columns():
+            self.conn.execute("""
+                UPDATE search_runs
+                SET workers = ?,
+                    combos_per_sec = ?,
+                    worker_stats_json = ?
+                WHERE run_id = ?
+            """, [
+                self.stats['workers'],
+                self.stats['combos_per_sec'],
+                json.dumps(self.stats['worker_utilisation']),
+                run_id
+            ])
+
+    def _has_run_metric_columns(self) -> bool:
+        """search_runs has the throughput columns (older DBs: run add_search_runs_metrics.py)"""
+        if self._run_metric_columns is None:
+            columns = {row[0] for row in self.conn.execute("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = 'search_runs'
+            """).fetchall()}
+            self._run_metric_columns = {'workers', 'combos_per_sec', 'worker_stats_json'} <= columns
+        return self._run_metric_columns
+
     def _generate_candidates(
         self,
         run_id: str,
@@ -327,13 +555,13 @@ class AutoSearchEngine:
         Strategy:
         1. Generate all parameter combinations (ORB × RR × filters)
         2. Check search_memory (skip if already tested)
-        3. Score using daily_features (fast proxy)
+        3. Score from precomputed ORB paths (in memory, no SQL per combination)
         4. If promising: save to search_candidates and search_memory
         """
         candidates = []
 
         # Generate combinations
-        combinations = self._generate_combinations(settings)
+        combinations = self._work_queue(settings)
         logger.info(f"Generated {len(combinations)} combinations to test")
 
         for combo in combinations:
@@ -348,59 +576,157 @@ class AutoSearchEngine:
                 self.stats['skipped'] += 1
                 continue
 
-            # Score candidate (fast proxy using daily_features)
+            # Score candidate (in-memory path scoring)
             score = self._score_candidate(combo, settings)
 
-            self.stats['tested'] += 1
-
-            # If promising: save and add to memory
-            if score and score['score_proxy'] >= settings.min_expected_r:
-                candidate = SearchCandidate(
-                    instrument=settings.instrument,
-                    setup_family=settings.setup_family,
-                    orb_time=combo['orb_time'],
-                    rr_target=combo['rr_target'],
-                    filters=combo.get('filters', {}),
-                    param_hash=param_hash,
-                    score_proxy=score['score_proxy'],
-                    sample_size=score['sample_size'],
-                    win_rate_proxy=None,  # DEPRECATED - use specific rates below
-                    expected_r_proxy=score.get('expected_r'),
-                    notes=f"Auto-discovered: {score['sample_size']}N, {score.get('score_proxy', 0):.3f}R proxy",
-                    profitable_trade_rate=score.get('profitable_trade_rate'),  # Profitable trades (RR > 0)
-                    target_hit_rate=score.get('target_hit_rate')  # Trades that hit target
-                )
-
-                # Save to search_candidates
-                self._save_candidate(run_id, candidate)
-
-                # Add to search_memory
-                self._add_to_memory(candidate)
-
+            candidate = self._record_score(run_id, combo, param_hash, score, settings)
+            if candidate is not None:
                 candidates.append(candidate)
-                self.stats['promising'] += 1
 
+            self._maybe_checkpoint(run_id)
+
+        return candidates
+
+    def _generate_candidates_parallel(
+        self,
+        run_id: str,
+        settings: SearchSettings,
+        workers: int
+    ) -> List[SearchCandidate]:
+        """
+        Score the work queue across a process pool
+
+        The coordinator (this process) dedups against search_memory, loads the
+        ORB paths once and ships a connection-free snapshot to each worker.
+        Workers score small shards until the run deadline and return scores;
+        only the coordinator writes search_candidates, search_memory and
+        search_knowledge (same buffered checkpoints as the sequential path).
+        """
+        # Dedup before sharding (also drops repeats within the queue)
+        pending = []
+        queued = set()
+        for combo in self._work_queue(settings):
+            param_hash = compute_param_hash(combo)
+            if param_hash in queued or self._is_in_memory(param_hash):
+                self.stats['skipped'] += 1
+                continue
+            queued.add(param_hash)
+            pending.append((param_hash, combo))
+        logger.info(f"Scoring {len(pending)} combinations across {workers} workers")
+        if not pending:
+            return []
+
+        snapshot = self._scoring_backend(settings).snapshot(sorted({combo['orb_time'] for _, combo in pending}))
+        deadline = self.start_time + self.max_seconds
+        if time.time() > deadline:
+            raise TimeoutError(f"Search exceeded {self.max_seconds} seconds")
+
+        shard_size = max(1, math.ceil(len(pending) / (workers * SHARDS_PER_WORKER)))
+        indexed = [(i, combo) for i, (_, combo) in enumerate(pending)]
+        shards = [indexed[i:i + shard_size] for i in range(0, len(indexed), shard_size)]
+
+        found = {}
+        scored = 0
+        busy = defaultdict(float)
+        pool_start = time.time()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_search_worker,
+            initargs=(snapshot, settings.min_sample_size)
+        ) as pool:
+            futures = [pool.submit(_score_shard, shard, deadline) for shard in shards]
+            for future in as_completed(futures):
+                result = future.result()
+                busy[result['pid']] += result['busy_seconds']
+                for index, score in result['scores']:
+                    scored += 1
+                    param_hash, combo = pending[index]
+                    candidate = self._record_score(run_id, combo, param_hash, score, settings)
+                    if candidate is not None:
+                        found[index] = candidate
+                self._maybe_checkpoint(run_id)
+
+        # Share of the pool's wall time each worker process spent scoring
+        wall = max(time.time() - pool_start, 1e-9)
+        self.stats['worker_utilisation'] = {
+            str(pid): round(min(seconds / wall, 1.0), 4) for pid, seconds in sorted(busy.items())
+        }
+
+        candidates = [found[i] for i in sorted(found)]
+        if scored < len(pending):
+            raise TimeoutError(
+                f"Search exceeded {self.max_seconds} seconds "
+                f"({scored}/{len(pending)} scored)"
+            )
         return candidates
 
+    def _work_queue(self, settings: SearchSettings) -> List[Dict]:
+        """
+        Combinations for this run, in scoring order
+
+        All combinations, or with settings.budget the ε-exploration split
+        (exploitation by priority, then exploration from the untested pool).
+        """
+        if not settings.budget:
+            return self._generate_combinations(settings)
+
+        exploitation, exploration = self._apply_epsilon_exploration(settings, settings.budget)
+        chosen = {combo['param_hash'] for combo in exploitation}
+        return exploitation + [combo for combo in exploration if combo['param_hash'] not in chosen]
+
+    def _record_score(
+        self,
+        run_id: str,
+        combo: Dict,
+        param_hash: str,
+        score: Optional[Dict],
+        settings: SearchSettings
+    ) -> Optional[SearchCandidate]:
+        """Count a scored combination; buffer it if promising (coordinator only)"""
+        self.stats['tested'] += 1
+
+        # If promising: save and add to memory
+        if not score or score['score_proxy'] < settings.min_expected_r:
+            return None
+
+        candidate = SearchCandidate(
+            instrument=settings.instrument,
+            setup_family=settings.setup_family,
+            orb_time=combo['orb_time'],
+            rr_target=combo['rr_target'],
+            filters=combo.get('filters', {}),
+            param_hash=param_hash,
+            score_proxy=score['score_proxy'],
+            sample_size=score['sample_size'],
+            win_rate_proxy=None,  # DEPRECATED - use specific rates below
+            expected_r_proxy=score.get('expected_r'),
+            notes=f"Auto-discovered: {score['sample_size']}N, {score.get('score_proxy', 0):.3f}R proxy",
+            profitable_trade_rate=score.get('profitable_trade_rate'),  # Profitable trades (RR > 0)
+            target_hit_rate=score.get('target_hit_rate')  # Trades that hit target
+        )
+
+        # Save to search_candidates
+        self._save_candidate(run_id, candidate)
+
+        # Add to search_memory
+        self._add_to_memory(candidate)
+
+        self.stats['promising'] += 1
+        return candidate
+
     def _generate_combinations(self, settings: SearchSettings) -> List[Dict]:
         """Generate all parameter combinations to test"""
         combinations = []
 
-        # Simple baseline: ORB × RR (no filters)
-        # PROXY MODE: No RR-specific data, use stored model from daily_features
+        # Baseline: ORB × RR (no filters), then ORB × RR × each filter value
         for orb_time in settings.orb_times:
             for rr_target in settings.rr_targets:
-                # Accept None (proxy mode) or skip non-None values
-                if rr_target is not None and rr_target != 1.0:
-                    logger.warning(f"Skipping RR={rr_target} for {orb_time} (proxy mode only, no RR-specific data)")
-                    continue
-
                 # Generate baseline (no filters)
                 combinations.append({
                     'instrument': settings.instrument,
                     'setup_family': settings.setup_family,
                     'orb_time': orb_time,
-                    'rr_target': rr_target,  # None = proxy mode
+                    'rr_target': rr_target,  # None = stored model RR (1.0)
                     'filters': {}
                 })
 
@@ -437,6 +763,9 @@ class AutoSearchEngine:
 
     def _is_in_memory(self, param_hash: str) -> bool:
         """Check if combination already tested (in search_memory)"""
+        if self.memory_index is not None:
+            return param_hash in self.memory_index
+
         result = self.conn.execute("""
             SELECT 1 FROM search_memory
             WHERE param_hash = ?
@@ -445,63 +774,25 @@ class AutoSearchEngine:
 
         return result is not None
 
+    def _scoring_backend(self, settings: SearchSettings) -> PathScoringBackend:
+        """Path scoring backend for the search scope (paths load once per ORB)"""
+        key = (settings.instrument, settings.date_start, settings.date_end)
+        if key not in self._scoring_backends:
+            self._scoring_backends[key] = PathScoringBackend(
+                self.conn,
+                instrument=settings.instrument,
+                date_start=settings.date_start,
+                date_end=settings.date_end
+            )
+        return self._scoring_backends[key]
+
     def _score_candidate(
         self,
         combo: Dict,
         settings: SearchSettings
     ) -> Optional[Dict]:
-        """
-        Fast scoring proxy using daily_features
-
-        Uses tradeable_realized_rr and tradeable_outcome columns (baseline RR=1.0 only)
-        For other RR targets, scales the baseline data
-        """
-        orb_time = combo['orb_time']
-        rr_target = combo['rr_target']
-        instrument = settings.instrument
-
-        try:
-            # CRITICAL: Use tradeable_* columns (1st close outside ORB, not limit order)
-            realized_rr_col = f"orb_{orb_time}_tradeable_realized_rr"
-            outcome_col = f"orb_{orb_time}_tradeable_outcome"
-
-            query = f"""
-                SELECT
-                    COUNT(*) as sample_size,
-                    AVG(CASE WHEN {realized_rr_col} > 0 THEN 1.0 ELSE 0.0 END) as profitable_trade_rate,
-                    AVG(CASE WHEN {outcome_col} = 'WIN' THEN 1.0 ELSE 0.0 END) as target_hit_rate,
-                    AVG({realized_rr_col}) as avg_realized_rr
-                FROM daily_features
-                WHERE instrument = ?
-                  AND {realized_rr_col} IS NOT NULL
-                  AND {outcome_col} IS NOT NULL
-            """
-
-            result = self.conn.execute(query, [instrument]).fetchone()
-
-            if result and result[0] >= settings.min_sample_size:
-                sample_size = result[0]
-                profitable_trade_rate = result[1]
-                target_hit_rate = result[2]
-                avg_realized_rr = result[3]
-
-                # Stored Model Proxy (single RR target per ORB in daily_features)
-                # No RR-specific data available - use average realized RR as proxy
-                expected_r = avg_realized_rr
-
-                return {
-                    'sample_size': sample_size,
-                    'profitable_trade_rate': profitable_trade_rate,
-                    'target_hit_rate': target_hit_rate,
-                    'expected_r': expected_r,
-                    'score_proxy': expected_r
-                }
-
-        except Exception as e:
-            logger.warning(f"Failed to score {orb_time} RR={rr_target}: {e}")
-            return None
-
-        return None
+        """Score one combination from precomputed ORB paths (see score_combination)"""
+        return score_combination(self._scoring_backend(settings), combo, settings.min_sample_size)
 
     def _save_candidate(self, run_id: str, candidate: SearchCandidate):
         """Save promising candidate to search_candidates"""
@@ -511,32 +802,25 @@ class AutoSearchEngine:
         hash_component = int(candidate.param_hash[:8], 16) % 1000000  # Keep hash for determinism
         candidate_id = (hash_component * 1000000 + timestamp_component) % (2**31 - 1)
 
-        self.conn.execute("""
-            INSERT OR IGNORE INTO search_candidates (
-                id, run_id, created_at, instrument, setup_family,
-                orb_time, rr_target, filters_json, param_hash,
-                score_proxy, sample_size, win_rate_proxy, expected_r_proxy, notes,
-                profitable_trade_rate, target_hit_rate
-            ) VALUES (
-                ?, ?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-            )
-        """, [
-            candidate_id,
-            run_id,
-            candidate.instrument,
-            candidate.setup_family,
-            candidate.orb_time,
-            candidate.rr_target,
-            json.dumps(candidate.filters),
-            candidate.param_hash,
-            candidate.score_proxy,
-            candidate.sample_size,
-            candidate.win_rate_proxy,
-            candidate.expected_r_proxy,
-            candidate.notes,
-            candidate.profitable_trade_rate,
-            candidate.target_hit_rate
-        ])
+        # Buffered: written in bulk by _flush_pending
+        self._pending_candidates.append({
+            'id': candidate_id,
+            'run_id': run_id,
+            'created_at': datetime.now(),
+            'instrument': candidate.instrument,
+            'setup_family': candidate.setup_family,
+            'orb_time': candidate.orb_time,
+            'rr_target': candidate.rr_target,
+            'filters_json': json.dumps(candidate.filters),
+            'param_hash': candidate.param_hash,
+            'score_proxy': candidate.score_proxy,
+            'sample_size': candidate.sample_size,
+            'win_rate_proxy': candidate.win_rate_proxy,
+            'expected_r_proxy': candidate.expected_r_proxy,
+            'notes': candidate.notes,
+            'profitable_trade_rate': candidate.profitable_trade_rate,
+            'target_hit_rate': candidate.target_hit_rate
+        })
 
         # Also save to search_knowledge with result classification
         expectancy_r = candidate.expected_r_proxy if candidate.expected_r_proxy else 0.0
@@ -584,38 +868,146 @@ class AutoSearchEngine:
         )
 
     def _add_to_memory(self, candidate: SearchCandidate):
-        """Add candidate to search_memory (deduplication registry)"""
-        from datetime import datetime
-
-        # Generate memory_id from hash (for determinism)
-        memory_id = int(candidate.param_hash[:8], 16) % (2**31 - 1)
+        """Add candidate to search_memory (deduplication registry, buffered)"""
         now = datetime.now()
+        if self.memory_index is not None:
+            self.memory_index.add(candidate.param_hash)
+
+        pending = self._pending_memory.get(candidate.param_hash)
+        if pending is not None:
+            # Same hash twice before a flush: merge as consecutive upserts would
+            pending['last_seen_at'] = now
+            pending['test_count'] += 1
+            if candidate.score_proxy is not None and (
+                pending['best_score'] is None or candidate.score_proxy > pending['best_score']
+            ):
+                pending['best_score'] = candidate.score_proxy
+            return
+
+        self._pending_memory[candidate.param_hash] = {
+            # Generate memory_id from hash (for determinism)
+            'memory_id': int(candidate.param_hash[:8], 16) % (2**31 - 1),
+            'param_hash': candidate.param_hash,
+            'instrument': candidate.instrument,
+            'setup_family': candidate.setup_family,
+            'filters_json': json.dumps(candidate.filters),
+            'first_seen_at': now,
+            'last_seen_at': now,
+            'test_count': 1,
+            'best_score': candidate.score_proxy
+        }
 
-        self.conn.execute("""
-            INSERT INTO search_memory (
-                memory_id, param_hash, instrument, setup_family, filters_json,
-                first_seen_at, last_seen_at, test_count, best_score, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, '')
-            ON CONFLICT (param_hash) DO UPDATE SET
-                last_seen_at = ?,
-                test_count = search_memory.test_count + 1,
-                best_score = CASE
-                    WHEN ? > search_memory.best_score THEN ?
-                    ELSE search_memory.best_score
-                END
-        """, [
-            memory_id,                          # ? for memory_id
-            candidate.param_hash,               # ? for param_hash
-            candidate.instrument,               # ? for instrument
-            candidate.setup_family,             # ? for setup_family
-            json.dumps(candidate.filters),      # ? for filters_json
-            now,                                # ? for first_seen_at
-            now,                                # ? for last_seen_at
-            candidate.score_proxy,              # ? for best_score
-            now,                                # ? for last_seen_at UPDATE
-            candidate.score_proxy,              # ? for CASE WHEN comparison
-            candidate.score_proxy               # ? for CASE WHEN THEN value
-        ])
+    def _pending_rows(self) -> int:
+        return len(self._pending_candidates) + len(self._pending_memory) + len(self._pending_knowledge)
+
+    def _maybe_checkpoint(self, run_id: str):
+        """Flush buffered rows and record progress every CHECKPOINT_ROWS / CHECKPOINT_SECONDS"""
+        if self._pending_rows() < CHECKPOINT_ROWS and time.time() - self._last_flush < CHECKPOINT_SECONDS:
+            return
+
+        self._flush_pending()
+        # Progress survives a crash (status stays RUNNING until the run ends)
+        self._update_run_record(
+            run_id,
+            status='RUNNING',
+            duration=time.time() - self.start_time,
+            candidates_found=self.stats['promising'],
+            candidates_skipped=self.stats['skipped'],
+            total_tested=self.stats['tested']
+        )
+
+    def _flush_pending(self):
+        """
+        Bulk-write buffered candidates, memory and knowledge rows in one transaction
+
+        All three tables commit together, so a crash never leaves a hash in
+        search_memory without its candidate (or the reverse). Rows stay buffered
+        if the write fails.
+        """
+        self._last_flush = time.time()
+        if self._pending_rows() == 0:
+            return
+
+        # INSERT OR IGNORE semantics: first row per candidate id wins
+        candidates = list({row['id']: row for row in reversed(self._pending_candidates)}.values())[::-1]
+        memory = list(self._pending_memory.values())
+        knowledge = list(self._pending_knowledge.values())
+
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            if candidates:
+                self.conn.register('pending_candidates', pd.DataFrame(candidates))
+                self.conn.execute("""
+                    INSERT OR IGNORE INTO search_candidates (
+                        id, run_id, created_at, instrument, setup_family,
+                        orb_time, rr_target, filters_json, param_hash,
+                        score_proxy, sample_size, win_rate_proxy, expected_r_proxy, notes,
+                        profitable_trade_rate, target_hit_rate
+                    )
+                    SELECT
+                        id, run_id, created_at, instrument, setup_family,
+                        orb_time, rr_target, filters_json, param_hash,
+                        score_proxy, sample_size, win_rate_proxy, expected_r_proxy, notes,
+                        profitable_trade_rate, target_hit_rate
+                    FROM pending_candidates
+                """)
+                self.conn.unregister('pending_candidates')
+
+            if memory:
+                self.conn.register('pending_memory', pd.DataFrame(memory))
+                self.conn.execute("""
+                    INSERT INTO search_memory (
+                        memory_id, param_hash, instrument, setup_family, filters_json,
+                        first_seen_at, last_seen_at, test_count, best_score, notes
+                    )
+                    SELECT
+                        memory_id, param_hash, instrument, setup_family, filters_json,
+                        first_seen_at, last_seen_at, test_count, best_score, ''
+                    FROM pending_memory
+                    ON CONFLICT (param_hash) DO UPDATE SET
+                        last_seen_at = EXCLUDED.last_seen_at,
+                        test_count = search_memory.test_count + EXCLUDED.test_count,
+                        best_score = CASE
+                            WHEN EXCLUDED.best_score > search_memory.best_score THEN EXCLUDED.best_score
+                            ELSE search_memory.best_score
+                        END
+                """)
+                self.conn.unregister('pending_memory')
+
+            if knowledge:
+                self.conn.register('pending_knowledge', pd.DataFrame(knowledge))
+                self.conn.execute("""
+                    INSERT INTO search_knowledge (
+                        knowledge_id, param_hash, param_hash_version,
+                        instrument, setup_family, orb_time, rr_target, filters_json,
+                        result_class, expectancy_r, sample_size, robust_flags,
+                        ruleset_version, priority_version,
+                        git_commit, db_path, created_at, last_seen_at, notes
+                    )
+                    SELECT
+                        knowledge_id, param_hash, param_hash_version,
+                        instrument, setup_family, orb_time, rr_target, filters_json,
+                        result_class, expectancy_r, sample_size, robust_flags,
+                        ruleset_version, priority_version,
+                        git_commit, db_path, created_at, last_seen_at, notes
+                    FROM pending_knowledge
+                    ON CONFLICT (param_hash) DO UPDATE SET
+                        result_class = EXCLUDED.result_class,
+                        expectancy_r = EXCLUDED.expectancy_r,
+                        sample_size = EXCLUDED.sample_size,
+                        robust_flags = EXCLUDED.robust_flags,
+                        last_seen_at = EXCLUDED.last_seen_at
+                """)
+                self.conn.unregister('pending_knowledge')
+
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        self._pending_candidates = []
+        self._pending_memory = {}
+        self._pending_knowledge = {}
 
     def get_recent_candidates(self, run_id: str, limit: int = 20) -> List[Dict]:
         """Get candidates from specific run"""
@@ -666,54 +1058,51 @@ class AutoSearchEngine:
         # Classify result
         result_class = classify_result(expectancy_r, sample_size, robust_flags)
 
-        # Get provenance
-        prov = create_provenance_dict(
-            ruleset_version=RULESET_VERSION,
-            priority_version=PRIORITY_VERSION,
-            param_hash_version=PARAM_HASH_VERSION
-        )
-
-        # Generate knowledge_id from param_hash (deterministic)
-        knowledge_id = int(candidate.param_hash[:8], 16) % (2**31 - 1)
+        # Get provenance (once per engine: git lookup is a subprocess)
+        if self._provenance is None:
+            self._provenance = create_provenance_dict(
+                ruleset_version=RULESET_VERSION,
+                priority_version=PRIORITY_VERSION,
+                param_hash_version=PARAM_HASH_VERSION
+            )
+        prov = self._provenance
 
-        # Insert or update
-        self.conn.execute("""
-            INSERT INTO search_knowledge (
-                knowledge_id, param_hash, param_hash_version,
-                instrument, setup_family, orb_time, rr_target, filters_json,
-                result_class, expectancy_r, sample_size, robust_flags,
-                ruleset_version, priority_version,
-                git_commit, db_path, created_at, last_seen_at, notes
-            ) VALUES (
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+        now = datetime.now()
+        pending = self._pending_knowledge.get(candidate.param_hash)
+        if pending is not None:
+            # Same hash twice before a flush: the later result wins (upsert semantics)
+            pending.update(
+                result_class=result_class,
+                expectancy_r=expectancy_r,
+                sample_size=sample_size,
+                robust_flags=robust_flags,
+                last_seen_at=now
             )
-            ON CONFLICT (param_hash) DO UPDATE SET
-                result_class = EXCLUDED.result_class,
-                expectancy_r = EXCLUDED.expectancy_r,
-                sample_size = EXCLUDED.sample_size,
-                robust_flags = EXCLUDED.robust_flags,
-                last_seen_at = CURRENT_TIMESTAMP
-        """, [
-            knowledge_id,
-            candidate.param_hash,
-            PARAM_HASH_VERSION,
-            candidate.instrument,
-            candidate.setup_family,
-            candidate.orb_time,
-            candidate.rr_target,
-            json.dumps(candidate.filters),
-            result_class,
-            expectancy_r,
-            sample_size,
-            robust_flags,
-            RULESET_VERSION,
-            PRIORITY_VERSION,
-            prov['git_commit'],
-            prov['db_path'],
-            datetime.now(),
-            datetime.now(),
-            candidate.notes
-        ])
+            return
+
+        # Buffered: written in bulk by _flush_pending
+        self._pending_knowledge[candidate.param_hash] = {
+            # Generate knowledge_id from param_hash (deterministic)
+            'knowledge_id': int(candidate.param_hash[:8], 16) % (2**31 - 1),
+            'param_hash': candidate.param_hash,
+            'param_hash_version': PARAM_HASH_VERSION,
+            'instrument': candidate.instrument,
+            'setup_family': candidate.setup_family,
+            'orb_time': candidate.orb_time,
+            'rr_target': candidate.rr_target,
+            'filters_json': json.dumps(candidate.filters),
+            'result_class': result_class,
+            'expectancy_r': expectancy_r,
+            'sample_size': sample_size,
+            'robust_flags': robust_flags,
+            'ruleset_version': RULESET_VERSION,
+            'priority_version': PRIORITY_VERSION,
+            'git_commit': prov['git_commit'],
+            'db_path': prov['db_path'],
+            'created_at': now,
+            'last_seen_at': now,
+            'notes': candidate.notes
+        }
 
     def _get_untested_combinations(
         self,
@@ -52,6 +52,7 @@ class DataBridge:
         self.databento_script = self.root_dir / "pipeline" / "backfill_databento_continuous.py"
         self.projectx_script = self.root_dir / "pipeline" / "backfill_range.py"
         self.features_script = self.root_dir / "pipeline" / "build_daily_features.py"
+        self.incremental_features_script = self.root_dir / "pipeline" / "incremental_features.py"
 
     def get_last_db_date(self, instrument: str = 'MGC') -> Optional[date]:
         """
@@ -254,6 +255,53 @@ class DataBridge:
             print(f"[ERROR] Exception during feature building: {e}")
             return False
 
+    def update_features_incremental(self, dry_run: bool = False) -> bool:
+        """
+        Run incremental_features.py: recompute only the trade dates / ORBs
+        (plus ATR dependents) invalidated by bars written since the last run.
+
+        Backfill scripts record the UTC range they touched in bar_change_log,
+        so this replaces a full per-date rebuild of the backfilled span.
+
+        Args:
+            dry_run: Only print which dates and ORBs would be recomputed
+
+        Returns:
+            True if successful, False otherwise
+        """
+        print(f"\n[INFO] Updating daily features from bar change log...")
+
+        try:
+            if not self.incremental_features_script.exists():
+                print(f"[ERROR] Incremental features script not found: {self.incremental_features_script}")
+                return False
+
+            cmd = ['python', str(self.incremental_features_script), '--db', str(self.db_path)]
+            if dry_run:
+                cmd.append('--dry-run')
+            print(f"[CMD] {' '.join(cmd)}")
+
+            result = subprocess.run(
+                cmd,
+                cwd=str(self.root_dir),
+                capture_output=True,
+                text=True,
+                shell=True  # Use shell on Windows
+            )
+            print(result.stdout)
+
+            if result.returncode != 0:
+                print(f"[ERROR] Incremental feature update failed:")
+                print(result.stderr)
+                return False
+
+            print(f"[OK] Incremental feature update completed")
+            return True
+
+        except Exception as e:
+            print(f"[ERROR] Exception during incremental feature update: {e}")
+            return False
+
     def fill_gap(self, last_db_date: Optional[date], current_date: date, instrument: str = 'MGC') -> bool:
         """
         Fill gap between last DB date and current date.
@@ -263,7 +311,7 @@ class DataBridge:
         2. If gap exists, backfill from (last_db_date + 1) to current_date
         3. Select source based on date range (Databento vs ProjectX)
         4. Run backfill
-        5. Build features
+        5. Update features invalidated by the backfill (full rebuild as fallback)
 
         Args:
             last_db_date: Last date in DB (None if no data)
@@ -301,8 +349,10 @@ class DataBridge:
             print(f"[ERROR] Backfill failed - cannot fill gap")
             return False
 
-        # Build features
-        features_success = self.build_features(start_date, end_date)
+        # Build features: only what the backfill invalidated, full span as fallback
+        features_success = self.update_features_incremental()
+        if not features_success:
+            features_success = self.build_features(start_date, end_date)
         if not features_success:
             print(f"[WARN] Feature building had issues, but backfill succeeded")
             # Return True anyway - bars data is there, features can be rebuilt later
@@ -3,11 +3,12 @@ LIVE DATA LOADER - Databento Integration
 Handles real-time 1-minute bar ingestion and rolling window management.
 """
 
+import numpy as np
 import pandas as pd
 import duckdb
 import httpx
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import logging
 import os
 from pathlib import Path
@@ -17,6 +18,7 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
+from intraday_orb_engine import IntradayOrbEngine
 from config import (
     PROJECTX_USERNAME,
     PROJECTX_API_KEY,
@@ -30,6 +32,156 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+BAR_COLUMNS = ["ts_utc", "open", "high", "low", "close", "volume"]
+RING_CAPACITY = DATA_WINDOW_HOURS * 60 + 60  # full rolling window plus an hour of slack
+
+
+class BarRingBuffer:
+    """
+    Fixed-capacity window of 1-minute bars in parallel NumPy columns.
+
+    Timestamps are epoch milliseconds (UTC). Every slot is written twice
+    (at i and i + capacity), so the live window is always ONE contiguous
+    slice: range queries are two binary searches plus array views - no
+    boolean masks, no copies. pv_before/volume_before hold running totals of
+    typical_price * volume and volume for all bars before each slot, so
+    VWAP over any range is O(log n).
+    """
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self.ts = np.zeros(2 * capacity, dtype=np.int64)
+        self.open = np.zeros(2 * capacity)
+        self.high = np.zeros(2 * capacity)
+        self.low = np.zeros(2 * capacity)
+        self.close = np.zeros(2 * capacity)
+        self.volume = np.zeros(2 * capacity, dtype=np.int64)
+        self.pv_before = np.zeros(2 * capacity)
+        self.volume_before = np.zeros(2 * capacity)
+        self.start = 0  # physical slot of the oldest bar
+        self.size = 0
+        self.evicted = 0  # bars dropped off the front since the last clear()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+        self.evicted = 0
+
+    @property
+    def first_ts(self) -> Optional[int]:
+        return int(self.ts[self.start]) if self.size else None
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        return int(self.ts[self.start + self.size - 1]) if self.size else None
+
+    def _write(self, slot: int, values: tuple):
+        for col, value in zip((self.ts, self.open, self.high, self.low, self.close, self.volume), values):
+            col[slot] = value
+            col[slot + self.capacity] = value
+
+    def _pv(self, i: int) -> float:
+        """typical_price * volume of logical bar i."""
+        j = self.start + i
+        return (self.high[j] + self.low[j] + self.close[j]) / 3 * self.volume[j]
+
+    def upsert(self, ts: int, open_: float, high: float, low: float, close: float, volume: int) -> bool:
+        """
+        Append a bar newer than the last one, or replace the last one (a
+        forming bar re-sent by the next poll). Older bars are ignored.
+        """
+        last = self.last_ts
+        if last is not None and ts < last:
+            return False
+        if last is not None and ts == last:
+            self._write((self.start + self.size - 1) % self.capacity, (ts, open_, high, low, close, volume))
+            return True
+
+        if self.size:
+            pv_before = self.pv_before[self.start + self.size - 1] + self._pv(self.size - 1)
+            volume_before = self.volume_before[self.start + self.size - 1] + self.volume[self.start + self.size - 1]
+        else:
+            pv_before = volume_before = 0.0
+
+        if self.size == self.capacity:
+            self.start = (self.start + 1) % self.capacity
+            self.size -= 1
+            self.evicted += 1
+        slot = (self.start + self.size) % self.capacity
+        self._write(slot, (ts, open_, high, low, close, volume))
+        for col, value in ((self.pv_before, pv_before), (self.volume_before, volume_before)):
+            col[slot] = value
+            col[slot + self.capacity] = value
+        self.size += 1
+        return True
+
+    def extend(self, ts, open_, high, low, close, volume) -> int:
+        """Upsert bars in time order. Returns how many were stored."""
+        stored = 0
+        for row in zip(ts.tolist(), open_.tolist(), high.tolist(), low.tolist(), close.tolist(), volume.tolist()):
+            stored += self.upsert(*row)
+        return stored
+
+    def column(self, name: str) -> np.ndarray:
+        """Contiguous view of a column over the whole window."""
+        return getattr(self, name)[self.start:self.start + self.size]
+
+    def span(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Tuple[int, int]:
+        """Logical [i, k) of bars with start_ms <= ts < end_ms (None = open-ended)."""
+        ts = self.column("ts")
+        i = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side="left"))
+        k = self.size if end_ms is None else int(np.searchsorted(ts, end_ms, side="left"))
+        return i, max(i, k)
+
+    def high_low(self, start_ms: int, end_ms: int) -> Optional[Tuple[float, float]]:
+        i, k = self.span(start_ms, end_ms)
+        if i == k:
+            return None
+        j = self.start
+        return float(self.high[j + i:j + k].max()), float(self.low[j + i:j + k].min())
+
+    def _totals_before(self, i: int) -> Tuple[float, float]:
+        """Running (pv, volume) of all bars before logical index i (i may equal size)."""
+        if i < self.size:
+            return self.pv_before[self.start + i], self.volume_before[self.start + i]
+        last = self.start + self.size - 1
+        return self.pv_before[last] + self._pv(self.size - 1), self.volume_before[last] + self.volume[last]
+
+    def vwap(self, start_ms: int, end_ms: int) -> Optional[float]:
+        i, k = self.span(start_ms, end_ms)
+        if i == k:
+            return None
+        pv_i, volume_i = self._totals_before(i)
+        pv_k, volume_k = self._totals_before(k)
+        total_volume = volume_k - volume_i
+        if total_volume == 0:
+            return None
+        return float((pv_k - pv_i) / total_volume)
+
+    def to_frame(self, i: int = 0, k: Optional[int] = None) -> pd.DataFrame:
+        """Bars [i, k) as a DataFrame (ts_utc, OHLCV, ts_local)."""
+        k = self.size if k is None else k
+        j = self.start
+        ts_utc = pd.to_datetime(self.ts[j + i:j + k], unit="ms", utc=True)
+        df = pd.DataFrame({
+            "ts_utc": ts_utc,
+            "open": self.open[j + i:j + k],
+            "high": self.high[j + i:j + k],
+            "low": self.low[j + i:j + k],
+            "close": self.close[j + i:j + k],
+            "volume": self.volume[j + i:j + k],
+        })
+        df["ts_local"] = ts_utc.tz_convert(TZ_LOCAL)
+        return df
+
+
+def _epoch_ms(dt: datetime) -> int:
+    """Aware datetime -> epoch milliseconds (UTC)."""
+    return int(dt.timestamp() * 1000)
+
 
 class LiveDataLoader:
     """
@@ -58,7 +210,16 @@ class LiveDataLoader:
             logger.info(f"Local mode: Connected to {DB_PATH} for {symbol}")
 
         self._setup_tables()
-        self.bars_df = pd.DataFrame()  # In-memory cache
+
+        # In-memory rolling window; polls only request bars after its last timestamp
+        self.bars = BarRingBuffer()
+        self._bars_from_ms: Optional[int] = None  # window is complete from here on
+        self._bars_df: Optional[pd.DataFrame] = None
+        self._db_bars_table: Optional[str] = None  # live_bars or bars_1m (DB fallback)
+
+        # Streaming ORB/session state, advanced with every completed bar fetched
+        self.orb_engine = IntradayOrbEngine(instrument=self._instrument_name())
+        self._today_atr: Optional[tuple] = None  # (date, atr) once found
 
         # ProjectX API client
         self.projectx_token: Optional[str] = None
@@ -141,70 +302,108 @@ class LiveDataLoader:
         self.projectx_source_symbol = contract.get("name", self.symbol)
         logger.info(f"Active contract: {self.projectx_source_symbol} (ID: {self.projectx_contract_id})")
 
+    @property
+    def bars_df(self) -> pd.DataFrame:
+        """The whole in-memory window as a DataFrame (rebuilt only after new bars)."""
+        if self._bars_df is None:
+            self._bars_df = self.bars.to_frame()
+        return self._bars_df
+
     def fetch_latest_bars(self, lookback_minutes: int = None) -> pd.DataFrame:
         """
         Fetch latest bars from ProjectX API or database.
 
+        Only bars from the last one held in memory onward are requested (the
+        last bar is re-requested because it may have been a forming bar);
+        the full lookback is loaded only when the window does not cover it yet.
+
         Args:
             lookback_minutes: How far back to fetch (default: DATA_WINDOW_HOURS)
 
         Returns:
-            DataFrame with columns: ts_utc, open, high, low, close, volume
+            DataFrame with columns: ts_utc, open, high, low, close, volume, ts_local
         """
         if lookback_minutes is None:
             lookback_minutes = DATA_WINDOW_HOURS * 60
 
+        cutoff_ms = _epoch_ms(datetime.now(TZ_UTC) - timedelta(minutes=lookback_minutes))
+        if self.bars.evicted:
+            self._bars_from_ms = self.bars.first_ts
+
+        if len(self.bars) and self._bars_from_ms is not None and self._bars_from_ms <= cutoff_ms:
+            since_ms = self.bars.last_ts
+        else:
+            self.bars.clear()
+            self._db_bars_table = None
+            self._bars_from_ms = since_ms = cutoff_ms
+
+        new_bars = self._poll_bars(since_ms)
+        if len(new_bars):
+            self.bars.extend(*(new_bars[c].to_numpy() for c in ("ts", "open", "high", "low", "close", "volume")))
+            self._bars_df = None
+            self._feed_orb_engine(new_bars)
+
+        if not len(self.bars):
+            logger.warning(f"No bars found for {self.symbol}")
+        return self.bars.to_frame(*self.bars.span(cutoff_ms))
+
+    def _poll_bars(self, since_ms: int) -> pd.DataFrame:
+        """Bars with ts >= since_ms (columns: ts [epoch ms], open, high, low, close, volume)."""
         # Try ProjectX API first if available
         if self.projectx_token and self.projectx_contract_id:
             try:
-                return self._fetch_from_projectx(lookback_minutes)
+                return self._fetch_from_projectx(since_ms)
             except Exception as e:
                 logger.warning(f"ProjectX fetch failed: {e}. Falling back to database.")
 
-        # Fall back to database
-        cutoff = datetime.now(TZ_UTC) - timedelta(minutes=lookback_minutes)
+        since = datetime.fromtimestamp(since_ms / 1000, TZ_UTC)
 
-        # Try live_bars first (cache), then fall back to historical bars_1m
-        try:
-            result = self.con.execute(f"""
-                SELECT ts_utc, open, high, low, close, volume
-                FROM live_bars
-                WHERE symbol = ? AND ts_utc >= ?
-                ORDER BY ts_utc
-            """, [self.symbol, cutoff]).fetchdf()
-        except Exception as e:
-            # live_bars doesn't exist (cloud mode), use historical bars_1m
-            logger.debug(f"live_bars query failed: {e}")
-            result = pd.DataFrame()
-
-        if len(result) == 0:
-            # Fall back to historical bars from bars_1m (MotherDuck)
-            logger.info(f"No live_bars found, querying bars_1m for {self.symbol}")
+        # Try live_bars first (cache), then fall back to historical bars_1m;
+        # delta polls keep reading whichever table the full load came from
+        tables = [self._db_bars_table] if self._db_bars_table else ["live_bars", "bars_1m"]
+        for table in tables:
             try:
                 result = self.con.execute(f"""
-                    SELECT ts_utc, open, high, low, close, volume
-                    FROM bars_1m
+                    SELECT epoch_ms(ts_utc) AS ts, open, high, low, close, volume
+                    FROM {table}
                     WHERE symbol = ? AND ts_utc >= ?
                     ORDER BY ts_utc
-                """, [self.symbol, cutoff]).fetchdf()
+                """, [self.symbol, since]).fetchdf()
             except Exception as e:
-                logger.warning(f"No bars found in bars_1m for {self.symbol}: {e}")
-                return pd.DataFrame(columns=["ts_utc", "open", "high", "low", "close", "volume"])
-
-        if len(result) == 0:
-            logger.warning(f"No bars found for {self.symbol}")
-            return pd.DataFrame(columns=["ts_utc", "open", "high", "low", "close", "volume"])
-
-        # Convert to local timezone for display
-        result["ts_local"] = pd.to_datetime(result["ts_utc"]).dt.tz_convert(TZ_LOCAL)
-
-        self.bars_df = result
-        return result
+                # live_bars doesn't exist (cloud mode), use historical bars_1m
+                logger.debug(f"{table} query failed: {e}")
+                continue
+            if len(result) or self._db_bars_table:
+                self._db_bars_table = table
+                result["volume"] = result["volume"].fillna(0)
+                return result
+            if table == "live_bars":
+                logger.info(f"No live_bars found, querying bars_1m for {self.symbol}")
+
+        return pd.DataFrame(columns=["ts", "open", "high", "low", "close", "volume"])
+
+    def _feed_orb_engine(self, bars: pd.DataFrame):
+        """Advance the streaming ORB engine with completed bars (the forming bar is skipped)."""
+        last_complete_ms = _epoch_ms(datetime.now(TZ_UTC) - timedelta(minutes=1))
+        day_before = self.orb_engine.day()
+        self.orb_engine.feed(bars[bars["ts"] <= last_complete_ms].rename(columns={"ts": "ts_utc"}))
+
+        # ATR for size_norm / type codes: looked up once per new trade date
+        if self.orb_engine.day() is not day_before:
+            self.orb_engine.atr_20 = self.get_today_atr()
+
+    def _instrument_name(self) -> str:
+        """Map symbol to instrument name (daily_features / cost model)."""
+        if self.symbol == "NQ" or self.symbol == "MNQ":
+            return "NQ"
+        elif self.symbol == "MPL":
+            return "MPL"
+        return "MGC"
 
-    def _fetch_from_projectx(self, lookback_minutes: int) -> pd.DataFrame:
-        """Fetch bars from ProjectX API and update database."""
+    def _fetch_from_projectx(self, since_ms: int) -> pd.DataFrame:
+        """Fetch bars from ts >= since_ms from ProjectX API and persist them (local mode)."""
+        start_utc = datetime.fromtimestamp(since_ms / 1000, TZ_UTC)
         end_utc = datetime.now(TZ_UTC)
-        start_utc = end_utc - timedelta(minutes=lookback_minutes)
 
         # Format as ISO strings
         start_iso = start_utc.isoformat().replace("+00:00", "Z")
@@ -238,59 +437,50 @@ class LiveDataLoader:
         bars = data.get("bars") or []
 
         if not bars:
-            logger.warning(f"No bars returned from ProjectX for {self.symbol}")
-            return pd.DataFrame(columns=["ts_utc", "open", "high", "low", "close", "volume"])
-
-        # Convert bars to DataFrame directly (skip database in cloud mode for performance)
+            logger.debug(f"No new bars from ProjectX for {self.symbol}")
+            return pd.DataFrame(columns=["ts", "open", "high", "low", "close", "volume"])
+
+        result = pd.DataFrame({
+            "ts": pd.to_datetime([bar["t"] for bar in bars], utc=True).as_unit("ms").asi8,
+            "open": [float(bar["o"]) for bar in bars],
+            "high": [float(bar["h"]) for bar in bars],
+            "low": [float(bar["l"]) for bar in bars],
+            "close": [float(bar["c"]) for bar in bars],
+            "volume": [int(bar["v"]) for bar in bars],
+        })
+        result = result.sort_values("ts").drop_duplicates("ts", keep="last").reset_index(drop=True)
+        result = result[result["ts"] >= since_ms]
+
+        # Local mode: ONE batched upsert per poll (cloud mode skips database writes)
         from cloud_mode import is_cloud_deployment
+        if not is_cloud_deployment():
+            self._upsert_live_bars(result)
 
-        if is_cloud_deployment():
-            # Cloud mode: Process bars directly without database writes
-            rows = []
-            for bar in bars:
-                rows.append({
-                    "ts_utc": pd.to_datetime(bar["t"]),
-                    "open": float(bar["o"]),
-                    "high": float(bar["h"]),
-                    "low": float(bar["l"]),
-                    "close": float(bar["c"]),
-                    "volume": int(bar["v"]),
-                })
-
-            result = pd.DataFrame(rows)
-            result["ts_local"] = result["ts_utc"].dt.tz_convert(TZ_LOCAL)
-
-            self.bars_df = result
-            logger.info(f"Fetched {len(bars)} bars from ProjectX for {self.symbol} (cloud mode)")
-            return result
-
-        else:
-            # Local mode: Insert into database
-            for bar in bars:
-                self.insert_bar({
-                    "ts_utc": bar["t"],
-                    "open": float(bar["o"]),
-                    "high": float(bar["h"]),
-                    "low": float(bar["l"]),
-                    "close": float(bar["c"]),
-                    "volume": int(bar["v"]),
-                })
-
-            # Fetch from database to get standardized format
-            cutoff = datetime.now(TZ_UTC) - timedelta(minutes=lookback_minutes)
-            result = self.con.execute(f"""
-                SELECT ts_utc, open, high, low, close, volume
-                FROM live_bars
-                WHERE symbol = ? AND ts_utc >= ?
-                ORDER BY ts_utc
-            """, [self.symbol, cutoff]).fetchdf()
-
-            # Convert to local timezone for display
-            result["ts_local"] = pd.to_datetime(result["ts_utc"]).dt.tz_convert(TZ_LOCAL)
+        logger.info(f"Fetched {len(result)} bars from ProjectX for {self.symbol}")
+        return result
 
-            self.bars_df = result
-            logger.info(f"Fetched {len(bars)} bars from ProjectX for {self.symbol}")
-            return result
+    def _upsert_live_bars(self, bars: pd.DataFrame):
+        """Upsert bars (ts [epoch ms], OHLCV) into live_bars with one statement."""
+        if not len(bars):
+            return
+        frame = pd.DataFrame({
+            "ts_utc": pd.to_datetime(bars["ts"].to_numpy(), unit="ms", utc=True),
+            "symbol": self.symbol,
+            "open": bars["open"].to_numpy(),
+            "high": bars["high"].to_numpy(),
+            "low": bars["low"].to_numpy(),
+            "close": bars["close"].to_numpy(),
+            "volume": bars["volume"].to_numpy(),
+        })
+        self.con.register("live_bars_batch", frame)
+        try:
+            self.con.execute("""
+                INSERT OR REPLACE INTO live_bars
+                (ts_utc, symbol, open, high, low, close, volume)
+                SELECT ts_utc, symbol, open, high, low, close, volume FROM live_bars_batch
+            """)
+        finally:
+            self.con.unregister("live_bars_batch")
 
     def get_bars_in_range(self, start_local: datetime, end_local: datetime) -> pd.DataFrame:
         """
@@ -303,36 +493,29 @@ class LiveDataLoader:
         Returns:
             DataFrame of bars in range
         """
-        if self.bars_df.empty:
+        if not len(self.bars):
             self.fetch_latest_bars()
 
-        if self.bars_df.empty:
-            return pd.DataFrame()
-
-        # Convert to UTC for filtering
-        start_utc = start_local.astimezone(TZ_UTC)
-        end_utc = end_local.astimezone(TZ_UTC)
-
-        mask = (self.bars_df["ts_utc"] >= start_utc) & (self.bars_df["ts_utc"] < end_utc)
-        return self.bars_df[mask].copy()
+        return self.bars.to_frame(*self.bars.span(_epoch_ms(start_local), _epoch_ms(end_local)))
 
     def get_latest_bar(self) -> Optional[dict]:
         """Get the most recent bar."""
-        if self.bars_df.empty:
+        if not len(self.bars):
             self.fetch_latest_bars()
 
-        if self.bars_df.empty:
+        if not len(self.bars):
             return None
 
-        latest = self.bars_df.iloc[-1]
+        j = self.bars.start + self.bars.size - 1
+        ts_utc = pd.Timestamp(int(self.bars.ts[j]), unit="ms", tz="UTC")
         return {
-            "ts_utc": latest["ts_utc"],
-            "ts_local": latest["ts_local"],
-            "open": float(latest["open"]),
-            "high": float(latest["high"]),
-            "low": float(latest["low"]),
-            "close": float(latest["close"]),
-            "volume": int(latest["volume"]),
+            "ts_utc": ts_utc,
+            "ts_local": ts_utc.tz_convert(TZ_LOCAL),
+            "open": float(self.bars.open[j]),
+            "high": float(self.bars.high[j]),
+            "low": float(self.bars.low[j]),
+            "close": float(self.bars.close[j]),
+            "volume": int(self.bars.volume[j]),
         }
 
     def get_session_high_low(self, session_start: datetime, session_end: datetime) -> Optional[dict]:
@@ -346,14 +529,14 @@ class LiveDataLoader:
         Returns:
             {"high": float, "low": float, "range": float} or None
         """
-        bars = self.get_bars_in_range(session_start, session_end)
+        if not len(self.bars):
+            self.fetch_latest_bars()
 
-        if bars.empty:
+        high_low = self.bars.high_low(_epoch_ms(session_start), _epoch_ms(session_end))
+        if high_low is None:
             return None
 
-        high = float(bars["high"].max())
-        low = float(bars["low"].min())
-
+        high, low = high_low
         return {
             "high": high,
             "low": low,
@@ -374,22 +557,11 @@ class LiveDataLoader:
         if end_local is None:
             end_local = datetime.now(TZ_LOCAL)
 
-        bars = self.get_bars_in_range(start_local, end_local)
-
-        if bars.empty:
-            return None
-
-        # VWAP = sum(price * volume) / sum(volume)
-        bars["typical_price"] = (bars["high"] + bars["low"] + bars["close"]) / 3
-        bars["pv"] = bars["typical_price"] * bars["volume"]
-
-        total_pv = bars["pv"].sum()
-        total_volume = bars["volume"].sum()
-
-        if total_volume == 0:
-            return None
+        if not len(self.bars):
+            self.fetch_latest_bars()
 
-        return float(total_pv / total_volume)
+        # VWAP = sum(typical_price * volume) / sum(volume), from running totals
+        return self.bars.vwap(_epoch_ms(start_local), _epoch_ms(end_local))
 
     def insert_bar(self, bar: dict):
         """
@@ -458,18 +630,11 @@ class LiveDataLoader:
             """
             params = [cutoff]
 
-        bars = gold_con.execute(query, params).fetchall()
+        bars = gold_con.execute(query, params).fetchdf()
         logger.info(f"Found {len(bars)} bars to backfill from {table_name}")
 
-        for bar in bars:
-            self.insert_bar({
-                "ts_utc": bar[0],
-                "open": bar[1],
-                "high": bar[2],
-                "low": bar[3],
-                "close": bar[4],
-                "volume": bar[5],
-            })
+        bars["ts"] = pd.to_datetime(bars["ts_utc"], utc=True).dt.as_unit("ms").astype("int64")
+        self._upsert_live_bars(bars)
 
         if close_con:
             gold_con.close()
@@ -491,14 +656,10 @@ class LiveDataLoader:
             ATR value or None if not available
         """
         today = datetime.now(TZ_LOCAL).date()
+        if self._today_atr is not None and self._today_atr[0] == today:
+            return self._today_atr[1]
 
-        # Map symbol to instrument name
-        if self.symbol == "NQ" or self.symbol == "MNQ":
-            instrument = "NQ"
-        elif self.symbol == "MPL":
-            instrument = "MPL"
-        else:
-            instrument = "MGC"
+        instrument = self._instrument_name()
 
         # Use unified daily_features table with instrument column
         features_table = "daily_features"
@@ -516,7 +677,8 @@ class LiveDataLoader:
 
             if result and result[0] is not None:
                 gold_con.close()
-                return float(result[0])
+                self._today_atr = (today, float(result[0]))
+                return self._today_atr[1]
 
             # Try yesterday if today not available yet
             yesterday = today - timedelta(days=1)
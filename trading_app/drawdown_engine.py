@@ -479,6 +479,55 @@ def calculate_ghost_drawdown_effect(
     }
 
 
+def simulate_breach_risk(
+    request: DrawdownRequest,
+    risk_per_trade: float,
+    r_multiples=None,
+    win_rate: float | None = None,
+    payoff_ratio: float | None = None,
+    profit_target: float | None = None,
+    n_paths: int = 100_000,
+    n_trades: int = 100,
+    trades_per_day: int = 1,
+    seed: int | None = 42
+):
+    """
+    Monte Carlo breach risk from the account's current drawdown state.
+
+    Simulates n_paths sequences of n_trades (bootstrapped r_multiples, or
+    win_rate + payoff_ratio) starting at request.current_balance with the
+    floor calculate_drawdown() puts in force now. See monte_carlo_engine.
+
+    Args:
+        request: Current account state
+        risk_per_trade: Dollars per 1R
+        profit_target: Dollars above current_balance that end a path (optional)
+
+    Returns:
+        MonteCarloResult (breach_probability, time-to-breach, drawdown quantiles)
+    """
+    from trading_app.monte_carlo_engine import MonteCarloRequest, simulate_drawdown
+
+    current = calculate_drawdown(request)
+    return simulate_drawdown(MonteCarloRequest(
+        drawdown_model=request.drawdown_model,
+        starting_balance=request.starting_balance,
+        max_drawdown_size=request.max_drawdown_size,
+        risk_per_trade=risk_per_trade,
+        r_multiples=tuple(r_multiples) if r_multiples is not None else None,
+        win_rate=win_rate,
+        payoff_ratio=payoff_ratio,
+        current_balance=request.current_balance,
+        # Trailing models: the HWM implied by the floor currently in force
+        high_water_mark=current.drawdown_floor + request.max_drawdown_size,
+        profit_target=profit_target,
+        n_paths=n_paths,
+        n_trades=n_trades,
+        trades_per_day=trades_per_day,
+        seed=seed,
+    ))
+
+
 def validate_drawdown_consistency(
     request: DrawdownRequest,
     result: DrawdownResult
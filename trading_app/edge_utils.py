@@ -6,6 +6,8 @@ Provides deterministic edge_id hashing and CRUD operations for edge_registry tab
 
 import hashlib
 import json
+import math
+from collections import Counter, defaultdict
 from datetime import datetime, date
 from typing import Dict, List, Optional
 import duckdb
@@ -137,6 +139,7 @@ def create_candidate(
         datetime.now(),
         datetime.now()
     ])
+    index_edge_fingerprint(db_connection, edge_id, fingerprint)
 
     return edge_id, "Candidate created successfully!"
 
@@ -396,7 +399,7 @@ def run_real_validation(
     Returns:
         Dict with validation results
     """
-    from strategies.execution_engine import simulate_orb_trade, ExecutionMode
+    from strategies.execution_engine import simulate_orb_trade, simulate_orb_trades_batch, ExecutionMode
     from pipeline.cost_model import get_cost_model, calculate_realized_rr, calculate_expectancy
 
     # Extract edge parameters
@@ -441,8 +444,9 @@ def run_real_validation(
             'error': f'No data found for {instrument} {orb_time} ORB in test window'
         }
 
-    # Simulate trades
+    # Apply filters, then simulate the surviving dates in one batch
     trades = []
+    trade_dates = []
     skipped = {'size_filter': 0, 'direction_filter': 0, 'no_break': 0}
 
     for row in rows:
@@ -470,41 +474,50 @@ def run_real_validation(
             skipped['no_break'] += 1
             continue
 
-        # Simulate trade using execution_engine
-        try:
-            # Get cost model for instrument
-            cost_model = get_cost_model(instrument, stress_level='normal')
-
-            result = simulate_orb_trade(
-                con=db_connection,
-                date_local=trade_date,
-                orb=orb_time,
-                mode="1m",
-                confirm_bars=1,
-                rr=rr,
-                sl_mode=sl_mode,
-                apply_size_filter=False,  # Already applied above
-                exec_mode=ExecutionMode.MARKET_ON_CLOSE,
-                slippage_ticks=cost_model['slippage_ticks'],
-                commission_per_contract=cost_model['commission_rt'] / 2  # One side
-            )
+        trade_dates.append(trade_date)
 
-            if result.outcome in ('WIN', 'LOSS'):
-                trades.append({
-                    'date': str(trade_date),
-                    'outcome': result.outcome,
-                    'realized_rr': result.realized_rr if result.realized_rr is not None else result.r_multiple,  # Use realized_rr (with costs), fallback to theoretical
-                    'mae_r': result.mae_r,
-                    'mfe_r': result.mfe_r,
-                    'direction': result.direction,
-                    'cost_r': result.cost_r,
-                    'r_theoretical': result.r_multiple  # Keep theoretical for reference
-                })
-
-        except Exception as e:
-            # Log error but continue
-            print(f"Error simulating trade for {trade_date}: {e}")
-            continue
+    # Get cost model for instrument
+    cost_model = get_cost_model(instrument, stress_level='normal')
+    sim_kwargs = dict(
+        con=db_connection,
+        orb=orb_time,
+        mode="1m",
+        confirm_bars=1,
+        rr=rr,
+        sl_mode=sl_mode,
+        apply_size_filter=False,  # Already applied above
+        exec_mode=ExecutionMode.MARKET_ON_CLOSE,
+        slippage_ticks=cost_model['slippage_ticks'],
+        commission_per_contract=cost_model['commission_rt'] / 2  # One side
+    )
+
+    # Simulate all surviving dates at once using execution_engine
+    try:
+        simulated = list(zip(trade_dates, simulate_orb_trades_batch(dates=trade_dates, **sim_kwargs)))
+    except Exception as e:
+        # Batch failed: simulate date by date so only the failing dates are skipped
+        print(f"Error simulating trades for {instrument} {orb_time} in batch, retrying per date: {e}")
+        simulated = []
+        for trade_date in trade_dates:
+            try:
+                simulated.append((trade_date, simulate_orb_trade(date_local=trade_date, **sim_kwargs)))
+            except Exception as e:
+                # Log error but continue
+                print(f"Error simulating trade for {trade_date}: {e}")
+                continue
+
+    for trade_date, result in simulated:
+        if result.outcome in ('WIN', 'LOSS'):
+            trades.append({
+                'date': str(trade_date),
+                'outcome': result.outcome,
+                'realized_rr': result.realized_rr if result.realized_rr is not None else result.r_multiple,  # Use realized_rr (with costs), fallback to theoretical
+                'mae_r': result.mae_r,
+                'mfe_r': result.mfe_r,
+                'direction': result.direction,
+                'cost_r': result.cost_r,
+                'r_theoretical': result.r_multiple  # Keep theoretical for reference
+            })
 
     # Calculate metrics
     n_trades = len(trades)
@@ -1204,6 +1217,123 @@ def calculate_similarity_score(fingerprint1: str, fingerprint2: str) -> float:
     return len(intersection) / len(union)
 
 
+# Inverted index: one row per (fingerprint token, edge). Lookups only touch
+# edges sharing a token with the reference, and prefix filtering (rarest
+# tokens first) skips most of those before any Jaccard score is computed.
+SIMILARITY_INDEX_TABLE = "edge_similarity_index"
+
+SIMILARITY_COLUMNS = """
+    edge_id, similarity_fingerprint, instrument, orb_time,
+    direction, trigger_definition, rr, sl_mode, status,
+    last_tested_at, test_count
+"""
+
+
+def fingerprint_tokens(fingerprint: Optional[str]) -> set:
+    """Keyword set of a fingerprint (the sets calculate_similarity_score compares)"""
+    return set(fingerprint.split('|')) if fingerprint else set()
+
+
+def ensure_similarity_index(db_connection: duckdb.DuckDBPyConnection) -> bool:
+    """
+    Create the similarity index if missing, filling it from edge_registry
+
+    Returns:
+        False when the index cannot be created (read-only database)
+    """
+    try:
+        exists = db_connection.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+            [SIMILARITY_INDEX_TABLE]
+        ).fetchone()[0]
+        if exists:
+            return True
+        db_connection.execute(f"""
+            CREATE TABLE {SIMILARITY_INDEX_TABLE} (
+                token VARCHAR NOT NULL,
+                edge_id VARCHAR NOT NULL,
+                n_tokens INTEGER NOT NULL
+            )
+        """)
+        db_connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_similarity_token ON {SIMILARITY_INDEX_TABLE}(token)"
+        )
+        db_connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_similarity_edge ON {SIMILARITY_INDEX_TABLE}(edge_id)"
+        )
+    except duckdb.Error:
+        return False
+    rebuild_similarity_index(db_connection)
+    return True
+
+
+def rebuild_similarity_index(db_connection: duckdb.DuckDBPyConnection) -> int:
+    """
+    Rebuild the whole similarity index from edge_registry in one statement
+
+    Returns:
+        Number of indexed edges
+    """
+    db_connection.execute(f"DELETE FROM {SIMILARITY_INDEX_TABLE}")
+    db_connection.execute(f"""
+        INSERT INTO {SIMILARITY_INDEX_TABLE}
+        SELECT token, edge_id, len(tokens)
+        FROM (
+            SELECT edge_id, list_distinct(string_split(similarity_fingerprint, '|')) AS tokens
+            FROM edge_registry
+            WHERE similarity_fingerprint IS NOT NULL AND similarity_fingerprint != ''
+        ), unnest(tokens) AS t(token)
+    """)
+    return db_connection.execute(
+        f"SELECT COUNT(DISTINCT edge_id) FROM {SIMILARITY_INDEX_TABLE}"
+    ).fetchone()[0]
+
+
+def index_edge_fingerprint(
+    db_connection: duckdb.DuckDBPyConnection,
+    edge_id: str,
+    fingerprint: Optional[str]
+) -> None:
+    """Replace the index entries of one edge (call after writing its fingerprint)"""
+    if not ensure_similarity_index(db_connection):
+        return
+    db_connection.execute(f"DELETE FROM {SIMILARITY_INDEX_TABLE} WHERE edge_id = ?", [edge_id])
+    tokens = fingerprint_tokens(fingerprint)
+    if tokens:
+        db_connection.execute(
+            f"INSERT INTO {SIMILARITY_INDEX_TABLE} SELECT unnest(?::VARCHAR[]), ?, ?",
+            [sorted(tokens), edge_id, len(tokens)]
+        )
+
+
+def _prefix_length(n_tokens: int, min_similarity: float) -> int:
+    """
+    Tokens of a set that any set with Jaccard >= min_similarity must share one of
+
+    Jaccard >= t needs an overlap of at least ceil(t * n) tokens, so some
+    token among the first n - ceil(t * n) + 1 (in any fixed order) is shared.
+    """
+    return n_tokens - math.ceil(min_similarity * n_tokens - 1e-9) + 1
+
+
+def _similar_edge_dict(row, score: float) -> Dict:
+    edge_id_cmp, _, instrument, orb_time, direction, \
+        trigger, rr, sl_mode, status, last_tested, test_count = row
+    return {
+        'edge_id': edge_id_cmp,
+        'similarity_score': score,
+        'instrument': instrument,
+        'orb_time': orb_time,
+        'direction': direction,
+        'trigger_definition': trigger,
+        'rr': rr,
+        'sl_mode': sl_mode,
+        'status': status,
+        'last_tested_at': last_tested,
+        'test_count': test_count
+    }
+
+
 def find_similar_edges(
     db_connection: duckdb.DuckDBPyConnection,
     edge_id: str,
@@ -1213,6 +1343,11 @@ def find_similar_edges(
     """
     Find edges similar to the given edge
 
+    Candidates come from the similarity index (edges sharing one of the
+    reference's rarest tokens, with a compatible token count); only those
+    are scored. Falls back to scoring every edge when min_similarity <= 0
+    or the index is unavailable.
+
     Args:
         edge_id: The edge to compare against
         min_similarity: Minimum similarity score (0.0-1.0)
@@ -1223,13 +1358,10 @@ def find_similar_edges(
     """
 
     # Get the reference edge
-    ref_edge = db_connection.execute("""
-        SELECT edge_id, similarity_fingerprint, instrument, orb_time,
-               direction, trigger_definition, rr, sl_mode, status,
-               last_tested_at, test_count
-        FROM edge_registry
-        WHERE edge_id = ?
-    """, [edge_id]).fetchone()
+    ref_edge = db_connection.execute(
+        f"SELECT {SIMILARITY_COLUMNS} FROM edge_registry WHERE edge_id = ?",
+        [edge_id]
+    ).fetchone()
 
     if not ref_edge:
         return []
@@ -1238,40 +1370,97 @@ def find_similar_edges(
     if not ref_fingerprint:
         return []
 
-    # Get all other edges
-    all_edges = db_connection.execute("""
-        SELECT edge_id, similarity_fingerprint, instrument, orb_time,
-               direction, trigger_definition, rr, sl_mode, status,
-               last_tested_at, test_count
-        FROM edge_registry
-        WHERE edge_id != ?
-          AND similarity_fingerprint IS NOT NULL
-    """, [edge_id]).fetchall()
+    if min_similarity <= 0 or not ensure_similarity_index(db_connection):
+        # Every edge qualifies (or no index): score all other edges
+        candidates = db_connection.execute(f"""
+            SELECT {SIMILARITY_COLUMNS}
+            FROM edge_registry
+            WHERE edge_id != ?
+              AND similarity_fingerprint IS NOT NULL
+        """, [edge_id]).fetchall()
+    else:
+        tokens = sorted(fingerprint_tokens(ref_fingerprint))
+        placeholders = ', '.join('?' for _ in tokens)
+        token_counts = dict(db_connection.execute(f"""
+            SELECT token, COUNT(*) FROM {SIMILARITY_INDEX_TABLE}
+            WHERE token IN ({placeholders})
+            GROUP BY token
+        """, tokens).fetchall())
+        rarest = sorted(tokens, key=lambda t: (token_counts.get(t, 0), t))
+        prefix = rarest[:_prefix_length(len(tokens), min_similarity)]
+
+        candidates = db_connection.execute(f"""
+            SELECT {SIMILARITY_COLUMNS}
+            FROM edge_registry
+            WHERE edge_id IN (
+                SELECT edge_id FROM {SIMILARITY_INDEX_TABLE}
+                WHERE token IN ({', '.join('?' for _ in prefix)})
+                  AND n_tokens BETWEEN ? AND ?
+            )
+              AND edge_id != ?
+              AND similarity_fingerprint IS NOT NULL
+        """, [*prefix, min_similarity * len(tokens) - 1e-9,
+              len(tokens) / min_similarity + 1e-9, edge_id]).fetchall()
 
     # Calculate similarities
     results = []
-    for edge in all_edges:
-        edge_id_cmp, fingerprint, instrument, orb_time, direction, \
-            trigger, rr, sl_mode, status, last_tested, test_count = edge
-
-        score = calculate_similarity_score(ref_fingerprint, fingerprint)
-
+    for edge in candidates:
+        score = calculate_similarity_score(ref_fingerprint, edge[1])
         if score >= min_similarity:
-            results.append({
-                'edge_id': edge_id_cmp,
-                'similarity_score': score,
-                'instrument': instrument,
-                'orb_time': orb_time,
-                'direction': direction,
-                'trigger_definition': trigger,
-                'rr': rr,
-                'sl_mode': sl_mode,
-                'status': status,
-                'last_tested_at': last_tested,
-                'test_count': test_count
-            })
+            results.append(_similar_edge_dict(edge, score))
 
     # Sort by similarity descending
-    results.sort(key=lambda x: x['similarity_score'], reverse=True)
+    results.sort(key=lambda x: (-x['similarity_score'], x['edge_id']))
 
     return results[:limit]
+
+
+def find_near_duplicate_pairs(
+    db_connection: duckdb.DuckDBPyConnection,
+    min_similarity: float = 0.8
+) -> List[Dict]:
+    """
+    Find every pair of edges in the registry with similarity >= min_similarity
+
+    All-pairs prefix filtering: edges are visited smallest fingerprint first
+    and only compared with earlier edges that share a token from the rarest-
+    first prefix, so common tokens (instrument, SL mode) never generate pairs.
+
+    Returns:
+        List of {'edge_id_a', 'edge_id_b', 'similarity_score'}, sorted by
+        score descending
+    """
+    if not 0 < min_similarity <= 1:
+        raise ValueError(f"min_similarity must be in (0, 1], got {min_similarity}")
+
+    rows = db_connection.execute("""
+        SELECT edge_id, similarity_fingerprint
+        FROM edge_registry
+        WHERE similarity_fingerprint IS NOT NULL AND similarity_fingerprint != ''
+    """).fetchall()
+
+    token_sets = {edge_id: fingerprint_tokens(fingerprint) for edge_id, fingerprint in rows}
+    token_counts = Counter(token for tokens in token_sets.values() for token in tokens)
+
+    postings = defaultdict(list)  # prefix token -> edges visited so far
+    pairs = []
+    for edge_id in sorted(token_sets, key=lambda e: (len(token_sets[e]), e)):
+        tokens = token_sets[edge_id]
+        rarest = sorted(tokens, key=lambda t: (token_counts[t], t))
+        prefix = rarest[:_prefix_length(len(tokens), min_similarity)]
+
+        seen = set()
+        for token in prefix:
+            for other in postings[token]:
+                if other in seen or len(token_sets[other]) < min_similarity * len(tokens) - 1e-9:
+                    continue
+                seen.add(other)
+                score = len(tokens & token_sets[other]) / len(tokens | token_sets[other])
+                if score >= min_similarity:
+                    first, second = sorted((other, edge_id))
+                    pairs.append({'edge_id_a': first, 'edge_id_b': second, 'similarity_score': score})
+        for token in prefix:
+            postings[token].append(edge_id)
+
+    pairs.sort(key=lambda p: (-p['similarity_score'], p['edge_id_a'], p['edge_id_b']))
+    return pairs
@@ -0,0 +1,510 @@
+"""
+Intraday ORB Engine - Streaming ORB state for live evaluation
+
+daily_features only has today's row after a feature rebuild, so live views
+either showed stale ORBs or forced a rebuild. This engine is fed one completed
+1-minute bar at a time (LiveDataLoader does this on every fetch) and keeps
+O(1) state per bar for the trade date:
+
+- all six ORB boxes (high/low/size)
+- STRUCTURAL model: first close outside, break direction, ORB-anchored
+  stop/target, outcome and MAE/MFE (calculate_orb_1m_exec)
+- TRADEABLE model: signal close, entry at next 1m open, entry-anchored
+  stop/target, outcome and realized RR from cost_model
+  (calculate_orb_1m_tradeable)
+- session highs/lows (pre_asia ... ny) and the asia/london/pre_ny type codes
+
+The rules are the ones in pipeline/build_daily_features.py: ORB = first 5
+minutes, scan until D+1 09:00, outcome checked from the bar after entry,
+same-bar stop+target = LOSS, cost-downgraded WIN = LOSS. At any point the
+results equal the batch calculators run over the bars seen so far.
+
+Trade date D covers D 07:00 -> D+1 09:00 local (Brisbane), so the 07:00-09:00
+bars feed both D (still scanning) and D+1 (pre_asia).
+
+Usage:
+    engine = IntradayOrbEngine(instrument='MGC')
+    engine.feed(bars_df)                  # ts_utc, open, high, low, close, volume
+    engine.on_bar({'ts_utc': ts, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v})
+
+    day = engine.day()                    # latest trade date
+    day.orbs['1000'].tradeable_result()   # == calculate_orb_1m_tradeable(...)
+    day.orb_snapshot('1000', atr_20=atr)  # LiveScanner orb_data entry
+"""
+
+import numbers
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+
+# Add repo root for pipeline imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.dirname(current_dir)
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from pipeline.build_daily_features import (
+    ORB_TIMES, RR_DEFAULT, SESSION_WINDOWS, SL_MODE, TZ_LOCAL, FeatureBuilder,
+    _dt_local, _epoch_ms,
+)
+from pipeline.cost_model import calculate_realized_rr
+
+ORB_MINUTES = 5
+BAR_MS = 60_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_ms(ts) -> int:
+    """Bar timestamp (epoch ms, aware datetime / pd.Timestamp; naive = UTC) -> epoch ms."""
+    if isinstance(ts, numbers.Integral):
+        return int(ts)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // timedelta(milliseconds=1)
+
+
+def trade_date_for(ts_ms: int) -> date:
+    """Trade date a bar opens: D 07:00 -> D+1 07:00 local belongs to D."""
+    local = datetime.fromtimestamp(ts_ms / 1000, TZ_LOCAL)
+    return (local - timedelta(hours=7)).date()
+
+
+class SessionRange:
+    """Running high/low/volume of one session window [start, end)."""
+
+    def __init__(self, name: str, start_ms: int, end_ms: int):
+        self.name = name
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.high: Optional[float] = None
+        self.low: Optional[float] = None
+        self.volume = 0
+
+    def on_bar(self, ts: int, high: float, low: float, volume: int) -> None:
+        if not self.start_ms <= ts < self.end_ms:
+            return
+        self.high = high if self.high is None else max(self.high, high)
+        self.low = low if self.low is None else min(self.low, low)
+        self.volume += int(volume)
+
+    def stats(self) -> Optional[Dict]:
+        """Same shape as FeatureBuilder session stats (None until a bar arrives)."""
+        if self.high is None:
+            return None
+        rng = self.high - self.low
+        return {
+            "high": self.high,
+            "low": self.low,
+            "range": rng,
+            "range_ticks": rng / 0.1,
+            "volume": self.volume,
+        }
+
+
+class OrbStateMachine:
+    """
+    One ORB for one trade date, advanced bar by bar.
+
+    Bars must arrive in time order; bars outside [ORB start, scan end) are
+    ignored. exec_result()/tradeable_result() can be read at any time.
+    """
+
+    def __init__(self, name: str, start_ms: int, scan_end_ms: int,
+                 rr: float = RR_DEFAULT, sl_mode: str = SL_MODE, instrument: str = 'MGC'):
+        self.name = name
+        self.start_ms = start_ms
+        self.orb_end_ms = start_ms + ORB_MINUTES * BAR_MS
+        self.scan_end_ms = scan_end_ms
+        self.rr = rr
+        self.sl_mode = sl_mode
+        self.instrument = instrument
+
+        # Box
+        self.high: Optional[float] = None
+        self.low: Optional[float] = None
+        self.bars_after = 0
+
+        # Signal (first close outside), shared by both models
+        self.break_dir = "NONE"
+        self.signal_close: Optional[float] = None
+        self.signal_ts: Optional[int] = None
+
+        # STRUCTURAL (ORB-anchored)
+        self.exec_stop: Optional[float] = None
+        self.exec_risk: Optional[float] = None
+        self.exec_target: Optional[float] = None
+        self.exec_outcome: Optional[str] = None
+        self.max_adverse = float("-inf")
+        self.max_favorable = float("-inf")
+
+        # TRADEABLE (entry-anchored)
+        self.entry_price: Optional[float] = None
+        self.entry_ts: Optional[int] = None
+        self.stop_price: Optional[float] = None
+        self.risk_points: Optional[float] = None
+        self.target_price: Optional[float] = None
+        self.realized: Optional[Dict] = None
+        self.outcome: Optional[str] = None
+
+    # ---------- feed ----------
+
+    def on_bar(self, ts: int, open_: float, high: float, low: float, close: float) -> None:
+        if ts < self.start_ms or ts >= self.scan_end_ms:
+            return
+
+        if ts < self.orb_end_ms:
+            if self.bars_after:
+                return  # late ORB bar after the scan started
+            self.high = high if self.high is None else max(self.high, high)
+            self.low = low if self.low is None else min(self.low, low)
+            return
+
+        if self.high is None:
+            return  # no ORB data: both calculators return None
+        self.bars_after += 1
+
+        if self.signal_close is None:
+            if close > self.high or close < self.low:
+                self._on_signal(ts, close)
+            return
+
+        self._scan_exec(high, low)
+        if self.entry_price is None:
+            self._on_entry(ts, open_)
+        else:
+            self._scan_tradeable(high, low)
+
+    def _on_signal(self, ts: int, close: float) -> None:
+        self.signal_ts = ts
+        self.signal_close = close
+        self.break_dir = "UP" if close > self.high else "DOWN"
+
+        # GUARDRAIL: Entry at close, never at the ORB edge
+        assert close != self.high and close != self.low, "FATAL: Entry at ORB edge (should be at close)"
+
+        orb_edge = self.high if self.break_dir == "UP" else self.low
+        if self.sl_mode == "full":
+            self.exec_stop = self.low if self.break_dir == "UP" else self.high
+        else:  # half
+            self.exec_stop = (self.high + self.low) / 2.0
+        self.exec_risk = abs(orb_edge - self.exec_stop)
+        if self.exec_risk <= 0:
+            self.exec_outcome = "NO_TRADE"
+            return
+        if self.break_dir == "UP":
+            self.exec_target = orb_edge + self.rr * self.exec_risk
+        else:
+            self.exec_target = orb_edge - self.rr * self.exec_risk
+
+    def _scan_exec(self, high: float, low: float) -> None:
+        if self.exec_outcome is not None:
+            return
+        if self.break_dir == "UP":
+            orb_edge = self.high
+            hit_stop, hit_target = low <= self.exec_stop, high >= self.exec_target
+            adverse, favorable = orb_edge - low, high - orb_edge
+        else:
+            orb_edge = self.low
+            hit_stop, hit_target = high >= self.exec_stop, low <= self.exec_target
+            adverse, favorable = high - orb_edge, orb_edge - low
+
+        # MAE/MFE accumulate up to and including the exit bar
+        self.max_adverse = max(self.max_adverse, adverse)
+        self.max_favorable = max(self.max_favorable, favorable)
+        if hit_stop or hit_target:
+            # Both hit in same bar = LOSS (conservative)
+            self.exec_outcome = "LOSS" if hit_stop else "WIN"
+
+    def _on_entry(self, ts: int, open_: float) -> None:
+        # B-entry: NEXT 1m OPEN after the signal close
+        self.entry_ts = ts
+        self.entry_price = open_
+        if self.sl_mode == "full":
+            self.stop_price = self.low if self.break_dir == "UP" else self.high
+        else:  # half
+            self.stop_price = (self.high + self.low) / 2.0
+        self.risk_points = abs(open_ - self.stop_price)
+
+        if self.risk_points <= 0:
+            self.risk_points = 0.0
+            self.outcome = "NO_TRADE"
+            return
+
+        if self.break_dir == "UP":
+            self.target_price = open_ + (self.rr * self.risk_points)
+        else:
+            self.target_price = open_ - (self.rr * self.risk_points)
+
+        try:
+            self.realized = calculate_realized_rr(
+                instrument=self.instrument,
+                stop_distance_points=self.risk_points,
+                rr_theoretical=self.rr,
+                stress_level='normal'
+            )
+        except Exception:
+            self.realized = None
+
+    def _scan_tradeable(self, high: float, low: float) -> None:
+        if self.outcome is not None:
+            return
+        if self.break_dir == "UP":
+            hit_stop, hit_target = low <= self.stop_price, high >= self.target_price
+        else:
+            hit_stop, hit_target = high >= self.stop_price, low <= self.target_price
+        if hit_stop or hit_target:
+            # Both hit in same bar = LOSS (conservative)
+            self.outcome = "LOSS" if hit_stop else "WIN"
+
+    # ---------- read ----------
+
+    def is_formed(self, now_ms: int) -> bool:
+        """ORB window closed (by the clock) and at least one ORB bar seen."""
+        return now_ms >= self.orb_end_ms and self.high is not None
+
+    def status(self, now_ms: int) -> str:
+        """PENDING / FORMING / NO_DATA / WAITING / SIGNAL / ACTIVE / WIN / LOSS / NO_TRADE / CLOSED."""
+        if now_ms < self.start_ms:
+            return "PENDING"
+        if now_ms < self.orb_end_ms:
+            return "FORMING"
+        if self.high is None:
+            return "NO_DATA"
+        if self.signal_close is None:
+            return "CLOSED" if now_ms >= self.scan_end_ms else "WAITING"
+        if self.entry_price is None:
+            return "SIGNAL"
+        if self.outcome is None:
+            return "ACTIVE"
+        return self.tradeable_result()["outcome"]
+
+    def box(self) -> Optional[Dict]:
+        if self.high is None:
+            return None
+        return {"high": self.high, "low": self.low, "size": self.high - self.low}
+
+    def exec_result(self) -> Optional[Dict]:
+        """Structural result; equals calculate_orb_1m_exec over the bars seen so far."""
+        if self.high is None:
+            return None
+        result = {
+            "high": self.high, "low": self.low, "size": self.high - self.low,
+            "break_dir": self.break_dir, "outcome": "NO_TRADE", "r_multiple": None,
+            "mae": None, "mfe": None,
+            "stop_price": None, "risk_ticks": None
+        }
+        if self.signal_close is None:
+            return result
+
+        result["stop_price"] = self.exec_stop
+        if self.exec_risk <= 0:
+            result["risk_ticks"] = 0.0
+            return result
+        result["risk_ticks"] = self.exec_risk / 0.1
+
+        mae_raw = max(0.0, self.max_adverse)
+        mfe_raw = max(0.0, self.max_favorable)
+        if self.exec_outcome is None:
+            result["mae"] = (mae_raw / self.exec_risk) if mae_raw > 0 else None
+            result["mfe"] = (mfe_raw / self.exec_risk) if mfe_raw > 0 else None
+            return result
+
+        result.update(
+            outcome=self.exec_outcome,
+            r_multiple=float(self.rr) if self.exec_outcome == "WIN" else -1.0,
+            mae=mae_raw / self.exec_risk,
+            mfe=mfe_raw / self.exec_risk,
+        )
+        return result
+
+    def tradeable_result(self) -> Optional[Dict]:
+        """Tradeable result; equals calculate_orb_1m_tradeable over the bars seen so far."""
+        if self.high is None:
+            return None
+        result = {
+            "entry_price": None,
+            "stop_price": None,
+            "risk_points": None,
+            "target_price": None,
+            "outcome": "NO_TRADE",
+            "realized_rr": None,
+            "realized_risk_dollars": None,
+            "realized_reward_dollars": None
+        }
+        if self.signal_close is None:
+            return result
+        if self.entry_price is None:
+            return dict(result, outcome="OPEN")
+
+        result.update(entry_price=self.entry_price, stop_price=self.stop_price, risk_points=self.risk_points)
+        if self.risk_points <= 0:
+            return result
+
+        realized_rr_win = self.realized['realized_rr'] if self.realized else None
+        outcome = self.outcome or "OPEN"
+        if outcome == "WIN":
+            # Costs can downgrade a WIN to a LOSS (realized RR is kept)
+            if realized_rr_win is not None and realized_rr_win <= 0:
+                outcome = "LOSS"
+            result["realized_rr"] = realized_rr_win
+        elif outcome == "LOSS":
+            result["realized_rr"] = -1.0
+        result.update(
+            target_price=self.target_price,
+            outcome=outcome,
+            realized_risk_dollars=self.realized['realized_risk_dollars'] if self.realized else None,
+            realized_reward_dollars=self.realized['realized_reward_dollars'] if self.realized else None,
+        )
+        return result
+
+
+class TradeDayState:
+    """Sessions and all six ORBs for one trade date (D 07:00 -> D+1 09:00)."""
+
+    def __init__(self, trade_date: date, rr: float = RR_DEFAULT, sl_mode: str = SL_MODE,
+                 instrument: str = 'MGC'):
+        self.trade_date = trade_date
+        self.start_ms = _epoch_ms(_dt_local(trade_date, 7, 0))
+        # All ORBs scan until next Asia open (09:00 next day), as in build_daily_features
+        self.end_ms = _epoch_ms(_dt_local(trade_date + timedelta(days=1), 9, 0))
+
+        self.sessions: Dict[str, SessionRange] = {}
+        for name, (sh, sm, sd), (eh, em, ed) in SESSION_WINDOWS:
+            self.sessions[name] = SessionRange(
+                name,
+                _epoch_ms(_dt_local(trade_date + timedelta(days=sd), sh, sm)),
+                _epoch_ms(_dt_local(trade_date + timedelta(days=ed), eh, em)),
+            )
+
+        self.orbs: Dict[str, OrbStateMachine] = {}
+        for orb_name, hh, mm, day_offset in ORB_TIMES:
+            start_ms = _epoch_ms(_dt_local(trade_date + timedelta(days=day_offset), hh, mm))
+            self.orbs[orb_name] = OrbStateMachine(orb_name, start_ms, self.end_ms, rr, sl_mode, instrument)
+
+    def on_bar(self, ts: int, open_: float, high: float, low: float, close: float, volume: int) -> None:
+        if not self.start_ms <= ts < self.end_ms:
+            return
+        for session in self.sessions.values():
+            session.on_bar(ts, high, low, volume)
+        for orb in self.orbs.values():
+            orb.on_bar(ts, open_, high, low, close)
+
+    def session_stats(self, name: str) -> Optional[Dict]:
+        return self.sessions[name].stats()
+
+    def type_codes(self, atr_20: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """asia/london/pre_ny type codes from the sessions seen so far."""
+        asia = self.session_stats("asia") or {}
+        london = self.session_stats("london") or {}
+        pre_ny = self.session_stats("pre_ny") or {}
+        return {
+            "asia_type_code": FeatureBuilder.classify_asia_code(asia.get("range"), atr_20),
+            "london_type_code": FeatureBuilder.classify_london_code(
+                london.get("high"), london.get("low"), asia.get("high"), asia.get("low"),
+            ),
+            "pre_ny_type_code": FeatureBuilder.classify_pre_ny_code(
+                pre_ny.get("high"), pre_ny.get("low"), london.get("high"), london.get("low"),
+                asia.get("high"), asia.get("low"), atr_20,
+            ),
+        }
+
+    def orb_snapshot(self, orb_name: str, atr_20: Optional[float] = None) -> Optional[Dict]:
+        """ORB box, break direction and tradeable levels (LiveScanner orb_data shape)."""
+        orb = self.orbs[orb_name]
+        structural = orb.exec_result()
+        if structural is None:
+            return None
+        tradeable = orb.tradeable_result()
+        return {
+            'high': structural['high'],
+            'low': structural['low'],
+            'size': structural['size'],
+            'size_norm': structural['size'] / atr_20 if atr_20 and atr_20 > 0 else None,
+            'break_dir': structural['break_dir'],
+            'atr': atr_20,
+            'entry_price': tradeable['entry_price'],
+            'stop_price': tradeable['stop_price'],
+            'target_price': tradeable['target_price'],
+            'outcome': tradeable['outcome'],
+            'mae': structural['mae'],
+            'mfe': structural['mfe'],
+        }
+
+
+class IntradayOrbEngine:
+    """
+    Streaming ORB/session state, fed completed 1m bars in time order.
+
+    Keeps the latest trade date plus the previous one (still scanning until
+    09:00); duplicate or out-of-order bars are ignored.
+    """
+
+    def __init__(self, instrument: str = 'MGC', rr: float = RR_DEFAULT, sl_mode: str = SL_MODE,
+                 atr_20: Optional[float] = None):
+        self.instrument = instrument
+        self.rr = rr
+        self.sl_mode = sl_mode
+        self.atr_20 = atr_20
+        self.days: Dict[date, TradeDayState] = {}
+        self.last_ts: Optional[int] = None
+        self.last_close: Optional[float] = None
+
+    @property
+    def now_ms(self) -> Optional[int]:
+        """Engine clock: end of the last bar seen."""
+        return None if self.last_ts is None else self.last_ts + BAR_MS
+
+    def on_bar(self, bar: Dict) -> bool:
+        """Advance by one completed 1m bar. Returns False if the bar was already seen."""
+        ts = to_epoch_ms(bar["ts_utc"])
+        if self.last_ts is not None and ts <= self.last_ts:
+            return False
+
+        trade_date = trade_date_for(ts)
+        if trade_date not in self.days:
+            self.days[trade_date] = TradeDayState(trade_date, self.rr, self.sl_mode, self.instrument)
+            for old in [d for d in self.days if d < trade_date - timedelta(days=1)]:
+                del self.days[old]
+
+        open_, high, low, close = (float(bar[k]) for k in ("open", "high", "low", "close"))
+        volume = bar.get("volume")
+        volume = 0 if volume is None or volume != volume else volume  # NULL/NaN volume counts as 0
+        for day in self.days.values():
+            day.on_bar(ts, open_, high, low, close, volume)
+
+        self.last_ts = ts
+        self.last_close = close
+        return True
+
+    def feed(self, bars) -> int:
+        """Feed a bars DataFrame (ts_utc, open, high, low, close, volume). Returns bars consumed."""
+        if bars is None or len(bars) == 0:
+            return 0
+        consumed = 0
+        volume = bars["volume"] if "volume" in bars else [0] * len(bars)
+        for ts, o, h, l, c, v in zip(bars["ts_utc"], bars["open"], bars["high"],
+                                     bars["low"], bars["close"], volume):
+            consumed += self.on_bar({"ts_utc": ts, "open": o, "high": h, "low": l, "close": c, "volume": v})
+        return consumed
+
+    def day(self, trade_date: Optional[date] = None) -> Optional[TradeDayState]:
+        """State for trade_date (default: the latest trade date seen)."""
+        if trade_date is None:
+            return self.days[max(self.days)] if self.days else None
+        return self.days.get(trade_date)
+
+    def orb(self, orb_name: str, trade_date: Optional[date] = None) -> Optional[OrbStateMachine]:
+        day = self.day(trade_date)
+        return day.orbs[orb_name] if day else None
+
+    def orb_data(self, trade_date: Optional[date] = None) -> Dict[str, Dict]:
+        """Snapshots of every ORB formed by the engine clock ({orb_name: snapshot})."""
+        day = self.day(trade_date)
+        if day is None:
+            return {}
+        return {
+            name: day.orb_snapshot(name, self.atr_20)
+            for name, orb in day.orbs.items()
+            if orb.is_formed(self.now_ms)
+        }
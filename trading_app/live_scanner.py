@@ -12,25 +12,35 @@ Usage:
 
     for setup in active_setups:
         print(f"{setup['edge_id']}: {setup['status']} - {setup['reason']}")
+
+    # Live ORB state from streamed bars instead of today's daily_features row
+    scanner = LiveScanner(db_connection, orb_engine=data_loader.orb_engine)
 """
 
 import duckdb
 from typing import Dict, List, Optional
 from datetime import datetime, date, time, timedelta
 import json
+from zoneinfo import ZoneInfo
+
+BRISBANE_TZ = ZoneInfo("Australia/Brisbane")
 
 
 class LiveScanner:
     """Real-time market scanner for validated edges"""
 
-    def __init__(self, db_connection: duckdb.DuckDBPyConnection):
+    def __init__(self, db_connection: duckdb.DuckDBPyConnection, orb_engine=None):
         self.conn = db_connection
+        self.orb_engine = orb_engine  # Optional IntradayOrbEngine (streamed live bars)
         self._condition_cache = {}  # Cache promoted conditions
 
     def get_current_market_state(self, instrument: str = 'MGC') -> Dict:
         """
         Get current market state for instrument
 
+        With an orb_engine that has seen bars, ORB data comes from the streamed
+        bars (no daily_features query); otherwise from today's daily_features row.
+
         Returns:
             Dict with:
             - date_local: Today's date
@@ -38,6 +48,9 @@ class LiveScanner:
             - available_orbs: List of ORBs that have completed
             - orb_data: Dict of ORB sizes and directions for completed ORBs
         """
+        if self.orb_engine is not None and self.orb_engine.day() is not None:
+            return self._market_state_from_engine(instrument)
+
         now_local = datetime.now()  # Assumes system is in Brisbane timezone
         today_date = now_local.date()
         current_time = now_local.time()
@@ -117,6 +130,22 @@ class LiveScanner:
             'instrument': instrument
         }
 
+    def _market_state_from_engine(self, instrument: str) -> Dict:
+        """Market state from the streaming ORB engine (engine clock = end of last bar)."""
+        engine = self.orb_engine
+        day = engine.day()
+        orb_data = engine.orb_data()
+        if engine.atr_20 is not None:
+            orb_data['atr_20'] = engine.atr_20
+
+        return {
+            'date_local': day.trade_date,
+            'current_time_local': datetime.fromtimestamp(engine.now_ms / 1000, BRISBANE_TZ).time(),
+            'available_orbs': [orb for orb in day.orbs if orb in orb_data],
+            'orb_data': orb_data,
+            'instrument': instrument
+        }
+
     def _load_promoted_conditions(self, edge_id: str) -> Optional[Dict]:
         """
         Load promoted condition rules for an edge
@@ -31,9 +31,10 @@ from trading_app.config import (
 class MarketScanner:
     """Real-time market scanner and setup validator"""
 
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(self, db_path: str = DB_PATH, orb_engine=None):
         self.db_path = db_path
         self.tz_local = TZ_LOCAL
+        self.orb_engine = orb_engine  # Optional IntradayOrbEngine (streamed live bars)
 
         # Statistical thresholds (from historical data)
         # These will be calculated from daily_features, or use defaults
@@ -102,7 +103,16 @@ class MarketScanner:
         - rsi_at_0030 (for RSI filter)
         - Liquidity state
         - Contract days to roll
+
+        With an orb_engine that has seen bars for the trade date, sessions and
+        ORBs come from the streamed bars (no daily_features query; rsi_at_0030
+        is None because the engine does not track 5m RSI).
         """
+        if self.orb_engine is not None:
+            day = self.orb_engine.day(date_local)
+            if day is not None:
+                return self._conditions_from_engine(day)
+
         if date_local is None:
             date_local = datetime.now(self.tz_local).date()
 
@@ -194,6 +204,33 @@ class MarketScanner:
             print(f"Error getting today's conditions: {e}")
             return {'date_local': date_local, 'data_available': False}
 
+    def _conditions_from_engine(self, day) -> Dict:
+        """get_today_conditions shape from a TradeDayState of the streaming ORB engine."""
+        asia = day.session_stats('asia') or {}
+        london = day.session_stats('london') or {}
+        orb_data = self.orb_engine.orb_data(day.trade_date)
+
+        return {
+            'date_local': day.trade_date,
+            'data_available': True,
+            'asia_high': asia.get('high'),
+            'asia_low': asia.get('low'),
+            'asia_travel': asia.get('range'),
+            'london_high': london.get('high'),
+            'london_low': london.get('low'),
+            'london_type_code': day.type_codes(self.orb_engine.atr_20)['london_type_code'],
+            'rsi_at_0030': None,
+            'orb_sizes': {
+                orb_time: orb_data[orb_time]['size'] if orb_time in orb_data else None
+                for orb_time in day.orbs
+            },
+            'orb_broken': {
+                orb_time: orb_time in orb_data and orb_data[orb_time]['break_dir'] != 'NONE'
+                for orb_time in day.orbs
+            },
+            'london_reversals': None,  # Not yet in schema
+        }
+
     def check_orb_size_anomaly(self, orb_time: str, orb_size: float) -> Dict:
         """
         Check if ORB size is anomalous (too large = trap, too small = low probability).
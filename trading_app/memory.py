@@ -42,6 +42,10 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 
 from trading_app.config import DB_PATH, TZ_LOCAL
+from trading_app.text_index import TextIndex
+
+# BM25 index over trade_journal.lesson_learned (see search_lessons)
+LESSON_INDEX = TextIndex("trade_journal_lessons")
 
 
 class TradingMemory:
@@ -144,7 +148,7 @@ class TradingMemory:
 
         # Insert trade
         try:
-            conn.execute("""
+            trade_id = conn.execute("""
                 INSERT INTO trade_journal (
                     date_local, orb_time, instrument, outcome, r_multiple,
                     entry_price, exit_price, mae, mfe,
@@ -152,12 +156,15 @@ class TradingMemory:
                     session_context, lesson_learned, notable
                 )
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
             """, [
                 date_local, orb_time, instrument, outcome, r_multiple,
                 entry_price, exit_price, mae, mfe,
                 asia_travel, london_reversals, pre_orb_travel, liquidity_state,
                 session_context_json, lesson_learned, notable
-            ])
+            ]).fetchone()[0]
+            LESSON_INDEX.ensure_schema(conn)
+            LESSON_INDEX.add(conn, trade_id, lesson_learned)
             conn.close()
             return True
         except Exception as e:
@@ -223,6 +230,55 @@ class TradingMemory:
 
         return trades
 
+    def search_lessons(
+        self,
+        query: str,
+        instrument: Optional[str] = None,
+        orb_time: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Search lessons learned, ranked by BM25 relevance.
+
+        Args:
+            query: Free text (any term may match; more / rarer matches rank higher)
+            instrument: Filter by instrument
+            orb_time: Filter by ORB time (session)
+            limit: Page size
+            offset: Rows to skip (pagination)
+
+        Returns:
+            List of trade records with a 'score' key, best match first
+        """
+        conn = duckdb.connect(self.db_path)
+        LESSON_INDEX.ensure_schema(conn)
+        LESSON_INDEX.sync(conn, 'trade_journal', 'id', 'lesson_learned')
+
+        conditions, params = [], []
+        if instrument:
+            conditions.append("t.instrument = ?")
+            params.append(instrument)
+        if orb_time:
+            conditions.append("t.orb_time = ?")
+            params.append(orb_time)
+
+        columns = [
+            'id', 'date_local', 'orb_time', 'instrument', 'outcome', 'r_multiple',
+            'lesson_learned', 'notable'
+        ]
+        results = LESSON_INDEX.search(
+            conn, query, limit=limit, offset=offset,
+            table='trade_journal',
+            where_sql=f"WHERE {' AND '.join(conditions)}" if conditions else "",
+            params=params,
+            columns=', '.join(f"t.{c}" for c in columns),
+            order_by="t.date_local DESC"
+        )
+        conn.close()
+
+        return [dict(zip(columns + ['score'], row)) for row in results]
+
     def query_similar_sessions(
         self,
         asia_travel: float,
@@ -0,0 +1,306 @@
+"""
+MONTE CARLO ENGINE - Vectorized drawdown and risk-of-ruin simulation
+
+Simulates an (n_paths x n_trades) matrix of realized-R sequences in one shot
+and applies the drawdown rules of drawdown_engine to every path at once:
+- STATIC: floor = starting_balance - max_drawdown_size
+- TRAILING_INTRADAY: floor = running max balance - max_drawdown_size,
+  trailing after every trade
+- TRAILING_EOD: floor = running max of end-of-day balances - max_drawdown_size,
+  moving only after the last trade of a day (trades_per_day trades per day)
+
+A path breaches when its balance after a trade is at or below the floor
+(effective capital 0 in calculate_drawdown) and stops at the profit target
+if one is set. Balances are known at trade closes only; excursions inside a
+trade are not modelled.
+
+Trades are bootstrapped from observed realized R (r_multiples) or drawn from
+a two-outcome model (win_rate, payoff_ratio, losses = -1R).
+
+CRITICAL: This module is PURE - no state, no I/O, no side effects.
+Results are deterministic for a given seed.
+
+Usage:
+    from trading_app.monte_carlo_engine import MonteCarloRequest, simulate_drawdown
+
+    result = simulate_drawdown(MonteCarloRequest(
+        drawdown_model='TRAILING_EOD',
+        starting_balance=50000,
+        max_drawdown_size=2000,
+        risk_per_trade=200,
+        r_multiples=tuple(trades['realized_rr']),
+        trades_per_day=2,
+    ))
+    result.breach_probability, result.max_drawdown_quantiles[0.95]
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from trading_app.drawdown_engine import DrawdownModel, DrawdownModelEnum
+
+
+# Paths simulated per block: bounds memory (a few block x n_trades float32 matrices)
+BLOCK_PATHS = 4096
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+# =============================================================================
+# INPUT CONTRACT
+# =============================================================================
+
+@dataclass(frozen=True)
+class MonteCarloRequest:
+    """
+    Input contract for a drawdown simulation.
+
+    Trade source: r_multiples (bootstrap) OR win_rate + payoff_ratio.
+    current_balance / high_water_mark default to starting_balance, so paths
+    start from a fresh account unless a live state is given.
+    """
+    drawdown_model: DrawdownModel
+    starting_balance: float
+    max_drawdown_size: float
+    risk_per_trade: float  # Dollars per 1R
+
+    r_multiples: tuple | None = None
+    win_rate: float | None = None
+    payoff_ratio: float | None = None
+
+    current_balance: float | None = None
+    high_water_mark: float | None = None
+    profit_target: float | None = None  # Dollars above current_balance that end a path
+
+    n_paths: int = 100_000
+    n_trades: int = 100
+    trades_per_day: int = 1
+    seed: int | None = 42
+
+    def __post_init__(self):
+        """Validate input constraints"""
+        if self.drawdown_model not in [m.value for m in DrawdownModelEnum]:
+            raise ValueError(
+                f"Invalid drawdown_model: {self.drawdown_model}. "
+                f"Must be one of: {[m.value for m in DrawdownModelEnum]}"
+            )
+
+        if self.starting_balance <= 0:
+            raise ValueError(f"starting_balance must be positive: {self.starting_balance}")
+
+        if self.max_drawdown_size <= 0:
+            raise ValueError(f"max_drawdown_size must be positive: {self.max_drawdown_size}")
+
+        if self.risk_per_trade <= 0:
+            raise ValueError(f"risk_per_trade must be positive: {self.risk_per_trade}")
+
+        if (self.r_multiples is None) == (self.win_rate is None):
+            raise ValueError("Provide either r_multiples or win_rate + payoff_ratio")
+
+        if self.r_multiples is not None and len(self.r_multiples) == 0:
+            raise ValueError("r_multiples is empty")
+
+        if self.win_rate is not None:
+            if not 0 <= self.win_rate <= 1:
+                raise ValueError(f"win_rate must be between 0 and 1.0, got {self.win_rate}")
+            if self.payoff_ratio is None or self.payoff_ratio < 0:
+                raise ValueError(f"payoff_ratio must be >= 0, got {self.payoff_ratio}")
+
+        if self.profit_target is not None and self.profit_target <= 0:
+            raise ValueError(f"profit_target must be positive: {self.profit_target}")
+
+        if self.n_paths < 1 or self.n_trades < 1 or self.trades_per_day < 1:
+            raise ValueError(
+                f"n_paths, n_trades and trades_per_day must be >= 1 "
+                f"(got {self.n_paths}, {self.n_trades}, {self.trades_per_day})"
+            )
+
+
+# =============================================================================
+# OUTPUT CONTRACT
+# =============================================================================
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """
+    Output contract for a drawdown simulation.
+
+    Quantile dicts are keyed by QUANTILES. Drawdowns are dollars below the
+    path's running peak, up to the trade where the path stopped.
+    """
+    n_paths: int
+    n_trades: int
+    breach_probability: float
+    target_probability: float  # 0.0 when no profit_target
+    time_to_breach_mean: float | None  # Trades, over breached paths only
+    time_to_breach_quantiles: dict = field(default_factory=dict)
+    max_drawdown_quantiles: dict = field(default_factory=dict)
+    final_balance_quantiles: dict = field(default_factory=dict)
+    expected_final_balance: float = 0.0
+    calculation_metadata: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Validate output constraints (drift detection)"""
+        if not 0.0 <= self.breach_probability + self.target_probability <= 1.0 + 1e-9:
+            raise ValueError(
+                f"DRIFT DETECTED: breach ({self.breach_probability}) + target "
+                f"({self.target_probability}) probability outside [0, 1]"
+            )
+
+
+# =============================================================================
+# SIMULATION
+# =============================================================================
+
+def draw_r_paths(
+    n_paths: int,
+    n_trades: int,
+    r_multiples=None,
+    win_rate: float | None = None,
+    payoff_ratio: float | None = None,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    (n_paths, n_trades) float32 matrix of realized R.
+
+    Bootstraps r_multiples with replacement, or draws wins (payoff_ratio) and
+    losses (-1) with probability win_rate.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if r_multiples is not None:
+        r = np.asarray(r_multiples, dtype=np.float32)
+        return r[rng.integers(0, len(r), size=(n_paths, n_trades))]
+    r = (rng.random((n_paths, n_trades), dtype=np.float32) < win_rate).astype(np.float32)
+    r *= np.float32(payoff_ratio + 1.0)
+    r -= 1.0
+    return r
+
+
+def _floors(cum_r: np.ndarray, peak_r: np.ndarray, request: MonteCarloRequest, start: float, hwm0: float):
+    """
+    Drawdown floor in force when each trade closes, in R relative to start.
+
+    cum_r: (paths, trades) cumulative R after each trade; peak_r its running max.
+    """
+    risk = request.risk_per_trade
+    dd = request.max_drawdown_size / risk
+    hwm_r = (hwm0 - start) / risk
+
+    if request.drawdown_model == 'STATIC':
+        return (request.starting_balance - request.max_drawdown_size - start) / risk
+
+    if request.drawdown_model == 'TRAILING_INTRADAY':
+        floor = np.maximum(peak_r, hwm_r)
+        floor -= dd
+        return floor
+
+    # TRAILING_EOD: during day d the floor uses closes of days < d
+    k = request.trades_per_day
+    n_paths, n_trades = cum_r.shape
+    n_days = -(-n_trades // k)
+    prev_hwm = np.empty((n_paths, n_days), dtype=cum_r.dtype)
+    prev_hwm[:, 0] = hwm_r
+    if n_days > 1:
+        closes = cum_r[:, k - 1::k][:, :n_days - 1]
+        np.maximum.accumulate(closes, axis=1, out=prev_hwm[:, 1:])
+        np.maximum(prev_hwm[:, 1:], hwm_r, out=prev_hwm[:, 1:])
+    prev_hwm -= dd
+    return np.repeat(prev_hwm, k, axis=1)[:, :n_trades]
+
+
+def _first_true(mask: np.ndarray) -> np.ndarray:
+    """Column of the first True per row, n_cols where there is none."""
+    first = mask.argmax(axis=1)
+    first[~mask[np.arange(len(mask)), first]] = mask.shape[1]
+    return first
+
+
+def _simulate_blocks(request, rng, start, hwm0, breach_at, target_at, max_dd, final) -> None:
+    """
+    Fill the per-path outputs, BLOCK_PATHS paths at a time.
+
+    Paths are kept in R relative to start (float32, in place) and converted
+    to dollars per path at the end.
+    """
+    n_trades = request.n_trades
+    target_r = request.profit_target / request.risk_per_trade if request.profit_target is not None else None
+    for lo in range(0, request.n_paths, BLOCK_PATHS):
+        hi = min(lo + BLOCK_PATHS, request.n_paths)
+        rows = np.arange(hi - lo)
+        cum_r = draw_r_paths(hi - lo, n_trades, request.r_multiples, request.win_rate, request.payoff_ratio, rng)
+        np.cumsum(cum_r, axis=1, out=cum_r)
+
+        peak_r = np.maximum.accumulate(cum_r, axis=1)
+        first_breach = _first_true(cum_r <= _floors(cum_r, peak_r, request, start, hwm0))
+        first_target = _first_true(cum_r >= target_r) if target_r is not None else np.full(hi - lo, n_trades)
+        stop = np.minimum(np.minimum(first_breach, first_target), n_trades - 1)
+
+        # Running max drawdown below the path's peak (start included), read at the stop trade
+        drawdown = np.maximum(peak_r, 0.0, out=peak_r)
+        drawdown -= cum_r
+        np.maximum.accumulate(drawdown, axis=1, out=drawdown)
+
+        breach_at[lo:hi] = first_breach
+        target_at[lo:hi] = first_target
+        max_dd[lo:hi] = drawdown[rows, stop] * request.risk_per_trade
+        final[lo:hi] = start + cum_r[rows, stop].astype(np.float64) * request.risk_per_trade
+
+
+def simulate_drawdown(request: MonteCarloRequest) -> MonteCarloResult:
+    """
+    Simulate request.n_paths trade sequences under the drawdown rules.
+
+    PURE FUNCTION: deterministic for a given seed.
+
+    Returns:
+        MonteCarloResult with breach probability, time-to-breach and
+        drawdown / final balance quantiles
+    """
+    rng = np.random.default_rng(request.seed)
+    start = request.current_balance if request.current_balance is not None else request.starting_balance
+    hwm0 = request.high_water_mark if request.high_water_mark is not None else max(start, request.starting_balance)
+    n_trades = request.n_trades
+
+    breach_at = np.empty(request.n_paths, dtype=np.int64)
+    target_at = np.empty(request.n_paths, dtype=np.int64)
+    max_dd = np.empty(request.n_paths)
+    final = np.empty(request.n_paths)
+
+    zero = np.zeros((1, 1), dtype=np.float32)
+    if np.min(_floors(zero, zero, request, start, hwm0)) >= 0:
+        # Already at or below the floor: breached before the first trade
+        breach_at[:], target_at[:], max_dd[:], final[:] = -1, n_trades, 0.0, start
+    else:
+        _simulate_blocks(request, rng, start, hwm0, breach_at, target_at, max_dd, final)
+
+    breached = breach_at < np.minimum(target_at, n_trades)
+    hit_target = target_at < np.minimum(breach_at, n_trades)
+    time_to_breach = breach_at[breached] + 1  # Trades taken, 1-based (0: breached at start)
+
+    return MonteCarloResult(
+        n_paths=request.n_paths,
+        n_trades=n_trades,
+        breach_probability=float(breached.mean()),
+        target_probability=float(hit_target.mean()),
+        time_to_breach_mean=float(time_to_breach.mean()) if len(time_to_breach) else None,
+        time_to_breach_quantiles=_quantiles(time_to_breach),
+        max_drawdown_quantiles=_quantiles(max_dd),
+        final_balance_quantiles=_quantiles(final),
+        expected_final_balance=float(final.mean()),
+        calculation_metadata={
+            'model_used': request.drawdown_model,
+            'trade_source': 'bootstrap' if request.r_multiples is not None else 'win_rate',
+            'start_balance': start,
+            'initial_high_water_mark': hwm0,
+            'profit_target': request.profit_target,
+            'trades_per_day': request.trades_per_day,
+            'seed': request.seed,
+        },
+    )
+
+
+def _quantiles(values: np.ndarray) -> dict:
+    if len(values) == 0:
+        return {}
+    return {q: float(v) for q, v in zip(QUANTILES, np.quantile(values, QUANTILES))}
@@ -32,6 +32,15 @@ from trading_app.cloud_mode import get_database_connection
 
 logger = logging.getLogger(__name__)
 
+FEATURE_TABLES = {
+    "MGC": "daily_features",
+    "NQ": "daily_features_nq",
+    "MPL": "daily_features_mpl"
+}
+
+# Simulation outcomes that are not trades (excluded from backtest metrics)
+NO_TRADE_OUTCOMES = ('SKIPPED_NO_ORB', 'SKIPPED_NO_BARS', 'SKIPPED_NO_ENTRY', 'NO_TRADE')
+
 
 @dataclass
 class BacktestMetrics:
@@ -62,6 +71,32 @@ class RobustnessMetrics:
     stress_50_pass: bool = False
 
 
+@dataclass
+class TradeLedger:
+    """
+    One canonical simulation of a candidate over its test window.
+
+    trades has one row per date that passed the ORB size filter, in date
+    order: date_local, atr, outcome, r_multiple, cost_r, mae_r, mfe_r.
+    n_dates counts the ORB break dates before the size filter.
+    """
+    n_dates: int
+    trades: pd.DataFrame
+
+    def closed(self, rows: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """WIN/LOSS rows of the ledger (or of a slice of it)."""
+        rows = self.trades if rows is None else rows
+        return rows[rows['outcome'].isin(('WIN', 'LOSS'))]
+
+    @staticmethod
+    def realized_r(trades: pd.DataFrame, cost_multiplier: float = 1.0) -> List[float]:
+        """REALIZED R (post-cost) per trade, with costs scaled by cost_multiplier."""
+        return [
+            r - cost_r * cost_multiplier
+            for r, cost_r in zip(trades['r_multiple'].tolist(), trades['cost_r'].tolist())
+        ]
+
+
 class ResearchRunner:
     """
     Automated backtest runner for edge candidates.
@@ -69,9 +104,9 @@ class ResearchRunner:
     Workflow:
     1. Load candidate from edge_candidates table
     2. Extract filter_spec and feature_spec
-    3. Run backtest on daily_features + bars data
+    3. Simulate the candidate once into a trade ledger (daily_features + bars data)
     4. Compute metrics (WR, avg R, total R, drawdown, MAE/MFE)
-    5. Run robustness checks (walk-forward, regime splits)
+    5. Run robustness checks (walk-forward, regime splits, stress) on the same ledger
     6. Write results back to edge_candidates
     7. Update status to TESTED
     """
@@ -134,15 +169,15 @@ class ResearchRunner:
 
         return candidate
 
-    def run_backtest(self, candidate: Dict[str, Any]) -> Optional[BacktestMetrics]:
+    def build_trade_ledger(self, candidate: Dict[str, Any]) -> Optional[TradeLedger]:
         """
-        Run backtest for a candidate using CANONICAL execution_engine.py.
+        Simulate a candidate once using CANONICAL execution_engine.py.
 
-        Uses execution_engine.simulate_orb_trade() for deterministic, cost-aware backtesting.
-        NO parallel execution paths - all research uses same engine as production.
+        Queries the ORB break dates in the test window, applies the ORB size
+        filter and runs simulate_orb_trades_batch() over them. Every result is
+        kept (skips included) so the backtest and all robustness checks can be
+        derived from the ledger without re-simulating.
         """
-        logger.info(f"Running backtest for candidate {candidate['candidate_id']}: {candidate['name']}")
-
         instrument = candidate['instrument']
         filter_spec = candidate.get('filter_spec') or {}
         test_window_start = candidate.get('test_window_start')
@@ -156,13 +191,7 @@ class ResearchRunner:
         sl_mode = filter_spec.get('sl_mode', 'FULL')
         orb_size_filter = filter_spec.get('orb_size_filter')
 
-        feature_tables = {
-            "MGC": "daily_features",
-            "NQ": "daily_features_nq",
-            "MPL": "daily_features_mpl"
-        }
-
-        table = feature_tables.get(instrument)
+        table = FEATURE_TABLES.get(instrument)
         if not table:
             logger.error(f"Unknown instrument: {instrument}")
             return None
@@ -171,102 +200,117 @@ class ResearchRunner:
 
         try:
             con = self.get_connection(read_only=True)
-
-            # Query dates with ORB breaks only (execution_engine will simulate from bars)
-            sql = f"""
-            SELECT
-                date_local,
-                CAST({orb_prefix}_size AS DOUBLE) as orb_size,
-                atr_20 as atr
-            FROM {table}
-            WHERE {orb_prefix}_high IS NOT NULL
-              AND {orb_prefix}_low IS NOT NULL
-              AND {orb_prefix}_break_dir IS NOT NULL
-              AND {orb_prefix}_break_dir != 'NONE'
-            """
-
-            if test_window_start:
-                sql += f" AND date_local >= '{test_window_start}'"
-            if test_window_end:
-                sql += f" AND date_local <= '{test_window_end}'"
-
-            sql += " ORDER BY date_local"
-
-            df = con.execute(sql).df()
-
-            if df.empty:
-                logger.warning("No data found for backtest")
-                con.close()
-                return BacktestMetrics(
-                    win_rate=0.0, avg_r=0.0, total_r=0.0, n_trades=0,
-                    max_drawdown_r=0.0, mae_avg=0.0, mfe_avg=0.0
-                )
-
-            # Apply ORB size filter if specified
-            if orb_size_filter is not None:
-                df = df[df['orb_size'] <= (df['atr'] * orb_size_filter)]
-
-            n_dates = len(df)
-            if n_dates == 0:
+            try:
+                # Query dates with ORB breaks only (execution_engine will simulate from bars)
+                sql = f"""
+                SELECT
+                    date_local,
+                    CAST({orb_prefix}_size AS DOUBLE) as orb_size,
+                    atr_20 as atr
+                FROM {table}
+                WHERE {orb_prefix}_high IS NOT NULL
+                  AND {orb_prefix}_low IS NOT NULL
+                  AND {orb_prefix}_break_dir IS NOT NULL
+                  AND {orb_prefix}_break_dir != 'NONE'
+                """
+
+                if test_window_start:
+                    sql += f" AND date_local >= '{test_window_start}'"
+                if test_window_end:
+                    sql += f" AND date_local <= '{test_window_end}'"
+
+                sql += " ORDER BY date_local"
+
+                df = con.execute(sql).df()
+                n_dates = len(df)
+
+                # Apply ORB size filter if specified
+                if orb_size_filter is not None:
+                    df = df[df['orb_size'] <= (df['atr'] * orb_size_filter)]
+
+                results = []
+                if len(df) > 0:
+                    # ✅ CANONICAL EXECUTION: Use execution_engine (batch form of simulate_orb_trade)
+                    from strategies.execution_engine import simulate_orb_trades_batch, ExecutionMode
+                    from pipeline.cost_model import get_cost_model
+
+                    # Get canonical costs for this instrument
+                    cost_model = get_cost_model(instrument)
+
+                    logger.info(f"  Simulating {len(df)} dates with canonical execution engine...")
+
+                    results = simulate_orb_trades_batch(
+                        con=con,
+                        dates=list(df['date_local']),
+                        orb=orb_time,
+                        mode='1m',
+                        confirm_bars=1,
+                        rr=rr,
+                        sl_mode=sl_mode.lower(),
+                        exec_mode=ExecutionMode.MARKET_ON_CLOSE,
+                        slippage_ticks=cost_model['slippage_ticks'],
+                        commission_per_contract=cost_model['commission_rt'] / 2  # Per side
+                    )
+            finally:
                 con.close()
-                return BacktestMetrics(
-                    win_rate=0.0, avg_r=0.0, total_r=0.0, n_trades=0,
-                    max_drawdown_r=0.0, mae_avg=0.0, mfe_avg=0.0
-                )
 
-            # ✅ CANONICAL EXECUTION: Use execution_engine.simulate_orb_trade()
-            from strategies.execution_engine import simulate_orb_trade, ExecutionMode
-            from pipeline.cost_model import get_cost_model
-
-            # Get canonical costs for this instrument
-            cost_model = get_cost_model(instrument)
-
-            trades = []
-            logger.info(f"  Simulating {n_dates} dates with canonical execution engine...")
-
-            for _, row in df.iterrows():
-                result = simulate_orb_trade(
-                    con=con,
-                    date_local=row['date_local'],
-                    orb=orb_time,
-                    mode='1m',
-                    confirm_bars=1,
-                    rr=rr,
-                    sl_mode=sl_mode.lower(),
-                    exec_mode=ExecutionMode.MARKET_ON_CLOSE,
-                    slippage_ticks=cost_model['slippage_ticks'],
-                    commission_per_contract=cost_model['commission_rt'] / 2  # Per side
-                )
+        except Exception as e:
+            logger.error(f"Trade ledger error: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return None
 
-                # Skip if no trade
-                if result.outcome in ['SKIPPED_NO_ORB', 'SKIPPED_NO_BARS', 'SKIPPED_NO_ENTRY', 'NO_TRADE']:
-                    continue
+        trades = pd.DataFrame({
+            'date_local': list(df['date_local']),
+            'atr': df['atr'].tolist(),
+            'outcome': [r.outcome for r in results],
+            'r_multiple': pd.Series([r.r_multiple for r in results], dtype=float),
+            'cost_r': pd.Series([r.cost_r for r in results], dtype=float),
+            'mae_r': pd.Series([r.mae_r for r in results], dtype=float),
+            'mfe_r': pd.Series([r.mfe_r for r in results], dtype=float),
+        })
+        return TradeLedger(n_dates=n_dates, trades=trades)
+
+    def run_backtest(
+        self,
+        candidate: Dict[str, Any],
+        ledger: Optional[TradeLedger] = None
+    ) -> Optional[BacktestMetrics]:
+        """
+        Run backtest for a candidate using CANONICAL execution_engine.py.
 
-                trades.append(result)
+        Uses execution_engine.simulate_orb_trade() for deterministic, cost-aware backtesting.
+        NO parallel execution paths - all research uses same engine as production.
+        Pass the ledger from build_trade_ledger() to reuse its simulation.
+        """
+        logger.info(f"Running backtest for candidate {candidate['candidate_id']}: {candidate['name']}")
 
-            con.close()
+        if ledger is None:
+            ledger = self.build_trade_ledger(candidate)
+            if ledger is None:
+                return None
 
-            if len(trades) == 0:
-                return BacktestMetrics(
-                    win_rate=0.0, avg_r=0.0, total_r=0.0, n_trades=0,
-                    max_drawdown_r=0.0, mae_avg=0.0, mfe_avg=0.0
-                )
+        empty = BacktestMetrics(
+            win_rate=0.0, avg_r=0.0, total_r=0.0, n_trades=0,
+            max_drawdown_r=0.0, mae_avg=0.0, mfe_avg=0.0
+        )
 
-            # Calculate metrics from canonical execution results
-            wins = sum(1 for t in trades if t.outcome == 'WIN')
-            losses = sum(1 for t in trades if t.outcome == 'LOSS')
-            n_trades_actual = wins + losses
+        try:
+            # Skip dates with no trade
+            trades = ledger.trades[~ledger.trades['outcome'].isin(NO_TRADE_OUTCOMES)]
+            closed = ledger.closed()
 
-            if n_trades_actual == 0:
-                return BacktestMetrics(
-                    win_rate=0.0, avg_r=0.0, total_r=0.0, n_trades=0,
-                    max_drawdown_r=0.0, mae_avg=0.0, mfe_avg=0.0
-                )
+            if len(closed) == 0:
+                if ledger.n_dates == 0:
+                    logger.warning("No data found for backtest")
+                return empty
 
+            wins = int((closed['outcome'] == 'WIN').sum())
+            n_trades_actual = len(closed)
             win_rate = wins / n_trades_actual
 
             # Use REALIZED R (post-cost)
-            r_values = [t.r_multiple - t.cost_r for t in trades if t.outcome in ['WIN', 'LOSS']]
+            r_values = ledger.realized_r(closed)
             total_r = sum(r_values)
             avg_r = total_r / n_trades_actual
 
@@ -283,8 +327,10 @@ class ResearchRunner:
                     max_dd = dd
 
             # Calculate MAE/MFE averages from execution results
-            mae_avg = sum(t.mae_r for t in trades if t.mae_r is not None) / len([t for t in trades if t.mae_r is not None]) if any(t.mae_r is not None for t in trades) else 0.0
-            mfe_avg = sum(t.mfe_r for t in trades if t.mfe_r is not None) / len([t for t in trades if t.mfe_r is not None]) if any(t.mfe_r is not None for t in trades) else 0.0
+            mae_values = trades['mae_r'].dropna().tolist()
+            mfe_values = trades['mfe_r'].dropna().tolist()
+            mae_avg = sum(mae_values) / len(mae_values) if mae_values else 0.0
+            mfe_avg = sum(mfe_values) / len(mfe_values) if mfe_values else 0.0
 
             # Calculate profit factor
             gross_profit = sum(r for r in r_values if r > 0)
@@ -320,11 +366,15 @@ class ResearchRunner:
             logger.error(traceback.format_exc())
             return None
 
-    def run_robustness_checks(self, candidate: Dict[str, Any]) -> Optional[RobustnessMetrics]:
+    def run_robustness_checks(
+        self,
+        candidate: Dict[str, Any],
+        ledger: Optional[TradeLedger] = None
+    ) -> Optional[RobustnessMetrics]:
         """
         Run robustness checks using CANONICAL execution_engine.py.
 
-        Checks:
+        Checks (all re-slice or re-cost the candidate's trade ledger):
         1. Walk-forward analysis (split into N windows, test on each)
         2. Regime split (high vol vs low vol based on ATR)
         3. Stress testing (+25%, +50% costs)
@@ -333,51 +383,16 @@ class ResearchRunner:
 
         test_config = candidate.get('test_config') or {}
         walk_forward_windows = test_config.get('walk_forward_windows', 4)
-        filter_spec = candidate.get('filter_spec') or {}
-
-        instrument = candidate['instrument']
-        rr = filter_spec.get('rr', 2.0)
-        orb_time = filter_spec.get('orb_time', '0900')
-        sl_mode = filter_spec.get('sl_mode', 'FULL')
-        orb_size_filter = filter_spec.get('orb_size_filter')
-        test_window_start = candidate.get('test_window_start')
-        test_window_end = candidate.get('test_window_end')
-
-        feature_tables = {
-            "MGC": "daily_features",
-            "NQ": "daily_features_nq",
-            "MPL": "daily_features_mpl"
-        }
-        table = feature_tables.get(instrument, "daily_features")
-        orb_prefix = f"orb_{orb_time}"
 
         logger.info(f"  Walk-forward windows: {walk_forward_windows}")
 
-        try:
-            con = self.get_connection(read_only=True)
+        if ledger is None:
+            ledger = self.build_trade_ledger(candidate)
+            if ledger is None:
+                return None
 
-            # Query dates only (execution_engine will simulate from bars)
-            sql = f"""
-            SELECT
-                date_local,
-                CAST({orb_prefix}_size AS DOUBLE) as orb_size,
-                atr_20 as atr
-            FROM {table}
-            WHERE {orb_prefix}_high IS NOT NULL
-              AND {orb_prefix}_low IS NOT NULL
-              AND {orb_prefix}_break_dir IS NOT NULL
-              AND {orb_prefix}_break_dir != 'NONE'
-            """
-            if test_window_start:
-                sql += f" AND date_local >= '{test_window_start}'"
-            if test_window_end:
-                sql += f" AND date_local <= '{test_window_end}'"
-            sql += " ORDER BY date_local"
-
-            df = con.execute(sql).df()
-
-            if df.empty or len(df) < walk_forward_windows:
-                con.close()
+        try:
+            if ledger.n_dates == 0 or ledger.n_dates < walk_forward_windows:
                 return RobustnessMetrics(
                     walk_forward_periods=walk_forward_windows,
                     walk_forward_avg_r=0.0,
@@ -386,16 +401,7 @@ class ResearchRunner:
                     is_robust=False
                 )
 
-            # Apply ORB size filter
-            if orb_size_filter is not None:
-                df = df[df['orb_size'] <= (df['atr'] * orb_size_filter)]
-
-            # ✅ CANONICAL EXECUTION: Use execution_engine
-            from strategies.execution_engine import simulate_orb_trade, ExecutionMode
-            from pipeline.cost_model import get_cost_model
-
-            cost_model = get_cost_model(instrument)
-
+            df = ledger.trades
             window_size = len(df) // walk_forward_windows
             wf_results = []
 
@@ -407,28 +413,10 @@ class ResearchRunner:
                 if len(window_df) == 0:
                     continue
 
-                # Simulate trades in this window using canonical engine
-                trades = []
-                for _, row in window_df.iterrows():
-                    result = simulate_orb_trade(
-                        con=con,
-                        date_local=row['date_local'],
-                        orb=orb_time,
-                        mode='1m',
-                        confirm_bars=1,
-                        rr=rr,
-                        sl_mode=sl_mode.lower(),
-                        exec_mode=ExecutionMode.MARKET_ON_CLOSE,
-                        slippage_ticks=cost_model['slippage_ticks'],
-                        commission_per_contract=cost_model['commission_rt'] / 2
-                    )
-
-                    if result.outcome in ['WIN', 'LOSS']:
-                        trades.append(result)
-
+                trades = ledger.closed(window_df)
                 if len(trades) > 0:
                     # Use REALIZED R (post-cost)
-                    r_values = [t.r_multiple - t.cost_r for t in trades]
+                    r_values = ledger.realized_r(trades)
                     avg_r = sum(r_values) / len(r_values)
                     wf_results.append(avg_r)
                 else:
@@ -439,73 +427,28 @@ class ResearchRunner:
             wf_std_r = statistics.stdev(wf_results) if len(wf_results) > 1 else 0.0
 
             # Regime split analysis
-            median_atr = df['atr'].median() if 'atr' in df.columns else 0
+            median_atr = df['atr'].median()
             high_vol_df = df[df['atr'] > median_atr]
             low_vol_df = df[df['atr'] <= median_atr]
 
             regime_results = {}
             for regime_name, regime_df in [("high_vol", high_vol_df), ("low_vol", low_vol_df)]:
-                if len(regime_df) > 0:
-                    # Simulate trades in this regime
-                    trades = []
-                    for _, row in regime_df.iterrows():
-                        result = simulate_orb_trade(
-                            con=con,
-                            date_local=row['date_local'],
-                            orb=orb_time,
-                            mode='1m',
-                            confirm_bars=1,
-                            rr=rr,
-                            sl_mode=sl_mode.lower(),
-                            exec_mode=ExecutionMode.MARKET_ON_CLOSE,
-                            slippage_ticks=cost_model['slippage_ticks'],
-                            commission_per_contract=cost_model['commission_rt'] / 2
-                        )
-
-                        if result.outcome in ['WIN', 'LOSS']:
-                            trades.append(result)
-
-                    if len(trades) > 0:
-                        wins = sum(1 for t in trades if t.outcome == 'WIN')
-                        r_values = [t.r_multiple - t.cost_r for t in trades]
-                        regime_results[regime_name] = {
-                            "avg_r": sum(r_values) / len(r_values),
-                            "n": len(trades),
-                            "win_rate": wins / len(trades)
-                        }
-
-            con.close()
+                trades = ledger.closed(regime_df)
+                if len(trades) > 0:
+                    wins = int((trades['outcome'] == 'WIN').sum())
+                    r_values = ledger.realized_r(trades)
+                    regime_results[regime_name] = {
+                        "avg_r": sum(r_values) / len(r_values),
+                        "n": len(trades),
+                        "win_rate": wins / len(trades)
+                    }
 
             # ✅ ADD STRESS TESTING (CANONICAL requirement)
-            # Reload all trades for stress testing
-            con = self.get_connection(read_only=True)
-            all_trades = []
-            for _, row in df.iterrows():
-                result = simulate_orb_trade(
-                    con=con,
-                    date_local=row['date_local'],
-                    orb=orb_time,
-                    mode='1m',
-                    confirm_bars=1,
-                    rr=rr,
-                    sl_mode=sl_mode.lower(),
-                    exec_mode=ExecutionMode.MARKET_ON_CLOSE,
-                    slippage_ticks=cost_model['slippage_ticks'],
-                    commission_per_contract=cost_model['commission_rt'] / 2
-                )
-
-                if result.outcome in ['WIN', 'LOSS']:
-                    all_trades.append(result)
-
-            con.close()
-
-            # Calculate stress test metrics
+            # Re-cost every trade: increase costs by 25% and 50%
+            all_trades = ledger.closed()
             if len(all_trades) > 0:
-                r_values = [t.r_multiple - t.cost_r for t in all_trades]
-
-                # Stress tests: increase costs by 25% and 50%
-                stress_25_r = [t.r_multiple - (t.cost_r * 1.25) for t in all_trades]
-                stress_50_r = [t.r_multiple - (t.cost_r * 1.50) for t in all_trades]
+                stress_25_r = ledger.realized_r(all_trades, cost_multiplier=1.25)
+                stress_50_r = ledger.realized_r(all_trades, cost_multiplier=1.50)
 
                 stress_25_exp_r = sum(stress_25_r) / len(stress_25_r)
                 stress_50_exp_r = sum(stress_50_r) / len(stress_50_r)
@@ -682,8 +625,8 @@ class ResearchRunner:
         Steps:
         1. Load candidate
         2. Auto-populate reproducibility fields if needed
-        3. Run backtest
-        4. Run robustness checks
+        3. Build trade ledger (one simulation per candidate)
+        4. Run backtest and robustness checks on the ledger
         5. Write results
         6. Update status to TESTED
 
@@ -709,14 +652,20 @@ class ResearchRunner:
         # Reload to get updated fields
         candidate = self.load_candidate(candidate_id)
 
+        # Simulate once; backtest and robustness checks share the ledger
+        ledger = self.build_trade_ledger(candidate)
+        if ledger is None:
+            logger.error("Backtest failed")
+            return False
+
         # Run backtest
-        metrics = self.run_backtest(candidate)
+        metrics = self.run_backtest(candidate, ledger)
         if not metrics:
             logger.error("Backtest failed")
             return False
 
         # Run robustness checks
-        robustness = self.run_robustness_checks(candidate)
+        robustness = self.run_robustness_checks(candidate, ledger)
         if not robustness:
             logger.error("Robustness checks failed")
             return False
@@ -11,6 +11,8 @@ Key Concepts:
 - Effective Capital: Real available capital (from DrawdownEngine)
 - Position Sizing: Uses effective capital, not balance
 - Kelly Criterion: Optimal bet sizing for edge preservation
+- Monte Carlo RoR (optional, monte_carlo_paths > 0): simulated breach
+  probability under the account's drawdown model instead of the closed form
 
 Integration:
     DrawdownEngine → effective_capital
@@ -55,6 +57,8 @@ from dataclasses import dataclass, field
 from typing import Literal
 import math
 
+from trading_app.monte_carlo_engine import MonteCarloRequest, MonteCarloResult, simulate_drawdown
+
 
 # =============================================================================
 # TYPE DEFINITIONS
@@ -91,6 +95,12 @@ class RiskRequest:
     commission_per_contract: float = 0.0  # Round-trip commission
     slippage_per_contract: float = 0.0  # Expected slippage cost
 
+    # Optional: Monte Carlo RoR (0 paths = closed-form Gambler's Ruin)
+    monte_carlo_paths: int = 0  # e.g., 100_000
+    monte_carlo_trades: int = 100  # Trades simulated per path
+    drawdown_model: str = 'STATIC'  # Drawdown rule applied to each path
+    trades_per_day: int = 1  # TRAILING_EOD: floor moves after this many trades
+
 
 @dataclass(frozen=True)
 class RiskResult:
@@ -167,6 +177,12 @@ def calculate_risk(request: RiskRequest) -> RiskResult:
         profit_target_multiplier=request.profit_target_multiplier
     )
 
+    # Monte Carlo RoR replaces the closed form when requested
+    monte_carlo = None
+    if request.monte_carlo_paths > 0 and max_loss > 0 and request.effective_capital > 0:
+        monte_carlo = _simulate_risk_of_ruin(request, max_loss)
+        ror = monte_carlo.breach_probability
+
     # Calculate Kelly Criterion
     kelly_fraction = _calculate_kelly_fraction(
         win_rate=request.win_rate,
@@ -205,8 +221,18 @@ def calculate_risk(request: RiskRequest) -> RiskResult:
         'win_rate': request.win_rate,
         'effective_capital': request.effective_capital,
         'risk_percent': request.risk_percent,
-        'kelly_fraction': kelly_fraction
+        'kelly_fraction': kelly_fraction,
+        'ror_method': 'monte_carlo' if monte_carlo is not None else 'gamblers_ruin'
     }
+    if monte_carlo is not None:
+        metadata['monte_carlo'] = {
+            'n_paths': monte_carlo.n_paths,
+            'n_trades': monte_carlo.n_trades,
+            'drawdown_model': request.drawdown_model,
+            'target_probability': monte_carlo.target_probability,
+            'time_to_breach_mean': monte_carlo.time_to_breach_mean,
+            'max_drawdown_quantiles': monte_carlo.max_drawdown_quantiles,
+        }
 
     return RiskResult(
         position_size=position_size,
@@ -355,6 +381,33 @@ def _calculate_risk_of_ruin(
     return ror, int(num_losses_to_ruin)
 
 
+def _simulate_risk_of_ruin(request: RiskRequest, risk_per_trade: float) -> MonteCarloResult:
+    """
+    Risk of Ruin by Monte Carlo (trading_app.monte_carlo_engine).
+
+    The account is modelled relative to its floor: effective_capital is the
+    whole drawdown allowance and the balance starts at its high water mark
+    (conservative for trailing models). Ruin = breach before the profit target
+    (profit_target_multiplier * effective_capital) within monte_carlo_trades.
+
+    Returns:
+        MonteCarloResult (breach_probability is the RoR)
+    """
+    profit_target = request.profit_target_multiplier * request.effective_capital
+    return simulate_drawdown(MonteCarloRequest(
+        drawdown_model=request.drawdown_model,
+        starting_balance=request.effective_capital,
+        max_drawdown_size=request.effective_capital,
+        risk_per_trade=risk_per_trade,
+        win_rate=request.win_rate,
+        payoff_ratio=request.payoff_ratio,
+        profit_target=profit_target if profit_target > 0 else None,
+        n_paths=request.monte_carlo_paths,
+        n_trades=request.monte_carlo_trades,
+        trades_per_day=request.trades_per_day,
+    ))
+
+
 # =============================================================================
 # KELLY CRITERION
 # =============================================================================
@@ -575,6 +628,15 @@ def _validate_risk_request(request: RiskRequest) -> None:
     if request.slippage_per_contract < 0:
         raise ValueError(f"slippage_per_contract must be >= 0, got {request.slippage_per_contract}")
 
+    if request.monte_carlo_paths < 0:
+        raise ValueError(f"monte_carlo_paths must be >= 0, got {request.monte_carlo_paths}")
+
+    if request.monte_carlo_paths > 0 and (request.monte_carlo_trades < 1 or request.trades_per_day < 1):
+        raise ValueError(
+            f"monte_carlo_trades and trades_per_day must be >= 1, "
+            f"got {request.monte_carlo_trades}, {request.trades_per_day}"
+        )
+
 
 # =============================================================================
 # TESTING & EXAMPLES
@@ -71,6 +71,8 @@ def run_update():
             print("\n[ERROR] Update failed")
     else:
         print("[OK] Data is current - no update needed")
+        # Bars written outside the bridge (manual backfills) still need their features
+        bridge.update_features_incremental()
 
     print(f"\n{'='*70}\n")
 
@@ -0,0 +1,365 @@
+"""
+Search Scoring Backend - In-memory RR/filter scoring for AutoSearchEngine
+
+daily_features stores ONE model per ORB (RR=1.0 tradeable columns), so the
+old search could only score a single proxy row per ORB. This backend loads
+each ORB's post-break price path once and reduces it to a few numbers per day:
+
+- direction, entry, risk (tradeable model: signal = 1st close outside ORB,
+  entry = next 1m open, stop at ORB edge/midpoint)
+- best favorable price reached BEFORE the first stop touch
+- whether the stop was touched at all
+
+A target at ANY RR is hit before the stop iff the best favorable price reaches
+it, so every RR (and every filter mask) is scored with a few vectorized numpy
+ops over the day arrays - no SQL per combination.
+
+Outcomes and realized RR match _orb_tradeable_from_arrays in
+pipeline/build_daily_features.py exactly (costs from pipeline/cost_model.py,
+same-bar stop+target = LOSS, cost-downgraded WIN = LOSS, OPEN not counted).
+
+Filters (value: scalar = maximum, [lo, hi] = inclusive range, NaN days excluded):
+- orb_size:       ORB size / ATR(20)
+- pre_orb_travel: range of the last session completed before the ORB / ATR(20)
+- session_type:   type code of the last classified session before the ORB
+                  (string or list of strings)
+
+Usage:
+    backend = PathScoringBackend(conn, instrument='MGC')
+    score = backend.score('1000', rr=2.0, filters={'orb_size': 0.10})
+
+    # Connection-free copy for worker processes
+    snapshot = backend.snapshot(['0900', '1000'])
+"""
+
+import copy
+import os
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+import duckdb
+import numpy as np
+
+# Add repo root for pipeline imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.dirname(current_dir)
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from pipeline.cost_model import (
+    calculate_realized_rr_array, get_cost_model, get_instrument_specs, minimum_viable_risk_mask,
+)
+
+ORB_TIMES = {
+    "0900": (9, 0), "1000": (10, 0), "1100": (11, 0),
+    "1800": (18, 0), "2300": (23, 0), "0030": (0, 30),
+}
+
+# Session context known at ORB start (no lookahead):
+# orb -> (pre-ORB travel column, session type column, type taken from previous trade date)
+ORB_CONTEXT = {
+    "0900": ("pre_asia_range", "pre_ny_type_code", True),
+    "1000": ("pre_asia_range", "pre_ny_type_code", True),
+    "1100": ("pre_asia_range", "pre_ny_type_code", True),
+    "1800": ("pre_london_range", "asia_type_code", False),
+    "2300": ("london_range", "london_type_code", False),
+    "0030": ("pre_ny_range", "pre_ny_type_code", False),
+}
+
+FILTER_KEYS = ("orb_size", "pre_orb_travel", "session_type")
+
+
+@dataclass
+class OrbPaths:
+    """Per-day path summary for one ORB (all arrays aligned with dates)."""
+    dates: np.ndarray           # datetime64[D]
+    up: np.ndarray              # bool, break direction UP
+    entry: np.ndarray           # entry price (NaN = no entry)
+    risk: np.ndarray            # |entry - stop| in points
+    best: np.ndarray            # best favorable price before the first stop touch
+    stopped: np.ndarray         # bool, stop touched after entry
+    tradeable: np.ndarray       # bool, entry exists and risk > 0
+    viable: np.ndarray          # bool, passes the minimum viable risk gate
+    orb_size_norm: np.ndarray   # ORB size / ATR
+    travel_norm: np.ndarray     # pre-ORB travel / ATR
+    session_type: np.ndarray    # object, type code (None if unknown)
+
+
+def _scan_window(orb: str, d: date) -> Tuple[str, str]:
+    """[ORB end, next 09:00) local - the bars the tradeable model scans."""
+    h, m = ORB_TIMES[orb]
+    start_date = d + timedelta(days=1) if orb == "0030" else d
+    end_date = d + timedelta(days=1)
+    return (f"{start_date} {h:02d}:{m + 5:02d}:00", f"{end_date} 09:00:00")
+
+
+def _path_summary(orb_high: float, orb_low: float, open_: np.ndarray, high: np.ndarray,
+                  low: np.ndarray, close: np.ndarray, sl_mode: str) -> Optional[Tuple]:
+    """
+    (up, entry, risk, best, stopped) for one day, or None if there is no entry.
+
+    Mirrors _orb_tradeable_from_arrays up to the point where RR matters.
+    """
+    outside = (close > orb_high) | (close < orb_low)
+    if not outside.any():
+        return None
+    signal_i = int(np.argmax(outside))
+    up = bool(close[signal_i] > orb_high)
+    if signal_i + 1 >= len(close):
+        return None
+
+    entry = float(open_[signal_i + 1])
+    if sl_mode == "full":
+        stop = orb_low if up else orb_high
+    else:  # half
+        stop = (orb_high + orb_low) / 2.0
+    risk = abs(entry - stop)
+
+    h = high[signal_i + 2:]
+    l = low[signal_i + 2:]
+    hit_stop = (l <= stop) if up else (h >= stop)
+    stopped = bool(hit_stop.any())
+    n = int(np.argmax(hit_stop)) if stopped else len(h)
+    if up:
+        best = float(h[:n].max()) if n else -np.inf
+    else:
+        best = float(l[:n].min()) if n else np.inf
+    return up, entry, risk, best, stopped
+
+
+def _range_mask(values: np.ndarray, spec: Any) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        if isinstance(spec, (list, tuple)):
+            lo, hi = spec
+            return (values >= lo) & (values <= hi)
+        return values <= spec
+
+
+class PathScoringBackend:
+    """Precomputed ORB paths; scores any (orb_time, rr, filters) from memory."""
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        instrument: str = 'MGC',
+        sl_mode: str = 'full',
+        date_start: Optional[date] = None,
+        date_end: Optional[date] = None,
+        stress_level: str = 'normal',
+    ):
+        self.conn = conn
+        self.instrument = instrument
+        self.sl_mode = sl_mode
+        self.date_start = date_start
+        self.date_end = date_end
+        self.stress_level = stress_level
+
+        specs = get_instrument_specs(instrument)
+        costs = get_cost_model(instrument, stress_level)
+        self.point_value = specs['point_value']
+        self.total_friction = costs['total_friction']
+
+        self._paths: Dict[str, OrbPaths] = {}
+
+    def paths(self, orb_time: str) -> OrbPaths:
+        """Path summary for one ORB (loaded on first use, 2 queries)."""
+        if orb_time not in self._paths:
+            if self.conn is None:
+                raise ValueError(f"ORB {orb_time} is not in this snapshot")
+            self._paths[orb_time] = self._load_paths(orb_time)
+        return self._paths[orb_time]
+
+    def snapshot(self, orb_times) -> 'PathScoringBackend':
+        """
+        Detached read-only copy with the given ORBs' paths preloaded.
+
+        Holds no connection, so it pickles into worker processes; every worker
+        scores from the arrays the coordinator loaded from daily_features.
+        """
+        snap = copy.copy(self)
+        snap.conn = None
+        snap._paths = {orb: self.paths(orb) for orb in orb_times}
+        return snap
+
+    def _load_paths(self, orb_time: str) -> OrbPaths:
+        if orb_time not in ORB_TIMES:
+            raise ValueError(f"Invalid ORB time: {orb_time}")
+        travel_col, type_col, type_from_prev = ORB_CONTEXT[orb_time]
+        type_expr = (
+            f"last_value({type_col} IGNORE NULLS) OVER "
+            f"(ORDER BY date_local ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)"
+            if type_from_prev else type_col
+        )
+
+        query = f"""
+            SELECT * FROM (
+                SELECT
+                    date_local,
+                    orb_{orb_time}_high AS orb_high,
+                    orb_{orb_time}_low AS orb_low,
+                    atr_20,
+                    {travel_col} AS travel,
+                    {type_expr} AS session_type
+                FROM daily_features
+                WHERE instrument = ?
+            )
+            WHERE 1=1
+        """
+        params = [self.instrument]
+        if self.date_start:
+            query += " AND date_local >= ?"
+            params.append(self.date_start)
+        if self.date_end:
+            query += " AND date_local <= ?"
+            params.append(self.date_end)
+        query += " ORDER BY date_local"
+        rows = self.conn.execute(query, params).fetchall()
+
+        n = len(rows)
+        up = np.zeros(n, dtype=bool)
+        entry = np.full(n, np.nan)
+        risk = np.full(n, np.nan)
+        best = np.full(n, np.nan)
+        stopped = np.zeros(n, dtype=bool)
+        orb_size_norm = np.full(n, np.nan)
+        travel_norm = np.full(n, np.nan)
+        session_type = np.full(n, None, dtype=object)
+
+        windows = {}
+        for i, (d, orb_high, orb_low, atr, travel, stype) in enumerate(rows):
+            session_type[i] = stype
+            if atr is not None and atr > 0:
+                if orb_high is not None and orb_low is not None:
+                    orb_size_norm[i] = (orb_high - orb_low) / atr
+                if travel is not None:
+                    travel_norm[i] = travel / atr
+            if orb_high is not None and orb_low is not None:
+                windows[i] = _scan_window(orb_time, d)
+
+        bars = self._load_windows(windows)
+        for i, (o, h, l, c) in bars.items():
+            summary = _path_summary(rows[i][1], rows[i][2], o, h, l, c, self.sl_mode)
+            if summary is not None:
+                up[i], entry[i], risk[i], best[i], stopped[i] = summary
+
+        with np.errstate(invalid="ignore"):
+            tradeable = ~np.isnan(entry) & (risk > 0)
+        # Minimum viable risk gate (pipeline/cost_model.check_minimum_viable_risk)
+        viable = tradeable & minimum_viable_risk_mask(risk, self.point_value, self.total_friction)[0]
+
+        return OrbPaths(
+            dates=np.array([r[0] for r in rows], dtype="datetime64[D]"),
+            up=up, entry=entry, risk=risk, best=best, stopped=stopped,
+            tradeable=tradeable, viable=viable,
+            orb_size_norm=orb_size_norm, travel_norm=travel_norm, session_type=session_type,
+        )
+
+    def _load_windows(self, windows: Dict[int, Tuple[str, str]]) -> Dict[int, Tuple[np.ndarray, ...]]:
+        """OHLC of every [start, end) local window in one range-join query."""
+        if not windows:
+            return {}
+        keys = sorted(windows)
+        starts = [windows[k][0] for k in keys]
+        ends = [windows[k][1] for k in keys]
+
+        data = self.conn.execute("""
+            WITH w AS (
+                SELECT
+                  unnest(?::INTEGER[]) AS k,
+                  unnest(?::TIMESTAMP[]) AS start_ts,
+                  unnest(?::TIMESTAMP[]) AS end_ts
+            ),
+            b AS (
+                SELECT
+                  (ts_utc AT TIME ZONE 'Australia/Brisbane') AS ts_local,
+                  open, high, low, close
+                FROM bars_1m
+                WHERE symbol = ?
+                  AND (ts_utc AT TIME ZONE 'Australia/Brisbane') >= CAST(? AS TIMESTAMP)
+                  AND (ts_utc AT TIME ZONE 'Australia/Brisbane') < CAST(? AS TIMESTAMP)
+            )
+            SELECT w.k, b.open, b.high, b.low, b.close
+            FROM b
+            JOIN w ON b.ts_local >= w.start_ts AND b.ts_local < w.end_ts
+            ORDER BY w.k, b.ts_local
+        """, [keys, starts, ends, self.instrument, min(starts), max(ends)]).fetchnumpy()
+
+        k_col = data["k"]
+        bounds = np.searchsorted(k_col, np.array(keys), side="left")
+        bounds = np.append(bounds, len(k_col))
+        return {
+            k: tuple(data[col][bounds[j]:bounds[j + 1]].astype(float) for col in ("open", "high", "low", "close"))
+            for j, k in enumerate(keys)
+        }
+
+    def filter_mask(self, orb_time: str, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Days passing every filter in the combo."""
+        p = self.paths(orb_time)
+        mask = np.ones(len(p.dates), dtype=bool)
+        for key, spec in (filters or {}).items():
+            if key == 'orb_size':
+                mask &= _range_mask(p.orb_size_norm, spec)
+            elif key == 'pre_orb_travel':
+                mask &= _range_mask(p.travel_norm, spec)
+            elif key == 'session_type':
+                allowed = set(spec) if isinstance(spec, (list, tuple, set)) else {spec}
+                mask &= np.array([t in allowed for t in p.session_type], dtype=bool)
+            else:
+                raise ValueError(f"Unsupported filter: {key} (supported: {', '.join(FILTER_KEYS)})")
+        return mask
+
+    def outcomes(self, orb_time: str, rr: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (outcome, realized_rr) per day for one RR, as the tradeable model stores them.
+
+        outcome: 'WIN' / 'LOSS' / 'OPEN', or None (no entry / zero risk).
+        realized_rr: NaN where daily_features would store NULL.
+        """
+        if rr is None or rr <= 0:
+            raise ValueError("rr must be positive")
+        p = self.paths(orb_time)
+
+        with np.errstate(invalid="ignore"):
+            target = np.where(p.up, p.entry + (rr * p.risk), p.entry - (rr * p.risk))
+            hit = np.where(p.up, p.best >= target, p.best <= target)
+        win = p.tradeable & hit
+        loss = p.tradeable & ~hit & p.stopped
+
+        # Realized RR on a WIN (NaN where the cost model rejects the trade)
+        realized_win = calculate_realized_rr_array(self.instrument, p.risk, rr, self.stress_level)['realized_rr']
+
+        realized = np.full(len(p.dates), np.nan)
+        realized[win & p.viable] = realized_win[win & p.viable]
+        realized[loss] = -1.0
+
+        outcome = np.full(len(p.dates), None, dtype=object)
+        outcome[p.tradeable] = 'OPEN'
+        outcome[loss] = 'LOSS'
+        outcome[win] = 'WIN'
+        # Costs can downgrade a WIN to a LOSS
+        outcome[win & p.viable & (realized_win <= 0)] = 'LOSS'
+        return outcome, realized
+
+    def score(self, orb_time: str, rr: float, filters: Optional[Dict[str, Any]] = None) -> Dict:
+        """
+        Aggregate metrics for one combination.
+
+        Returns sample_size, profitable_trade_rate, target_hit_rate and
+        avg_realized_rr over the days with a realized RR (as the stored proxy did).
+        """
+        outcome, realized = self.outcomes(orb_time, rr)
+        counted = ~np.isnan(realized) & self.filter_mask(orb_time, filters)
+        n = int(counted.sum())
+        if n == 0:
+            return {'sample_size': 0, 'profitable_trade_rate': None,
+                    'target_hit_rate': None, 'avg_realized_rr': None}
+
+        r = realized[counted]
+        return {
+            'sample_size': n,
+            'profitable_trade_rate': float((r > 0).mean()),
+            'target_hit_rate': float((outcome[counted] == 'WIN').mean()),
+            'avg_realized_rr': float(r.mean()),
+        }
@@ -171,7 +171,8 @@ class SetupScanner:
         self,
         current_prices: Dict[str, float],
         current_atrs: Dict[str, float],
-        orb_data: Dict[str, Dict[str, Dict]] = None
+        orb_data: Dict[str, Dict[str, Dict]] = None,
+        orb_engines: Dict = None
     ) -> pd.DataFrame:
         """
         Scan all setups across all instruments.
@@ -180,6 +181,8 @@ class SetupScanner:
             current_prices: Dict of {instrument: price}
             current_atrs: Dict of {instrument: atr}
             orb_data: Optional dict of {instrument: {orb_name: {high, low, size}}}
+            orb_engines: Optional dict of {instrument: IntradayOrbEngine}; fills
+                orb_data (and missing prices) from streamed bars
 
         Returns:
             DataFrame with all setup statuses
@@ -187,6 +190,14 @@ class SetupScanner:
         now = datetime.now(self.tz)
         results = []
 
+        if orb_engines:
+            orb_data = dict(orb_data or {})
+            current_prices = dict(current_prices)
+            for instrument, engine in orb_engines.items():
+                orb_data.setdefault(instrument, engine.orb_data())
+                if current_prices.get(instrument) is None and engine.last_close is not None:
+                    current_prices[instrument] = engine.last_close
+
         for instrument in self.get_all_instruments():
             # Get all setups for this instrument
             setups = self.detector.get_all_validated_setups(instrument)
@@ -335,7 +346,8 @@ def render_setup_scanner_tab(
     scanner: SetupScanner,
     current_prices: Dict[str, float],
     current_atrs: Dict[str, float],
-    orb_data: Dict[str, Dict[str, Dict]] = None
+    orb_data: Dict[str, Dict[str, Dict]] = None,
+    orb_engines: Dict = None
 ):
     """
     Render the setup scanner tab in Streamlit.
@@ -345,12 +357,13 @@ def render_setup_scanner_tab(
         current_prices: Dict of {instrument: price}
         current_atrs: Dict of {instrument: atr}
         orb_data: Optional ORB data
+        orb_engines: Optional {instrument: IntradayOrbEngine} (live ORB state)
     """
     st.header("🔍 Setup Scanner")
     st.markdown("Real-time monitoring of all 17 validated setups across MGC, NQ, and MPL")
 
     # Scan all setups
-    df = scanner.scan_all_setups(current_prices, current_atrs, orb_data)
+    df = scanner.scan_all_setups(current_prices, current_atrs, orb_data, orb_engines)
 
     if df.empty:
         st.warning("No setups found")
@@ -145,28 +145,27 @@ class StrategyDiscovery:
                 total_r=0.0
             )
 
-        # ✅ CANONICAL EXECUTION: Use execution_engine.simulate_orb_trade()
-        from strategies.execution_engine import simulate_orb_trade, ExecutionMode
+        # ✅ CANONICAL EXECUTION: Use execution_engine (batch form of simulate_orb_trade)
+        from strategies.execution_engine import simulate_orb_trades_batch, ExecutionMode
         from pipeline.cost_model import get_cost_model
 
         # Get canonical costs for this instrument
         cost_model = get_cost_model(config.instrument)
 
         trades = []
-        for _, row in df.iterrows():
-            result = simulate_orb_trade(
-                con=con,
-                date_local=row['date_local'],
-                orb=config.orb_time,
-                mode='1m',
-                confirm_bars=1,
-                rr=config.rr,
-                sl_mode=config.sl_mode.lower(),
-                exec_mode=ExecutionMode.MARKET_ON_CLOSE,
-                slippage_ticks=cost_model['slippage_ticks'],
-                commission_per_contract=cost_model['commission_rt'] / 2
-            )
-
+        results = simulate_orb_trades_batch(
+            con=con,
+            dates=list(df['date_local']),
+            orb=config.orb_time,
+            mode='1m',
+            confirm_bars=1,
+            rr=config.rr,
+            sl_mode=config.sl_mode.lower(),
+            exec_mode=ExecutionMode.MARKET_ON_CLOSE,
+            slippage_ticks=cost_model['slippage_ticks'],
+            commission_per_contract=cost_model['commission_rt'] / 2
+        )
+        for result in results:
             # Skip if no trade
             if result.outcome in ['WIN', 'LOSS']:
                 trades.append(result)
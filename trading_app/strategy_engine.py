@@ -725,6 +725,14 @@ class StrategyEngine:
 
         return False
 
+    def _streamed_orb(self, orb_name: str, orb_start: datetime):
+        """The loader's streaming ORB state for this ORB window, if it has formed."""
+        engine = getattr(self.loader, "orb_engine", None)
+        orb = engine.orb(orb_name) if engine is not None else None
+        if orb is None or orb.start_ms != int(orb_start.timestamp()) * 1000:
+            return None
+        return orb if orb.is_formed(engine.now_ms) else None
+
     def _check_orb(self, orb_name: str) -> Optional[StrategyEvaluation]:
         """
         Check ORB status for a specific time.
@@ -785,7 +793,9 @@ class StrategyEngine:
             )
 
         # ORB complete, check for breakout
-        orb_hl = self.loader.get_session_high_low(orb_start, orb_end)
+        # Streaming ORB state (O(1), no bar rescans); bar cache fallback
+        orb_state = self._streamed_orb(orb_name, orb_start)
+        orb_hl = orb_state.box() if orb_state else self.loader.get_session_high_low(orb_start, orb_end)
 
         if not orb_hl:
             return None
@@ -795,6 +805,23 @@ class StrategyEngine:
         orb_mid = (orb_high + orb_low) / 2
         orb_size = orb_high - orb_low
 
+        # Streamed trade already resolved (or scan window over): the signal is stale
+        if orb_state:
+            orb_status = orb_state.status(self.loader.orb_engine.now_ms)
+            if orb_status in ("WIN", "LOSS", "NO_TRADE", "CLOSED"):
+                return StrategyEvaluation(
+                    strategy_name=f"{orb_name}_ORB",
+                    priority=2 if config["tier"] == "NIGHT" else 4,
+                    state=StrategyState.EXITED,
+                    action=ActionType.STAND_DOWN,
+                    reasons=[
+                        f"{orb_name} ORB: {orb_low:.2f} - {orb_high:.2f}",
+                        f"{orb_name} ORB trade closed ({orb_status})" if orb_status != "CLOSED"
+                        else f"{orb_name} ORB scan window closed without a breakout"
+                    ],
+                    next_instruction=f"Stand down - {orb_name} ORB is done for today"
+                )
+
         # Apply ORB size filter (NO LOOKAHEAD - computed at ORB close)
         filter_result = self.loader.check_orb_size_filter(orb_high, orb_low, orb_name)
 
@@ -819,11 +846,19 @@ class StrategyEngine:
 
         current_price = latest_bar["close"]
 
+        # Breakout = first 1m close outside ORB (from the stream when available)
+        if orb_state:
+            breakout = orb_state.break_dir if orb_state.signal_close is not None else None
+            signal_price = orb_state.signal_close
+        else:
+            breakout = "UP" if current_price > orb_high else "DOWN" if current_price < orb_low else None
+            signal_price = current_price
+
         # Check for breakout
-        if current_price > orb_high:
+        if breakout == "UP":
             # LONG breakout
             # Entry: First close outside ORB (aligned with canonical engine)
-            entry = current_price
+            entry = signal_price
             stop = orb_mid if config["sl_mode"] == "HALF" else orb_low
             risk = abs(entry - stop)  # Risk from ENTRY to STOP (not ORB high to stop)
             target = entry + (config["rr"] * risk)
@@ -846,7 +881,7 @@ class StrategyEngine:
                 reasons=[
                     f"{orb_name} ORB formed (High: ${orb_high:.2f}, Low: ${orb_low:.2f}, Size: {orb_size:.2f} pts)",
                     f"ORB size filter PASSED ({orb_size:.2f} pts / {filter_result.get('atr', 0):.1f} ATR < threshold)" if filter_result["pass"] else f"ORB filter N/A (no filter on {orb_name})",
-                    f"First close outside ORB detected (Close: ${current_price:.2f} > High: ${orb_high:.2f})",
+                    f"First close outside ORB detected (Close: ${signal_price:.2f} > High: ${orb_high:.2f})",
                     f"{setup_info.get('tier', 'N/A')} tier setup ({setup_info.get('win_rate', 0):.1f}% win rate, {setup_info.get('annual_expectancy', 0):.0f}R/year expectancy)" if setup_info else f"Config: RR={config['rr']}, SL={config['sl_mode']}{size_note}"
                 ],
                 next_instruction=f"Enter long at ${entry:.2f}, stop at ${stop:.2f} (ORB {config['sl_mode'].lower()}), target at ${target:.2f} ({config['rr']}R)",
@@ -870,10 +905,10 @@ class StrategyEngine:
                 annual_trades=setup_info.get('annual_trades') if setup_info else None
             )
 
-        elif current_price < orb_low:
+        elif breakout == "DOWN":
             # SHORT breakout
             # Entry: First close outside ORB (aligned with canonical engine)
-            entry = current_price
+            entry = signal_price
             stop = orb_mid if config["sl_mode"] == "HALF" else orb_high
             risk = abs(entry - stop)  # Risk from ENTRY to STOP (not ORB low to stop)
             target = entry - (config["rr"] * risk)
@@ -896,7 +931,7 @@ class StrategyEngine:
                 reasons=[
                     f"{orb_name} ORB formed (High: ${orb_high:.2f}, Low: ${orb_low:.2f}, Size: {orb_size:.2f} pts)",
                     f"ORB size filter PASSED ({orb_size:.2f} pts / {filter_result.get('atr', 0):.1f} ATR < threshold)" if filter_result["pass"] else f"ORB filter N/A (no filter on {orb_name})",
-                    f"First close outside ORB detected (Close: ${current_price:.2f} < Low: ${orb_low:.2f})",
+                    f"First close outside ORB detected (Close: ${signal_price:.2f} < Low: ${orb_low:.2f})",
                     f"{setup_info.get('tier', 'N/A')} tier setup ({setup_info.get('win_rate', 0):.1f}% win rate, {setup_info.get('annual_expectancy', 0):.0f}R/year expectancy)" if setup_info else f"Config: RR={config['rr']}, SL={config['sl_mode']}{size_note}"
                 ],
                 next_instruction=f"Enter short at ${entry:.2f}, stop at ${stop:.2f} (ORB {config['sl_mode'].lower()}), target at ${target:.2f} ({config['rr']}R)",
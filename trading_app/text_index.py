@@ -0,0 +1,229 @@
+"""
+TEXT INDEX - Incremental inverted index with BM25 ranking in DuckDB
+
+Replaces `content LIKE '%query%'` scans over growing text tables
+(ai_chat_history, trade_journal lessons). Each indexed table gets three
+side tables named after it:
+
+- {name}_postings: (token, doc_id, tf) - one row per distinct token per doc
+- {name}_docs:     (doc_id, length)    - token count per doc (BM25 length norm)
+- {name}_stats:    single row (n_docs, total_length, watermark)
+
+Documents are added as they are written (add) and removed with their rows
+(remove). sync() indexes rows written by anything else: rows above the
+watermark id that are not indexed yet, so it reads only new rows.
+
+Plain SQL only - no full-text-search extension to install.
+
+Usage:
+    from trading_app.text_index import TextIndex
+
+    index = TextIndex("ai_chat_history")
+    index.ensure_schema(conn)
+    index.add(conn, message_id, content)
+    hits = index.search(conn, "asia sweep", limit=10)   # [(doc_id, score), ...]
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import duckdb
+
+# BM25 parameters (Robertson / Lucene defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word / number tokens ('Asia sweep, 2.5R' -> ['asia', 'sweep', '2.5', 'r'])"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+class TextIndex:
+    """Inverted index over one text column of one table, keyed by its integer id"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.postings = f"{name}_postings"
+        self.docs = f"{name}_docs"
+        self.stats = f"{name}_stats"
+
+    def ensure_schema(self, conn: duckdb.DuckDBPyConnection) -> None:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.postings} (
+                token VARCHAR NOT NULL,
+                doc_id BIGINT NOT NULL,
+                tf INTEGER NOT NULL
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.postings}_token ON {self.postings}(token)")
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.docs} (
+                doc_id BIGINT PRIMARY KEY,
+                length INTEGER NOT NULL
+            )
+        """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.stats} (
+                n_docs BIGINT NOT NULL,
+                total_length BIGINT NOT NULL,
+                watermark BIGINT
+            )
+        """)
+        if conn.execute(f"SELECT COUNT(*) FROM {self.stats}").fetchone()[0] == 0:
+            conn.execute(f"INSERT INTO {self.stats} VALUES (0, 0, NULL)")
+
+    def add(self, conn: duckdb.DuckDBPyConnection, doc_id: int, text: Optional[str]) -> None:
+        """Index one document (no-op if already indexed)"""
+        self.add_many(conn, [(doc_id, text)])
+
+    def add_many(self, conn: duckdb.DuckDBPyConnection, docs: Sequence[Tuple[int, Optional[str]]]) -> int:
+        """
+        Index documents in three set-based statements
+
+        Returns:
+            Number of documents newly indexed
+        """
+        if not docs:
+            return 0
+        ids = [doc_id for doc_id, _ in docs]
+        placeholders = ", ".join("?" for _ in ids)
+        indexed = {row[0] for row in conn.execute(
+            f"SELECT doc_id FROM {self.docs} WHERE doc_id IN ({placeholders})", ids
+        ).fetchall()}
+
+        postings, lengths = [], []
+        for doc_id, text in docs:
+            if doc_id in indexed:
+                continue
+            indexed.add(doc_id)
+            tokens = tokenize(text)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            postings.extend((token, doc_id, tf) for token, tf in counts.items())
+            lengths.append((doc_id, len(tokens)))
+        if not lengths:
+            return 0
+
+        conn.execute(
+            f"INSERT INTO {self.docs} SELECT unnest(?::BIGINT[]), unnest(?::INTEGER[])",
+            [[d for d, _ in lengths], [n for _, n in lengths]],
+        )
+        if postings:
+            conn.execute(
+                f"INSERT INTO {self.postings} "
+                f"SELECT unnest(?::VARCHAR[]), unnest(?::BIGINT[]), unnest(?::INTEGER[])",
+                [[p[0] for p in postings], [p[1] for p in postings], [p[2] for p in postings]],
+            )
+        conn.execute(
+            f"UPDATE {self.stats} SET n_docs = n_docs + ?, total_length = total_length + ?",
+            [len(lengths), sum(n for _, n in lengths)],
+        )
+        return len(lengths)
+
+    def remove(self, conn: duckdb.DuckDBPyConnection, doc_id_sql: str, params: Sequence = ()) -> None:
+        """Drop the documents selected by doc_id_sql (a query returning ids)"""
+        n_docs, total_length = conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM {self.docs} WHERE doc_id IN ({doc_id_sql})",
+            list(params),
+        ).fetchone()
+        if not n_docs:
+            return
+        conn.execute(f"DELETE FROM {self.postings} WHERE doc_id IN ({doc_id_sql})", list(params))
+        conn.execute(f"DELETE FROM {self.docs} WHERE doc_id IN ({doc_id_sql})", list(params))
+        conn.execute(
+            f"UPDATE {self.stats} SET n_docs = n_docs - ?, total_length = total_length - ?",
+            [n_docs, total_length],
+        )
+
+    def sync(self, conn: duckdb.DuckDBPyConnection, table: str, id_column: str, text_column: str) -> int:
+        """
+        Index rows of table written without add() (above the watermark only)
+
+        Returns:
+            Number of documents newly indexed
+        """
+        watermark = conn.execute(f"SELECT watermark FROM {self.stats}").fetchone()[0]
+        rows = conn.execute(f"""
+            SELECT t.{id_column}, t.{text_column}
+            FROM {table} t
+            WHERE t.{id_column} > COALESCE(?, -9223372036854775808)
+              AND NOT EXISTS (SELECT 1 FROM {self.docs} d WHERE d.doc_id = t.{id_column})
+            ORDER BY t.{id_column}
+        """, [watermark]).fetchall()
+        added = self.add_many(conn, rows)
+        newest = conn.execute(
+            f"SELECT MAX({id_column}) FROM {table} WHERE {id_column} > COALESCE(?, -9223372036854775808)",
+            [watermark],
+        ).fetchone()[0]
+        if newest is not None:
+            conn.execute(f"UPDATE {self.stats} SET watermark = ?", [newest])
+        return added
+
+    def search(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        table: Optional[str] = None,
+        id_column: str = "id",
+        where_sql: str = "",
+        params: Sequence = (),
+        columns: str = "",
+        order_by: str = "",
+    ) -> List[tuple]:
+        """
+        BM25-ranked documents matching any query term (more terms rank higher)
+
+        Without table: [(doc_id, score), ...]. With table: its rows
+        (columns, then score) joined on id_column, filtered by where_sql
+        (on alias t, using params), tie-broken by order_by.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        n_docs, total_length = conn.execute(f"SELECT n_docs, total_length FROM {self.stats}").fetchone()
+        if not n_docs:
+            return []
+        avg_length = max(total_length / n_docs, 1e-9)
+
+        placeholders = ", ".join("?" for _ in terms)
+        scored = f"""
+            WITH matches AS (
+                SELECT token, doc_id, tf FROM {self.postings} WHERE token IN ({placeholders})
+            ),
+            idf AS (
+                SELECT token, ln(1 + (? - COUNT(*) + 0.5) / (COUNT(*) + 0.5)) AS idf
+                FROM matches GROUP BY token
+            ),
+            scores AS (
+                SELECT m.doc_id,
+                       SUM(i.idf * m.tf * {BM25_K1 + 1}
+                           / (m.tf + {BM25_K1} * (1 - {BM25_B} + {BM25_B} * d.length / ?))) AS score
+                FROM matches m
+                JOIN idf i USING (token)
+                JOIN {self.docs} d USING (doc_id)
+                GROUP BY m.doc_id
+            )
+        """
+        args = [*terms, n_docs, avg_length]
+        if table is None:
+            sql = scored + "SELECT doc_id, score FROM scores ORDER BY score DESC, doc_id DESC LIMIT ? OFFSET ?"
+            return conn.execute(sql, [*args, limit, offset]).fetchall()
+
+        select = f"{columns}, s.score" if columns else f"t.{id_column}, s.score"
+        sql = scored + f"""
+            SELECT {select}
+            FROM scores s
+            JOIN {table} t ON t.{id_column} = s.doc_id
+            {where_sql}
+            ORDER BY s.score DESC{', ' + order_by if order_by else ''}, s.doc_id DESC
+            LIMIT ? OFFSET ?
+        """
+        return conn.execute(sql, [*args, *params, limit, offset]).fetchall()